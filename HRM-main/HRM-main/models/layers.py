@@ -7,8 +7,12 @@ import torch.nn.functional as F
 try:
     from flash_attn_interface import flash_attn_func  # type: ignore[import]
 except ImportError:
-    # Fallback to FlashAttention 2
-    from flash_attn import flash_attn_func  # type: ignore[import]
+    try:
+        # Fallback to FlashAttention 2
+        from flash_attn import flash_attn_func  # type: ignore[import]
+    except ImportError:
+        # No FlashAttention (e.g. CPU-only installs): use PyTorch SDPA
+        flash_attn_func = None
 
 from models.common import trunc_normal_init_
 
@@ -126,12 +130,24 @@ class Attention(nn.Module):
             cos, sin = cos_sin
             query, key = apply_rotary_pos_emb(query, key, cos, sin)
 
-        # flash attn
-        attn_output = flash_attn_func(q=query, k=key, v=value, causal=self.causal)
-        if isinstance(attn_output, tuple):  # fa2 and fa3 compatibility
-            attn_output = attn_output[0]
-
-        attn_output = attn_output.view(batch_size, seq_len, self.output_size)  # type: ignore
+        if flash_attn_func is not None and query.is_cuda:
+            # flash attn
+            attn_output = flash_attn_func(q=query, k=key, v=value, causal=self.causal)
+            if isinstance(attn_output, tuple):  # fa2 and fa3 compatibility
+                attn_output = attn_output[0]
+        else:
+            # SDPA expects [bs, num_heads, seq_len, head_dim]
+            query, key, value = query.transpose(1, 2), key.transpose(1, 2), value.transpose(1, 2)
+            if self.num_key_value_heads != self.num_heads:
+                # Expand KV heads for GQA (SDPA's enable_gqa needs torch >= 2.5)
+                groups = self.num_heads // self.num_key_value_heads
+                key = key.repeat_interleave(groups, dim=1)
+                value = value.repeat_interleave(groups, dim=1)
+            attn_output = F.scaled_dot_product_attention(
+                query, key, value, is_causal=self.causal
+            ).transpose(1, 2)
+
+        attn_output = attn_output.reshape(batch_size, seq_len, self.output_size)  # type: ignore
         return self.o_proj(attn_output)
 
 
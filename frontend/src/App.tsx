@@ -1,4 +1,4 @@
-import React, { useState, useEffect } from 'react';
+import React, { useState, useEffect, useCallback } from 'react';
 import { MainContainer } from './components/MainContainer';
 import { RightSideMenu, MenuItem } from './components/RightSideMenu';
 import { ChatModule, Message } from './components/ChatModule';
@@ -58,13 +58,18 @@ const App: React.FC = () => {
     */
   };
 
+  // Lets the backend start retrieval before the message is sent
+  const handleDraftChange = useCallback((content: string) => {
+    bridge.sendDraft(content);
+  }, []);
+
   // Rendering logic for Overlay Mode
   if (isOverlayMode) {
     return (
       <div className="p-4 flex flex-col items-center gap-4">
         <CentralHUD gameName="Cyberpunk 2077" isDetected={true} />
         <div className="w-[400px] h-[300px]">
-          <ChatModule messages={messages} onSendMessage={handleSendMessage} />
+          <ChatModule messages={messages} onSendMessage={handleSendMessage} onDraftChange={handleDraftChange} />
         </div>
       </div>
     );
@@ -84,7 +89,7 @@ const App: React.FC = () => {
           <div className="flex-1 p-6 overflow-hidden">
             <AnimatedSection key={activeTab} className="h-full">
               {activeTab === 'chat' && (
-                <ChatModule messages={messages} onSendMessage={handleSendMessage} />
+                <ChatModule messages={messages} onSendMessage={handleSendMessage} onDraftChange={handleDraftChange} />
               )}
               {activeTab === 'settings' && (
                 <SettingsModule />
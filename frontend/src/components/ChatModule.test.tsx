@@ -1,4 +1,4 @@
-import { render, screen, fireEvent } from '@testing-library/react';
+import { render, screen, fireEvent, act } from '@testing-library/react';
 import { ChatModule } from './ChatModule';
 import { describe, it, expect, vi } from 'vitest';
 
@@ -30,6 +30,25 @@ describe('ChatModule', () => {
     expect(onSendMessage).toHaveBeenCalledWith('New message');
   });
 
+  it('reports the draft once typing pauses', () => {
+    vi.useFakeTimers();
+    const onDraftChange = vi.fn();
+    render(<ChatModule messages={[]} onSendMessage={() => {}} onDraftChange={onDraftChange} />);
+
+    const input = screen.getByPlaceholderText(/Type your message/i);
+    fireEvent.change(input, { target: { value: 'How do I' } });
+    fireEvent.change(input, { target: { value: 'How do I parry' } });
+    expect(onDraftChange).not.toHaveBeenCalled();
+
+    act(() => {
+      vi.advanceTimersByTime(300);
+    });
+
+    expect(onDraftChange).toHaveBeenCalledTimes(1);
+    expect(onDraftChange).toHaveBeenCalledWith('How do I parry');
+    vi.useRealTimers();
+  });
+
   it('has the correct cyberpunk styling classes', () => {
     render(<ChatModule messages={[]} onSendMessage={() => {}} />);
     const container = screen.getByTestId('chat-module');
@@ -10,9 +10,17 @@ export interface Message {
 interface ChatModuleProps {
   messages: Message[];
   onSendMessage: (content: string) => void;
+  /** Called with the input text once typing pauses, so answers can be prefetched */
+  onDraftChange?: (content: string) => void;
+  draftDelayMs?: number;
 }
 
-export const ChatModule: React.FC<ChatModuleProps> = ({ messages, onSendMessage }) => {
+export const ChatModule: React.FC<ChatModuleProps> = ({
+  messages,
+  onSendMessage,
+  onDraftChange,
+  draftDelayMs = 300,
+}) => {
   const [inputValue, setInputValue] = useState('');
   const messagesEndRef = useRef<HTMLDivElement>(null);
 
@@ -26,6 +34,13 @@ export const ChatModule: React.FC<ChatModuleProps> = ({ messages, onSendMessage
     scrollToBottom();
   }, [messages]);
 
+  useEffect(() => {
+    const draft = inputValue.trim();
+    if (!onDraftChange || !draft) return;
+    const timer = setTimeout(() => onDraftChange(draft), draftDelayMs);
+    return () => clearTimeout(timer);
+  }, [inputValue, onDraftChange, draftDelayMs]);
+
   const handleSubmit = (e: React.FormEvent) => {
     e.preventDefault();
     if (inputValue.trim()) {
@@ -45,6 +45,12 @@ class Bridge {
     }
   }
 
+  public sendDraft(content: string) {
+    if (this.bridge && this.bridge.updateDraft) {
+      this.bridge.updateDraft(content);
+    }
+  }
+
   public toggleOverlay() {
     if (this.bridge) {
       this.bridge.toggleOverlay();
@@ -67,6 +67,7 @@ def main():
     from config import Config
     from credential_store import CredentialStore
     from game_detector import GameDetector
+    from game_discovery import GameDiscovery
     from ai_assistant import AIAssistant
     from gui import run_gui
     from ui.design_system import design_system
@@ -103,7 +104,7 @@ def main():
         logger.info("Step 2: Initializing game detector...")
         print("Initializing game detector...")
 
-        game_detector = GameDetector()
+        game_detector = GameDetector(discovery=GameDiscovery())
 
         logger.info("Game detector initialized")
         logger.info("  Known games: %s", len(game_detector.common_games))
@@ -135,6 +136,18 @@ def main():
             )
             print()
 
+        # Long sessions are summarized in the background as events are logged;
+        # the recap dialog reuses this coach and its summaries
+        try:
+            from src.session_coaching import get_session_coach
+
+            session_coach = get_session_coach(config=config)
+            if session_coach.summarizer is not None:
+                atexit.register(session_coach.summarizer.shutdown)
+                logger.info("Session summarizer attached to session logger")
+        except Exception as e:
+            logger.warning("Session summarizer unavailable: %s", e)
+
         logger.info("Step 4: Scanning for running games...")
         print("Scanning for running games...")
 
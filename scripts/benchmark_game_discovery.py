@@ -0,0 +1,122 @@
+"""
+Benchmark game discovery on synthetic process tables.
+
+Builds a fake filesystem with store libraries, engine files, tools and
+system binaries, then measures classifying a full process table cold
+(empty cache), warm (same instance) and after reloading the cache from
+disk, as happens on the next start.
+
+Usage:
+    python scripts/benchmark_game_discovery.py [--processes 300] [--games 10]
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.game_discovery import GameDiscovery  # noqa: E402
+from src.process_monitor import ProcessInfo  # noqa: E402
+
+
+def build_table(root: Path, process_count: int, game_count: int) -> List[ProcessInfo]:
+    """Create executables on disk and a matching process table"""
+    table: List[ProcessInfo] = []
+    layouts = [
+        ("steamapps/common/Game{i}/game{i}.exe", ["UnityPlayer.dll", "steam_api64.dll"]),
+        ("Games/Heroic/Game{i}/Binaries/Win64/Game{i}-Win64-Shipping.exe", []),
+        ("Games/Lutris/game{i}/game{i}", ["game{i}.pck"]),
+    ]
+    for i in range(game_count):
+        pattern, neighbours = layouts[i % len(layouts)]
+        table.append(_make(root, pattern.format(i=i), [n.format(i=i) for n in neighbours], i))
+
+    pid = game_count
+    while len(table) < process_count:
+        if pid % 3 == 0:
+            # System binaries are rejected by path without touching the disk
+            table.append(ProcessInfo(pid, f"daemon{pid}", f"/usr/lib/daemon{pid}"))
+        elif pid % 3 == 1:
+            table.append(_make(root, f"tools/tool{pid}/tool{pid}.exe", ["readme.txt"], pid))
+        else:
+            table.append(_make(root, f"apps/app{pid}/app{pid}.exe", ["fmod.dll"], pid))
+        pid += 1
+    return table
+
+
+def _make(root: Path, relative: str, neighbours: List[str], pid: int) -> ProcessInfo:
+    exe = root / relative
+    exe.parent.mkdir(parents=True, exist_ok=True)
+    exe.write_bytes(b"")
+    for name in neighbours:
+        (exe.parent / name).write_bytes(b"")
+    return ProcessInfo(pid=pid, name=exe.name, exe=str(exe))
+
+
+def time_pass(discovery: GameDiscovery, table: List[ProcessInfo]) -> float:
+    """Seconds to classify every process once"""
+    start = time.perf_counter()
+    for info in table:
+        discovery.classify(info)
+    return time.perf_counter() - start
+
+
+def run_benchmark(process_count: int = 300, game_count: int = 10) -> Dict:
+    """
+    Measure cold, warm and reloaded classification passes
+
+    Returns:
+        Dict with 'cold_ms', 'warm_ms', 'reloaded_ms', 'games' and
+        'classifications' (static classifications per pass)
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        table = build_table(root / "fs", process_count, game_count)
+        probes = {"cpu_probe": lambda pid: 0.0, "window_class_probe": lambda pid: []}
+
+        discovery = GameDiscovery(config_dir=root / "config", **probes)
+        cold = time_pass(discovery, table)
+        cold_classifications = discovery.classifications
+        warm = time_pass(discovery, table)
+        games = sum(1 for info in table if (r := discovery.classify(info)) and r.is_game)
+        discovery.save()
+
+        reloaded = GameDiscovery(config_dir=root / "config", **probes)
+        reloaded_time = time_pass(reloaded, table)
+
+    return {
+        "processes": len(table),
+        "games": games,
+        "cold_ms": cold * 1000,
+        "warm_ms": warm * 1000,
+        "reloaded_ms": reloaded_time * 1000,
+        "classifications": [cold_classifications, discovery.classifications - cold_classifications,
+                            reloaded.classifications],
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--processes", type=int, default=300)
+    parser.add_argument("--games", type=int, default=10)
+    args = parser.parse_args()
+
+    row = run_benchmark(args.processes, args.games)
+    print(f"{row['processes']} processes, {row['games']} classified as games")
+    print(f"{'pass':>9} {'ms/table':>10} {'us/process':>11} {'classified':>11}")
+    for label, key, classified in zip(
+        ("cold", "warm", "reloaded"),
+        ("cold_ms", "warm_ms", "reloaded_ms"),
+        row["classifications"],
+    ):
+        per_process = row[key] * 1000 / row["processes"]
+        print(f"{label:>9} {row[key]:>10.3f} {per_process:>11.2f} {classified:>11}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
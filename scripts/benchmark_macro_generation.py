@@ -0,0 +1,98 @@
+"""
+Benchmark AI macro generation against the configured Ollama endpoint.
+
+Runs a fixed set of macro descriptions through MacroAIGenerator and
+reports mean request latency and failure rate (no valid macro in the
+reply) for three passes:
+
+- cold: one request per description
+- cached: the same descriptions again, served from the result cache
+- variants: several variants per description, one request each
+
+With --free-form the schema `format` is not sent, for comparison with the
+old prompt-and-scrape behaviour.
+
+Usage:
+    python scripts/benchmark_macro_generation.py [--model llama3]
+        [--variants 3] [--free-form] [--max-failure-rate 0.1]
+"""
+
+import argparse
+import logging
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.ai_router import AIRouter  # noqa: E402
+from src.config import Config  # noqa: E402
+from src.macro_ai_generator import MacroAIGenerator  # noqa: E402
+
+DESCRIPTIONS = [
+    ("Press 1 then 2 quickly", "Elden Ring"),
+    ("Dodge roll twice with a short pause", "Elden Ring"),
+    ("Drink a flask and then heavy attack", "Elden Ring"),
+    ("Open the map, wait, close it", "Skyrim"),
+    ("Quick save with F5", "Skyrim"),
+    ("Hold W for two seconds then jump", "Minecraft"),
+    ("Right click, wait half a second, left click", "Minecraft"),
+    ("Copy and paste a blueprint with ctrl+c and ctrl+v", "Factorio"),
+    ("Cycle through weapons 1 to 4", "Counter-Strike 2"),
+    ("Scroll down three times to zoom out", "Civilization VI"),
+]
+
+
+def run_pass(generator: MacroAIGenerator, label: str, variants: int) -> None:
+    before = generator.get_generation_stats()
+    started = time.perf_counter()
+    produced = 0
+    for description, game in DESCRIPTIONS:
+        macros, _ = generator.generate_variants(description, game, count=variants)
+        produced += len(macros)
+    elapsed = time.perf_counter() - started
+    after = generator.get_generation_stats()
+
+    requests = after["requests"] - before["requests"]
+    failures = after["failures"] - before["failures"]
+    hits = after["cache_hits"] - before["cache_hits"]
+    mean_ms = elapsed / len(DESCRIPTIONS) * 1000
+    failure_rate = failures / requests if requests else 0.0
+    print(f"{label:<10} {requests:>4} req {hits:>4} hits {produced:>4} macros "
+          f"mean {mean_ms:8.1f} ms  failure rate {failure_rate:.0%}")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark AI macro generation")
+    parser.add_argument("--model", help="Model to use (default: configured model)")
+    parser.add_argument("--variants", type=int, default=3, help="Variants per request in the batch pass")
+    parser.add_argument("--free-form", action="store_true", help="Do not send the JSON schema format")
+    parser.add_argument("--max-failure-rate", type=float, help="Exit 1 if the overall failure rate is higher")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    config = Config()
+    if args.model:
+        config.ollama_model = args.model
+    generator = MacroAIGenerator(AIRouter(config=config))
+    if args.free_form:
+        generator.get_schema = lambda variants=1: None
+
+    print(f"model={config.ollama_model} schema={'off' if args.free_form else 'on'} "
+          f"descriptions={len(DESCRIPTIONS)}")
+    run_pass(generator, "cold", 1)
+    run_pass(generator, "cached", 1)
+    run_pass(generator, "variants", args.variants)
+
+    stats = generator.get_generation_stats()
+    print(f"overall: {stats['requests']} requests, mean latency {stats['mean_latency'] * 1000:.1f} ms, "
+          f"failure rate {stats['failure_rate']:.0%}")
+
+    if args.max_failure_rate is not None and stats["failure_rate"] > args.max_failure_rate:
+        print(f"FAIL: failure rate above {args.max_failure_rate:.0%}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,219 @@
+"""
+Benchmark macro replay on a macro corpus.
+
+Replays every macro of a corpus (synthetic, or a JSON file in the
+MacroManager.save_to_dict format) three ways, all headless through a
+recording input backend:
+
+- virtual: MacroRunner on a virtual clock, one macro at a time. Waits are
+  free, so wall time is pure scheduling and dispatch overhead.
+- concurrent: the whole corpus at once through MacroExecutor on a
+  virtual clock.
+- realtime: a sample of macros on the real clock, reporting how late
+  events ran against their deadlines (step jitter).
+
+Usage:
+    python scripts/benchmark_macro_replay.py [--macros 200] [--steps 50]
+        [--corpus macros.json] [--realtime-seconds 2] [--max-p95-ms 2.0]
+"""
+
+import argparse
+import json
+import logging
+import random
+import sys
+import time
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Dict, List, Optional
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.macro_executor import MacroExecutor  # noqa: E402
+from src.macro_input import RecordingInputBackend, VirtualClock  # noqa: E402
+from src.macro_manager import Macro, MacroStep, MacroStepType  # noqa: E402
+from src.macro_plan import MacroPlanCache, compile_macro  # noqa: E402
+from src.macro_runner import MacroExecutionState, MacroRunner  # noqa: E402
+from src.macro_timing import PrecisionTimer, TimingStats  # noqa: E402
+
+# Limits are lifted: corpora can be longer than the interactive defaults
+_CONFIG = SimpleNamespace(macro_execution_timeout=10 ** 9, max_macro_repeat=10 ** 6)
+
+_KEYS = ["w", "a", "s", "d", "e", "q", "r", "space", "shift", "ctrl+c", "alt+tab", "f5"]
+
+
+def synthetic_corpus(macro_count: int, step_count: int, seed: int = 0) -> List[Macro]:
+    """Random but reproducible macros mixing key, mouse and delay steps"""
+    rng = random.Random(seed)
+    corpus = []
+    for i in range(macro_count):
+        steps = []
+        for _ in range(step_count):
+            roll = rng.random()
+            if roll < 0.35:
+                steps.append(MacroStep(type=MacroStepType.KEY_PRESS.value, key=rng.choice(_KEYS),
+                                       duration_ms=rng.randint(0, 30)))
+            elif roll < 0.5:
+                steps.append(MacroStep(type=MacroStepType.KEY_DOWN.value, key=rng.choice(_KEYS),
+                                       duration_ms=rng.randint(10, 80)))
+            elif roll < 0.6:
+                steps.append(MacroStep(type=MacroStepType.KEY_SEQUENCE.value, key="gg wp"))
+            elif roll < 0.75:
+                steps.append(MacroStep(type=MacroStepType.MOUSE_MOVE.value,
+                                       x=rng.randint(0, 1920), y=rng.randint(0, 1080)))
+            elif roll < 0.85:
+                steps.append(MacroStep(type=MacroStepType.MOUSE_CLICK.value, button="left",
+                                       x=rng.randint(0, 1920), y=rng.randint(0, 1080)))
+            else:
+                steps.append(MacroStep(type=MacroStepType.DELAY.value, duration_ms=rng.randint(5, 50),
+                                       delay_jitter_ms=rng.choice([0, 0, 5])))
+        corpus.append(Macro(id=f"bench{i}", name=f"Bench {i}", description="",
+                            steps=steps, repeat=rng.randint(1, 3)))
+    return corpus
+
+
+def load_corpus(path: Path) -> List[Macro]:
+    """Load macros saved with MacroManager.save_to_dict"""
+    data = json.loads(path.read_text(encoding="utf-8"))
+    return [Macro.from_dict(entry) for entry in data.values()]
+
+
+def _runner(backend, timer) -> MacroRunner:
+    return MacroRunner(enabled=True, config=_CONFIG, backend=backend, timer=timer)
+
+
+def _play(runner: MacroRunner, macro: Macro) -> None:
+    if not runner.execute_macro(macro):
+        raise RuntimeError(f"Macro failed to start: {macro.name}")
+    if runner.execution_thread is not None:
+        runner.execution_thread.join()
+    if runner.state != MacroExecutionState.COMPLETED:
+        raise RuntimeError(f"Macro did not complete: {macro.name} ({runner.state.value})")
+
+
+def bench_virtual(corpus: List[Macro]) -> Dict:
+    """Sequential replay in simulated time"""
+    clock = VirtualClock()
+    backend = RecordingInputBackend(clock)
+    runner = _runner(backend, clock)
+    steps = sum(len(m.steps) * m.repeat for m in corpus)
+
+    start = time.perf_counter()
+    for macro in corpus:
+        _play(runner, macro)
+    wall = time.perf_counter() - start
+
+    return _row("virtual", wall, steps, len(backend.events), clock.now)
+
+
+def bench_concurrent(corpus: List[Macro]) -> Dict:
+    """All macros at once on one executor, in simulated time"""
+    clock = VirtualClock()
+    backend = RecordingInputBackend(clock)
+    executor = MacroExecutor(backend=backend, timer=clock, default_timeout=None,
+                             rng=random.Random(0))
+    steps = sum(len(m.steps) * m.repeat for m in corpus)
+
+    start = time.perf_counter()
+    for macro in corpus:
+        executor.submit(macro)
+    executor.run_until_idle()
+    wall = time.perf_counter() - start
+
+    row = _row("concurrent", wall, steps, len(backend.events), clock.now)
+    row["conflicts"] = len(executor.conflicts)
+    return row
+
+
+def bench_realtime(corpus: List[Macro], budget: float) -> Dict:
+    """Replay macros on the real clock until `budget` seconds of plans are used (at least one)"""
+    timer = PrecisionTimer()
+    runner = _runner(RecordingInputBackend(timer.clock), timer)
+    plans = MacroPlanCache(lambda m: compile_macro(m, resolve_keys=runner._parse_key_combo))
+    jitter = TimingStats()
+    steps = events = 0
+    planned = 0.0
+
+    # Shortest macros first, so small budgets still cover several macros
+    durations = sorted((plans.get(m).duration * m.repeat, i) for i, m in enumerate(corpus))
+
+    start = time.perf_counter()
+    for duration, index in durations:
+        if planned and planned + duration > budget:
+            break
+        macro = corpus[index]
+        _play(runner, macro)
+        planned += duration
+        steps += len(macro.steps) * macro.repeat
+        events += runner.timing_stats.count
+        jitter.merge(runner.timing_stats)
+    wall = time.perf_counter() - start
+
+    row = _row("realtime", wall, steps, events, planned)
+    row.update(jitter.to_dict())
+    # Time beyond the plans' own durations is the overhead here
+    row["overhead_us"] = max(0.0, wall - planned) * 1e6 / events if events else 0.0
+    return row
+
+
+def _row(label: str, wall: float, steps: int, events: int, simulated: float) -> Dict:
+    return {
+        "pass": label,
+        "wall_s": wall,
+        "simulated_s": simulated,
+        "steps": steps,
+        "events": events,
+        "steps_per_s": steps / wall if wall else float("inf"),
+        "overhead_us": wall * 1e6 / events if events else 0.0,
+    }
+
+
+def run_benchmark(corpus: List[Macro], realtime_budget: float = 2.0) -> List[Dict]:
+    """
+    Run every pass over a corpus
+
+    Returns:
+        One dict per pass with 'wall_s', 'simulated_s', 'steps', 'events',
+        'steps_per_s' and 'overhead_us' (wall microseconds per event beyond
+        simulated waits); the realtime pass adds lateness statistics
+        ('mean_ms', 'p95_ms', ...)
+    """
+    rows = [bench_virtual(corpus), bench_concurrent(corpus)]
+    if realtime_budget > 0:
+        rows.append(bench_realtime(corpus, realtime_budget))
+    return rows
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--macros", type=int, default=200)
+    parser.add_argument("--steps", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--corpus", type=Path, help="JSON file of saved macros")
+    parser.add_argument("--realtime-seconds", type=float, default=2.0)
+    parser.add_argument("--max-p95-ms", type=float, help="Fail if realtime p95 lateness exceeds this")
+    args = parser.parse_args(argv)
+    logging.getLogger("src").setLevel(logging.WARNING)
+
+    corpus = load_corpus(args.corpus) if args.corpus else synthetic_corpus(args.macros, args.steps, args.seed)
+    rows = run_benchmark(corpus, args.realtime_seconds)
+
+    print(f"{len(corpus)} macros")
+    print(f"{'pass':>11} {'wall s':>8} {'sim s':>8} {'steps':>8} {'events':>8} {'steps/s':>10} {'us/event':>9}")
+    for row in rows:
+        print(f"{row['pass']:>11} {row['wall_s']:>8.3f} {row['simulated_s']:>8.2f} {row['steps']:>8} "
+              f"{row['events']:>8} {row['steps_per_s']:>10.0f} {row['overhead_us']:>9.2f}")
+
+    realtime = next((row for row in rows if row["pass"] == "realtime"), None)
+    if realtime:
+        print(f"realtime lateness: mean {realtime['mean_ms']:.3f} ms, stdev {realtime['stdev_ms']:.3f} ms, "
+              f"p95 {realtime['p95_ms']:.3f} ms, max {realtime['max_ms']:.3f} ms, "
+              f"rebases {realtime['rebases']}")
+        if args.max_p95_ms is not None and realtime["p95_ms"] > args.max_p95_ms:
+            print(f"FAIL: p95 lateness above {args.max_p95_ms} ms")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
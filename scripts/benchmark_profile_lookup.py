@@ -0,0 +1,110 @@
+"""
+Benchmark executable -> profile matching per watch tick.
+
+Compares the indexed GameProfileStore lookup with the previous linear
+scan over every profile's exe_names, for a synthetic process table
+matched once per tick.
+
+Usage:
+    python scripts/benchmark_profile_lookup.py [--processes 300] [--ticks 20]
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.game_profile import GameProfile, GameProfileStore  # noqa: E402
+
+
+def build_store(config_dir: str, profile_count: int) -> GameProfileStore:
+    """Create a store with `profile_count` custom profiles (plus built-ins)"""
+    store = GameProfileStore(config_dir=Path(config_dir))
+    store._save_to_disk = lambda: None  # keep the benchmark off the disk
+    for i in range(profile_count):
+        exe_names = [f"game{i}.exe", f"Game{i}-Win64-Shipping.exe"]
+        if i % 10 == 0:
+            exe_names.append(f"launcher{i}_*.exe")
+        store.create_profile(
+            GameProfile(
+                id=f"game_{i}",
+                display_name=f"Game {i}",
+                exe_names=exe_names,
+                system_prompt="Prompt",
+            )
+        )
+    return store
+
+
+def linear_lookup(store: GameProfileStore, exe_name: str) -> GameProfile:
+    """The pre-index lookup: first profile whose exe_names match"""
+    for profile in store.profiles.values():
+        if profile.matches_executable(exe_name):
+            return profile
+    return store.profiles["generic_game"]
+
+
+def time_ticks(lookup, store: GameProfileStore, processes: List[str], ticks: int) -> float:
+    """Mean seconds to match every process once"""
+    start = time.perf_counter()
+    for _ in range(ticks):
+        for name in processes:
+            lookup(store, name)
+    return (time.perf_counter() - start) / ticks
+
+
+def run_benchmark(
+    profile_counts: List[int], process_count: int = 300, ticks: int = 20
+) -> List[Dict]:
+    """
+    Measure tick cost for each profile count
+
+    Returns:
+        Rows with 'profiles', 'linear_ms', 'indexed_ms' and 'speedup'
+    """
+    # Mostly system processes, a few games
+    processes = [f"proc{i}" for i in range(process_count - 3)]
+    processes += ["eldenring.exe", "game3.exe", "launcher0_x64.exe"]
+
+    rows = []
+    for count in profile_counts:
+        with tempfile.TemporaryDirectory() as config_dir:
+            store = build_store(config_dir, count)
+            linear = time_ticks(linear_lookup, store, processes, ticks)
+            indexed = time_ticks(
+                lambda s, name: s.get_profile_by_executable(name), store, processes, ticks
+            )
+        rows.append(
+            {
+                "profiles": len(store.profiles),
+                "linear_ms": linear * 1000,
+                "indexed_ms": indexed * 1000,
+                "speedup": linear / indexed if indexed else float("inf"),
+            }
+        )
+    return rows
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--processes", type=int, default=300)
+    parser.add_argument("--ticks", type=int, default=20)
+    parser.add_argument("--profiles", type=int, nargs="+", default=[0, 10, 100, 1000])
+    args = parser.parse_args()
+
+    print(f"{args.processes} processes per tick, {args.ticks} ticks")
+    print(f"{'profiles':>9} {'linear ms/tick':>15} {'indexed ms/tick':>16} {'speedup':>8}")
+    for row in run_benchmark(args.profiles, args.processes, args.ticks):
+        print(
+            f"{row['profiles']:>9} {row['linear_ms']:>15.3f} "
+            f"{row['indexed_ms']:>16.3f} {row['speedup']:>7.1f}x"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,77 @@
+"""
+Benchmark prompt evaluation time for the legacy and stable prompt orderings.
+
+Sends the same multi-turn conversation to the configured Ollama model
+twice, once with the legacy ordering (context blocks around the question)
+and once with the stable ordering (fixed system prompt, then per-turn
+context, question last), and reports the prompt tokens evaluated and
+prompt evaluation time Ollama reports for each.
+
+Usage:
+    python scripts/benchmark_prompt_ordering.py [--model llama3] [--turns 8]
+"""
+
+import argparse
+import logging
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.ai_router import AIRouter  # noqa: E402
+from src.config import Config  # noqa: E402
+from src.prompt_builder import PromptParts, compare_prompt_orderings  # noqa: E402
+
+SYSTEM_PROMPT = (
+    "You are an expert Elden Ring guide. Help with boss strategies, build "
+    "optimization, questlines, item locations and map guidance. Provide "
+    "concise, actionable tips."
+)
+KNOWLEDGE_INSTRUCTIONS = (
+    "When knowledge pack context is provided, prefer it over general knowledge "
+    "and say when it does not answer the question."
+)
+QUESTIONS = [
+    ("How do I beat Margit?", "Margit is weak to bleed and jump attacks."),
+    ("Where is the Stormhill shack?", "The shack is north of the Stormhill gate."),
+    ("What's a good strength build?", "Strength builds scale with greatswords."),
+    ("How do I reach Liurnia?", "Liurnia lies past Stormveil Castle."),
+    ("Should I kill the Tree Sentinel early?", "The Tree Sentinel guards the Church."),
+    ("Where do I find smithing stones?", "Smithing stones drop in mines."),
+    ("How does spirit summoning work?", "Spirit ashes need the Spirit Calling Bell."),
+    ("What is the best early shield?", "The Brass Shield blocks 100% physical."),
+]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark prompt orderings")
+    parser.add_argument("--model", help="Model to use (default: configured model)")
+    parser.add_argument("--turns", type=int, default=len(QUESTIONS), help="Turns per ordering")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    config = Config(require_keys=False)
+    provider = AIRouter(config=config).get_provider()
+    if provider is None or not provider.is_configured():
+        print("Ollama is not available")
+        return 1
+
+    turns = [
+        PromptParts(system_prompt=SYSTEM_PROMPT, question=question, knowledge_context=knowledge)
+        for question, knowledge in (QUESTIONS * (args.turns // len(QUESTIONS) + 1))[:args.turns]
+    ]
+    result = compare_prompt_orderings(
+        provider, turns, KNOWLEDGE_INSTRUCTIONS, model=args.model or config.ollama_model
+    )
+
+    print(f"model={args.model or config.ollama_model} turns={len(turns)}")
+    for name in ("legacy", "stable"):
+        stats = result[name]
+        print(f"{name:<7} {stats['prompt_eval_count']:>6} prompt tokens "
+              f"{stats['prompt_eval_seconds'] * 1000:9.1f} ms prompt eval")
+    print(f"saved: {result['seconds_saved'] * 1000:.1f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -28,6 +28,8 @@ from src.hrm_integration import (
     requires_complex_reasoning,
     get_hrm_analysis,
 )
+from src.prompt_builder import PromptEvalStats, PromptParts, build_stable_prompt
+from src.speculative_prefetch import SpeculativePrefetcher
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -93,7 +95,13 @@ class AIAssistant:
             self.provider = provider or self.config.ai_provider or "ollama"
             # Initialize default provider instance
             try:
-                self.provider_instance = get_provider(self.config.get_ai_config())
+                router_provider = self.router.get_provider()
+                if self.provider == "ollama" and router_provider is not None:
+                    # Share the router's provider so the keep-alive and response
+                    # observers the model lifecycle manager attaches apply here
+                    self.provider_instance = router_provider
+                else:
+                    self.provider_instance = get_provider(self.config.get_ai_config())
             except Exception as e:
                 logger.warning(f"Failed to initialize default provider: {e}")
                 # Fallback or placeholder? MockProvider could be useful here
@@ -117,6 +125,15 @@ class AIAssistant:
         # Get HRM interface (may be used for complex reasoning)
         self.hrm_interface = get_hrm_interface()
 
+        # Prefetches knowledge context while the user is still typing
+        self.prefetcher = SpeculativePrefetcher(self.knowledge_integration)
+
+        # Prompt evaluation timings reported by the provider (Ollama only)
+        self.prompt_stats = PromptEvalStats()
+        add_observer = getattr(self.provider_instance, "add_response_observer", None)
+        if callable(add_observer):
+            add_observer(self.prompt_stats.record)
+
         logger.info(f"AIAssistant initialized with provider: {self.provider}")
 
     def register_session_refresh_handler(
@@ -175,6 +192,7 @@ class AIAssistant:
     def set_current_game(self, game_info: Optional[Dict[str, str]]):
         """Set the current game context"""
         self.current_game = game_info
+        self.prefetcher.clear()
 
         with self._history_lock:
             self.conversation_history = []
@@ -198,6 +216,7 @@ class AIAssistant:
             override_provider: Ignored (always uses Ollama)
         """
         self.current_profile = profile
+        self.prefetcher.clear()
 
         # Update model from profile if specified
         if profile.default_model:
@@ -218,6 +237,7 @@ class AIAssistant:
         """Clear the current game profile"""
         self.current_profile = None
         self.current_model = None
+        self.prefetcher.clear()
 
         with self._history_lock:
             self.conversation_history = []
@@ -286,6 +306,72 @@ Please start a game or tell me which game you'd like help with, and I'll provide
                 f"Trimmed conversation history to {len(self.conversation_history)} messages"
             )
 
+    def prefetch_draft(self, draft: str) -> bool:
+        """
+        Start retrieving context for a question the user is still typing
+
+        Knowledge retrieval and the HRM decision run in the background, so
+        `ask_question` can reuse them if the submitted text matches.
+
+        Args:
+            draft: Current contents of the chat input
+
+        Returns:
+            True if a prefetch was queued
+        """
+        if not self.current_game:
+            return False
+
+        game_name = self.current_game.get("name", "Unknown Game")
+        game_profile_id = ""
+        extra_settings: Dict = {}
+        use_knowledge = False
+        try:
+            if self.current_profile:
+                game_profile_id = self.current_profile.id
+                extra_settings = self.current_profile.extra_settings
+                use_knowledge = self.knowledge_integration.should_use_knowledge_packs(
+                    game_profile_id, extra_settings
+                )
+            hrm_enabled = self.config.hrm_enabled and self.hrm_interface.is_available()
+        except Exception as e:
+            logger.debug(f"Skipping draft prefetch: {e}")
+            return False
+
+        return self.prefetcher.submit(
+            draft,
+            game_profile_id=game_profile_id,
+            game_name=game_name,
+            extra_settings=extra_settings,
+            use_knowledge=use_knowledge,
+            hrm_enabled=hrm_enabled,
+        )
+
+    def _generate(self, system_prompt: str, user_message: str) -> str:
+        """
+        Send one prompt to the AI provider
+
+        Requests for the router's own provider go through the router, so
+        pooled endpoints get load balancing and failover.
+
+        Args:
+            system_prompt: System prompt
+            user_message: User message
+
+        Returns:
+            Response text
+        """
+        if self.provider_instance is self.router.get_provider():
+            response = self.router.chat([
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": user_message},
+            ])
+            return response.get("content", "")
+        return self.provider_instance.generate_response(
+            system_prompt=system_prompt,
+            user_prompt=user_message
+        )
+
     def ask_question(self, question: str, game_context: Optional[str] = None) -> str:
         """
         Ask a question about the current game
@@ -314,19 +400,28 @@ Please start a game or tell me which game you'd like help with, and I'll provide
                 if self.current_game
                 else "Unknown Game"
             )
-            use_hrm = hrm_enabled and requires_complex_reasoning(question, game_name)
+            game_profile_id = self.current_profile.id if self.current_profile else ""
 
-            # Build the user message
-            user_message = question.strip()
+            # Reuse work prefetched while the question was being typed
+            prefetched = self.prefetcher.take(question, game_profile_id)
+            if prefetched is not None:
+                use_hrm = prefetched.use_hrm
+            else:
+                use_hrm = hrm_enabled and requires_complex_reasoning(question, game_name)
 
             # Add knowledge pack context if available
             knowledge_context = None
             if self.current_profile:
-                game_profile_id = self.current_profile.id
                 extra_settings = self.current_profile.extra_settings
 
+                if prefetched is not None:
+                    knowledge_context = prefetched.knowledge_context
+                    if knowledge_context:
+                        self.knowledge_integration.log_knowledge_query(
+                            game_profile_id, question, prefetched.chunks_retrieved
+                        )
                 # Check if knowledge packs should be used
-                if self.knowledge_integration.should_use_knowledge_packs(
+                elif self.knowledge_integration.should_use_knowledge_packs(
                     game_profile_id, extra_settings
                 ):
                     knowledge_context = (
@@ -337,25 +432,41 @@ Please start a game or tell me which game you'd like help with, and I'll provide
                         )
                     )
 
-            # Add knowledge context if available
-            if knowledge_context:
-                user_message = f"{knowledge_context}\n{user_message}"
-
             # Add HRM analysis if required
             hrm_analysis = None
             if use_hrm:
                 try:
-                    hrm_analysis = get_hrm_analysis(question, game_context)
-                    if hrm_analysis:
-                        user_message = f"{hrm_analysis}\n\n{user_message}"
+                    if prefetched is not None and not game_context:
+                        hrm_analysis = prefetched.hrm_analysis
+                    else:
+                        hrm_analysis = get_hrm_analysis(question, game_context)
                 except Exception as e:
                     logger.warning(
                         f"HRM analysis failed: {e}, proceeding with standard response"
                     )
 
-            # Add web scraping context if available
-            if game_context:
-                user_message = f"{user_message}\n\nAdditional context from game resources:\n{game_context}"
+            # Stable content goes in the system prompt, which leads every
+            # request unchanged so the inference server can reuse its cached
+            # prefix; per-turn context follows and the question comes last
+            with self._history_lock:
+                base_system_prompt = ""
+                if self.conversation_history and self.conversation_history[0]["role"] == "system":
+                    base_system_prompt = self.conversation_history[0]["content"]
+            knowledge_instructions = (
+                self.knowledge_integration.format_knowledge_instructions()
+                if self.current_profile
+                else ""
+            )
+            system_prompt, user_message = build_stable_prompt(
+                PromptParts(
+                    system_prompt=base_system_prompt,
+                    question=question,
+                    knowledge_context=knowledge_context,
+                    hrm_analysis=hrm_analysis,
+                    web_context=game_context,
+                ),
+                knowledge_instructions=knowledge_instructions,
+            )
 
             # Thread-safe history modification
             with self._history_lock:
@@ -369,18 +480,10 @@ Please start a game or tell me which game you'd like help with, and I'll provide
 
             # Get response using the provider instance
             try:
-                system_prompt = ""
-                with self._history_lock:
-                    if self.conversation_history and self.conversation_history[0]["role"] == "system":
-                        system_prompt = self.conversation_history[0]["content"]
-
                 if not self.provider_instance:
                     return "❌ AI Provider not initialized."
 
-                response_content = self.provider_instance.generate_response(
-                    system_prompt=system_prompt,
-                    user_prompt=user_message
-                )
+                response_content = self._generate(system_prompt, user_message)
 
                 # Extract content from response (it's already a string from generate_response)
                 content = str(response_content)
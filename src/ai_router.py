@@ -6,9 +6,12 @@ Handles provider instantiation, error handling, and model management.
 """
 
 import logging
+import time
 from typing import Any, Dict, List, Optional
 
 from src.config import Config
+from src.endpoint_pool import EndpointPool
+from src.provider_health import ProviderHealthMonitor
 from src.providers import (
     OllamaProvider,
     create_provider,
@@ -31,10 +34,14 @@ class AIRouter:
         """
         self.config = config or Config()
         self._provider: Optional[OllamaProvider] = None
+        self._pool: Optional[EndpointPool] = None
+        self.health_monitor = ProviderHealthMonitor(self.get_provider)
+        self.health_monitor.add_check_hook(self._check_pool_health)
         self._initialize_provider()
 
     def _initialize_provider(self):
         """Initialize the Ollama provider"""
+        self.health_monitor.invalidate()
         try:
             base_url = self.config.ollama_host
             default_model = self.config.ollama_model
@@ -46,6 +53,29 @@ class AIRouter:
         except Exception as e:
             logger.warning(f"Failed to initialize Ollama provider: {e}")
 
+        self._initialize_pool()
+
+    def _initialize_pool(self):
+        """Build the endpoint pool when several endpoints are configured"""
+        self._pool = None
+        endpoints = getattr(self.config, "ai_endpoints", None)
+        if not endpoints or not isinstance(endpoints, (list, tuple)):
+            return
+
+        try:
+            self._pool = EndpointPool.from_specs(
+                endpoints,
+                default_model=self.config.ollama_model,
+                api_key=self.config.ai_api_key,
+                strategy=self.config.load_balancing_strategy,
+            )
+            logger.info(
+                f"Initialized endpoint pool with {len(self._pool.endpoints)} endpoints "
+                f"({self._pool.strategy})"
+            )
+        except Exception as e:
+            logger.warning(f"Failed to initialize endpoint pool: {e}")
+
     def get_provider(
         self, provider_name: Optional[str] = None
     ) -> Optional[OllamaProvider]:
@@ -80,16 +110,26 @@ class AIRouter:
             return ["ollama"]
         return []
 
-    def list_models(self) -> List[str]:
+    def list_models(self, refresh: bool = False) -> List[str]:
         """
         List available models from Ollama.
 
+        Returns the health monitor's cached listing without touching the
+        network (empty until the first check completes). A stale cache, or
+        ``refresh``, starts a background check; callers are notified of the
+        new list through ``health_monitor.models_changed``.
+
+        Args:
+            refresh: Re-list models from the daemon in the background
+
         Returns:
             List of model names
         """
-        if self._provider:
-            return self._provider.list_models()
-        return []
+        if not self._provider:
+            return []
+        if refresh:
+            self.health_monitor.refresh()
+        return self.health_monitor.get_models()
 
     def chat(
         self,
@@ -111,9 +151,13 @@ class AIRouter:
             Response dict with 'content' and provider-specific fields
 
         Raises:
-            ProviderConnectionError: If Ollama is not available
+            ProviderConnectionError: If Ollama (or every pooled endpoint) is
+                not available
             ProviderError: If the request fails
         """
+        if self._pool:
+            return self._pool_chat(messages, model, **kwargs)
+
         if not self._provider:
             raise ProviderConnectionError(
                 "Ollama is not configured.\n\n"
@@ -142,36 +186,72 @@ class AIRouter:
         except ProviderError as e:
             raise ProviderError(f"Ollama error: {str(e)}")
 
+    def _pool_chat(
+        self, messages: List[Dict[str, str]], model: Optional[str], **kwargs: Any
+    ) -> Dict[str, Any]:
+        """
+        Send a chat request through the endpoint pool.
+
+        Requests carry the Ollama provider's keep-alive and are reported to
+        its response observers as if the provider had served them. Pool
+        errors propagate unchanged: they already name the failing endpoints,
+        which need not be Ollama hosts.
+        """
+        if self._provider and self._provider.keep_alive is not None:
+            kwargs.setdefault("keep_alive", self._provider.keep_alive)
+
+        started = time.perf_counter()
+        response = self._pool.chat(messages, model=model, **kwargs)
+        if self._provider:
+            self._provider.record_response({
+                "model": response.get("model") or model,
+                "latency": time.perf_counter() - started,
+                **(response.get("timings") or {}),
+            })
+        return response
+
+    def _check_pool_health(self) -> None:
+        """Probe pooled endpoints on the health monitor's schedule."""
+        if self._pool:
+            self._pool.check_health()
+
     def test_provider(self, provider_name: Optional[str] = None) -> tuple[bool, str]:
         """
         Test connection to Ollama.
 
+        Starts a fresh health check in the background and returns the last
+        known result; the outcome of the new check is delivered through
+        ``health_monitor.status_changed``.
+
         Args:
             provider_name: Ignored (kept for API compatibility)
 
         Returns:
-            Tuple of (success: bool, message: str)
+            Tuple of (success: bool, message: str) from the cached status
         """
         if not self._provider:
             return False, "Ollama provider not initialized"
 
-        try:
-            health = self._provider.test_connection()
-            return health.is_healthy, health.message
-        except Exception as e:
-            return False, f"Test failed: {str(e)}"
+        status = self.health_monitor.refresh()
+        return bool(status["healthy"]), status["message"]
 
     def get_provider_status(
-        self, provider_name: Optional[str] = None
+        self, provider_name: Optional[str] = None, refresh: bool = False
     ) -> Dict[str, Any]:
         """
         Get status information for Ollama.
 
+        Returns the health monitor's cached status without touching the
+        network; a stale cache is refreshed in the background and callers
+        are notified through ``health_monitor.status_changed``.
+
         Args:
             provider_name: Ignored (kept for API compatibility)
+            refresh: Block on a fresh health check instead of using the cache
 
         Returns:
-            Dict with provider status information
+            Dict with provider status information ('healthy' is None until
+            the first check has completed)
         """
         if not self._provider:
             return {
@@ -180,15 +260,9 @@ class AIRouter:
                 "message": "Provider not initialized",
             }
 
-        health = self._provider.test_connection()
-        return {
-            "name": "ollama",
-            "configured": self._provider.is_configured(),
-            "healthy": health.is_healthy,
-            "message": health.message,
-            "error_type": health.error_type,
-            "details": health.details or {},
-        }
+        if refresh:
+            return self.health_monitor.refresh(wait=True)
+        return self.health_monitor.get_status()
 
     def set_model(self, model: str) -> None:
         """
@@ -197,11 +271,24 @@ class AIRouter:
         Args:
             model: Model name (e.g., 'llama3', 'mistral')
         """
+        if self._pool:
+            self._pool.set_default_model(model)
         if self._provider:
             self._provider.default_model = model
             self.config.ollama_model = model
             logger.info(f"Updated default model to: {model}")
 
+    def get_endpoint_stats(self) -> List[Dict[str, Any]]:
+        """
+        Get per-endpoint latency and error statistics.
+
+        Returns:
+            One stats dict per pooled endpoint (empty without a pool)
+        """
+        if self._pool:
+            return self._pool.get_stats()
+        return []
+
     def set_host(self, host: str) -> None:
         """
         Set the Ollama host URL and reinitialize the provider.
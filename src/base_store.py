@@ -7,6 +7,7 @@ from __future__ import annotations
 import json
 import logging
 import os
+import tempfile
 from pathlib import Path
 from typing import Any, Dict, Generic, Iterator, Optional, TypeVar
 
@@ -54,14 +55,37 @@ class BaseStore(Generic[T]):
     def _json_save(self, file_path: Path, data: Dict[str, Any]) -> bool:
         """Persist JSON data to disk."""
         try:
-            file_path.parent.mkdir(parents=True, exist_ok=True)
-            with open(file_path, "w", encoding="utf-8") as handle:
-                json.dump(data, handle, indent=2)
+            self._atomic_write(file_path, json.dumps(data, indent=2))
             return True
         except Exception as exc:  # pragma: no cover - defensive logging
             self.logger.error("Failed to write %s: %s", file_path, exc)
             return False
 
+    def _atomic_write(self, file_path: Path, text: str) -> None:
+        """
+        Replace a file's contents atomically.
+
+        Writes to a temporary file in the same directory and renames it
+        over the target, so readers (and a crash mid-write) only ever see
+        the old or the new file. Raises OSError on failure.
+        """
+        file_path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(
+            dir=file_path.parent, prefix=f".{file_path.name}.", suffix=".tmp"
+        )
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as handle:
+                handle.write(text)
+                handle.flush()
+                os.fsync(handle.fileno())
+            os.replace(tmp_path, file_path)
+        except BaseException:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            raise
+
     def _delete_file(self, file_path: Path) -> bool:
         """Delete a file if it exists."""
         try:
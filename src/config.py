@@ -19,6 +19,8 @@ from src.credential_store import (
     CredentialStore,
     CredentialStoreError,
 )
+from src.macro_manager import Macro
+from src.macro_store import MacroStore
 from src.security import ensure_private_dir, ensure_private_file
 
 logger = logging.getLogger(__name__)
@@ -26,7 +28,7 @@ logger = logging.getLogger(__name__)
 # Configuration directory
 CONFIG_DIR = Path.home() / ".gaming_ai_assistant"
 KEYBINDS_FILE = CONFIG_DIR / "keybinds.json"
-MACROS_FILE = CONFIG_DIR / "macros.json"
+MACROS_FILE = CONFIG_DIR / "macros.json"  # Legacy single-file macros, migrated on load
 THEME_FILE = CONFIG_DIR / "theme.json"
 
 # AI Provider Constants
@@ -36,6 +38,9 @@ SUPPORTED_AI_PROVIDERS = [DEFAULT_AI_PROVIDER]  # Currently only Ollama is suppo
 # Default Configuration Values
 DEFAULT_OLLAMA_HOST = "http://localhost:11434"
 DEFAULT_OLLAMA_MODEL = "llama3"
+DEFAULT_OLLAMA_KEEP_ALIVE = "30m"  # How long a preloaded model stays resident
+DEFAULT_MODEL_PRELOAD_ENABLED = True
+DEFAULT_LOAD_BALANCING_STRATEGY = "least_outstanding"
 DEFAULT_OVERLAY_HOTKEY = "ctrl+shift+g"
 DEFAULT_CHECK_INTERVAL = 5
 DEFAULT_OVERLAY_X = 100
@@ -50,6 +55,8 @@ DEFAULT_MAX_MACRO_REPEAT = 10
 DEFAULT_MACRO_EXECUTION_TIMEOUT = 30
 DEFAULT_HRM_ENABLED = False
 DEFAULT_HRM_MAX_INFERENCE_TIME = 5.0  # seconds
+DEFAULT_HRM_QUANTIZE = True  # int8 dynamic quantization for CPU inference
+DEFAULT_HRM_NUM_THREADS = 0  # 0 = PyTorch default
 
 
 class Config:
@@ -108,12 +115,32 @@ class Config:
             or DEFAULT_OLLAMA_HOST
         )
         self.ollama_model = os.getenv("OLLAMA_MODEL", DEFAULT_OLLAMA_MODEL)
+        self.ollama_keep_alive = os.getenv(
+            "OLLAMA_KEEP_ALIVE", DEFAULT_OLLAMA_KEEP_ALIVE
+        )
+        self.model_preload_enabled = (
+            os.getenv(
+                "MODEL_PRELOAD_ENABLED", str(DEFAULT_MODEL_PRELOAD_ENABLED)
+            ).lower()
+            == "true"
+        )
 
         # OpenAI-Compatible Configuration
         self.ai_api_key = os.getenv("AI_API_KEY")
         self.ai_base_url = os.getenv("AI_BASE_URL")
         self.ai_model = os.getenv("AI_MODEL")
 
+        # Endpoint pool: comma-separated Ollama URLs or kind=url entries,
+        # e.g. "http://box1:11434,openai_compatible=http://box2:1234/v1"
+        self.ai_endpoints = [
+            spec.strip()
+            for spec in os.getenv("AI_ENDPOINTS", "").split(",")
+            if spec.strip()
+        ]
+        self.load_balancing_strategy = os.getenv(
+            "LOAD_BALANCING_STRATEGY", DEFAULT_LOAD_BALANCING_STRATEGY
+        )
+
         # Application Settings
         self.overlay_hotkey = os.getenv("OVERLAY_HOTKEY", DEFAULT_OVERLAY_HOTKEY)
         self.check_interval = int(os.getenv("CHECK_INTERVAL", DEFAULT_CHECK_INTERVAL))
@@ -154,10 +181,18 @@ class Config:
         self.hrm_max_inference_time = float(
             os.getenv("HRM_MAX_INFERENCE_TIME", str(DEFAULT_HRM_MAX_INFERENCE_TIME))
         )
+        # Optional HRM checkpoint (pretrain.py state dict next to all_config.yaml)
+        self.hrm_checkpoint_path = os.getenv("HRM_CHECKPOINT_PATH") or None
+        self.hrm_quantize = (
+            os.getenv("HRM_QUANTIZE", str(DEFAULT_HRM_QUANTIZE)).lower() == "true"
+        )
+        self.hrm_num_threads = int(
+            os.getenv("HRM_NUM_THREADS", str(DEFAULT_HRM_NUM_THREADS))
+        )
 
         # Extended Settings (stored in separate JSON files)
         self.keybinds: Dict = {}
-        self.macros: Dict = {}
+        self.macro_store: Optional[MacroStore] = None
         self.theme: Dict = {}
 
         # Session tokens (kept for compatibility but not used)
@@ -188,6 +223,13 @@ class Config:
                     "Failed to secure custom config dir %s: %s", self.config_dir, exc
                 )
 
+    def _protect_dir(self, path: Path) -> None:
+        """Ensure a configuration directory is restricted to the current user."""
+        try:
+            ensure_private_dir(path)
+        except Exception as exc:
+            logger.warning("Unable to harden permissions for %s: %s", path, exc)
+
     def _protect_file(self, path: Path) -> None:
         """Ensure a configuration file is restricted to the current user."""
         try:
@@ -213,19 +255,40 @@ class Config:
             self.keybinds = {}
 
     def _load_macros(self):
-        """Load macros from JSON file"""
+        """Load macros from the per-macro store, migrating the legacy macros.json"""
         try:
-            self._protect_file(MACROS_FILE)
+            self.macro_store = MacroStore(config_dir=str(CONFIG_DIR))
+            self._protect_dir(self.macro_store.macros_dir)
+            count = self.macro_store.reload()
             if MACROS_FILE.exists():
-                with open(MACROS_FILE, "r", encoding="utf-8") as f:
-                    self.macros = json.load(f)
-                    logger.info(f"Loaded {len(self.macros)} macros from {MACROS_FILE}")
-            else:
-                logger.info("No macros file found, using defaults")
-                self.macros = {}
+                self._migrate_macros_file(MACROS_FILE)
+            logger.info(f"Loaded {count} macros from {self.macro_store.macros_dir}")
         except Exception as e:
             logger.error(f"Failed to load macros: {e}")
-            self.macros = {}
+
+    def _migrate_macros_file(self, path: Path) -> None:
+        """Move macros from the legacy single JSON file into the store"""
+        with open(path, "r", encoding="utf-8") as f:
+            legacy = json.load(f)
+        existing = self.macro_store.load_all_macros()
+        migrated = {
+            macro_id: Macro.from_dict(data)
+            for macro_id, data in legacy.items()
+            if macro_id not in existing
+        }
+        if self.macro_store.save_all_macros(migrated):
+            path.replace(path.with_name(path.name + ".migrated"))
+            logger.info(f"Migrated {len(migrated)} macros from {path}")
+
+    @property
+    def macros(self) -> Dict:
+        """All stored macros as {macro_id: macro dict}"""
+        if self.macro_store is None:
+            return {}
+        return {
+            macro_id: macro.to_dict()
+            for macro_id, macro in self.macro_store.load_all_macros().items()
+        }
 
     def _load_theme(self):
         """Load theme from JSON file"""
@@ -257,19 +320,41 @@ class Config:
             return False
 
     def save_macros(self, macros: Dict) -> bool:
-        """Save macros to JSON file"""
+        """
+        Replace the stored macros
+
+        Only macros whose contents changed are written; stored macros
+        missing from `macros` are deleted.
+
+        Args:
+            macros: {macro_id: Macro or macro dict}
+        """
         try:
-            CONFIG_DIR.mkdir(parents=True, exist_ok=True)
-            with open(MACROS_FILE, "w", encoding="utf-8") as f:
-                json.dump(macros, f, indent=2)
-            self.macros = macros
-            self._protect_file(MACROS_FILE)
-            logger.info(f"Saved {len(macros)} macros to {MACROS_FILE}")
-            return True
+            macro_objects = {
+                macro_id: macro if isinstance(macro, Macro) else Macro.from_dict(macro)
+                for macro_id, macro in macros.items()
+            }
+            return self.macro_store.save_all_macros(macro_objects, remove_missing=True)
         except Exception as e:
             logger.error(f"Failed to save macros: {e}")
             return False
 
+    def save_macro(self, macro: Macro) -> bool:
+        """Save a single macro (one file write)"""
+        try:
+            return self.macro_store.save_macro(macro)
+        except Exception as e:
+            logger.error(f"Failed to save macro {macro.id}: {e}")
+            return False
+
+    def delete_macro(self, macro_id: str) -> bool:
+        """Delete a single stored macro"""
+        try:
+            return self.macro_store.delete_macro(macro_id)
+        except Exception as e:
+            logger.error(f"Failed to delete macro {macro_id}: {e}")
+            return False
+
     def save_theme(self, theme: Dict) -> bool:
         """Save theme to JSON file"""
         try:
@@ -365,9 +450,13 @@ class Config:
                 "ai_provider": self.ai_provider,
                 "ollama_host": self.ollama_host,
                 "ollama_model": self.ollama_model,
+                "ollama_keep_alive": self.ollama_keep_alive,
+                "model_preload_enabled": self.model_preload_enabled,
                 "ai_api_key": self.ai_api_key,
                 "ai_base_url": self.ai_base_url,
                 "ai_model": self.ai_model,
+                "ai_endpoints": self.ai_endpoints,
+                "load_balancing_strategy": self.load_balancing_strategy,
                 "overlay_hotkey": self.overlay_hotkey,
                 "check_interval": self.check_interval,
                 "overlay_x": self.overlay_x,
@@ -415,6 +504,8 @@ class Config:
         self.ai_provider = DEFAULT_AI_PROVIDER
         self.ollama_host = DEFAULT_OLLAMA_HOST
         self.ollama_model = DEFAULT_OLLAMA_MODEL
+        self.ollama_keep_alive = DEFAULT_OLLAMA_KEEP_ALIVE
+        self.model_preload_enabled = DEFAULT_MODEL_PRELOAD_ENABLED
         self.overlay_hotkey = DEFAULT_OVERLAY_HOTKEY
         self.check_interval = DEFAULT_CHECK_INTERVAL
         self.overlay_x = DEFAULT_OVERLAY_X
@@ -0,0 +1,361 @@
+"""
+Endpoint Pool Module
+Load balancing and failover across several Ollama / OpenAI-compatible hosts
+"""
+
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from src.providers import (
+    AwaitableDict,
+    OllamaProvider,
+    OpenAIProvider,
+    ProviderConnectionError,
+    ProviderError,
+)
+
+logger = logging.getLogger(__name__)
+
+# Load balancing strategies
+LEAST_OUTSTANDING = "least_outstanding"
+LATENCY_EWMA = "latency_ewma"
+STRATEGIES = (LEAST_OUTSTANDING, LATENCY_EWMA)
+
+ENDPOINT_KINDS = {
+    "ollama": OllamaProvider,
+    "openai_compatible": OpenAIProvider,
+    "openai": OpenAIProvider,
+}
+
+
+def is_timeout(error: BaseException) -> bool:
+    """
+    Check whether an error, or one that caused it, is a request timeout.
+
+    Args:
+        error: Exception raised by a provider
+
+    Returns:
+        True for timeouts (e.g. a hung endpoint), False otherwise
+    """
+    seen = set()
+    current: Optional[BaseException] = error
+    while current is not None and id(current) not in seen:
+        seen.add(id(current))
+        if isinstance(current, TimeoutError) or "timeout" in type(current).__name__.lower():
+            return True
+        if "timed out" in str(current).lower():
+            return True
+        current = current.__cause__ or current.__context__
+    return False
+
+
+class Endpoint:
+    """A single inference host together with its routing statistics."""
+
+    def __init__(self, provider: Any, name: Optional[str] = None, ewma_alpha: float = 0.3):
+        """
+        Initialize an endpoint.
+
+        Args:
+            provider: Provider exposing ``chat`` and ``test_connection``
+            name: Display name (defaults to the provider's base URL)
+            ewma_alpha: Weight of the newest sample in the latency average
+        """
+        self.provider = provider
+        self.name = name or getattr(provider, "base_url", repr(provider))
+        self.kind = getattr(provider, "name", "custom")
+        self.ewma_alpha = ewma_alpha
+
+        self.outstanding = 0
+        self.requests = 0
+        self.successes = 0
+        self.failures = 0
+        self.consecutive_failures = 0
+        self.ewma_latency: Optional[float] = None
+        self.ejected_until = 0.0
+        self.last_error: Optional[str] = None
+
+    def record_latency(self, seconds: float) -> None:
+        """Fold a latency sample into the moving average."""
+        if self.ewma_latency is None:
+            self.ewma_latency = seconds
+        else:
+            self.ewma_latency = (
+                self.ewma_alpha * seconds + (1 - self.ewma_alpha) * self.ewma_latency
+            )
+
+    def to_dict(self, now: float) -> Dict[str, Any]:
+        """Convert statistics to a dictionary."""
+        return {
+            "name": self.name,
+            "kind": self.kind,
+            "outstanding": self.outstanding,
+            "requests": self.requests,
+            "successes": self.successes,
+            "failures": self.failures,
+            "consecutive_failures": self.consecutive_failures,
+            "error_rate": self.failures / self.requests if self.requests else 0.0,
+            "ewma_latency": self.ewma_latency,
+            "ejected": self.ejected_until > now,
+            "last_error": self.last_error,
+        }
+
+
+class EndpointPool:
+    """
+    Routes chat requests across several endpoints.
+
+    Endpoints are chosen by fewest in-flight requests (``least_outstanding``)
+    or lowest moving-average latency (``latency_ewma``). An endpoint that
+    fails ``max_consecutive_failures`` times in a row is ejected for
+    ``ejection_seconds`` and then given another chance. Idempotent requests
+    that hit a connection-level failure or a timeout are retried on the
+    next endpoint.
+    """
+
+    DEFAULT_MAX_CONSECUTIVE_FAILURES = 3
+    DEFAULT_EJECTION_SECONDS = 30.0
+
+    def __init__(
+        self,
+        endpoints: Iterable[Endpoint],
+        strategy: str = LEAST_OUTSTANDING,
+        max_consecutive_failures: int = DEFAULT_MAX_CONSECUTIVE_FAILURES,
+        ejection_seconds: float = DEFAULT_EJECTION_SECONDS,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Initialize the pool.
+
+        Args:
+            endpoints: Endpoints to balance across
+            strategy: 'least_outstanding' or 'latency_ewma'
+            max_consecutive_failures: Failures in a row before ejection
+            ejection_seconds: How long an ejected endpoint is skipped
+            clock: Monotonic time source (injectable for tests)
+
+        Raises:
+            ValueError: If no endpoints are given or the strategy is unknown
+        """
+        self.endpoints: List[Endpoint] = list(endpoints)
+        if not self.endpoints:
+            raise ValueError("EndpointPool requires at least one endpoint")
+        if strategy not in STRATEGIES:
+            raise ValueError(
+                f"Unknown load balancing strategy: {strategy}. "
+                f"Expected one of: {', '.join(STRATEGIES)}"
+            )
+        self.strategy = strategy
+        self.max_consecutive_failures = max_consecutive_failures
+        self.ejection_seconds = ejection_seconds
+        self._clock = clock
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_specs(
+        cls,
+        specs: Iterable[str],
+        default_model: Optional[str] = None,
+        api_key: Optional[str] = None,
+        **kwargs: Any,
+    ) -> "EndpointPool":
+        """
+        Build a pool from endpoint specs.
+
+        Each spec is a URL (an Ollama host) or ``kind=url`` where kind is
+        'ollama' or 'openai_compatible', e.g.
+        ``openai_compatible=http://lmstudio:1234/v1``.
+
+        Args:
+            specs: Endpoint specs
+            default_model: Default model for every endpoint
+            api_key: API key for OpenAI-compatible endpoints
+            **kwargs: Passed to the EndpointPool constructor
+
+        Returns:
+            A new EndpointPool
+
+        Raises:
+            ValueError: If a spec names an unknown endpoint kind
+        """
+        endpoints = []
+        for spec in specs:
+            spec = spec.strip()
+            if not spec:
+                continue
+            kind, sep, url = spec.partition("=")
+            if not sep or "://" in kind:
+                kind, url = "ollama", spec
+            kind = kind.strip().lower()
+            provider_class = ENDPOINT_KINDS.get(kind)
+            if provider_class is None:
+                raise ValueError(f"Unknown endpoint kind '{kind}' in '{spec}'")
+            if provider_class is OpenAIProvider:
+                provider = OpenAIProvider(
+                    api_key=api_key, base_url=url.strip(), default_model=default_model
+                )
+            else:
+                provider = OllamaProvider(base_url=url.strip(), default_model=default_model)
+            endpoints.append(Endpoint(provider))
+        return cls(endpoints, **kwargs)
+
+    def _is_ejected(self, endpoint: Endpoint, now: float) -> bool:
+        return endpoint.ejected_until > now
+
+    def select(self, exclude: Iterable[str] = ()) -> Optional[Endpoint]:
+        """
+        Pick the best endpoint for the next request.
+
+        Ejected endpoints are only used when every other endpoint has been
+        excluded or ejected, so requests still have somewhere to go.
+
+        Args:
+            exclude: Names of endpoints already tried for this request
+
+        Returns:
+            The chosen endpoint or None if all are excluded
+        """
+        excluded = set(exclude)
+        now = self._clock()
+        with self._lock:
+            candidates = [ep for ep in self.endpoints if ep.name not in excluded]
+            if not candidates:
+                return None
+            healthy = [ep for ep in candidates if not self._is_ejected(ep, now)]
+            if not healthy:
+                # Everything is ejected: try the one that comes back soonest
+                return min(candidates, key=lambda ep: ep.ejected_until)
+
+            if self.strategy == LATENCY_EWMA:
+                # Unmeasured endpoints sort first so they get sampled
+                return min(
+                    healthy,
+                    key=lambda ep: (
+                        ep.ewma_latency if ep.ewma_latency is not None else 0.0,
+                        ep.outstanding,
+                    ),
+                )
+            return min(
+                healthy,
+                key=lambda ep: (ep.outstanding, ep.ewma_latency or 0.0),
+            )
+
+    def chat(
+        self,
+        messages: List[Dict[str, str]],
+        model: Optional[str] = None,
+        idempotent: bool = True,
+        **kwargs: Any,
+    ) -> AwaitableDict:
+        """
+        Send a chat request to the best endpoint, failing over if needed.
+
+        Args:
+            messages: Conversation messages with 'role' and 'content'
+            model: Model name (default: each endpoint's default model)
+            idempotent: Allow retrying on another endpoint after a
+                connection failure (streaming requests are never retried)
+            **kwargs: Passed through to the provider
+
+        Returns:
+            Provider response dict with an added 'endpoint' key
+
+        Raises:
+            ProviderConnectionError: If every attempted endpoint failed
+            ProviderError: If an endpoint rejected the request itself
+        """
+        retry = idempotent and not kwargs.get("stream")
+        max_attempts = len(self.endpoints) if retry else 1
+        tried: List[str] = []
+        last_error: Optional[Exception] = None
+
+        for _ in range(max_attempts):
+            endpoint = self.select(exclude=tried)
+            if endpoint is None:
+                break
+            tried.append(endpoint.name)
+
+            with self._lock:
+                endpoint.outstanding += 1
+                endpoint.requests += 1
+            started = self._clock()
+            try:
+                response = endpoint.provider.chat(messages, model=model, **dict(kwargs))
+            except ProviderError as exc:
+                if not isinstance(exc, ProviderConnectionError) and not is_timeout(exc):
+                    # The endpoint answered; the request itself was rejected
+                    self._record_failure(endpoint, exc, eject=False)
+                    raise
+                # Unreachable or hung (timed out): eligible for ejection and failover
+                self._record_failure(endpoint, exc)
+                last_error = exc
+                logger.warning(f"Endpoint {endpoint.name} failed: {exc}")
+                continue
+            finally:
+                with self._lock:
+                    endpoint.outstanding -= 1
+
+            self._record_success(endpoint, self._clock() - started)
+            response["endpoint"] = endpoint.name
+            return response
+
+        raise ProviderConnectionError(
+            f"All endpoints failed ({', '.join(tried) or 'none available'}): {last_error}"
+        )
+
+    def _record_success(self, endpoint: Endpoint, latency: float) -> None:
+        with self._lock:
+            endpoint.successes += 1
+            endpoint.consecutive_failures = 0
+            endpoint.ejected_until = 0.0
+            endpoint.record_latency(latency)
+
+    def _record_failure(self, endpoint: Endpoint, error: Exception, eject: bool = True) -> None:
+        with self._lock:
+            endpoint.failures += 1
+            endpoint.last_error = str(error)
+            if not eject:
+                return
+            endpoint.consecutive_failures += 1
+            if endpoint.consecutive_failures >= self.max_consecutive_failures:
+                endpoint.ejected_until = self._clock() + self.ejection_seconds
+                logger.warning(
+                    f"Ejected endpoint {endpoint.name} for {self.ejection_seconds:.0f}s "
+                    f"after {endpoint.consecutive_failures} consecutive failures"
+                )
+
+    def check_health(self) -> Dict[str, bool]:
+        """
+        Probe every endpoint, ejecting unhealthy ones and restoring others.
+
+        Returns:
+            Mapping of endpoint name to health
+        """
+        results = {}
+        for endpoint in self.endpoints:
+            try:
+                healthy = endpoint.provider.test_connection().is_healthy
+            except Exception:
+                healthy = False
+            with self._lock:
+                if healthy:
+                    endpoint.consecutive_failures = 0
+                    endpoint.ejected_until = 0.0
+                else:
+                    endpoint.ejected_until = self._clock() + self.ejection_seconds
+            results[endpoint.name] = healthy
+        return results
+
+    def set_default_model(self, model: str) -> None:
+        """Update the default model on every endpoint."""
+        for endpoint in self.endpoints:
+            endpoint.provider.default_model = model
+
+    def get_stats(self) -> List[Dict[str, Any]]:
+        """Get per-endpoint latency and error statistics."""
+        now = self._clock()
+        with self._lock:
+            return [endpoint.to_dict(now) for endpoint in self.endpoints]
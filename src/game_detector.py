@@ -10,6 +10,9 @@ import threading
 from typing import Optional, Dict, List, Set, Tuple
 import psutil
 
+from src.game_discovery import GameDiscovery
+from src.process_monitor import ProcessInfo, ProcessMonitor
+from src.scan_scheduler import AdaptiveScanScheduler
 from src.type_definitions import GameInfo
 
 # Configure logging
@@ -21,12 +24,23 @@ class GameDetector:
     """Detects running games on Windows with performance optimizations"""
 
     # Cache settings
-    _CACHE_DURATION = 2.0  # Cache results for 2 seconds
+    _CACHE_DURATION = 2.0  # Cache lifetime while the process monitor is not running
     _MAX_CACHE_SIZE = 100  # Maximum cached entries
-    _BACKGROUND_SCAN_INTERVAL = 5.0  # Background scan every 5 seconds
+    _BACKGROUND_SCAN_INTERVAL = 5.0  # Base snapshot interval when process events are unavailable
 
-    def __init__(self):
-        """Initialize game detector with common game process names"""
+    def __init__(
+        self,
+        process_monitor: Optional[ProcessMonitor] = None,
+        discovery: Optional[GameDiscovery] = None,
+    ):
+        """
+        Initialize game detector with common game process names
+
+        Args:
+            process_monitor: Shared ProcessMonitor (a private one is started if None)
+            discovery: Classifier for running executables missing from
+                common_games (discovery is disabled if None)
+        """
         self.common_games = {
             "League of Legends": ["LeagueClientUx.exe", "League of Legends.exe"],
             "Valorant": ["VALORANT.exe", "valorant.exe"],
@@ -50,10 +64,25 @@ class GameDetector:
         self._cache_lock = threading.RLock()
         self._running_processes_cache: Set[str] = set()
         self._last_process_scan = 0.0
-        self._background_thread: Optional[threading.Thread] = None
-        self._stop_background_scan = False
 
-        # Start background scanning for better performance
+        # Unknown executables classified as games: {pid: ProcessInfo, game_name}
+        self.discovery = discovery
+        self._discovered: Dict[int, Tuple[ProcessInfo, str]] = {}
+        self._initial_discovery: Optional[threading.Thread] = None
+
+        # Process table kept current by kernel events (or adaptive polling)
+        self._owns_monitor = process_monitor is None
+        if process_monitor is not None and process_monitor.scheduler is not None:
+            self.scan_scheduler = process_monitor.scheduler
+        else:
+            self.scan_scheduler = AdaptiveScanScheduler(
+                base_interval=self._BACKGROUND_SCAN_INTERVAL
+            )
+        self.process_monitor = process_monitor or ProcessMonitor(
+            poll_interval=self._BACKGROUND_SCAN_INTERVAL,
+            scheduler=self.scan_scheduler,
+        )
+        self.process_monitor.subscribe(self._on_processes_changed)
         self._start_background_scan()
 
     @staticmethod
@@ -97,6 +126,13 @@ class GameDetector:
                     continue
                 process_index.setdefault(normalized, game_name)
         self._process_index = process_index
+        self._index_version = getattr(self, "_index_version", 0) + 1
+
+        # Cached scans were matched against the old index
+        cache_lock = getattr(self, "_cache_lock", None)
+        if cache_lock is not None:
+            with cache_lock:
+                self._scan_cache.clear()
 
     def detect_running_game(self) -> Optional[GameInfo]:
         """Detect if any known game is currently running."""
@@ -129,14 +165,11 @@ class GameDetector:
         try:
             if not process_name:
                 return False
-            for proc in psutil.process_iter(["pid", "name"]):
-                try:
-                    name = proc.info.get("name")
-                    if name and name.lower() == process_name.lower():
-                        return True
-                except (psutil.NoSuchProcess, psutil.AccessDenied):
-                    continue
-            return False
+            target = process_name.lower()
+            return any(
+                info.name.lower() == target
+                for info in self.process_monitor.get_processes()
+            )
 
         except Exception as e:
             logger.error(f"Error checking process: {e}", exc_info=True)
@@ -149,7 +182,7 @@ class GameDetector:
         return datetime.now().strftime("%Y-%m-%d %H:%M:%S")
 
     def get_running_games(self) -> List[GameInfo]:
-        """Get all running games from the common games list."""
+        """Get all running games from the common games list and discovery."""
         try:
             return self._optimized_scan_running_games()
         except Exception as e:
@@ -207,66 +240,160 @@ class GameDetector:
         }
 
     def _start_background_scan(self) -> None:
-        """Start background scanning thread for better performance"""
-        if self._background_thread is not None:
+        """Start the process monitor and seed the process name cache"""
+        if self._owns_monitor:
+            self.process_monitor.start()
+        self._update_process_cache()
+        processes = self.process_monitor.get_processes()
+        for info in processes:
+            if self._normalize_process_name(info.name) in self._process_index:
+                self.scan_scheduler.on_game_started(info.pid)
+        if self.discovery is not None:
+            # Classifying every running process stats and lists directories;
+            # keep that off the constructing (usually GUI) thread
+            self._initial_discovery = threading.Thread(
+                target=self._discover_running, daemon=True, name="GameDiscoveryThread"
+            )
+            self._initial_discovery.start()
+        logger.debug(f"Game detection using process monitor ({self.process_monitor.mode} mode)")
+
+    def _discover_running(self) -> None:
+        """Classify the processes that were running when detection started"""
+        try:
+            changed = self._discover_games(self.process_monitor.get_processes(), [])
+            # Forget games that exited while the pass was running
+            live = {info.pid for info in self.process_monitor.get_processes()}
+            with self._cache_lock:
+                exited = [info for pid, (info, _) in self._discovered.items() if pid not in live]
+            if exited:
+                self._discover_games([], exited)
+            if changed:
+                with self._cache_lock:
+                    self._scan_cache.clear()
+        except Exception as e:
+            logger.error(f"Initial game discovery failed: {e}", exc_info=True)
+
+    def request_rescan(self, reason: str = "") -> None:
+        """
+        Ask for a full process scan as soon as possible
+
+        Called on user activity such as hotkeys, which often means a game
+        was just launched or focused.
+
+        Args:
+            reason: Short description for debug logging
+        """
+        with self._cache_lock:
+            self._scan_cache.clear()
+        self.scan_scheduler.hint(reason)
+
+    def _on_processes_changed(
+        self, added: List[ProcessInfo], removed: List[ProcessInfo]
+    ) -> None:
+        """Process monitor callback: refresh caches when a tracked process starts or exits"""
+        relevant = [
+            info for info in added + removed
+            if self._normalize_process_name(info.name) in self._process_index
+        ]
+        self._update_process_cache()
+        if self._discover_games(added, removed):
+            with self._cache_lock:
+                self._scan_cache.clear()
+        if not relevant:
             return
 
-        def background_scanner():
-            """Background thread that periodically scans for game processes"""
-            while not self._stop_background_scan:
-                try:
-                    self._update_process_cache()
-                    time.sleep(self._BACKGROUND_SCAN_INTERVAL)
-                except Exception as e:
-                    logger.error(f"Background scan error: {e}", exc_info=True)
-                    time.sleep(1)  # Brief pause on error
-
-        self._background_thread = threading.Thread(
-            target=background_scanner, daemon=True, name="GameDetector-BackgroundScan"
+        with self._cache_lock:
+            self._scan_cache.clear()
+        for info in added:
+            if info in relevant:
+                self.scan_scheduler.on_game_started(info.pid)
+                self.process_monitor.watch_pid(info.pid)
+        for info in removed:
+            if info in relevant:
+                self.scan_scheduler.on_game_exited(info.pid)
+        logger.debug(
+            f"Tracked processes changed: +{[i.name for i in added if i in relevant]} "
+            f"-{[i.name for i in removed if i in relevant]}"
         )
-        self._background_thread.start()
-        logger.debug("Started background game detection scanning")
 
-    def _update_process_cache(self) -> None:
-        """Update the cached set of running processes"""
-        try:
-            current_time = time.time()
+    def _discover_games(
+        self, added: List[ProcessInfo], removed: List[ProcessInfo]
+    ) -> bool:
+        """
+        Classify unknown started processes and forget exited ones
 
-            # Only update if enough time has passed since last scan
-            if current_time - self._last_process_scan < 1.0:  # 1 second minimum
-                return
+        Returns:
+            True if the set of discovered games changed
+        """
+        if self.discovery is None:
+            return False
 
-            new_processes = set()
+        changed = False
+        with self._cache_lock:
+            for info in removed:
+                if self._discovered.pop(info.pid, None) is not None:
+                    self.scan_scheduler.on_game_exited(info.pid)
+                    changed = True
 
-            # Optimized process scanning - only get name and pid
-            for proc in psutil.process_iter(["pid", "name"]):
-                try:
-                    proc_name = proc.info.get("name")
-                    if proc_name:
-                        new_processes.add(proc_name.lower())
-                except (psutil.NoSuchProcess, psutil.AccessDenied):
-                    continue
+        for info in added:
+            if self._normalize_process_name(info.name) in self._process_index:
+                continue
+            try:
+                result = self.discovery.classify(info)
+            except Exception as e:
+                logger.error(f"Error classifying {info.exe}: {e}", exc_info=True)
+                continue
+            if result is None or not result.is_game:
+                continue
+            with self._cache_lock:
+                self._discovered[info.pid] = (info, result.name)
+            self.scan_scheduler.on_game_started(info.pid)
+            changed = True
+            logger.info(f"Discovered game {result.name} ({', '.join(result.signals)})")
+
+        if added:
+            self.discovery.save()
+        return changed
+
+    def get_discovered_games(self) -> Dict[int, str]:
+        """Get running processes classified as games by discovery as {pid: game_name}"""
+        with self._cache_lock:
+            return {pid: name for pid, (_, name) in self._discovered.items()}
 
+    def _update_process_cache(self) -> None:
+        """Update the cached set of running process names from the process table"""
+        try:
+            new_processes = {
+                info.name.lower() for info in self.process_monitor.get_processes()
+            }
             with self._cache_lock:
                 self._running_processes_cache = new_processes
-                self._last_process_scan = current_time
+                self._last_process_scan = time.time()
 
         except Exception as e:
             logger.error(f"Error updating process cache: {e}", exc_info=True)
 
+    def _cache_duration(self) -> float:
+        """How long a scan result stays valid"""
+        if self.process_monitor.mode != "stopped":
+            # A running monitor publishes every change, which clears the cache
+            return float("inf")
+        return self._CACHE_DURATION
+
     def _get_cached_result(self) -> Optional[List[GameInfo]]:
         """Get cached scan result if still valid"""
         current_time = time.time()
+        cache_duration = self._cache_duration()
 
         with self._cache_lock:
             if (
                 self._scan_cache
-                and current_time - self._last_cache_time < self._CACHE_DURATION
+                and current_time - self._last_cache_time < cache_duration
             ):
                 cache_key = self._get_cache_key()
                 if cache_key in self._scan_cache:
                     cached_time, cached_result = self._scan_cache[cache_key]
-                    if current_time - cached_time < self._CACHE_DURATION:
+                    if current_time - cached_time < cache_duration:
                         logger.debug("Using cached game detection result")
                         return cached_result
 
@@ -291,72 +418,81 @@ class GameDetector:
 
     def _get_cache_key(self) -> str:
         """Generate cache key based on current game list and system state"""
-        try:
-            # Include game list hash and process count for cache invalidation
-            games_hash = hash(tuple(sorted(self.common_games.items())))
-            process_count = len(self._running_processes_cache)
-            return f"{games_hash}:{process_count}"
-        except Exception:
-            # Fallback to simple key
-            return "default"
+        # The index version changes whenever the game list does
+        process_count = len(self._running_processes_cache)
+        return f"{self._index_version}:{process_count}"
 
     def _optimized_scan_running_games(self) -> List[GameInfo]:
-        """Optimized version of _scan_running_games using cache"""
+        """Match the shared process table against known games using the scan cache"""
         # Check cache first
         cached_result = self._get_cached_result()
         if cached_result is not None:
             return cached_result
 
-        # Update process cache if needed
-        current_time = time.time()
-        if current_time - self._last_process_scan > 2.0:  # 2 seconds
-            self._update_process_cache()
+        # A running monitor keeps the table fresh on the scheduler's cadence;
+        # without one, snapshot on demand when the scheduler says so
+        if self.process_monitor.mode == "stopped":
+            elapsed = time.time() - self._last_process_scan
+            if elapsed >= self.scan_scheduler.next_delay() and self.scan_scheduler.should_full_scan():
+                self.process_monitor.refresh()
+                self._update_process_cache()
 
         running_games: List[GameInfo] = []
         seen_games: Set[str] = set()
 
-        # Use cached process list if available
-        with self._cache_lock:
-            current_processes = self._running_processes_cache.copy()
-
-        # Fast lookup using cached processes
-        for process_name in current_processes:
-            game_name = self._process_index.get(process_name)
+        # The table already holds pid, name and exe, so no per-match enumeration
+        for info in sorted(self.process_monitor.get_processes(), key=lambda i: i.pid):
+            game_name = self._process_index.get(self._normalize_process_name(info.name))
             if not game_name or game_name in seen_games:
                 continue
 
             seen_games.add(game_name)
+            running_games.append(self._build_game_info_from_entry(info, game_name))
 
-            # Get detailed process info only when we have a match
-            try:
-                for proc in psutil.process_iter(["pid", "name", "exe"]):
-                    try:
-                        proc_name = proc.info.get("name")
-                        if proc_name and proc_name.lower() == process_name:
-                            running_games.append(self._build_game_info(proc, game_name))
-                            break  # Found the process, no need to continue
-                    except (psutil.NoSuchProcess, psutil.AccessDenied):
-                        continue
-            except Exception as e:
-                logger.error(
-                    f"Error getting process info for {game_name}: {e}", exc_info=True
-                )
+        # Known games first, then executables found by discovery
+        with self._cache_lock:
+            discovered = sorted(self._discovered.items())
+        for _, (info, game_name) in discovered:
+            if game_name in seen_games:
                 continue
+            seen_games.add(game_name)
+            running_games.append(self._build_game_info_from_entry(info, game_name))
 
         # Cache the result
         self._cache_result(running_games)
         return running_games
 
+    def _build_game_info_from_entry(self, info: ProcessInfo, game_name: str) -> GameInfo:
+        """Build a structured game info object from a process table entry."""
+        version = ""
+        if info.exe:
+            version = self._get_file_version_info(info.exe)
+
+        return {
+            "name": game_name,
+            "exe": info.exe,
+            "process_name": info.name,
+            "pid": info.pid,
+            "path": os.path.dirname(info.exe) if info.exe else "",
+            "version": version
+        }
+
     def stop_background_scan(self) -> None:
-        """Stop the background scanning thread"""
-        self._stop_background_scan = True
-        if self._background_thread and self._background_thread.is_alive():
-            self._background_thread.join(timeout=2.0)
+        """Stop the process monitor if this detector owns it"""
+        monitor = getattr(self, "process_monitor", None)
+        if monitor is None:
+            return
+        monitor.unsubscribe(self._on_processes_changed)
+        if self._owns_monitor:
+            monitor.stop()
         logger.debug("Stopped background game detection scanning")
 
     def __del__(self):
         """Cleanup when object is destroyed"""
-        self.stop_background_scan()
+        try:
+            self.stop_background_scan()
+        except Exception:
+            pass
 
     def add_custom_game(self, game_name: str, process_names: Optional[List[str]] = None) -> bool:
         """
@@ -0,0 +1,443 @@
+"""
+Game Discovery Module
+Classifies unknown running executables as games from cheap signals
+"""
+
+import json
+import logging
+import os
+import re
+import sys
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional
+
+import psutil
+
+from src.process_monitor import ProcessInfo
+
+logger = logging.getLogger(__name__)
+
+# Store library layouts: (path marker, score)
+LIBRARY_MARKERS = (
+    ("/steamapps/common/", 3),
+    ("/heroic/", 3),
+    ("/epic games/", 3),
+    ("/gog galaxy/games/", 3),
+    ("/gog games/", 3),
+    ("/lutris/", 2),
+    ("/games/", 1),
+)
+
+# Files an engine ships next to the game executable
+ENGINE_FILES = {
+    "unityplayer.dll": "unity",
+    "unityplayer.so": "unity",
+    "gameassembly.dll": "unity",
+    "gameassembly.so": "unity",
+    "data.win": "gamemaker",
+    "game.ios": "gamemaker",
+    "engine.dll": "source",
+    "engine.so": "source",
+    "fna.dll": "fna",
+    "monogame.framework.dll": "monogame",
+    "libgodot.so": "godot",
+}
+ENGINE_SUFFIXES = {
+    ".pck": "godot",
+    ".pak": "pak",
+    ".rpa": "renpy",
+}
+MIDDLEWARE_FILES = {
+    "steam_api.dll", "steam_api64.dll", "libsteam_api.so",
+    "fmod.dll", "fmod64.dll", "fmodstudio.dll", "libfmod.so",
+    "bink2w64.dll", "eossdk-win64-shipping.dll", "galaxy64.dll",
+}
+
+# Window classes created by common engines
+ENGINE_WINDOW_CLASSES = {
+    "unitywndclass", "unrealwindow", "sdl_app", "glfw30", "valve001",
+    "lwjgl", "godot", "d3d window",
+}
+
+# Executables that live in game libraries but are not games
+NON_GAME_NAMES = {
+    "steam", "steamwebhelper", "steamservice", "gameoverlayui",
+    "epicgameslauncher", "epicwebhelper", "galaxyclient", "heroic", "lutris",
+    "unitycrashhandler64", "unitycrashhandler32", "crashreportclient",
+    "easyanticheat", "easyanticheat_eos", "battleye", "beservice",
+    "wineserver", "explorer", "services", "winedevice", "plugplay", "rpcss",
+    "start", "pressure-vessel-wrap", "reaper", "gamescope", "python", "python3",
+}
+
+# Wine/Proton loaders: the process image is the loader, the game is the
+# Windows executable it runs
+WINE_LOADERS = {"wine", "wine64", "wine-preloader", "wine64-preloader"}
+
+_DRIVE_PATH = re.compile(r"^([a-z]):/", re.IGNORECASE)
+
+# The Windows directory inside a Wine prefix
+WINE_SYSTEM_DIRS = ("/drive_c/windows/", "/dosdevices/c:/windows/")
+
+SYSTEM_PREFIXES = (
+    "/usr/", "/bin/", "/sbin/", "/lib/", "/lib64/", "/opt/google/", "/snap/",
+    "/system/", "/applications/utilities/",
+    "c:/windows/", "c:/program files/windowsapps/", "c:/program files/common files/",
+)
+
+_SHIPPING_SUFFIX = re.compile(r"-(win64|win32|linux|wingdk)-shipping$", re.IGNORECASE)
+
+
+@dataclass
+class DiscoveryResult:
+    """
+    Classification of one executable
+
+    Attributes:
+        exe: Executable path
+        name: Display name guessed from the install layout
+        score: Sum of static signal weights
+        signals: Signals that contributed to the score
+        is_game: Final decision
+    """
+    exe: str
+    name: str
+    score: int = 0
+    signals: List[str] = field(default_factory=list)
+    is_game: bool = False
+
+
+def _normalize_path(path: str) -> str:
+    return path.replace("\\", "/").lower()
+
+
+def _cpu_usage(pid: int) -> Optional[float]:
+    """Average CPU percent since the process started (no sampling interval)"""
+    try:
+        proc = psutil.Process(pid)
+        times = proc.cpu_times()
+        elapsed = max(1.0, time.time() - proc.create_time())
+        return 100.0 * (times.user + times.system) / elapsed
+    except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess, OSError):
+        return None
+
+
+def _wine_child_exe(pid: int) -> Optional[str]:
+    """
+    Host path of the Windows executable run by a Wine/Proton loader
+
+    Wine rewrites the loader's command line to the Windows path of the
+    program. ``Z:`` maps to the host root; other drives are resolved under
+    the Wine prefix, falling back to the working directory.
+    """
+    try:
+        proc = psutil.Process(pid)
+        cmdline = proc.cmdline()
+        cwd = proc.cwd()
+    except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess, OSError):
+        return None
+
+    for arg in cmdline:
+        if not arg.lower().endswith(".exe"):
+            continue
+        path = arg.replace("\\", "/")
+        drive = _DRIVE_PATH.match(path)
+        if drive is None:
+            return os.path.join(cwd, path)
+        if drive.group(1).lower() == "z":
+            return path[2:]
+        try:
+            environ = proc.environ()
+        except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess, OSError):
+            environ = {}
+        prefix = environ.get("WINEPREFIX")
+        if not prefix and environ.get("STEAM_COMPAT_DATA_PATH"):
+            prefix = os.path.join(environ["STEAM_COMPAT_DATA_PATH"], "pfx")
+        if prefix:
+            return os.path.join(prefix, "dosdevices", path[:2].lower(), path[3:])
+        return os.path.join(cwd, os.path.basename(path))
+    return None
+
+
+def _windows_window_classes(pid: int) -> List[str]:
+    """Class names of the visible top-level windows owned by a process"""
+    try:
+        import ctypes
+        from ctypes import wintypes
+    except ImportError:
+        return []
+
+    user32 = ctypes.windll.user32
+    classes: List[str] = []
+
+    @ctypes.WINFUNCTYPE(wintypes.BOOL, wintypes.HWND, wintypes.LPARAM)
+    def _collect(hwnd, _lparam):
+        owner = wintypes.DWORD()
+        user32.GetWindowThreadProcessId(hwnd, ctypes.byref(owner))
+        if owner.value == pid and user32.IsWindowVisible(hwnd):
+            buffer = ctypes.create_unicode_buffer(256)
+            if user32.GetClassNameW(hwnd, buffer, 256):
+                classes.append(buffer.value)
+        return True
+
+    user32.EnumWindows(_collect, 0)
+    return classes
+
+
+class GameDiscovery:
+    """
+    Signature-based classifier for executables missing from the known lists
+
+    Static signals are read once per binary and cached on disk by
+    (exe path, mtime):
+
+    - install path under a Steam, Heroic, Epic, GOG or Lutris library (or a
+      configured library root)
+    - engine files next to the executable (UnityPlayer, GameAssembly,
+      Godot .pck, Unreal ``*-Win64-Shipping`` binaries, ...)
+    - game middleware such as steam_api or FMOD
+
+    Binaries with no static signal at all are rejected from the cache with a
+    single stat. For binaries whose static score is suggestive but below the
+    threshold, per-process signals (engine window class, CPU usage) decide;
+    these depend on the running process and are never cached.
+
+    Wine and Proton games run inside a loader process; those are classified
+    by the Windows executable the loader runs. The cache keeps the
+    ``MAX_ENTRIES`` most recently used binaries.
+    """
+
+    FILENAME = "discovered_games.json"
+    GAME_THRESHOLD = 3
+    CPU_THRESHOLD = 15.0  # average percent since start
+    CACHE_VERSION = 1
+    MAX_ENTRIES = 1000
+
+    def __init__(
+        self,
+        config_dir: Optional[Path] = None,
+        library_roots: Optional[Iterable[str]] = None,
+        cpu_probe: Optional[Callable[[int], Optional[float]]] = _cpu_usage,
+        window_class_probe: Optional[Callable[[int], List[str]]] = None,
+        wine_exe_probe: Optional[Callable[[int], Optional[str]]] = _wine_child_exe,
+    ):
+        """
+        Initialize discovery
+
+        Args:
+            config_dir: Directory holding the classification cache
+            library_roots: Extra directories whose subfolders are games
+            cpu_probe: Returns average CPU percent for a PID
+            window_class_probe: Returns window class names for a PID
+                (defaults to EnumWindows on Windows)
+            wine_exe_probe: Returns the Windows executable run by a
+                Wine/Proton loader PID (loaders are skipped if None)
+        """
+        self.config_dir = Path(config_dir or os.path.expanduser("~/.gaming_ai_assistant"))
+        self.path = self.config_dir / self.FILENAME
+        self.library_roots = [
+            _normalize_path(str(root)).rstrip("/") + "/" for root in (library_roots or [])
+        ]
+        self.cpu_probe = cpu_probe
+        if window_class_probe is None and sys.platform == "win32":
+            window_class_probe = _windows_window_classes
+        self.window_class_probe = window_class_probe
+        self.wine_exe_probe = wine_exe_probe
+
+        self._lock = threading.Lock()
+        self._entries: Dict[str, Dict] = {}
+        self._dirty = False
+        self.classifications = 0  # static classifications run (cache misses)
+        self._load()
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+
+    def _load(self) -> None:
+        if not self.path.exists():
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("version") == self.CACHE_VERSION:
+                entries = data.get("entries", {})
+                # Least recently used first
+                self._entries = dict(list(entries.items())[-self.MAX_ENTRIES:])
+        except Exception as e:
+            logger.error(f"Failed to load game discovery cache: {e}")
+            self._entries = {}
+
+    def save(self) -> None:
+        """Write the cache atomically if anything changed"""
+        with self._lock:
+            if not self._dirty:
+                return
+            data = json.dumps(
+                {"version": self.CACHE_VERSION, "entries": self._entries},
+                separators=(",", ":"),
+            )
+            self._dirty = False
+        try:
+            self.config_dir.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_suffix(".json.tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.write(data)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            logger.error(f"Failed to save game discovery cache: {e}")
+            with self._lock:
+                self._dirty = True
+
+    # ------------------------------------------------------------------
+    # Classification
+    # ------------------------------------------------------------------
+
+    def classify(self, info: ProcessInfo) -> Optional[DiscoveryResult]:
+        """
+        Decide whether a running process is a game
+
+        Args:
+            info: Process table entry (needs an executable path)
+
+        Returns:
+            DiscoveryResult, or None if the process cannot be classified
+            (no executable path, system binary or known non-game)
+        """
+        exe = info.exe
+        if not exe:
+            return None
+        normalized = _normalize_path(exe)
+        stem = os.path.splitext(os.path.basename(normalized))[0]
+        if stem in WINE_LOADERS:
+            exe = self.wine_exe_probe(info.pid) if self.wine_exe_probe else None
+            if not exe:
+                return None
+            normalized = _normalize_path(exe)
+            stem = os.path.splitext(os.path.basename(normalized))[0]
+            if any(system_dir in normalized for system_dir in WINE_SYSTEM_DIRS):
+                return None
+        if stem in NON_GAME_NAMES or normalized.startswith(SYSTEM_PREFIXES):
+            return None
+
+        try:
+            mtime = os.stat(exe).st_mtime_ns
+        except OSError:
+            return None
+
+        with self._lock:
+            entry = self._entries.pop(exe, None)
+            if entry is not None:
+                # Re-insert as most recently used
+                self._entries[exe] = entry
+        if entry is None or entry.get("mtime") != mtime:
+            result = self._classify_static(exe, normalized)
+            entry = {"mtime": mtime, **asdict(result)}
+            with self._lock:
+                self._entries.pop(exe, None)
+                self._entries[exe] = entry
+                while len(self._entries) > self.MAX_ENTRIES:
+                    del self._entries[next(iter(self._entries))]
+                self._dirty = True
+                self.classifications += 1
+
+        result = DiscoveryResult(
+            exe=exe,
+            name=entry["name"],
+            score=entry["score"],
+            signals=list(entry["signals"]),
+            is_game=entry["is_game"],
+        )
+        if not result.is_game and result.score > 0:
+            self._apply_process_signals(info.pid, result)
+        return result
+
+    def _classify_static(self, exe: str, normalized: str) -> DiscoveryResult:
+        """Score path and neighbouring files for one binary"""
+        score = 0
+        signals: List[str] = []
+        name = self._guess_name(exe, normalized)
+
+        for root in self.library_roots:
+            if normalized.startswith(root):
+                score += 3
+                signals.append("library:custom")
+                break
+        else:
+            for marker, weight in LIBRARY_MARKERS:
+                if marker in normalized:
+                    score += weight
+                    signals.append(f"library:{marker.strip('/')}")
+                    break
+
+        stem = os.path.splitext(os.path.basename(exe))[0]
+        if _SHIPPING_SUFFIX.search(stem):
+            score += 3
+            signals.append("engine:unreal")
+
+        try:
+            neighbours = [entry.lower() for entry in os.listdir(os.path.dirname(exe))]
+        except OSError:
+            neighbours = []
+        for file_name in neighbours:
+            engine = ENGINE_FILES.get(file_name)
+            if engine is None:
+                engine = ENGINE_SUFFIXES.get(os.path.splitext(file_name)[1])
+            if engine is not None:
+                score += 3
+                signals.append(f"engine:{engine}")
+                break
+        if any(file_name in MIDDLEWARE_FILES for file_name in neighbours):
+            score += 1
+            signals.append("middleware")
+
+        return DiscoveryResult(
+            exe=exe,
+            name=name,
+            score=score,
+            signals=signals,
+            is_game=score >= self.GAME_THRESHOLD,
+        )
+
+    def _apply_process_signals(self, pid: int, result: DiscoveryResult) -> None:
+        """Use window class and CPU usage for binaries with a suggestive score"""
+        if self.window_class_probe is not None:
+            try:
+                classes = {c.lower() for c in self.window_class_probe(pid)}
+            except Exception as e:
+                logger.debug(f"Window class probe failed for {pid}: {e}")
+                classes = set()
+            if classes & ENGINE_WINDOW_CLASSES:
+                result.score += 2
+                result.signals.append("window")
+        if self.cpu_probe is not None:
+            usage = self.cpu_probe(pid)
+            if usage is not None and usage >= self.CPU_THRESHOLD:
+                result.score += 1
+                result.signals.append("cpu")
+        result.is_game = result.score >= self.GAME_THRESHOLD
+
+    @staticmethod
+    def _guess_name(exe: str, normalized: str) -> str:
+        """Folder name under the library root, else the cleaned executable name"""
+        parts = exe.replace("\\", "/").split("/")
+        lowered = normalized.split("/")
+        for marker in ("common", "heroic", "epic games", "games", "lutris"):
+            if marker in lowered[:-1]:
+                index = len(lowered) - 1 - lowered[::-1].index(marker)
+                if index + 1 < len(parts) - 1:
+                    return parts[index + 1]
+        stem = os.path.splitext(parts[-1])[0]
+        return _SHIPPING_SUFFIX.sub("", stem)
+
+    def forget(self, exe: str) -> None:
+        """Drop a cached classification (e.g. after a user correction)"""
+        with self._lock:
+            if self._entries.pop(exe, None) is not None:
+                self._dirty = True
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
@@ -1,9 +1,11 @@
 """Game Profile Module."""
 
+import fnmatch
 import logging
+import re
 from dataclasses import dataclass, asdict, field
 from pathlib import Path
-from typing import Dict, List, Optional, Set
+from typing import Dict, List, Optional, Pattern, Set, Tuple
 
 from src.base_store import BaseStore
 
@@ -13,6 +15,22 @@ logger = logging.getLogger(__name__)
 CONFIG_DIR = Path.home() / '.gaming_ai_assistant'
 PROFILES_FILE = CONFIG_DIR / 'game_profiles.json'
 
+# exe_names entries starting with this prefix are regular expressions
+REGEX_PREFIX = "re:"
+_GLOB_CHARS = frozenset("*?[")
+
+
+def is_exe_pattern(exe: str) -> bool:
+    """Check whether an exe_names entry is a glob or regex rather than a literal name"""
+    return exe.startswith(REGEX_PREFIX) or any(ch in _GLOB_CHARS for ch in exe)
+
+
+def exe_pattern_to_regex(exe: str) -> str:
+    """Translate a glob or 're:' exe_names entry into a regular expression"""
+    if exe.startswith(REGEX_PREFIX):
+        return exe[len(REGEX_PREFIX):]
+    return fnmatch.translate(exe)
+
 
 @dataclass
 class GameProfile:
@@ -53,14 +71,26 @@ class GameProfile:
         """
         Check if this profile matches the given executable name.
 
+        Entries may be literal names, globs (``*.exe``) or regular
+        expressions prefixed with ``re:``.
+
         Args:
             exe_name: Executable filename (case-insensitive)
 
         Returns:
             True if exe_name matches any in exe_names list
         """
-        exe_lower = exe_name.lower()
-        return any(exe.lower() == exe_lower for exe in self.exe_names)
+        exe_folded = exe_name.casefold()
+        for exe in self.exe_names:
+            if is_exe_pattern(exe):
+                try:
+                    if re.fullmatch(exe_pattern_to_regex(exe), exe_name, re.IGNORECASE):
+                        return True
+                except re.error:
+                    continue
+            elif exe.casefold() == exe_folded:
+                return True
+        return False
 
 
 class GameProfileStore(BaseStore[GameProfile]):
@@ -272,6 +302,14 @@ class GameProfileStore(BaseStore[GameProfile]):
         self.profiles_file = self.config_dir / 'game_profiles.json'
         self.profiles: Dict[str, GameProfile] = {}
         self._custom_profile_ids: Set[str] = set()
+
+        # Executable lookup: casefolded name -> profile id, plus compiled
+        # glob/regex entries in profile order. Bumped on every rebuild so
+        # consumers that cache matches know when to re-match.
+        self._exe_index: Dict[str, str] = {}
+        self._exe_patterns: List[Tuple[Pattern, str]] = []
+        self.exe_index_version = 0
+
         self._load_profiles()
 
     def _load_profiles(self) -> None:
@@ -283,6 +321,7 @@ class GameProfileStore(BaseStore[GameProfile]):
         # Load custom profiles from file
         data = self._json_load(self.profiles_file)
         if not data:
+            self._rebuild_exe_index()
             return
 
         for profile_data in data.get('profiles', []):
@@ -295,6 +334,7 @@ class GameProfileStore(BaseStore[GameProfile]):
             self._custom_profile_ids.add(profile.id)
 
         logger.info("Loaded %s custom game profiles", len(self._custom_profile_ids))
+        self._rebuild_exe_index()
 
     def _save_to_disk(self) -> None:
         """Save all custom profiles to JSON file"""
@@ -309,6 +349,52 @@ class GameProfileStore(BaseStore[GameProfile]):
         else:
             logger.error("Failed to save game profiles to %s", self.profiles_file)
 
+    def _rebuild_exe_index(self) -> None:
+        """
+        Rebuild the executable lookup tables from all profiles
+
+        Literal names go into a dict keyed by casefolded name. Glob and
+        regex entries are compiled one by one (a single alternation would
+        reject inline flags such as ``(?i)`` anywhere but the start) and
+        invalid ones are skipped. Profiles earlier in ``self.profiles`` win
+        ties, matching the previous first-match scan.
+        """
+        index: Dict[str, str] = {}
+        patterns: List[Tuple[Pattern, str]] = []
+
+        for profile in self.profiles.values():
+            for exe in profile.exe_names:
+                if not exe:
+                    continue
+                if not is_exe_pattern(exe):
+                    index.setdefault(exe.casefold(), profile.id)
+                    continue
+                try:
+                    compiled = re.compile(exe_pattern_to_regex(exe), re.IGNORECASE)
+                except re.error as exc:
+                    logger.warning("Ignoring invalid exe pattern %r in profile %s: %s", exe, profile.id, exc)
+                    continue
+                patterns.append((compiled, profile.id))
+
+        self._exe_index = index
+        self._exe_patterns = patterns
+        self.exe_index_version += 1
+
+    def _match_executable(self, exe_name: str) -> Optional[Tuple[str, bool]]:
+        """
+        Look up the profile id for an executable
+
+        Returns:
+            (profile_id, is_pattern_match) or None
+        """
+        profile_id = self._exe_index.get(exe_name.casefold())
+        if profile_id is not None:
+            return profile_id, False
+        for pattern, pattern_id in self._exe_patterns:
+            if pattern.fullmatch(exe_name):
+                return pattern_id, True
+        return None
+
     def get_profile_by_id(self, profile_id: str) -> Optional[GameProfile]:
         """Get a profile by its ID"""
         return self.profiles.get(profile_id)
@@ -323,9 +409,11 @@ class GameProfileStore(BaseStore[GameProfile]):
         Returns:
             Matching GameProfile or generic_game profile as fallback
         """
-        # Try exact matches first
-        for profile in self.profiles.values():
-            if profile.matches_executable(exe_name):
+        # Exact names first (O(1) dict lookup), then the combined pattern matcher
+        match = self._match_executable(exe_name) if exe_name else None
+        if match is not None:
+            profile = self.profiles.get(match[0])
+            if profile is not None:
                 logger.debug(f"Matched executable '{exe_name}' to profile '{profile.id}'")
                 return profile
 
@@ -380,6 +468,7 @@ class GameProfileStore(BaseStore[GameProfile]):
 
         self.profiles[profile.id] = profile
         self._custom_profile_ids.add(profile.id)
+        self._rebuild_exe_index()
         self._save_to_disk()
         logger.info(f"Created new game profile: {profile.id}")
         return True
@@ -404,6 +493,7 @@ class GameProfileStore(BaseStore[GameProfile]):
             return False
 
         self.profiles[profile.id] = profile
+        self._rebuild_exe_index()
         self._save_to_disk()
         logger.info(f"Updated game profile: {profile.id}")
         return True
@@ -429,6 +519,7 @@ class GameProfileStore(BaseStore[GameProfile]):
 
         del self.profiles[profile_id]
         self._custom_profile_ids.discard(profile_id)
+        self._rebuild_exe_index()
         self._save_to_disk()
         logger.info(f"Deleted game profile: {profile_id}")
         return True
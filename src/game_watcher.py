@@ -6,11 +6,12 @@ Monitors active game and emits Qt signals when game changes
 import logging
 import threading
 import time
-from typing import Optional, Callable, Dict
+from typing import Optional, Callable, Dict, List
 from PyQt6.QtCore import QObject, pyqtSignal
 
 from src.game_detector import GameDetector
 from src.game_profile import GameProfile, get_profile_store
+from src.process_monitor import ProcessInfo
 
 logger = logging.getLogger(__name__)
 
@@ -35,7 +36,12 @@ class GameWatcher(QObject):
         Initialize game watcher.
 
         Args:
-            check_interval: How often to check for active game (seconds)
+            detector: GameDetector whose process monitor is shared (created if None)
+            profile_store: Profile store used to match executables
+            check_interval: Longest wait between foreground window checks
+                (seconds); the detector's scan scheduler shortens it after
+                start-up and game exits, and process changes or rescan
+                hints wake the watcher immediately
         """
         super().__init__()
         # Allow dependency injection for easier testing
@@ -48,8 +54,18 @@ class GameWatcher(QObject):
         self._watching = False
         self._watcher_thread: Optional[threading.Thread] = None
         self._stop_event = threading.Event()
+        self._change_event = threading.Event()
         self.last_known_pid: Optional[int] = None  # Cache PID for non-Windows optimization
 
+        # Running processes that match a game profile: {pid: exe_name}
+        self._running_games: Dict[int, str] = {}
+        self._running_lock = threading.Lock()
+        self._matched_index_version = None
+        self.process_monitor = getattr(self.detector, "process_monitor", None)
+        self.scan_scheduler = getattr(self.detector, "scan_scheduler", None)
+        if self.scan_scheduler is not None:
+            self.scan_scheduler.add_wake_callback(self._change_event.set)
+
     def start_watching(self) -> None:
         """Start monitoring for active game changes"""
         if self._watching:
@@ -58,6 +74,9 @@ class GameWatcher(QObject):
 
         self._watching = True
         self._stop_event.clear()
+        if self.process_monitor is not None:
+            self.process_monitor.subscribe(self._on_processes_changed)
+            self._rematch_running_games()
         self._watcher_thread = threading.Thread(
             target=self._watch_loop,
             daemon=True,
@@ -73,6 +92,9 @@ class GameWatcher(QObject):
 
         self._watching = False
         self._stop_event.set()
+        self._change_event.set()
+        if self.process_monitor is not None:
+            self.process_monitor.unsubscribe(self._on_processes_changed)
 
         if self._watcher_thread and self._watcher_thread.is_alive():
             self._watcher_thread.join(timeout=2)
@@ -84,6 +106,7 @@ class GameWatcher(QObject):
         logger.debug(f"Watch loop started with {self.check_interval}s interval")
 
         while self._watching and not self._stop_event.is_set():
+            self._change_event.clear()
             try:
                 # Get current foreground window process (Windows-specific)
                 current_exe = self._get_foreground_executable()
@@ -96,13 +119,66 @@ class GameWatcher(QObject):
             except Exception as e:
                 logger.error(f"Error in watch loop: {e}", exc_info=True)
 
-            # Sleep with interruptible wait using Event (allows immediate shutdown)
-            if self._stop_event.wait(self.check_interval):
-                # Event was set (stop requested), exit immediately
+            # Sleep until the interval elapses, a game process starts/exits
+            # or a rescan is requested
+            self._change_event.wait(self._next_wait())
+            if self._stop_event.is_set():
                 break
 
         logger.debug("Watch loop ended")
 
+    def _next_wait(self) -> float:
+        """Seconds until the next foreground check"""
+        if self.scan_scheduler is None:
+            return self.check_interval
+        # Hints wake the loop through the scheduler callback, so never spin on a 0 delay
+        delay = max(self.scan_scheduler.fast_interval, self.scan_scheduler.next_delay())
+        return min(self.check_interval, delay)
+
+    def request_rescan(self, reason: str = "") -> None:
+        """Ask the detector for a full scan and re-check the foreground now"""
+        if hasattr(self.detector, "request_rescan"):
+            self.detector.request_rescan(reason)
+        self._change_event.set()
+
+    def _on_processes_changed(
+        self, added: List[ProcessInfo], removed: List[ProcessInfo]
+    ) -> None:
+        """
+        Process monitor callback: track started and exited game processes
+
+        Each process is matched against the profiles once, when it appears,
+        rather than on every watch tick.
+        """
+        changed = False
+        with self._running_lock:
+            for info in removed:
+                if self._running_games.pop(info.pid, None) is not None:
+                    changed = True
+                    if self.scan_scheduler is not None:
+                        self.scan_scheduler.on_game_exited(info.pid)
+            for info in added:
+                profile = self.profile_store.get_profile_by_executable(info.name)
+                if profile and profile.id != "generic_game":
+                    self._running_games[info.pid] = info.name
+                    changed = True
+                    if self.scan_scheduler is not None:
+                        self.scan_scheduler.on_game_started(info.pid)
+        if changed:
+            self._change_event.set()
+
+    def _rematch_running_games(self) -> None:
+        """Match every process in the table again (after profiles changed)"""
+        self._matched_index_version = getattr(self.profile_store, "exe_index_version", None)
+        with self._running_lock:
+            self._running_games.clear()
+        self._on_processes_changed(self.process_monitor.get_processes(), [])
+
+    def get_running_game_processes(self) -> Dict[int, str]:
+        """Get running processes that match a game profile as {pid: exe_name}"""
+        with self._running_lock:
+            return dict(self._running_games)
+
     def _get_foreground_executable(self) -> Optional[str]:
         """
         Get the executable name of the foreground window.
@@ -125,6 +201,15 @@ class GameWatcher(QObject):
                 # This is "good enough" for single-screen setups.
                 logger.debug("Using fallback game detection for non-Windows platform")
 
+                # Answered from the shared process table kept by the detector's monitor
+                if self.process_monitor is not None:
+                    if getattr(self.profile_store, "exe_index_version", None) != self._matched_index_version:
+                        self._rematch_running_games()
+                    running = self.get_running_game_processes()
+                    if self.last_known_pid not in running:
+                        self.last_known_pid = min(running) if running else None
+                    return running.get(self.last_known_pid)
+
                 # Optimization: Check if previously detected game is still running
                 if self.last_known_pid:
                     try:
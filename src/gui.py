@@ -34,11 +34,14 @@ from PyQt6.QtWidgets import (
 from PyQt6.QtWebEngineWidgets import QWebEngineView
 from PyQt6.QtWebChannel import QWebChannel
 
+from src.ai_router import get_router
 from src.config import Config
 from src.credential_store import CredentialStore
 from src.ui.design_system import OmnixDesignSystem, design_system
+from src.game_profile import get_profile_store
 from src.keybind_manager import KeybindManager
 from src.macro_manager import MacroManager
+from src.model_lifecycle import ModelLifecycleManager, get_model_lifecycle_manager
 from src.ui.theme_manager import OmnixThemeManager
 from src.settings_dialog import TabbedSettingsDialog
 
@@ -71,6 +74,11 @@ class JSBridge(QObject):
         """Called from React when user sends a message."""
         self.main_window.send_message_to_ai(content)
 
+    @pyqtSlot(str)
+    def updateDraft(self, content: str):
+        """Called from React while the user is typing a message."""
+        self.main_window.prefetch_draft(content)
+
     @pyqtSlot(str, str)
     def updateSetting(self, key: str, value: str):
         """Called from React to update a config setting."""
@@ -143,10 +151,8 @@ class JSBridge(QObject):
             # Update manager
             self.main_window.macro_manager.macros[macro.id] = macro
             
-            # Persist to disk
-            all_macros = self.main_window.macro_manager.save_to_dict()
-            self.main_window.config.save_macros(all_macros)
-            return True
+            # Persist to disk (this macro's file only)
+            return self.main_window.config.save_macro(macro)
         except Exception as e:
             logger.error(f"Failed to save macro: {e}")
             return False
@@ -155,15 +161,14 @@ class JSBridge(QObject):
     def startMacroRecording(self):
         """Start recording a macro."""
         # Use a default name, user can rename later
-        self.main_window.macro_manager.start_recording("New Recording")
+        self.main_window.macro_manager.start_recording("New Recording", capture_input=True)
 
     @pyqtSlot()
     def stopMacroRecording(self):
         """Stop recording."""
         macro = self.main_window.macro_manager.stop_recording()
         if macro:
-            all_macros = self.main_window.macro_manager.save_to_dict()
-            self.main_window.config.save_macros(all_macros)
+            self.main_window.config.save_macro(macro)
             # Signal could be emitted here to refresh UI
 
 
@@ -373,7 +378,12 @@ class MainWindow(QMainWindow):
         self.setStyleSheet(OMNIX_GLOBAL_QSS)
 
         self.keybind_manager = KeybindManager()
-        self.macro_manager = MacroManager()
+        self.macro_manager = MacroManager(config)
+        if getattr(config, "macro_store", None) is not None:
+            self.macro_manager.macros.update(config.macro_store.load_all_macros())
+        self._setup_macro_hotkeys()
+        self.model_lifecycle = self._create_model_lifecycle()
+        self.health_monitor = self._start_health_monitor()
         self.theme_manager = OmnixThemeManager()
         self.settings_dialog = None
 
@@ -404,6 +414,38 @@ class MainWindow(QMainWindow):
             
         self._start_system_stats()
 
+    def _create_model_lifecycle(self) -> Optional[ModelLifecycleManager]:
+        """Keep the active game's Ollama model warm while it runs."""
+        try:
+            return get_model_lifecycle_manager(self.config)
+        except Exception as e:
+            logger.warning(f"Model lifecycle management unavailable: {e}")
+            return None
+
+    def _start_health_monitor(self):
+        """Keep Ollama health and the model list cached in the background."""
+        try:
+            monitor = get_router(self.config).health_monitor
+            monitor.start()
+            return monitor
+        except Exception as e:
+            logger.warning(f"Provider health monitor unavailable: {e}")
+            return None
+
+    def _setup_macro_hotkeys(self) -> None:
+        """Run macros bound to hotkeys through the shared macro executor."""
+        keybinds = getattr(self.config, "keybinds", None)
+        if isinstance(keybinds, dict) and keybinds:
+            self.keybind_manager.load_from_dict(keybinds)
+        macro_keybinds = self.keybind_manager.get_macro_keybinds()
+        with self.keybind_manager.batch_updates():
+            for macro_keybind in macro_keybinds:
+                self.keybind_manager.register_macro_keybind(
+                    macro_keybind, self.macro_manager.hotkey_callback(macro_keybind.macro_id), override=True
+                )
+        if macro_keybinds:
+            self.keybind_manager.start_listening()
+
     def _start_system_stats(self) -> None:
         """Start periodic system stats collection."""
         self.stats_timer = QTimer()
@@ -430,6 +472,15 @@ class MainWindow(QMainWindow):
         self.ai_worker.error.connect(self._handle_error)
         self.ai_worker.start()
 
+    def prefetch_draft(self, text: str) -> None:
+        """Start speculative retrieval for a message still being typed."""
+        if self.ai_worker is not None or not self.ai_assistant:
+            return
+        try:
+            self.ai_assistant.prefetch_draft(text)
+        except Exception as e:
+            logger.debug(f"Draft prefetch skipped: {e}")
+
     def _handle_response(self, response: str) -> None:
         """Send AI response back to React."""
         self.bridge.messageReceived.emit(response)
@@ -515,6 +566,11 @@ class MainWindow(QMainWindow):
         pass
 
     def _start_game_detection(self) -> None:
+        # Hotkey use often means a game was just launched or focused
+        if hasattr(self.game_detector, "request_rescan"):
+            self.keybind_manager.add_trigger_observer(
+                lambda action: self.game_detector.request_rescan(f"hotkey:{action}")
+            )
         self.game_check_timer = QTimer()
         self.game_check_timer.timeout.connect(self._check_for_game)
         self.game_check_timer.start(5000)
@@ -533,18 +589,24 @@ class MainWindow(QMainWindow):
             self._update_game_status(None)
 
     def _update_game_status(self, game: Optional[Dict]) -> None:
-        online = bool(game)
         name = game.get("name") if game else None
-        pid = str(game.get("pid", "--")) if game else "--"
-
-        # Update Center Widget
-        self.game_status.set_game(name, online)
 
-        # Update Stats (Mock stats for now, could come from DB)
-        if online:
-            self.stat_block.set_stats(kd="1.2", matches="42", wins="54%")
-        else:
-            self.stat_block.set_stats(kd="--", matches="--", wins="--")
+        # Only the running game's macro hotkeys should match, and its model
+        # should be kept warm
+        try:
+            if game:
+                profile = get_profile_store().get_profile_by_executable(
+                    game.get("process_name") or ""
+                )
+                self.keybind_manager.on_game_changed(name, profile)
+                if self.model_lifecycle:
+                    self.model_lifecycle.on_game_changed(name, profile)
+            else:
+                self.keybind_manager.on_game_closed()
+                if self.model_lifecycle:
+                    self.model_lifecycle.on_game_closed()
+        except Exception as e:
+            logger.error(f"Failed to apply game change: {e}", exc_info=True)
 
         # Notify AI
         if self.ai_assistant:
@@ -553,6 +615,12 @@ class MainWindow(QMainWindow):
     def cleanup(self) -> None:
         if self.overlay_window:
             self.overlay_window.close()
+        self.keybind_manager.stop_listening()
+        self.macro_manager.shutdown()
+        if self.model_lifecycle:
+            self.model_lifecycle.shutdown()
+        if self.health_monitor:
+            self.health_monitor.stop()
         if hasattr(self, "game_check_timer"):
             self.game_check_timer.stop()
         if hasattr(self, "stats_timer"):
@@ -573,6 +641,7 @@ def run_gui(
     app.setStyle("Fusion")
 
     window = MainWindow(ai_assistant, config, credential_store, ds, game_detector)
+    app.aboutToQuit.connect(window.cleanup)
     window.show()
     sys.exit(app.exec())
 
@@ -0,0 +1,220 @@
+"""
+Hotkey Matcher Module
+Constant-time hotkey matching on a modifier bitmask plus key
+"""
+
+import logging
+from dataclasses import dataclass
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Modifier bits
+CTRL = 1
+SHIFT = 2
+ALT = 4
+CMD = 8
+
+# Key names as reported by pynput (Key.<name>) mapped to modifier bits
+MODIFIER_BITS: Dict[str, int] = {
+    'ctrl': CTRL, 'ctrl_l': CTRL, 'ctrl_r': CTRL, 'control': CTRL,
+    'shift': SHIFT, 'shift_l': SHIFT, 'shift_r': SHIFT,
+    'alt': ALT, 'alt_l': ALT, 'alt_r': ALT, 'alt_gr': ALT,
+    'cmd': CMD, 'cmd_l': CMD, 'cmd_r': CMD, 'win': CMD, 'super': CMD,
+    'command': CMD, 'windows': CMD,
+}
+
+# Combo-string spellings mapped to pynput key names
+_KEY_ALIASES = {
+    'escape': 'esc',
+    'return': 'enter',
+    'pageup': 'page_up',
+    'pagedown': 'page_down',
+}
+
+
+def key_name(key: Any) -> Optional[str]:
+    """
+    Canonical name of a key event
+
+    Accepts pynput Key members (by name), KeyCode objects (by character,
+    falling back to the virtual key code when a held Ctrl turns the
+    character into a control code) and plain strings.
+
+    Returns:
+        Lower-cased key name, or None if the key cannot be identified
+    """
+    if isinstance(key, str):
+        name = key.strip().lower()
+        return _KEY_ALIASES.get(name, name) or None
+
+    name = getattr(key, 'name', None)
+    if name:
+        return name
+
+    char = getattr(key, 'char', None)
+    if char and char.isprintable():
+        return char.lower()
+
+    vk = getattr(key, 'vk', None)
+    if vk is not None:
+        if 0x41 <= vk <= 0x5A or 0x30 <= vk <= 0x39:
+            return chr(vk).lower()
+        return f"vk{vk}"
+    return None
+
+
+def parse_combo(keys: str) -> Optional[Tuple[int, FrozenSet[str]]]:
+    """
+    Parse a key combination string
+
+    Args:
+        keys: Combination such as "ctrl+shift+g"
+
+    Returns:
+        (modifier mask, non-modifier key names), or None if the
+        combination has no non-modifier key
+    """
+    mask = 0
+    names = set()
+    for part in keys.lower().split('+'):
+        part = part.strip()
+        if not part:
+            continue
+        bit = MODIFIER_BITS.get(part)
+        if bit:
+            mask |= bit
+        else:
+            names.add(_KEY_ALIASES.get(part, part))
+    if not names:
+        return None
+    return mask, frozenset(names)
+
+
+@dataclass(frozen=True)
+class HotkeyBinding:
+    """
+    A compiled hotkey
+
+    Attributes:
+        action: Action fired by the hotkey
+        mask: Exact modifier bits that must be held
+        keys: Non-modifier key names that must be held
+    """
+    action: str
+    mask: int
+    keys: FrozenSet[str]
+
+    @classmethod
+    def compile(cls, action: str, keys: str) -> Optional['HotkeyBinding']:
+        """Compile a combo string; None if it cannot be matched"""
+        parsed = parse_combo(keys)
+        if parsed is None:
+            return None
+        return cls(action, parsed[0], parsed[1])
+
+
+class BindingTable:
+    """
+    Immutable hotkey index keyed on (modifier mask, key name)
+
+    Each binding is indexed under every one of its non-modifier keys, so
+    a key press is a single dict lookup. Tables are never mutated after
+    construction; `with_binding`/`without` return new tables, so a table
+    can be swapped into a matcher with one assignment while the input
+    hook is reading the old one.
+    """
+
+    def __init__(self, bindings: Iterable[HotkeyBinding] = ()):
+        self.bindings: Dict[str, HotkeyBinding] = {b.action: b for b in bindings}
+        index: Dict[Tuple[int, str], List[HotkeyBinding]] = {}
+        for binding in self.bindings.values():
+            for name in binding.keys:
+                index.setdefault((binding.mask, name), []).append(binding)
+        self._index: Dict[Tuple[int, str], Tuple[HotkeyBinding, ...]] = {
+            slot: tuple(entries) for slot, entries in index.items()
+        }
+
+    def __len__(self) -> int:
+        return len(self.bindings)
+
+    def __contains__(self, action: str) -> bool:
+        return action in self.bindings
+
+    def lookup(self, mask: int, name: str) -> Tuple[HotkeyBinding, ...]:
+        """Bindings triggered by `name` while exactly `mask` is held"""
+        return self._index.get((mask, name), ())
+
+    def with_binding(self, binding: HotkeyBinding) -> 'BindingTable':
+        """Copy with `binding` added (replacing any binding for its action)"""
+        bindings = dict(self.bindings)
+        bindings[binding.action] = binding
+        return BindingTable(bindings.values())
+
+    def without(self, action: str) -> 'BindingTable':
+        """Copy with the binding for `action` removed"""
+        if action not in self.bindings:
+            return self
+        return BindingTable(b for a, b in self.bindings.items() if a != action)
+
+
+class HotkeyMatcher:
+    """
+    Tracks held keys and reports the hotkeys each key press completes
+
+    Matching needs the held modifiers to be exactly the binding's
+    modifiers; other held non-modifier keys (movement keys during
+    gameplay) do not block a hotkey. Auto-repeat presses of a key that
+    is already down are ignored, so a held hotkey fires once.
+
+    Called from the input hook thread only; `table` may be replaced from
+    any thread.
+    """
+
+    def __init__(self, table: Optional[BindingTable] = None):
+        self.table = table if table is not None else BindingTable()
+        self._held_modifiers: Dict[str, int] = {}
+        self._held: set = set()
+        self.mask = 0
+
+    def press(self, key: Any) -> List[str]:
+        """
+        Handle a key press
+
+        Returns:
+            Actions whose hotkeys the press completed
+        """
+        name = key_name(key)
+        if name is None or name in self._held:
+            return []
+        self._held.add(name)
+
+        bit = MODIFIER_BITS.get(name)
+        if bit:
+            self._held_modifiers[name] = bit
+            self.mask |= bit
+            return []
+
+        table = self.table
+        candidates = table.lookup(self.mask, name)
+        if not candidates:
+            return []
+        return [b.action for b in candidates if len(b.keys) == 1 or b.keys <= self._held]
+
+    def release(self, key: Any) -> None:
+        """Handle a key release"""
+        name = key_name(key)
+        if name is None:
+            return
+        self._held.discard(name)
+        if self._held_modifiers.pop(name, None):
+            mask = 0
+            for bit in self._held_modifiers.values():
+                mask |= bit
+            self.mask = mask
+
+    def reset(self) -> None:
+        """Forget held keys (e.g. after the listener restarts)"""
+        self._held.clear()
+        self._held_modifiers.clear()
+        self.mask = 0
@@ -0,0 +1,254 @@
+"""
+HRM Inference Module
+
+CPU inference for Hierarchical Reasoning Model checkpoints trained with
+HRM-main/pretrain.py, plus Sudoku encoding for puzzle questions.
+"""
+
+import logging
+import re
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+try:
+    import torch
+    from torch import nn
+    TORCH_AVAILABLE = True
+except ImportError:
+    TORCH_AVAILABLE = False
+    torch = None
+    nn = None
+
+# Vendored HRM sources (provides the `models` package)
+HRM_SOURCE_DIR = Path(__file__).resolve().parent.parent / "HRM-main" / "HRM-main"
+
+SUDOKU_CELLS = 81
+_SUDOKU_BLANKS = ".0_"
+
+
+def parse_sudoku(text: str) -> Optional[List[int]]:
+    """
+    Find a 9x9 Sudoku grid in free text
+
+    Digits 1-9 are givens; '0', '.' and '_' are blanks. Everything else
+    (spaces, separators, row breaks) is ignored, so grids pasted as one
+    line or as nine rows both work.
+
+    Args:
+        text: Question text
+
+    Returns:
+        81 cell values (0 = blank), or None if the text has no grid
+    """
+    cells = [0 if ch in _SUDOKU_BLANKS else int(ch)
+             for ch in re.findall(r"[0-9._]", text)]
+    # A grid is the last 81 cells (numbers in the question come first)
+    if len(cells) < SUDOKU_CELLS:
+        return None
+    grid = cells[-SUDOKU_CELLS:]
+    if not any(grid) or not is_consistent(grid):
+        return None
+    return grid
+
+
+def is_consistent(grid: List[int]) -> bool:
+    """Check no row, column or box repeats a digit (blanks ignored)"""
+    for unit in _UNITS:
+        digits = [grid[i] for i in unit if grid[i]]
+        if len(digits) != len(set(digits)):
+            return False
+    return True
+
+
+def is_solution(puzzle: List[int], solution: List[int]) -> bool:
+    """Check a filled grid is valid and keeps the puzzle's givens"""
+    if len(solution) != SUDOKU_CELLS or any(d < 1 or d > 9 for d in solution):
+        return False
+    if any(given and given != value for given, value in zip(puzzle, solution)):
+        return False
+    return is_consistent(solution)
+
+
+def format_grid(grid: List[int]) -> str:
+    """Render a grid as nine rows with box separators"""
+    rows = []
+    for r in range(9):
+        row = grid[r * 9:(r + 1) * 9]
+        rows.append(" | ".join(" ".join(str(d or ".") for d in row[c:c + 3]) for c in (0, 3, 6)))
+        if r in (2, 5):
+            rows.append("------+-------+------")
+    return "\n".join(rows)
+
+
+def _build_units() -> List[List[int]]:
+    rows = [[r * 9 + c for c in range(9)] for r in range(9)]
+    cols = [[r * 9 + c for r in range(9)] for c in range(9)]
+    boxes = [[(br + r) * 9 + bc + c for r in range(3) for c in range(3)]
+             for br in (0, 3, 6) for bc in (0, 3, 6)]
+    return rows + cols + boxes
+
+
+_UNITS = _build_units()
+
+
+class HRMCPUModel:
+    """
+    An HRM checkpoint running on CPU
+
+    The checkpoint directory layout is the one pretrain.py writes: a state
+    dict file plus all_config.yaml. Attention uses PyTorch SDPA (the
+    FlashAttention kernels are CUDA-only), the forward pass runs in float32
+    under torch.inference_mode, linear layers can be int8 dynamically
+    quantized, and torch uses a fixed number of threads.
+    """
+
+    def __init__(
+        self,
+        checkpoint_path: str,
+        seq_len: int = SUDOKU_CELLS,
+        quantize: bool = True,
+        num_threads: int = 0,
+        source_dir: Path = HRM_SOURCE_DIR,
+    ):
+        """
+        Load a checkpoint
+
+        Args:
+            checkpoint_path: State dict file saved by pretrain.py
+            seq_len: Puzzle sequence length of the dataset the model was trained on
+            quantize: Apply int8 dynamic quantization to linear layers
+            num_threads: torch intra-op threads (0 leaves the torch default)
+            source_dir: Directory containing the HRM `models` package
+
+        Raises:
+            RuntimeError: If PyTorch is not installed
+            FileNotFoundError: If the checkpoint or its config is missing
+        """
+        if not TORCH_AVAILABLE:
+            raise RuntimeError("PyTorch is required for HRM inference")
+
+        checkpoint = Path(checkpoint_path)
+        config_file = checkpoint.parent / "all_config.yaml"
+        if not checkpoint.is_file() or not config_file.is_file():
+            raise FileNotFoundError(f"HRM checkpoint or all_config.yaml not found: {checkpoint}")
+
+        if num_threads > 0:
+            torch.set_num_threads(num_threads)
+
+        started = time.perf_counter()
+        self.model = self._load(checkpoint, config_file, seq_len, source_dir)
+        if quantize:
+            self.model = self._quantize(self.model)
+        self.quantized = quantize
+        self.seq_len = seq_len
+        self.halt_max_steps = self.model.config.halt_max_steps
+        self._lock = threading.Lock()
+        logger.info(f"Loaded HRM checkpoint {checkpoint} on CPU in {time.perf_counter() - started:.1f}s "
+                    f"(int8={quantize}, threads={torch.get_num_threads()})")
+
+    @staticmethod
+    def _load(checkpoint: Path, config_file: Path, seq_len: int, source_dir: Path) -> "nn.Module":
+        import yaml
+
+        if str(source_dir) not in sys.path:
+            sys.path.insert(0, str(source_dir))
+        from utils.functions import load_model_class  # type: ignore[import]
+
+        with open(config_file, "r", encoding="utf-8") as f:
+            arch = dict(yaml.safe_load(f)["arch"])
+
+        # Checkpoints hold the torch.compile'd loss head: strip both wrappers
+        state = torch.load(checkpoint, map_location="cpu", weights_only=True)
+        state = {
+            key.removeprefix("_orig_mod.").removeprefix("model."): value
+            for key, value in state.items()
+        }
+
+        name = arch.pop("name")
+        arch.pop("loss", None)
+        model_cfg = dict(
+            **arch,
+            batch_size=1,
+            seq_len=seq_len,
+            vocab_size=state["inner.embed_tokens.embedding_weight"].shape[0],
+            num_puzzle_identifiers=(state["inner.puzzle_emb.weights"].shape[0]
+                                    if "inner.puzzle_emb.weights" in state else 1),
+            forward_dtype="float32",
+        )
+
+        with torch.device("cpu"):
+            model = load_model_class(name)(model_cfg)
+        model.load_state_dict({k: v.float() for k, v in state.items()}, assign=True)
+        model.eval()
+        return model
+
+    @staticmethod
+    def _quantize(model: "nn.Module") -> "nn.Module":
+        """int8 dynamic quantization of every CastedLinear"""
+        # quantize_dynamic only matches nn.Linear; in float32 a CastedLinear
+        # computes exactly F.linear(x, weight, bias), so swap them first
+        for parent in list(model.modules()):
+            for child_name, child in list(parent.named_children()):
+                if type(child).__name__ == "CastedLinear":
+                    linear = nn.Linear(child.weight.shape[1], child.weight.shape[0], bias=child.bias is not None)
+                    linear.weight = child.weight
+                    if child.bias is not None:
+                        linear.bias = child.bias
+                    setattr(parent, child_name, linear)
+        return torch.ao.quantization.quantize_dynamic(model, {nn.Linear}, dtype=torch.qint8)
+
+    def predict(self, tokens: List[int], deadline: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Run the ACT loop on one puzzle
+
+        Stops when the model's halt head says halt, after halt_max_steps
+        segments, or at the deadline.
+
+        Args:
+            tokens: Input token IDs (length seq_len)
+            deadline: time.perf_counter() value to stop by
+
+        Returns:
+            Dict with 'tokens' (predicted token IDs), 'steps' and 'halted'
+            (False if the deadline cut the loop short)
+        """
+        batch = {
+            "inputs": torch.tensor([tokens], dtype=torch.int32),
+            "puzzle_identifiers": torch.zeros((1,), dtype=torch.int32),
+        }
+        with self._lock, torch.inference_mode():
+            carry = self.model.initial_carry(batch)
+            steps, halted, logits = 0, False, None
+            while steps < self.halt_max_steps:
+                carry, outputs = self.model(carry=carry, batch=batch)
+                logits = outputs["logits"]
+                steps += 1
+                if bool(outputs["q_halt_logits"][0] > outputs["q_continue_logits"][0]):
+                    halted = True
+                    break
+                if deadline is not None and time.perf_counter() >= deadline:
+                    break
+            halted = halted or steps >= self.halt_max_steps
+
+        return {"tokens": logits[0].argmax(-1).tolist(), "steps": steps, "halted": halted}
+
+    def solve_sudoku(self, puzzle: List[int], deadline: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Solve a Sudoku grid
+
+        Tokens follow dataset/build_sudoku_dataset.py: 0 is padding and
+        digit d is token d + 1 (blank = 1).
+
+        Returns:
+            Dict with 'solution' (81 digits), 'valid', 'steps' and 'halted'
+        """
+        result = self.predict([d + 1 for d in puzzle], deadline)
+        solution = [max(0, t - 1) for t in result["tokens"]]
+        result["solution"] = solution
+        result["valid"] = is_solution(puzzle, solution)
+        return result
@@ -6,11 +6,15 @@ and the Hierarchical Reasoning Model for enhanced reasoning capabilities.
 """
 
 import logging
+import time
 from typing import Optional, Dict, Any, List
 import threading
 
 logger = logging.getLogger(__name__)
 
+# Words marking puzzle-type questions
+PUZZLE_WORDS = ['puzzle', 'sudoku', 'maze', 'riddle', 'cipher']
+
 
 class HRMInterface:
     """
@@ -46,6 +50,11 @@ class HRMInterface:
         except Exception as e:
             logger.warning(f"PyTorch check failed: {e}")
 
+        # Loading and quantizing a checkpoint takes longer than the analysis
+        # time limit, so do it up front rather than on the first question
+        if getattr(self.config, "hrm_checkpoint_path", None) and self.pytorch_available:
+            threading.Thread(target=self._get_model, daemon=True, name="HRMPreload").start()
+
     def is_available(self) -> bool:
         """
         Check if HRM is available for use.
@@ -127,10 +136,16 @@ class HRMInterface:
         # Use threading for timeout (works on all platforms)
         result = [None]
         exception = [None]
+        deadline = time.perf_counter() + self.config.hrm_max_inference_time
 
         def run():
             try:
-                result[0] = self._generate_reasoning_outline(question, game_context)
+                answer = None
+                try:
+                    answer = self._solve_puzzle(question, deadline)
+                except Exception as e:
+                    logger.warning(f"HRM model inference failed, using reasoning outline: {e}")
+                result[0] = answer or self._generate_reasoning_outline(question, game_context)
             except Exception as e:
                 exception[0] = e
 
@@ -148,6 +163,76 @@ class HRMInterface:
 
         return result[0]
 
+    def _get_model(self, wait: bool = True):
+        """
+        Load the configured HRM checkpoint on first use.
+
+        Args:
+            wait: Block while another thread is loading the checkpoint
+
+        Returns:
+            HRMCPUModel, or None if no checkpoint is configured, it fails to
+            load, or it is still loading and wait is False
+        """
+        if not self._lock.acquire(blocking=wait):
+            return None
+        try:
+            if not self._initialized:
+                self._initialized = True
+                checkpoint = getattr(self.config, "hrm_checkpoint_path", None)
+                if checkpoint and self.pytorch_available:
+                    try:
+                        from src.hrm_inference import HRMCPUModel
+                        self._model = HRMCPUModel(
+                            checkpoint,
+                            quantize=self.config.hrm_quantize,
+                            num_threads=self.config.hrm_num_threads,
+                        )
+                    except Exception as e:
+                        logger.warning(f"HRM checkpoint unavailable, using reasoning outlines: {e}")
+            return self._model
+        finally:
+            self._lock.release()
+
+    def _solve_puzzle(self, question: str, deadline: float) -> Optional[str]:
+        """
+        Solve a Sudoku grid in the question with the HRM model.
+
+        Args:
+            question: The question, containing the grid
+            deadline: time.perf_counter() value inference must stop by
+
+        Returns:
+            str: Analysis with the solved grid, or None if the question has no
+                grid, no model is loaded or the model's answer is not valid
+        """
+        question_lower = question.lower()
+        if not any(word in question_lower for word in PUZZLE_WORDS):
+            return None
+
+        from src.hrm_inference import format_grid, parse_sudoku
+        grid = parse_sudoku(question)
+        if grid is None:
+            return None
+
+        # Don't wait on a checkpoint that is still loading in the background
+        model = self._get_model(wait=False)
+        if model is None:
+            return None
+
+        result = model.solve_sudoku(grid, deadline=deadline)
+        if not result["valid"]:
+            logger.info(f"HRM Sudoku answer invalid after {result['steps']} steps")
+            return None
+
+        return "\n".join([
+            "[HRM Reasoning Analysis]",
+            f"\n**Sudoku Solution (HRM model, {result['steps']} reasoning steps):**",
+            "```",
+            format_grid(result["solution"]),
+            "```",
+        ])
+
     def _generate_reasoning_outline(self, question: str, game_context: Optional[str] = None) -> str:
         """
         Generate structured reasoning based on question type.
@@ -163,7 +248,7 @@ class HRMInterface:
         question_lower = question.lower()
 
         # Detect puzzle-type questions
-        if any(word in question_lower for word in ['puzzle', 'sudoku', 'maze', 'riddle', 'cipher']):
+        if any(word in question_lower for word in PUZZLE_WORDS):
             outline_parts.extend([
                 "\n**Puzzle Solving Strategy:**",
                 "1. Identify constraints and rules",
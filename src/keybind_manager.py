@@ -4,21 +4,22 @@ Handles keybind registration, conflict detection, and global hotkey listening
 """
 
 import logging
-from typing import Dict, Callable, Optional, Set, List, Tuple
+import queue
+import threading
+from contextlib import contextmanager
+from typing import Any, Dict, Callable, Iterable, Optional, Set, List, Tuple
 from dataclasses import dataclass, asdict
 from enum import Enum
 import json
 
+from src.hotkey_matcher import BindingTable, HotkeyBinding, HotkeyMatcher
+
 try:
     from pynput import keyboard
-    from pynput.keyboard import Key, KeyCode, HotKey
     PYNPUT_AVAILABLE = True
 except ImportError:
     PYNPUT_AVAILABLE = False
     keyboard = None
-    Key = None
-    KeyCode = None
-    HotKey = None
 
 logger = logging.getLogger(__name__)
 
@@ -88,6 +89,16 @@ class KeybindManager:
     - Conflict detection
     - Global hotkey listening (system-wide)
     - Platform-friendly key parsing
+
+    System-wide hotkeys are compiled into a HotkeyMatcher, so each key
+    event is one table lookup however many keybinds exist. Matched
+    actions are handed to a worker thread; callbacks never run on (or
+    stall) the input hook thread.
+
+    Game-specific macro keybinds only match while their game is active.
+    A binding table is compiled once per game (global bindings plus that
+    game's) and cached until keybinds change; switching games swaps the
+    matcher's table in a single assignment without parsing any keys.
     """
 
     def __init__(self):
@@ -96,8 +107,21 @@ class KeybindManager:
         self.macro_keybinds: Dict[str, MacroKeybind] = {}  # Track macro keybinds separately for scope checking
         self.callbacks: Dict[str, Callable] = {}
         self.listener: Optional[keyboard.Listener] = None
-        self.active_hotkeys: Dict[str, HotKey] = {}
+        self.active_hotkeys: Dict[str, HotkeyBinding] = {}
+        self.matcher = HotkeyMatcher()
         self.currently_pressed: Set = set()
+        self.active_game_profile_id: Optional[str] = None
+        self._tables: Dict[Optional[str], BindingTable] = {}
+        self._game_keybinds: Dict[Optional[str], List[Keybind]] = {}
+        self._trigger_observers: List[Callable[[str], None]] = []
+        # Table rebuilds deferred by batch_updates
+        self._batch_depth = 0
+        self._tables_stale = False
+
+        # Callbacks run on a worker thread fed by the input hook
+        self._dispatch_queue: "queue.Queue[Optional[str]]" = queue.Queue()
+        self._dispatch_thread: Optional[threading.Thread] = None
+        self._dispatch_lock = threading.Lock()
 
         if not PYNPUT_AVAILABLE:
             logger.warning("pynput not available - global hotkeys will not work")
@@ -119,17 +143,19 @@ class KeybindManager:
             logger.warning(f"Keybind conflict: {keybind.keys} already assigned")
             return False
 
-        # Unregister old keybind if it exists
-        if keybind.action in self.keybinds:
-            self.unregister_keybind(keybind.action)
+        with self.batch_updates():
+            # Unregister old keybind if it exists
+            if keybind.action in self.keybinds:
+                self.unregister_keybind(keybind.action)
 
-        # Store keybind and callback
-        self.keybinds[keybind.action] = keybind
-        self.callbacks[keybind.action] = callback
+            # Store keybind and callback
+            self.keybinds[keybind.action] = keybind
+            self.callbacks[keybind.action] = callback
+            self._game_keybinds = {}
 
-        # Register hotkey if system-wide
-        if keybind.system_wide and keybind.enabled:
-            self._register_hotkey(keybind.action, keybind.keys)
+            # Register hotkey if system-wide
+            if keybind.system_wide and keybind.enabled:
+                self._register_hotkey(keybind.action, keybind.keys)
 
         logger.info(f"Registered keybind: {keybind.action} -> {keybind.keys}")
         return True
@@ -155,6 +181,7 @@ class KeybindManager:
         del self.keybinds[action]
         if action in self.callbacks:
             del self.callbacks[action]
+        self._game_keybinds = {}
 
         logger.info(f"Unregistered keybind: {action}")
         return True
@@ -243,49 +270,186 @@ class KeybindManager:
             self.listener.stop()
             self.listener = None
             logger.info("Stopped global hotkey listener")
+        self.matcher.reset()
+        self.currently_pressed.clear()
+        self._stop_dispatcher()
 
     def _register_hotkey(self, action: str, keys: str):
         """Register a system-wide hotkey"""
-        if not PYNPUT_AVAILABLE:
+        binding = HotkeyBinding.compile(action, keys)
+        if binding is None:
+            logger.error(f"Failed to register hotkey {action}: no non-modifier key in {keys}")
             return
 
-        try:
-            # Parse key combination
-            key_combo = self._parse_keys(keys)
-
-            # Create hotkey
-            def on_activate():
-                self._trigger_action(action)
-
-            hotkey = HotKey(key_combo, on_activate)
-            self.active_hotkeys[action] = hotkey
-
-            logger.debug(f"Registered hotkey: {action} -> {keys}")
-        except Exception as e:
-            logger.error(f"Failed to register hotkey {action}: {e}")
+        self.active_hotkeys[action] = binding
+        self._invalidate_tables()
+        logger.debug(f"Registered hotkey: {action} -> {keys}")
 
     def _unregister_hotkey(self, action: str):
         """Unregister a system-wide hotkey"""
         if action in self.active_hotkeys:
             del self.active_hotkeys[action]
+            self._invalidate_tables()
             logger.debug(f"Unregistered hotkey: {action}")
 
+    def _binding_scope(self, action: str) -> Optional[str]:
+        """Game profile ID an action is limited to, or None for global"""
+        if action.startswith("macro_"):
+            macro_keybind = self.macro_keybinds.get(action[len("macro_"):])
+            if macro_keybind is not None:
+                return macro_keybind.game_profile_id
+        return None
+
+    def _table_for(self, game_profile_id: Optional[str]) -> BindingTable:
+        """Compiled bindings active for a game (cached)"""
+        table = self._tables.get(game_profile_id)
+        if table is None:
+            table = BindingTable(
+                binding for action, binding in self.active_hotkeys.items()
+                if self._binding_scope(action) in (None, game_profile_id)
+            )
+            self._tables[game_profile_id] = table
+        return table
+
+    def _invalidate_tables(self):
+        """Recompile the cached tables and the active one after keybinds change"""
+        self._game_keybinds = {}
+        if self._batch_depth:
+            self._tables_stale = True
+            return
+        self._tables_stale = False
+        compiled = list(self._tables)
+        self._tables = {}
+        # Keep tables compiled ahead of time (precompile_tables) warm
+        for game_profile_id in compiled:
+            self._table_for(game_profile_id)
+        self.matcher.table = self._table_for(self.active_game_profile_id)
+
+    @contextmanager
+    def batch_updates(self):
+        """
+        Defer binding table rebuilds until a block of keybind changes ends
+
+        Registering N keybinds inside the block recompiles the tables once
+        instead of once per keybind.
+        """
+        self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            self._batch_depth -= 1
+            if not self._batch_depth and self._tables_stale:
+                self._invalidate_tables()
+
+    def precompile_tables(self, game_profile_ids: Iterable[Optional[str]]) -> None:
+        """Compile the binding tables of games ahead of their first switch"""
+        for game_profile_id in game_profile_ids:
+            self._table_for(game_profile_id)
+
+    def set_active_game(self, game_profile_id: Optional[str]) -> None:
+        """
+        Switch hotkey matching to a game's bindings
+
+        Args:
+            game_profile_id: Game profile ID, or None for global bindings only
+        """
+        if game_profile_id == self.active_game_profile_id:
+            return
+        self.active_game_profile_id = game_profile_id
+        # One reference assignment; the hook thread sees the old or the new table
+        self.matcher.table = self._table_for(game_profile_id)
+        logger.debug(f"Active keybind table: {game_profile_id or 'global'} "
+                     f"({len(self.matcher.table)} hotkeys)")
+
+    def attach_watcher(self, watcher: Any) -> None:
+        """
+        Follow a GameWatcher's game_changed and game_closed signals.
+
+        Args:
+            watcher: GameWatcher instance
+        """
+        watcher.game_changed.connect(self.on_game_changed)
+        watcher.game_closed.connect(self.on_game_closed)
+
+    def on_game_changed(self, game_name: str, profile: Optional[Any] = None) -> None:
+        """Activate the bindings of the game's profile"""
+        profile_id = getattr(profile, "id", None) if profile is not None else None
+        if profile_id == "generic_game":
+            profile_id = None
+        self.set_active_game(profile_id)
+
+    def on_game_closed(self) -> None:
+        """Fall back to global bindings"""
+        self.set_active_game(None)
+
+    def refresh_bindings(self) -> None:
+        """Recompile hotkeys after keybinds were edited in place"""
+        for action in list(self.active_hotkeys):
+            del self.active_hotkeys[action]
+        for action, keybind in self.keybinds.items():
+            if keybind.system_wide and keybind.enabled:
+                binding = HotkeyBinding.compile(action, keybind.keys)
+                if binding is not None:
+                    self.active_hotkeys[action] = binding
+        self._invalidate_tables()
+
     def _on_press(self, key):
         """Handle key press events"""
         self.currently_pressed.add(key)
 
-        # Check all active hotkeys
-        for action, hotkey in self.active_hotkeys.items():
-            hotkey.press(key)
+        for action in self.matcher.press(key):
+            self._dispatch(action)
 
     def _on_release(self, key):
         """Handle key release events"""
         if key in self.currently_pressed:
             self.currently_pressed.remove(key)
 
-        # Check all active hotkeys
-        for action, hotkey in self.active_hotkeys.items():
-            hotkey.release(key)
+        self.matcher.release(key)
+
+    def _dispatch(self, action: str):
+        """Queue a matched action for the dispatch worker"""
+        with self._dispatch_lock:
+            if self._dispatch_thread is None or not self._dispatch_thread.is_alive():
+                self._dispatch_thread = threading.Thread(
+                    target=self._dispatch_loop, name="KeybindDispatch", daemon=True
+                )
+                self._dispatch_thread.start()
+        self._dispatch_queue.put(action)
+
+    def _dispatch_loop(self):
+        """Run queued keybind actions in order"""
+        while True:
+            action = self._dispatch_queue.get()
+            try:
+                if action is None:
+                    return
+                self._trigger_action(action)
+            finally:
+                self._dispatch_queue.task_done()
+
+    def _stop_dispatcher(self):
+        """Stop the dispatch worker after the queued actions have run"""
+        with self._dispatch_lock:
+            thread = self._dispatch_thread
+            self._dispatch_thread = None
+        if thread is not None and thread.is_alive():
+            self._dispatch_queue.put(None)
+            thread.join(timeout=1.0)
+
+    def wait_for_dispatch(self):
+        """Block until every queued keybind action has run"""
+        self._dispatch_queue.join()
+
+    def add_trigger_observer(self, observer: Callable[[str], None]) -> None:
+        """
+        Register a callback run with the action name whenever a keybind fires
+
+        Args:
+            observer: Function called as observer(action)
+        """
+        if observer not in self._trigger_observers:
+            self._trigger_observers.append(observer)
 
     def _trigger_action(self, action: str):
         """Trigger a keybind action"""
@@ -293,70 +457,16 @@ class KeybindManager:
             keybind = self.keybinds[action]
             if keybind.enabled:
                 logger.info(f"Triggering keybind action: {action}")
+                for observer in list(self._trigger_observers):
+                    try:
+                        observer(action)
+                    except Exception as e:
+                        logger.error(f"Error in keybind trigger observer: {e}")
                 try:
                     self.callbacks[action]()
                 except Exception as e:
                     logger.error(f"Error executing keybind callback {action}: {e}")
 
-    def _parse_keys(self, keys: str) -> Set:
-        """
-        Parse key combination string into pynput key set
-
-        Args:
-            keys: Key combination string (e.g., "ctrl+shift+g")
-
-        Returns:
-            Set of pynput Key/KeyCode objects
-        """
-        if not PYNPUT_AVAILABLE:
-            return set()
-
-        key_set = set()
-        parts = keys.lower().split('+')
-
-        for part in parts:
-            part = part.strip()
-
-            # Map common key names
-            key_map = {
-                'ctrl': Key.ctrl_l,
-                'control': Key.ctrl_l,
-                'shift': Key.shift_l,
-                'alt': Key.alt_l,
-                'win': Key.cmd,
-                'cmd': Key.cmd,
-                'super': Key.cmd,
-                'tab': Key.tab,
-                'esc': Key.esc,
-                'escape': Key.esc,
-                'enter': Key.enter,
-                'return': Key.enter,
-                'space': Key.space,
-                'backspace': Key.backspace,
-                'delete': Key.delete,
-                'up': Key.up,
-                'down': Key.down,
-                'left': Key.left,
-                'right': Key.right,
-                'home': Key.home,
-                'end': Key.end,
-                'pageup': Key.page_up,
-                'pagedown': Key.page_down,
-                'f1': Key.f1, 'f2': Key.f2, 'f3': Key.f3, 'f4': Key.f4,
-                'f5': Key.f5, 'f6': Key.f6, 'f7': Key.f7, 'f8': Key.f8,
-                'f9': Key.f9, 'f10': Key.f10, 'f11': Key.f11, 'f12': Key.f12,
-            }
-
-            if part in key_map:
-                key_set.add(key_map[part])
-            elif len(part) == 1:
-                # Single character key
-                key_set.add(KeyCode.from_char(part))
-            else:
-                logger.warning(f"Unknown key: {part}")
-
-        return key_set
-
     def _normalize_keys(self, keys: str) -> str:
         """
         Normalize key combination string for comparison
@@ -472,7 +582,9 @@ class KeybindManager:
             system_wide=macro_keybind.system_wide
         )
 
-        success = self.register_keybind(keybind, callback, override=override)
+        # Conflicts were checked above with game scopes; the plain check would
+        # match this macro's own entry and same-key bindings of other games
+        success = self.register_keybind(keybind, callback, override=True)
 
         if success:
             logger.info(f"Registered macro keybind: {macro_keybind.macro_id} -> {macro_keybind.keys}")
@@ -580,14 +692,15 @@ class KeybindManager:
         Returns:
             List of Keybind objects
         """
-        keybinds = []
-
-        for action, keybind in self.keybinds.items():
-            # Include global keybinds
-            if keybind.enabled:
-                keybinds.append(keybind)
-
-        return keybinds
+        keybinds = self._game_keybinds.get(game_profile_id)
+        if keybinds is None:
+            # Global keybinds plus the game's own macro keybinds
+            keybinds = [
+                keybind for action, keybind in self.keybinds.items()
+                if keybind.enabled and self._binding_scope(action) in (None, game_profile_id)
+            ]
+            self._game_keybinds[game_profile_id] = keybinds
+        return list(keybinds)
 
     def save_to_dict(self) -> dict:
         """Save all keybinds to dictionary for JSON serialization"""
@@ -631,6 +744,8 @@ class KeybindManager:
             except Exception as e:
                 logger.error(f"Failed to load macro keybind {macro_id}: {e}")
 
+        self._game_keybinds = {}
+
 
 # Default keybinds
 DEFAULT_KEYBINDS = [
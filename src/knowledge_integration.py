@@ -4,7 +4,7 @@ Integrates knowledge packs, session logging, and coaching into the AI assistant
 """
 
 import logging
-from typing import Optional, List, Dict
+from typing import Optional, List, Dict, Tuple
 
 from src.knowledge_pack import RetrievedChunk
 from src.knowledge_index import get_knowledge_index, KnowledgeIndex
@@ -64,7 +64,7 @@ class KnowledgeIntegration:
         self, game_profile_id: str, question: str, extra_settings: Dict
     ) -> Optional[str]:
         """
-        Retrieve knowledge context for a question
+        Retrieve knowledge context for a question and log the query
 
         Args:
             game_profile_id: Game profile ID
@@ -74,6 +74,32 @@ class KnowledgeIntegration:
         Returns:
             Formatted context string or None if no relevant context found
         """
+        context, chunks_retrieved = self.build_knowledge_context(
+            game_profile_id=game_profile_id,
+            question=question,
+            extra_settings=extra_settings,
+        )
+        if context:
+            self.log_knowledge_query(game_profile_id, question, chunks_retrieved)
+        return context
+
+    def build_knowledge_context(
+        self, game_profile_id: str, question: str, extra_settings: Dict
+    ) -> Tuple[Optional[str], int]:
+        """
+        Retrieve knowledge context for a question without logging it
+
+        Used directly for speculative retrieval on draft input, where only
+        the submitted question should appear in the session log.
+
+        Args:
+            game_profile_id: Game profile ID
+            question: User's question
+            extra_settings: Profile's extra_settings dict
+
+        Returns:
+            Tuple of (formatted context or None, number of chunks used)
+        """
         try:
             # Get context depth setting (default: 5)
             top_k = extra_settings.get("knowledge_context_depth", 5)
@@ -87,7 +113,7 @@ class KnowledgeIntegration:
                 logger.debug(
                     f"No knowledge chunks found for question in {game_profile_id}"
                 )
-                return None
+                return None, 0
 
             # Filter by minimum score threshold (0.3 out of 1.0)
             min_score = extra_settings.get("knowledge_min_score", 0.3)
@@ -95,7 +121,7 @@ class KnowledgeIntegration:
 
             if not relevant_chunks:
                 logger.debug(f"No chunks met score threshold {min_score}")
-                return None
+                return None, 0
 
             # Format context
             context_parts = [
@@ -118,19 +144,32 @@ class KnowledgeIntegration:
                 f"Retrieved {len(relevant_chunks)} relevant chunks for question"
             )
 
-            # Log the knowledge query event
+            return context, len(relevant_chunks)
+
+        except Exception as e:
+            logger.error(f"Failed to get knowledge context: {e}", exc_info=True)
+            return None, 0
+
+    def log_knowledge_query(
+        self, game_profile_id: str, question: str, chunks_retrieved: int
+    ) -> None:
+        """
+        Log a knowledge query event
+
+        Args:
+            game_profile_id: Game profile ID
+            question: User's question
+            chunks_retrieved: Number of chunks added to the prompt
+        """
+        try:
             self.session_logger.log_event(
                 game_profile_id=game_profile_id,
                 event_type="knowledge_query",
                 content=question,
-                meta={"chunks_retrieved": len(relevant_chunks)},
+                meta={"chunks_retrieved": chunks_retrieved},
             )
-
-            return context
-
         except Exception as e:
-            logger.error(f"Failed to get knowledge context: {e}", exc_info=True)
-            return None
+            logger.error(f"Failed to log knowledge query: {e}", exc_info=True)
 
     def log_conversation(
         self, game_profile_id: str, question: str, answer: str
@@ -5,27 +5,64 @@ Generates and refines macros using AI from natural language descriptions
 
 import logging
 import json
-from typing import Optional, List, Tuple
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, List, Tuple
 
 from src.macro_manager import Macro, MacroStep, MacroStepType
 
 logger = logging.getLogger(__name__)
 
 
+@dataclass
+class GenerationStats:
+    """Counters for AI macro generation requests"""
+    requests: int = 0
+    failures: int = 0
+    cache_hits: int = 0
+    total_latency: float = 0.0
+
+    @property
+    def mean_latency(self) -> float:
+        """Mean seconds per AI request (cache hits excluded)"""
+        return self.total_latency / self.requests if self.requests else 0.0
+
+    @property
+    def failure_rate(self) -> float:
+        """Share of AI requests that produced no valid macro"""
+        return self.failures / self.requests if self.requests else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'requests': self.requests,
+            'failures': self.failures,
+            'cache_hits': self.cache_hits,
+            'mean_latency': self.mean_latency,
+            'failure_rate': self.failure_rate,
+        }
+
+
 class MacroAIGenerator:
     """
     Generates macros from natural language using AI
     Validates generated macros and provides refinement capabilities
     """
 
-    def __init__(self, ai_router):
+    def __init__(self, ai_router, cache_size: int = 64):
         """
         Initialize the AI generator
 
         Args:
             ai_router: AIRouter instance for API calls
+            cache_size: Generated results kept per (description, game, model)
         """
         self.ai_router = ai_router
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[tuple, List[dict]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = GenerationStats()
 
         # JSON schema for strict macro format
         self.macro_schema = {
@@ -63,47 +100,122 @@ class MacroAIGenerator:
             "required": ["name", "description", "steps"]
         }
 
-    def generate_macro(self, description: str, game_name: str = "Unknown") -> Tuple[Optional[Macro], str]:
+    def get_schema(self, variants: int = 1) -> dict:
+        """
+        JSON schema for generated output
+
+        Passed as the Ollama `format` so the model can only produce
+        matching JSON.
+
+        Args:
+            variants: Number of macros requested; above 1 the schema is an
+                object with a "macros" array of exactly that many macros
+
+        Returns:
+            JSON schema dict
+        """
+        if variants <= 1:
+            return self.macro_schema
+        return {
+            "type": "object",
+            "properties": {
+                "macros": {
+                    "type": "array",
+                    "items": self.macro_schema,
+                    "minItems": variants,
+                    "maxItems": variants
+                }
+            },
+            "required": ["macros"]
+        }
+
+    def generate_macro(self, description: str, game_name: str = "Unknown",
+                       model: Optional[str] = None) -> Tuple[Optional[Macro], str]:
         """
         Generate a macro from natural language description
 
         Args:
             description: Natural language description of the macro
             game_name: Name of the game (for context)
+            model: Model to use (default: the router's default model)
 
         Returns:
             Tuple of (Macro or None, error_message or success_message)
         """
-        try:
-            # Create prompt for AI
-            prompt = self._create_generation_prompt(description, game_name)
-
-            # Get AI response
-            logger.debug(f"Requesting macro generation from AI: {description}")
-            response = self.ai_router.chat(
-                [{"role": "user", "content": prompt}],
-                model=None  # Use default model
-            )
+        macros, message = self.generate_variants(description, game_name, count=1, model=model)
+        if not macros:
+            return None, message
+        return macros[0], "✅ Macro generated successfully!"
 
-            # Extract JSON from response
-            macro_data = self._extract_json_from_response(response)
+    def generate_variants(self, description: str, game_name: str = "Unknown", count: int = 3,
+                          model: Optional[str] = None) -> Tuple[List[Macro], str]:
+        """
+        Generate several alternative macros for one description in a single request
 
-            if not macro_data:
-                return None, "❌ Failed to extract macro data from AI response. Please try a different description."
+        Results are cached by (description, game, model, count); a cache hit
+        makes no AI request and returns fresh Macro objects.
 
-            # Validate the generated macro
-            is_valid, errors = self._validate_macro_data(macro_data)
-            if not is_valid:
-                error_list = "\n".join(f"  • {e}" for e in errors)
-                return None, f"❌ Generated macro has errors:\n{error_list}"
+        Args:
+            description: Natural language description of the macro
+            game_name: Name of the game (for context)
+            count: Number of variants to request
+            model: Model to use (default: the router's default model)
 
-            # Convert to Macro object
-            macro = self._convert_to_macro(macro_data)
-            return macro, "✅ Macro generated successfully!"
+        Returns:
+            Tuple of (valid Macros, possibly empty, and a status message)
+        """
+        count = max(1, count)
+        key = (" ".join(description.lower().split()), game_name, model or self._default_model(), count)
+
+        with self._lock:
+            cached = self._cache.get(key)
+            if cached is not None:
+                self._cache.move_to_end(key)
+                self.stats.cache_hits += 1
+        if cached is not None:
+            logger.debug(f"Macro generation cache hit: {description}")
+            return [self._convert_to_macro(data) for data in cached], "✅ Macro generated successfully!"
+
+        started = time.perf_counter()
+        try:
+            prompt = self._create_generation_prompt(description, game_name, count)
+            logger.debug(f"Requesting {count} macro variant(s) from AI: {description}")
+            data = self._request(prompt, self.get_schema(count), model)
+
+            if data is None:
+                message = "❌ Failed to extract macro data from AI response. Please try a different description."
+                valid = []
+            else:
+                candidates = data.get("macros", [data]) if count > 1 else [data]
+                valid, errors = [], []
+                for i, candidate in enumerate(candidates[:count] if isinstance(candidates, list) else []):
+                    is_valid, candidate_errors = self._validate_macro_data(candidate)
+                    if is_valid:
+                        valid.append(candidate)
+                    else:
+                        prefix = f"Variant {i + 1}: " if count > 1 else ""
+                        errors.extend(prefix + e for e in candidate_errors)
+                if valid:
+                    message = "✅ Macro generated successfully!"
+                else:
+                    error_list = "\n".join(f"  • {e}" for e in errors) or "  • No macros returned"
+                    message = f"❌ Generated macro has errors:\n{error_list}"
 
         except Exception as e:
             logger.error(f"Error generating macro: {e}")
-            return None, f"❌ Error generating macro: {str(e)}"
+            valid, message = [], f"❌ Error generating macro: {str(e)}"
+
+        with self._lock:
+            self.stats.requests += 1
+            self.stats.total_latency += time.perf_counter() - started
+            if not valid:
+                self.stats.failures += 1
+            else:
+                self._cache[key] = valid
+                while len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+
+        return [self._convert_to_macro(d) for d in valid], message
 
     def refine_macro(self, macro: Macro, instruction: str) -> Tuple[Optional[Macro], str]:
         """
@@ -122,13 +234,7 @@ class MacroAIGenerator:
 
             # Get AI response
             logger.debug(f"Requesting macro refinement from AI: {instruction}")
-            response = self.ai_router.chat(
-                [{"role": "user", "content": prompt}],
-                model=None
-            )
-
-            # Extract JSON from response
-            macro_data = self._extract_json_from_response(response)
+            macro_data = self._request(prompt, self.get_schema(), None)
 
             if not macro_data:
                 return None, "❌ Failed to extract refined macro from AI response."
@@ -150,8 +256,55 @@ class MacroAIGenerator:
             logger.error(f"Error refining macro: {e}")
             return None, f"❌ Error refining macro: {str(e)}"
 
-    def _create_generation_prompt(self, description: str, game_name: str) -> str:
+    def get_generation_stats(self) -> Dict[str, Any]:
+        """Request count, mean latency, failure rate and cache hits"""
+        with self._lock:
+            return self.stats.to_dict()
+
+    def clear_cache(self) -> None:
+        """Drop all cached generation results"""
+        with self._lock:
+            self._cache.clear()
+
+    def _default_model(self) -> Optional[str]:
+        config = getattr(self.ai_router, "config", None)
+        return getattr(config, "ollama_model", None)
+
+    def _request(self, prompt: str, schema: dict, model: Optional[str]) -> Optional[dict]:
+        """
+        Send a prompt with a JSON-schema output format and parse the reply
+
+        Providers that ignore `format` still get the prompt's JSON
+        instructions, and their reply goes through the lenient extractor.
+        """
+        response = self.ai_router.chat(
+            [{"role": "user", "content": prompt}],
+            model=model,
+            format=schema,
+            temperature=0
+        )
+        content = response.get("content", "") if isinstance(response, dict) else str(response)
+        return self._extract_json_from_response(content)
+
+    def _create_generation_prompt(self, description: str, game_name: str, count: int = 1) -> str:
         """Create prompt for macro generation"""
+        if count > 1:
+            return f"""You are a gaming macro expert. Generate {count} different macros that each perform this action:
+
+"{description}"
+
+Context: Game = {game_name}
+
+Return a JSON object {{"macros": [...]}} with exactly {count} macros. Make the variants
+meaningfully different (timing, key choice or ordering). Each macro has "name",
+"description", "repeat", "randomize_delay", "delay_jitter_ms" and "steps".
+
+Common keys: a-z, 0-9, space, enter, shift, ctrl, alt
+Mouse buttons: left, right, middle
+Step types: key_press, key_down, key_up, key_sequence, mouse_move, mouse_click, mouse_scroll, delay
+
+IMPORTANT: Return ONLY the JSON object, nothing else."""
+
         return f"""You are a gaming macro expert. Generate a macro that performs this action:
 
 "{description}"
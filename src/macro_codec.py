@@ -0,0 +1,116 @@
+"""
+Macro Codec Module
+Compact, delta-encoded storage format for long macro step lists
+"""
+
+from typing import Any, Dict, List
+
+PACKED_FORMAT = 1
+
+# Row layout, most frequently set fields first so trailing defaults can be trimmed
+_FIELDS = ('type', 'duration_ms', 'x', 'y', 'key', 'button', 'scroll_amount', 'delay_jitter_ms')
+_DEFAULTS = {
+    'duration_ms': 0,
+    'x': None,
+    'y': None,
+    'key': None,
+    'button': None,
+    'scroll_amount': 0,
+    'delay_jitter_ms': 0,
+}
+
+
+def pack_steps(steps: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Pack step dicts (MacroStep.to_dict output) into the compact format
+
+    Each step becomes a row [type index, duration_ms, dx, dy, key, button,
+    scroll_amount, delay_jitter_ms] with trailing defaults dropped. Step
+    types are interned, and coordinates are stored as deltas from the
+    previous coordinate, so recorded mouse paths become short runs of
+    small integers. Non-empty `meta` dicts are kept by row index.
+
+    Args:
+        steps: Step dictionaries
+
+    Returns:
+        Packed dictionary (JSON-serializable)
+    """
+    types: List[str] = []
+    type_index: Dict[str, int] = {}
+    rows: List[list] = []
+    meta: Dict[str, Any] = {}
+    last_x = last_y = 0
+
+    for i, step in enumerate(steps):
+        step_type = step['type']
+        if step_type not in type_index:
+            type_index[step_type] = len(types)
+            types.append(step_type)
+
+        x, y = step.get('x'), step.get('y')
+        row = [
+            type_index[step_type],
+            step.get('duration_ms', 0),
+            None if x is None else x - last_x,
+            None if y is None else y - last_y,
+            step.get('key'),
+            step.get('button'),
+            step.get('scroll_amount', 0),
+            step.get('delay_jitter_ms', 0),
+        ]
+        if x is not None:
+            last_x = x
+        if y is not None:
+            last_y = y
+
+        while len(row) > 1 and row[-1] == _DEFAULTS[_FIELDS[len(row) - 1]]:
+            row.pop()
+        rows.append(row)
+
+        if step.get('meta'):
+            meta[str(i)] = step['meta']
+
+    packed: Dict[str, Any] = {'format': PACKED_FORMAT, 'types': types, 'rows': rows}
+    if meta:
+        packed['meta'] = meta
+    return packed
+
+
+def unpack_steps(packed: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    Expand the compact format back into step dicts
+
+    Args:
+        packed: Output of pack_steps
+
+    Returns:
+        Step dictionaries accepted by MacroStep.from_dict
+
+    Raises:
+        ValueError: If the format version is unknown
+    """
+    if packed.get('format') != PACKED_FORMAT:
+        raise ValueError(f"Unsupported packed step format: {packed.get('format')}")
+
+    types = packed['types']
+    meta = packed.get('meta', {})
+    steps: List[Dict[str, Any]] = []
+    last_x = last_y = 0
+
+    for i, row in enumerate(packed['rows']):
+        step: Dict[str, Any] = dict(_DEFAULTS)
+        step['type'] = types[row[0]]
+        for field_name, value in zip(_FIELDS[1:], row[1:]):
+            step[field_name] = value
+
+        if step['x'] is not None:
+            last_x += step['x']
+            step['x'] = last_x
+        if step['y'] is not None:
+            last_y += step['y']
+            step['y'] = last_y
+
+        step['meta'] = meta.get(str(i), {})
+        steps.append(step)
+    return steps
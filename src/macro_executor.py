@@ -0,0 +1,436 @@
+"""
+Macro Executor Module
+Runs several macros concurrently on one timing thread
+"""
+
+import heapq
+import itertools
+import logging
+import random
+import threading
+from dataclasses import dataclass
+from enum import IntEnum
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+from src.macro_input import InputBackend, PynputInputBackend
+from src.macro_manager import Macro, MacroStepType
+from src.macro_plan import (
+    ACTION, CLICK, JITTER, MARK, MOVE, PRESS, RELEASE, SCROLL, TYPE,
+    MacroPlan, MacroPlanCache, compile_macro,
+)
+from src.macro_timing import PrecisionTimer, TimingStats
+
+logger = logging.getLogger(__name__)
+
+_STEP_TYPE_VALUES = frozenset(e.value for e in MacroStepType)
+
+
+class MacroPriority(IntEnum):
+    """Priority of a macro run; higher wins key conflicts and deadline ties"""
+    LOOP = 0
+    NORMAL = 1
+    HOTKEY = 2
+
+
+@dataclass
+class KeyConflict:
+    """
+    Two runs wanting the same key held at once
+
+    Attributes:
+        key: Contested key
+        holder: Run ID holding the key
+        contender: Run ID that tried to press it
+        resolution: "preempted" (contender took the key) or "deferred"
+            (contender waits for the release)
+        time: Clock time of the conflict
+    """
+    key: Any
+    holder: int
+    contender: int
+    resolution: str
+    time: float
+
+
+class _Run:
+    """Execution state of one submitted macro"""
+
+    def __init__(self, run_id: int, macro: Macro, plan: MacroPlan,
+                 priority: MacroPriority, base: float, timeout_at: Optional[float]):
+        self.id = run_id
+        self.macro = macro
+        self.plan = plan
+        self.priority = priority
+        self.base = base
+        self.timeout_at = timeout_at
+        self.index = 0
+        self.repeats_left = macro.repeat
+        self.held: Set[Any] = set()
+        self.generation = 0  # bumped on reschedule; stale heap entries are skipped
+        self.blocked_at: Optional[float] = None
+
+    @property
+    def rank(self) -> Tuple[int, int]:
+        # Equal priorities are broken by the newer run, so waits never form a cycle
+        return (int(self.priority), self.id)
+
+    @property
+    def deadline(self) -> float:
+        return self.base + self.plan.events[self.index].offset
+
+
+class MacroExecutor:
+    """
+    Runs any number of macros concurrently on a single timing thread
+
+    Each run contributes its next event deadline to a heap; the thread
+    waits for the earliest deadline and dispatches every event that is
+    due, so there is one thread no matter how many macros are active.
+    Ties go to the higher-priority run.
+
+    Key holds are tracked per key. When a run presses a key another run
+    is holding, the higher-ranked run (priority, then newest) gets it: a
+    hotkey macro releases the key on a loop macro's behalf and takes it
+    over, while a lower-ranked run waits for the release with the rest of
+    its schedule shifted.
+
+    `tick()` is the whole scheduling step and can be driven directly
+    with a VirtualClock for deterministic runs.
+    """
+
+    DEFAULT_TIMEOUT = 30  # Seconds, as MacroRunner; None disables
+    KEY_EVENT_GAP = 0.01
+
+    def __init__(
+        self,
+        backend: Optional[InputBackend] = None,
+        timer=None,
+        action_handlers: Optional[Dict[str, Callable]] = None,
+        default_timeout: Optional[float] = DEFAULT_TIMEOUT,
+        rng: Optional[random.Random] = None,
+    ):
+        """
+        Initialize the executor
+
+        Args:
+            backend: Input backend (PynputInputBackend if None)
+            timer: PrecisionTimer or VirtualClock
+            action_handlers: UI action handlers keyed by step type
+            default_timeout: Per-run timeout in seconds when the macro has none
+            rng: Random source for delay jitter
+        """
+        self.backend = backend if backend is not None else PynputInputBackend()
+        self.timer = timer if timer is not None else PrecisionTimer()
+        self.action_handlers = action_handlers if action_handlers is not None else {}
+        self.default_timeout = default_timeout
+        self.rng = rng or random.Random()
+        self.plans = MacroPlanCache(self._compile)
+        self.timing_stats = TimingStats()
+
+        self._heap: List[Tuple[float, int, int, int, int]] = []
+        self._runs: Dict[int, _Run] = {}
+        self._holders: Dict[Any, int] = {}
+        self._waiting: Dict[Any, List[int]] = {}
+        self._ids = itertools.count(1)
+        self._seq = itertools.count()
+        self._lock = threading.RLock()
+
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+        self.conflicts: List[KeyConflict] = []
+
+        # Callbacks
+        self.on_step_executed: Optional[Callable[[int, int, int], None]] = None
+        self.on_macro_finished: Optional[Callable[[int, Macro], None]] = None
+        self.on_conflict: Optional[Callable[[KeyConflict], None]] = None
+        self.on_error: Optional[Callable[[int, str], None]] = None
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def submit(self, macro: Macro, priority: MacroPriority = MacroPriority.NORMAL) -> Optional[int]:
+        """
+        Schedule a macro to start now
+
+        Args:
+            macro: Macro to run
+            priority: Run priority
+
+        Returns:
+            Run ID, or None if the macro cannot run
+        """
+        if not macro.steps or macro.repeat < 1:
+            logger.warning(f"Macro cannot run (no steps or repeat < 1): {macro.name}")
+            return None
+
+        plan = self.plans.get(macro)
+        timeout = macro.execution_timeout if macro.execution_timeout is not None else self.default_timeout
+        with self._lock:
+            now = self.timer.clock()
+            run = _Run(next(self._ids), macro, plan, priority, now,
+                       now + timeout if timeout is not None else None)
+            self._runs[run.id] = run
+            self._schedule(run)
+        self._wake.set()
+        logger.info(f"Submitted macro run {run.id}: {macro.name} ({priority.name})")
+        return run.id
+
+    def cancel(self, run_id: int) -> bool:
+        """Stop a run, releasing any keys it holds"""
+        with self._lock:
+            run = self._runs.get(run_id)
+            if run is None:
+                return False
+            self._finish(run, self.timer.clock())
+        self._wake.set()
+        logger.info(f"Cancelled macro run {run_id}")
+        return True
+
+    def cancel_all(self) -> None:
+        """Stop every run"""
+        with self._lock:
+            for run_id in list(self._runs):
+                self.cancel(run_id)
+
+    def is_running(self, run_id: int) -> bool:
+        with self._lock:
+            return run_id in self._runs
+
+    def active_runs(self) -> List[int]:
+        """IDs of runs that have not finished"""
+        with self._lock:
+            return sorted(self._runs)
+
+    def held_keys(self) -> Dict[Any, int]:
+        """Currently held keys and the run holding each"""
+        with self._lock:
+            return dict(self._holders)
+
+    def next_deadline(self) -> Optional[float]:
+        """Earliest pending event time, or None when nothing is scheduled"""
+        with self._lock:
+            self._drop_stale()
+            return self._heap[0][0] if self._heap else None
+
+    def tick(self, now: Optional[float] = None) -> int:
+        """
+        Dispatch every event due at `now`
+
+        Args:
+            now: Current time (the timer's clock if None)
+
+        Returns:
+            Number of events dispatched
+        """
+        dispatched = 0
+        with self._lock:
+            if now is None:
+                now = self.timer.clock()
+            while self._heap and self._heap[0][0] <= now:
+                deadline, _, _, run_id, generation = heapq.heappop(self._heap)
+                run = self._runs.get(run_id)
+                if run is None or run.generation != generation:
+                    continue
+                self._step(run, deadline, now)
+                dispatched += 1
+        return dispatched
+
+    def run_until_idle(self, max_events: int = 1_000_000) -> int:
+        """
+        Run on the calling thread until every run has finished
+
+        Intended for a VirtualClock, where waits return immediately.
+
+        Returns:
+            Number of events dispatched
+        """
+        dispatched = 0
+        while dispatched < max_events:
+            deadline = self.next_deadline()
+            if deadline is None:
+                break
+            self.timer.wait_until(deadline)
+            dispatched += self.tick()
+        return dispatched
+
+    def start(self) -> None:
+        """Start the timing thread"""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, name="MacroExecutor", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Cancel all runs and stop the timing thread"""
+        self.cancel_all()
+        self._stop.set()
+        self._wake.set()
+        if self._thread and self._thread.is_alive():
+            self._thread.join(timeout=1.0)
+        self._thread = None
+
+    def get_timing_stats(self) -> Dict:
+        """Lateness statistics across all runs"""
+        return self.timing_stats.to_dict()
+
+    # ------------------------------------------------------------------
+    # Scheduling
+    # ------------------------------------------------------------------
+
+    def _loop(self):
+        while not self._stop.is_set():
+            self._wake.clear()
+            deadline = self.next_deadline()
+            if deadline is None:
+                self._wake.wait()
+                continue
+            # A new submission sets _wake and the earliest deadline is recomputed
+            if self.timer.wait_until(deadline, self._wake):
+                try:
+                    self.tick()
+                except Exception as e:
+                    logger.error(f"Macro executor error: {e}", exc_info=True)
+
+    def _schedule(self, run: _Run) -> None:
+        run.generation += 1
+        heapq.heappush(
+            self._heap,
+            (run.deadline, -int(run.priority), next(self._seq), run.id, run.generation),
+        )
+
+    def _drop_stale(self) -> None:
+        heap = self._heap
+        while heap:
+            run = self._runs.get(heap[0][3])
+            if run is not None and run.generation == heap[0][4]:
+                return
+            heapq.heappop(heap)
+
+    def _compile(self, macro: Macro) -> MacroPlan:
+        return compile_macro(
+            macro,
+            resolve_keys=self.backend.resolve_keys,
+            resolve_button=self.backend.resolve_button,
+            key_gap=self.KEY_EVENT_GAP,
+        )
+
+    def _step(self, run: _Run, deadline: float, now: float) -> None:
+        """Dispatch the next event of a run and reschedule it"""
+        if run.timeout_at is not None and now > run.timeout_at:
+            self._fail(run, now, f"Macro exceeded timeout (run {run.id}: {run.macro.name})")
+            return
+
+        event = run.plan.events[run.index]
+        try:
+            if event.kind == MARK:
+                if self.on_step_executed:
+                    self.on_step_executed(run.id, event.step_index + 1, run.plan.step_count)
+            else:
+                self.timing_stats.record(max(0.0, now - deadline))
+                if event.kind == PRESS:
+                    if not self._acquire(run, event.key, now):
+                        return  # parked until the key is released
+                elif event.kind == RELEASE:
+                    self._release(run, event.key, now)
+                elif event.kind == TYPE:
+                    self.backend.type(event.key)
+                elif event.kind == MOVE:
+                    self.backend.move(event.x, event.y)
+                elif event.kind == CLICK:
+                    self.backend.click(event.button, event.x, event.y)
+                elif event.kind == SCROLL:
+                    self.backend.scroll(event.x, event.y, event.amount)
+                elif event.kind == JITTER:
+                    run.base += self.rng.randint(0, event.amount) / 1000.0
+                elif event.kind == ACTION:
+                    self._run_action(event)
+        except Exception as e:
+            self._fail(run, now, f"Error in step {event.step_index + 1}: {e}")
+            return
+
+        run.index += 1
+        if run.index == len(run.plan.events):
+            run.repeats_left -= 1
+            if run.repeats_left <= 0:
+                self._finish(run, now)
+                if self.on_macro_finished:
+                    self.on_macro_finished(run.id, run.macro)
+                return
+            run.index = 0
+            run.base += run.plan.duration
+        self._schedule(run)
+
+    def _run_action(self, event) -> None:
+        handler = self.action_handlers.get(event.action)
+        if handler:
+            handler(**dict(event.params))
+        elif event.action in _STEP_TYPE_VALUES:
+            logger.warning(f"Skipping unhandled legacy/UI action type: {event.action}")
+
+    # ------------------------------------------------------------------
+    # Key ownership
+    # ------------------------------------------------------------------
+
+    def _acquire(self, run: _Run, key: Any, now: float) -> bool:
+        """Press `key` for `run`; False if the run must wait for it"""
+        holder_id = self._holders.get(key)
+        if holder_id is not None and holder_id != run.id:
+            holder = self._runs[holder_id]
+            if run.rank > holder.rank:
+                # Release on the holder's behalf; its own release becomes a no-op
+                self.backend.release(key)
+                holder.held.discard(key)
+                self._record_conflict(key, holder_id, run.id, "preempted", now)
+            else:
+                run.blocked_at = now
+                self._waiting.setdefault(key, []).append(run.id)
+                self._record_conflict(key, holder_id, run.id, "deferred", now)
+                return False
+
+        self.backend.press(key)
+        self._holders[key] = run.id
+        run.held.add(key)
+        return True
+
+    def _release(self, run: _Run, key: Any, now: float) -> None:
+        if key in run.held and self._holders.get(key) == run.id:
+            self.backend.release(key)
+            del self._holders[key]
+            self._resume_waiters(key, now)
+        run.held.discard(key)
+
+    def _resume_waiters(self, key: Any, now: float) -> None:
+        for run_id in self._waiting.pop(key, []):
+            run = self._runs.get(run_id)
+            if run is None or run.blocked_at is None:
+                continue
+            # Continue from the blocked press with the remaining schedule intact
+            run.base += now - run.blocked_at
+            run.blocked_at = None
+            self._schedule(run)
+
+    def _record_conflict(self, key: Any, holder: int, contender: int, resolution: str, now: float) -> None:
+        conflict = KeyConflict(key, holder, contender, resolution, now)
+        self.conflicts.append(conflict)
+        logger.debug(f"Key conflict on {key}: run {contender} {resolution} (holder {holder})")
+        if self.on_conflict:
+            self.on_conflict(conflict)
+
+    def _finish(self, run: _Run, now: float) -> None:
+        """Remove a run, releasing its keys"""
+        self._runs.pop(run.id, None)
+        for waiters in self._waiting.values():
+            if run.id in waiters:
+                waiters.remove(run.id)
+        for key in list(run.held):
+            self._release(run, key, now)
+
+    def _fail(self, run: _Run, now: float, message: str) -> None:
+        logger.error(message)
+        self._finish(run, now)
+        if self.on_error:
+            self.on_error(run.id, message)
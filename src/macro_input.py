@@ -0,0 +1,273 @@
+"""
+Macro Input Module
+Input backends and clocks used to play macros
+"""
+
+import logging
+import threading
+from typing import Any, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Try to import input simulation library
+try:
+    from pynput import mouse
+    from pynput.keyboard import Key, KeyCode
+    PYNPUT_AVAILABLE = True
+except ImportError:
+    PYNPUT_AVAILABLE = False
+    mouse = None
+    Key = None
+    KeyCode = None
+
+_KEY_MAP: Optional[dict] = None
+
+
+def _key_map() -> dict:
+    """Named keys, built once"""
+    global _KEY_MAP
+    if _KEY_MAP is None:
+        _KEY_MAP = {
+            'ctrl': Key.ctrl_l,
+            'control': Key.ctrl_l,
+            'shift': Key.shift_l,
+            'alt': Key.alt_l,
+            'win': Key.cmd,
+            'cmd': Key.cmd,
+            'super': Key.cmd,
+            'tab': Key.tab,
+            'esc': Key.esc,
+            'escape': Key.esc,
+            'enter': Key.enter,
+            'return': Key.enter,
+            'space': Key.space,
+            'backspace': Key.backspace,
+            'delete': Key.delete,
+            'up': Key.up,
+            'down': Key.down,
+            'left': Key.left,
+            'right': Key.right,
+            'home': Key.home,
+            'end': Key.end,
+            'pageup': Key.page_up,
+            'pagedown': Key.page_down,
+            'f1': Key.f1, 'f2': Key.f2, 'f3': Key.f3, 'f4': Key.f4,
+            'f5': Key.f5, 'f6': Key.f6, 'f7': Key.f7, 'f8': Key.f8,
+            'f9': Key.f9, 'f10': Key.f10, 'f11': Key.f11, 'f12': Key.f12,
+        }
+    return _KEY_MAP
+
+
+def parse_key_combo(key_combo: str) -> list:
+    """
+    Parse key combination string into pynput keys
+
+    Args:
+        key_combo: Key combination string (e.g., "ctrl+shift+a")
+
+    Returns:
+        List of pynput Key/KeyCode objects
+    """
+    if not Key or not KeyCode:
+        return []
+
+    key_map = _key_map()
+    keys = []
+    for part in key_combo.lower().split('+'):
+        part = part.strip()
+        if part in key_map:
+            keys.append(key_map[part])
+        elif len(part) == 1:
+            # Single character key
+            try:
+                keys.append(KeyCode.from_char(part))
+            except ValueError:
+                logger.warning(f"Cannot convert character to key: {part}")
+        else:
+            logger.warning(f"Unknown key: {part}")
+    return keys
+
+
+class InputBackend:
+    """
+    Destination for synthesized input
+
+    The base class resolves keys to lower-cased names and discards all
+    input; subclasses send it somewhere.
+    """
+
+    def resolve_keys(self, key_combo: str) -> list:
+        """Map a key combo string to the backend's key objects"""
+        return [part.strip() for part in key_combo.lower().split('+') if part.strip()]
+
+    def resolve_button(self, button: Optional[str]) -> Any:
+        """Map a button name to the backend's button object"""
+        return button or 'left'
+
+    def press(self, key: Any) -> None:
+        pass
+
+    def release(self, key: Any) -> None:
+        pass
+
+    def type(self, char: str) -> None:
+        pass
+
+    def move(self, x: Optional[int], y: Optional[int]) -> None:
+        pass
+
+    def click(self, button: Any, x: Optional[int] = None, y: Optional[int] = None) -> None:
+        pass
+
+    def scroll(self, x: Optional[int], y: Optional[int], amount: int) -> None:
+        pass
+
+
+class PynputInputBackend(InputBackend):
+    """Sends input to the desktop through pynput controllers"""
+
+    def __init__(self, keyboard_controller=None, mouse_controller=None, create: bool = True):
+        """
+        Initialize the backend
+
+        Args:
+            keyboard_controller: pynput keyboard Controller
+            mouse_controller: pynput mouse Controller
+            create: Create missing controllers now (otherwise call create_controllers)
+        """
+        self.keyboard_controller = keyboard_controller
+        self.mouse_controller = mouse_controller
+        if create:
+            self.create_controllers()
+
+    def create_controllers(self) -> None:
+        """Create any missing pynput controllers; input is dropped if unavailable"""
+        if self.keyboard_controller is not None and self.mouse_controller is not None:
+            return
+        try:
+            from pynput.keyboard import Controller as KeyboardController
+            from pynput import mouse as pynput_mouse
+            if self.keyboard_controller is None:
+                self.keyboard_controller = KeyboardController()
+            if self.mouse_controller is None:
+                self.mouse_controller = pynput_mouse.Controller()
+        except Exception:
+            logger.debug("pynput controllers unavailable at runtime; input simulation disabled")
+
+    def resolve_keys(self, key_combo: str) -> list:
+        return parse_key_combo(key_combo)
+
+    def resolve_button(self, button: Optional[str]) -> Any:
+        if mouse is None:
+            return button
+        button_map = {
+            'left': mouse.Button.left,
+            'right': mouse.Button.right,
+            'middle': mouse.Button.middle
+        }
+        return button_map.get(button, mouse.Button.left)
+
+    def press(self, key: Any) -> None:
+        if self.keyboard_controller:
+            self.keyboard_controller.press(key)
+
+    def release(self, key: Any) -> None:
+        if self.keyboard_controller:
+            self.keyboard_controller.release(key)
+
+    def type(self, char: str) -> None:
+        if self.keyboard_controller:
+            self.keyboard_controller.type(char)
+
+    def move(self, x: Optional[int], y: Optional[int]) -> None:
+        if self.mouse_controller:
+            self.mouse_controller.position = (x, y)
+
+    def click(self, button: Any, x: Optional[int] = None, y: Optional[int] = None) -> None:
+        if not self.mouse_controller:
+            return
+        if x is not None and y is not None:
+            self.mouse_controller.position = (x, y)
+        self.mouse_controller.click(button)
+
+    def scroll(self, x: Optional[int], y: Optional[int], amount: int) -> None:
+        if not self.mouse_controller:
+            return
+        self.mouse_controller.position = (x, y)
+        # pynput uses (dx, dy) where dy is vertical scroll
+        self.mouse_controller.scroll(0, amount)
+
+
+class RecordingInputBackend(InputBackend):
+    """
+    Records input instead of sending it
+
+    Each call is stored as (time, operation, argument) using `clock`, so
+    tests and benchmarks can check ordering and timing without a display.
+    """
+
+    def __init__(self, clock=None):
+        """
+        Initialize the backend
+
+        Args:
+            clock: Time source for timestamps (defaults to a constant 0.0)
+        """
+        self.clock = clock or (lambda: 0.0)
+        self.events: List[Tuple[float, str, Any]] = []
+
+    def _record(self, operation: str, argument: Any) -> None:
+        self.events.append((self.clock(), operation, argument))
+
+    def press(self, key: Any) -> None:
+        self._record("press", key)
+
+    def release(self, key: Any) -> None:
+        self._record("release", key)
+
+    def type(self, char: str) -> None:
+        self._record("type", char)
+
+    def move(self, x: Optional[int], y: Optional[int]) -> None:
+        self._record("move", (x, y))
+
+    def click(self, button: Any, x: Optional[int] = None, y: Optional[int] = None) -> None:
+        self._record("click", (button, x, y))
+
+    def scroll(self, x: Optional[int], y: Optional[int], amount: int) -> None:
+        self._record("scroll", (x, y, amount))
+
+    def operations(self) -> List[Tuple[str, Any]]:
+        """Recorded (operation, argument) pairs without timestamps"""
+        return [(operation, argument) for _, operation, argument in self.events]
+
+
+class VirtualClock:
+    """
+    Manually driven clock with the PrecisionTimer interface
+
+    Waiting advances the clock to the deadline instantly, so scheduling
+    code runs deterministically and without real sleeps.
+    """
+
+    def __init__(self, start: float = 0.0):
+        self.now = start
+
+    def clock(self) -> float:
+        return self.now
+
+    def __call__(self) -> float:
+        return self.now
+
+    def advance(self, seconds: float) -> None:
+        """Move time forward"""
+        self.now += seconds
+
+    def wait_until(self, deadline: float, stop_event: Optional[threading.Event] = None) -> bool:
+        if stop_event is not None and stop_event.is_set():
+            return False
+        self.now = max(self.now, deadline)
+        return True
+
+    def sleep(self, duration: float, stop_event: Optional[threading.Event] = None) -> bool:
+        return self.wait_until(self.now + duration, stop_event)
@@ -12,6 +12,8 @@ from enum import Enum
 import uuid
 from datetime import datetime
 
+from src.macro_codec import pack_steps, unpack_steps
+
 logger = logging.getLogger(__name__)
 
 
@@ -144,13 +146,27 @@ class Macro:
     # Legacy support
     actions: List[MacroAction] = field(default_factory=list)  # For backward compatibility
 
-    def to_dict(self) -> dict:
-        """Convert to dictionary for JSON serialization"""
+    # Step count from which storage uses the packed (delta-encoded) step format
+    PACK_THRESHOLD = 32
+
+    def to_dict(self, compact: bool = False) -> dict:
+        """
+        Convert to dictionary for JSON serialization
+
+        Args:
+            compact: Store long step lists in the packed format (for files;
+                UI consumers expect plain 'steps')
+        """
+        steps = [step.to_dict() for step in self.steps]
+        if compact and len(steps) >= self.PACK_THRESHOLD:
+            step_fields = {'steps_packed': pack_steps(steps)}
+        else:
+            step_fields = {'steps': steps}
         return {
             'id': self.id,
             'name': self.name,
             'description': self.description,
-            'steps': [step.to_dict() for step in self.steps],
+            **step_fields,
             'game_profile_id': self.game_profile_id,
             'repeat': self.repeat,
             'randomize_delay': self.randomize_delay,
@@ -167,7 +183,9 @@ class Macro:
         """Create Macro from dictionary"""
         # Support both new 'steps' and legacy 'actions' format
         steps = []
-        if 'steps' in data:
+        if 'steps_packed' in data:
+            steps = [MacroStep.from_dict(s) for s in unpack_steps(data['steps_packed'])]
+        elif 'steps' in data:
             steps = [MacroStep.from_dict(s) for s in data.get('steps', [])]
 
         actions = []
@@ -251,6 +269,40 @@ class Macro:
         return False
 
 
+# Repeat limit when neither the macro nor the config sets one
+DEFAULT_REPEAT_LIMIT = 100
+
+
+def get_repeat_limit(macro: Macro, config=None) -> int:
+    """Maximum repeat count for a macro: its own max_repeat, else config.max_macro_repeat"""
+    if macro.max_repeat is not None:
+        return macro.max_repeat
+    if config is not None and hasattr(config, 'max_macro_repeat'):
+        return config.max_macro_repeat
+    return DEFAULT_REPEAT_LIMIT
+
+
+def check_macro(macro: Macro) -> List[str]:
+    """
+    Quick checks every execution path runs before starting a macro
+
+    Returns:
+        List of errors (empty if the macro can run)
+    """
+    errors = []
+
+    if not macro.name:
+        errors.append("Macro name is empty")
+
+    if len(macro.steps) == 0:
+        errors.append("Macro has no steps")
+
+    if macro.repeat < 1:
+        errors.append("Repeat count must be at least 1")
+
+    return errors
+
+
 class MacroManager:
     """
     Manages macros and their execution
@@ -262,12 +314,19 @@ class MacroManager:
     - Validate macro actions
     """
 
-    def __init__(self):
-        """Initialize the macro manager"""
+    def __init__(self, config=None):
+        """
+        Initialize the macro manager
+
+        Args:
+            config: Configuration object (max_macro_repeat), optional
+        """
+        self.config = config
         self.macros: Dict[str, Macro] = {}
         self.action_handlers: Dict[str, Callable] = {}
         self.recording_macro: Optional[Macro] = None
         self.is_recording: bool = False
+        self.recorder = None
 
     def create_macro(self, name: str, description: str = "") -> Macro:
         """
@@ -377,7 +436,7 @@ class MacroManager:
         if enabled is not None:
             macro.enabled = enabled
 
-        macro.modified_at = time.time()
+        macro.updated_at = time.time()
         logger.info(f"Updated macro: {macro.name}")
         return True
 
@@ -423,7 +482,7 @@ class MacroManager:
 
             # Initialize runner (singleton-like or new instance)
             if not hasattr(self, '_runner') or self._runner is None:
-                self._runner = MacroRunner(enabled=True, macro_manager=self)
+                self._runner = MacroRunner(enabled=True, macro_manager=self, config=self.config)
             
             # Execute in background thread
             success = self._runner.execute_macro(macro)
@@ -442,6 +501,75 @@ class MacroManager:
             logger.error(f"Error starting macro execution: {e}", exc_info=True)
             return False
 
+    def run_macro(self, macro_id: str, priority=None) -> Optional[int]:
+        """
+        Run a macro concurrently with other running macros
+
+        Unlike execute_macro, several macros can run at once; they share
+        one MacroExecutor timing thread.
+
+        Args:
+            macro_id: ID of macro to run
+            priority: MacroPriority (NORMAL if None)
+
+        Returns:
+            Run ID, or None if the macro could not be started
+        """
+        macro = self.macros.get(macro_id)
+        if macro is None:
+            logger.warning(f"Macro not found: {macro_id}")
+            return None
+        if not macro.enabled:
+            logger.warning(f"Macro is disabled: {macro.name}")
+            return None
+        if not macro.steps and macro.actions:
+            self._migrate_actions_to_steps(macro)
+
+        # Same limits as MacroRunner.execute_macro
+        max_repeat = get_repeat_limit(macro, self.config)
+        errors = check_macro(macro)
+        if macro.repeat > max_repeat:
+            errors.insert(0, f"Macro repeat count ({macro.repeat}) exceeds maximum allowed ({max_repeat})")
+        if errors:
+            logger.error(f"Cannot run macro {macro.name}: {'; '.join(errors)}")
+            return None
+
+        # Local import to avoid circular dependency
+        from src.macro_executor import MacroPriority
+
+        executor = self.get_executor()
+        return executor.submit(macro, priority if priority is not None else MacroPriority.NORMAL)
+
+    def hotkey_callback(self, macro_id: str) -> Callable[[], Optional[int]]:
+        """
+        Keybind callback that runs a macro at hotkey priority
+
+        Args:
+            macro_id: ID of macro the keybind runs
+
+        Returns:
+            Callback for KeybindManager.register_macro_keybind
+        """
+        from src.macro_executor import MacroPriority
+
+        return lambda: self.run_macro(macro_id, MacroPriority.HOTKEY)
+
+    def get_executor(self):
+        """Get the shared MacroExecutor, starting it on first use"""
+        if getattr(self, '_executor', None) is None:
+            from src.macro_executor import MacroExecutor
+            self._executor = MacroExecutor(action_handlers=self.action_handlers)
+            self._executor.start()
+        return self._executor
+
+    def shutdown(self) -> None:
+        """Stop running macros and the shared executor thread"""
+        if getattr(self, '_executor', None) is not None:
+            self._executor.stop()
+            self._executor = None
+        if getattr(self, '_runner', None) is not None:
+            self._runner.stop_macro()
+
     def _migrate_actions_to_steps(self, macro: Macro):
         """Helper to convert legacy actions to steps"""
         for action in macro.actions:
@@ -493,13 +621,15 @@ class MacroManager:
             logger.error(f"Error executing macro {macro.name}: {e}")
             return False
 
-    def start_recording(self, name: str, description: str = "") -> bool:
+    def start_recording(self, name: str, description: str = "", capture_input: bool = False) -> bool:
         """
         Start recording a new macro
 
         Args:
             name: Name for the macro being recorded
             description: Description for the macro
+            capture_input: Capture keyboard/mouse input with a MacroRecorder;
+                the coalesced steps are added when recording stops
 
         Returns:
             True if recording started, False if already recording
@@ -510,6 +640,10 @@ class MacroManager:
 
         self.recording_macro = self.create_macro(name, description)
         self.is_recording = True
+        if capture_input:
+            from src.macro_recorder import MacroRecorder
+            self.recorder = MacroRecorder()
+            self.recorder.start()
         logger.info(f"Started recording macro: {name}")
         return True
 
@@ -546,7 +680,11 @@ class MacroManager:
         macro = self.recording_macro
         self.is_recording = False
         self.recording_macro = None
-        logger.info(f"Stopped recording macro: {macro.name} ({len(macro.actions)} actions)")
+        if self.recorder is not None:
+            macro.steps.extend(self.recorder.stop())
+            macro.updated_at = time.time()
+            self.recorder = None
+        logger.info(f"Stopped recording macro: {macro.name} ({len(macro.actions)} actions, {len(macro.steps)} steps)")
         return macro
 
     def cancel_recording(self):
@@ -557,13 +695,16 @@ class MacroManager:
         macro_id = self.recording_macro.id
         self.is_recording = False
         self.recording_macro = None
+        if self.recorder is not None:
+            self.recorder.stop()
+            self.recorder = None
         self.delete_macro(macro_id)
         logger.info("Cancelled macro recording")
 
-    def save_to_dict(self) -> dict:
+    def save_to_dict(self, compact: bool = True) -> dict:
         """Save all macros to dictionary for JSON serialization"""
         return {
-            macro_id: macro.to_dict()
+            macro_id: macro.to_dict(compact=compact)
             for macro_id, macro in self.macros.items()
         }
 
@@ -0,0 +1,220 @@
+"""
+Macro Plan Module
+Compiles macros into immutable, pre-timed execution plans
+"""
+
+import logging
+import threading
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from src.macro_manager import Macro, MacroStepType
+
+logger = logging.getLogger(__name__)
+
+# Plan event kinds
+PRESS = "press"
+RELEASE = "release"
+TYPE = "type"
+MOVE = "move"
+CLICK = "click"
+SCROLL = "scroll"
+ACTION = "action"
+JITTER = "jitter"
+MARK = "mark"
+
+
+@dataclass(frozen=True)
+class PlanEvent:
+    """
+    One primitive input event at a fixed offset from the start of a repeat
+
+    Attributes:
+        kind: Event kind (PRESS, RELEASE, TYPE, ...)
+        offset: Seconds from the start of the repeat
+        step_index: Index of the macro step the event came from
+        key: Resolved key object (PRESS/RELEASE) or character (TYPE)
+        button: Resolved mouse button (CLICK)
+        x: Mouse X coordinate
+        y: Mouse Y coordinate
+        amount: Scroll amount (SCROLL) or maximum jitter in ms (JITTER)
+        action: Step type handled by a MacroManager action handler (ACTION)
+        params: Keyword arguments for the action handler
+    """
+    kind: str
+    offset: float
+    step_index: int
+    key: Any = None
+    button: Any = None
+    x: Optional[int] = None
+    y: Optional[int] = None
+    amount: int = 0
+    action: Optional[str] = None
+    params: Tuple[Tuple[str, Any], ...] = ()
+
+
+@dataclass(frozen=True)
+class MacroPlan:
+    """
+    Compiled form of a macro
+
+    Attributes:
+        macro_id: Source macro ID
+        version: Source macro version the plan was compiled from
+        events: Events in offset order; MARK events end each step
+        duration: Seconds one repeat takes, including trailing delays
+        step_count: Number of steps in the source macro
+    """
+    macro_id: str
+    version: Tuple[float, int]
+    events: Tuple[PlanEvent, ...]
+    duration: float
+    step_count: int
+
+
+def macro_version(macro: Macro) -> Tuple[float, int]:
+    """Version key of a macro: bumped by every Macro/MacroManager edit"""
+    return (macro.updated_at, len(macro.steps))
+
+
+def compile_macro(
+    macro: Macro,
+    resolve_keys: Callable[[str], list],
+    resolve_button: Callable[[Optional[str]], Any] = lambda name: name,
+    key_gap: float = 0.01,
+) -> MacroPlan:
+    """
+    Compile a macro into a plan
+
+    Key combos are resolved once, every event gets its offset from the
+    start of the repeat (key events are `key_gap` apart, as the runner
+    has always spaced them), and delays become gaps between offsets, so
+    consecutive delays cost nothing at run time. Jittered delays leave a
+    JITTER event that shifts the rest of the repeat by a random amount.
+
+    Args:
+        macro: Macro to compile
+        resolve_keys: Maps a key combo string to key objects
+        resolve_button: Maps a button name to a mouse button object
+        key_gap: Seconds between synthesized key events
+
+    Returns:
+        MacroPlan
+    """
+    events: List[PlanEvent] = []
+    t = 0.0
+
+    for index, step in enumerate(macro.steps):
+        step_type = step.type
+        delay = max(0, step.duration_ms) / 1000.0
+
+        if step_type == MacroStepType.KEY_PRESS.value:
+            keys = resolve_keys(step.key or "")
+            for key in keys:
+                events.append(PlanEvent(PRESS, t, index, key=key))
+                t += key_gap
+            for key in reversed(keys):
+                events.append(PlanEvent(RELEASE, t, index, key=key))
+                t += key_gap
+            t += delay
+
+        elif step_type == MacroStepType.KEY_DOWN.value:
+            keys = resolve_keys(step.key or "")
+            for key in keys:
+                events.append(PlanEvent(PRESS, t, index, key=key))
+                t += key_gap
+            if delay > 0:
+                # A held key is released after its duration
+                t += delay
+                for key in reversed(keys):
+                    events.append(PlanEvent(RELEASE, t, index, key=key))
+                    t += key_gap
+
+        elif step_type == MacroStepType.KEY_UP.value:
+            for key in reversed(resolve_keys(step.key or "")):
+                events.append(PlanEvent(RELEASE, t, index, key=key))
+                t += key_gap
+
+        elif step_type == MacroStepType.KEY_SEQUENCE.value:
+            for char in step.key or "":
+                events.append(PlanEvent(TYPE, t, index, key=char))
+                t += key_gap
+            t += delay
+
+        elif step_type == MacroStepType.MOUSE_MOVE.value:
+            events.append(PlanEvent(MOVE, t, index, x=step.x, y=step.y))
+            t += delay
+
+        elif step_type == MacroStepType.MOUSE_CLICK.value:
+            events.append(
+                PlanEvent(CLICK, t, index, button=resolve_button(step.button), x=step.x, y=step.y)
+            )
+            t += delay
+
+        elif step_type == MacroStepType.MOUSE_SCROLL.value:
+            events.append(
+                PlanEvent(SCROLL, t, index, x=step.x, y=step.y, amount=step.scroll_amount)
+            )
+            t += delay
+
+        elif step_type == MacroStepType.DELAY.value:
+            if step.delay_jitter_ms > 0:
+                events.append(PlanEvent(JITTER, t, index, amount=step.delay_jitter_ms))
+            t += delay
+
+        else:
+            # UI/legacy actions are looked up in the MacroManager at run time
+            params: Tuple[Tuple[str, Any], ...] = ()
+            if step_type == MacroStepType.SEND_MESSAGE.value and step.key:
+                params = (("message", step.key),)
+            events.append(PlanEvent(ACTION, t, index, action=step_type, params=params))
+            t += delay
+
+        events.append(PlanEvent(MARK, t, index))
+
+    return MacroPlan(
+        macro_id=macro.id,
+        version=macro_version(macro),
+        events=tuple(events),
+        duration=t,
+        step_count=len(macro.steps),
+    )
+
+
+class MacroPlanCache:
+    """Compiled plans keyed by macro ID, recompiled when the macro version changes"""
+
+    def __init__(self, compiler: Callable[[Macro], MacroPlan]):
+        """
+        Initialize the cache
+
+        Args:
+            compiler: Function compiling a macro into a plan
+        """
+        self._compiler = compiler
+        self._plans: Dict[str, MacroPlan] = {}
+        self._lock = threading.Lock()
+        self.compilations = 0
+
+    def get(self, macro: Macro) -> MacroPlan:
+        """Get the plan for a macro, compiling it if missing or stale"""
+        version = macro_version(macro)
+        with self._lock:
+            plan = self._plans.get(macro.id)
+        if plan is not None and plan.version == version:
+            return plan
+
+        plan = self._compiler(macro)
+        with self._lock:
+            self._plans[macro.id] = plan
+            self.compilations += 1
+        logger.debug(f"Compiled macro plan {macro.id}: {len(plan.events)} events, {plan.duration:.3f}s")
+        return plan
+
+    def invalidate(self, macro_id: Optional[str] = None) -> None:
+        """Drop one plan, or all plans"""
+        with self._lock:
+            if macro_id is None:
+                self._plans.clear()
+            else:
+                self._plans.pop(macro_id, None)
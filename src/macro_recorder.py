@@ -0,0 +1,391 @@
+"""
+Macro Recorder Module
+Captures keyboard/mouse input and turns it into compact macro steps
+"""
+
+import logging
+import math
+import threading
+import time
+from typing import Any, Callable, List, Optional, Tuple
+
+from src.hotkey_matcher import MODIFIER_BITS, key_name
+from src.macro_manager import MacroStep, MacroStepType
+
+logger = logging.getLogger(__name__)
+
+try:
+    from pynput import keyboard, mouse
+    PYNPUT_AVAILABLE = True
+except ImportError:
+    PYNPUT_AVAILABLE = False
+    keyboard = None
+    mouse = None
+
+# Raw event kinds
+KEY_DOWN = "key_down"
+KEY_UP = "key_up"
+MOVE = "move"
+BUTTON_DOWN = "button_down"
+BUTTON_UP = "button_up"
+SCROLL = "scroll"
+
+# pynput key names spelled the way macro key combos spell them
+_COMBO_NAMES = {
+    'ctrl_l': 'ctrl', 'ctrl_r': 'ctrl',
+    'shift_l': 'shift', 'shift_r': 'shift',
+    'alt_l': 'alt', 'alt_r': 'alt', 'alt_gr': 'alt',
+    'cmd_l': 'cmd', 'cmd_r': 'cmd',
+    'page_up': 'pageup', 'page_down': 'pagedown',
+}
+
+# Steps whose duration_ms is a pause after the step, so gaps can be folded in
+_TRAILING_DELAY_TYPES = frozenset({
+    MacroStepType.KEY_PRESS.value,
+    MacroStepType.MOUSE_MOVE.value,
+    MacroStepType.MOUSE_CLICK.value,
+    MacroStepType.MOUSE_SCROLL.value,
+})
+
+RawEvent = Tuple[float, str, Any]
+
+
+def simplify_path(points: List[Tuple[float, int, int]], tolerance: float) -> List[Tuple[float, int, int]]:
+    """
+    Ramer-Douglas-Peucker simplification of a timed mouse path
+
+    Args:
+        points: (time, x, y) samples in order
+        tolerance: Maximum distance in pixels between the path and the
+            kept segments
+
+    Returns:
+        Subset of `points` including both endpoints
+    """
+    if len(points) < 3 or tolerance <= 0:
+        return list(points)
+
+    keep = [False] * len(points)
+    keep[0] = keep[-1] = True
+    stack = [(0, len(points) - 1)]
+    while stack:
+        first, last = stack.pop()
+        _, x1, y1 = points[first]
+        _, x2, y2 = points[last]
+        dx, dy = x2 - x1, y2 - y1
+        length = math.hypot(dx, dy)
+
+        farthest, distance = -1, tolerance
+        for i in range(first + 1, last):
+            _, x, y = points[i]
+            if length:
+                d = abs(dy * (x - x1) - dx * (y - y1)) / length
+            else:
+                d = math.hypot(x - x1, y - y1)
+            if d > distance:
+                farthest, distance = i, d
+
+        if farthest >= 0:
+            keep[farthest] = True
+            stack.append((first, farthest))
+            stack.append((farthest, last))
+
+    return [p for p, kept in zip(points, keep) if kept]
+
+
+def bucket_path(points: List[Tuple[float, int, int]], bucket: float) -> List[Tuple[float, int, int]]:
+    """
+    Keep the last sample of each `bucket`-second window (and the first sample)
+
+    Args:
+        points: (time, x, y) samples in order
+        bucket: Window length in seconds (0 keeps everything)
+    """
+    if bucket <= 0 or len(points) < 3:
+        return list(points)
+    kept = [points[0]]
+    window_end = points[0][0] + bucket
+    pending = None
+    for point in points[1:]:
+        if point[0] >= window_end:
+            if pending is not None:
+                kept.append(pending)
+            window_end = point[0] + bucket
+        pending = point
+    if pending is not None and pending is not kept[-1]:
+        kept.append(pending)
+    return kept
+
+
+class MacroRecorder:
+    """
+    Records raw input and coalesces it into macro steps
+
+    Raw events are kept with their timestamps while recording; `build_steps`
+    then:
+    - simplifies each run of mouse moves (time buckets, then
+      Ramer-Douglas-Peucker within `move_tolerance` pixels),
+    - merges a key down/up pair with nothing in between into one KEY_PRESS
+      (taps) or KEY_DOWN with a hold duration, and modifier+key taps into a
+      combo such as "ctrl+c",
+    - merges button down/up into MOUSE_CLICK and consecutive scroll ticks,
+    - turns the gaps between steps into delays, folded into the previous
+      step's trailing duration where the step type has one.
+
+    Keys still held when recording stops (the stop hotkey) and releases
+    without a recorded press (the start hotkey) are dropped.
+    """
+
+    def __init__(
+        self,
+        move_tolerance: float = 2.0,
+        move_bucket_ms: int = 8,
+        tap_ms: int = 30,
+        scroll_merge_ms: int = 50,
+        min_delay_ms: int = 1,
+        key_gap: float = 0.01,
+        clock: Callable[[], float] = time.perf_counter,
+    ):
+        """
+        Initialize the recorder
+
+        Args:
+            move_tolerance: RDP tolerance in pixels for mouse paths
+            move_bucket_ms: Keep at most one mouse sample per this many ms
+            tap_ms: Key holds up to this long are recorded as taps
+            scroll_merge_ms: Merge scroll ticks closer together than this
+            min_delay_ms: Shorter gaps between steps are dropped
+            key_gap: Seconds the runner spends per key event (MacroRunner.KEY_EVENT_GAP)
+            clock: Monotonic clock for timestamps
+        """
+        self.move_tolerance = move_tolerance
+        self.move_bucket = move_bucket_ms / 1000.0
+        self.tap = tap_ms / 1000.0
+        self.scroll_merge = scroll_merge_ms / 1000.0
+        self.min_delay_ms = min_delay_ms
+        self.key_gap = key_gap
+        self.clock = clock
+
+        self.events: List[RawEvent] = []
+        self._lock = threading.Lock()
+        self._listeners: list = []
+        self.recording = False
+
+    # ------------------------------------------------------------------
+    # Capture
+    # ------------------------------------------------------------------
+
+    def start(self, capture_input: bool = True) -> bool:
+        """
+        Start recording
+
+        Args:
+            capture_input: Hook the global keyboard/mouse via pynput; when
+                False (or pynput is unavailable) events are fed through the
+                on_* methods
+
+        Returns:
+            True if global input capture is active
+        """
+        with self._lock:
+            self.events = []
+        self.recording = True
+        if not capture_input:
+            return False
+        if not PYNPUT_AVAILABLE:
+            logger.warning("pynput not available - recording needs events fed manually")
+            return False
+        try:
+            self._listeners = [
+                keyboard.Listener(on_press=self.on_key_down, on_release=self.on_key_up),
+                mouse.Listener(on_move=self.on_move, on_click=self.on_click, on_scroll=self.on_scroll),
+            ]
+            for listener in self._listeners:
+                listener.start()
+            return True
+        except Exception as e:
+            logger.error(f"Failed to start input capture: {e}")
+            self._stop_listeners()
+            return False
+
+    def stop(self) -> List[MacroStep]:
+        """Stop recording and return the coalesced steps"""
+        self.recording = False
+        self._stop_listeners()
+        steps = self.build_steps()
+        logger.info(f"Recorded {len(self.events)} input events as {len(steps)} steps")
+        return steps
+
+    def _stop_listeners(self):
+        for listener in self._listeners:
+            try:
+                listener.stop()
+            except Exception as e:
+                logger.debug(f"Failed to stop input listener: {e}")
+        self._listeners = []
+
+    def _add(self, kind: str, data: Any) -> None:
+        if not self.recording:
+            return
+        with self._lock:
+            self.events.append((self.clock(), kind, data))
+
+    def on_key_down(self, key: Any) -> None:
+        name = key_name(key)
+        if name:
+            self._add(KEY_DOWN, _COMBO_NAMES.get(name, name))
+
+    def on_key_up(self, key: Any) -> None:
+        name = key_name(key)
+        if name:
+            self._add(KEY_UP, _COMBO_NAMES.get(name, name))
+
+    def on_move(self, x: int, y: int) -> None:
+        self._add(MOVE, (int(x), int(y)))
+
+    def on_click(self, x: int, y: int, button: Any, pressed: bool) -> None:
+        name = getattr(button, 'name', button) or 'left'
+        self._add(BUTTON_DOWN if pressed else BUTTON_UP, (int(x), int(y), name))
+
+    def on_scroll(self, x: int, y: int, dx: int, dy: int) -> None:
+        self._add(SCROLL, (int(x), int(y), int(dy)))
+
+    # ------------------------------------------------------------------
+    # Coalescing
+    # ------------------------------------------------------------------
+
+    def build_steps(self) -> List[MacroStep]:
+        """Coalesce the recorded events into macro steps"""
+        with self._lock:
+            events = self._simplify_moves(list(self.events))
+        return self._with_delays(self._to_steps(events))
+
+    def _simplify_moves(self, events: List[RawEvent]) -> List[RawEvent]:
+        """Simplify every run of consecutive mouse moves"""
+        result: List[RawEvent] = []
+        run: List[Tuple[float, int, int]] = []
+
+        def flush():
+            if run:
+                path = simplify_path(bucket_path(run, self.move_bucket), self.move_tolerance)
+                result.extend((t, MOVE, (x, y)) for t, x, y in path)
+                run.clear()
+
+        for event in events:
+            if event[1] == MOVE:
+                run.append((event[0], event[2][0], event[2][1]))
+            else:
+                flush()
+                result.append(event)
+        flush()
+        return result
+
+    def _to_steps(self, events: List[RawEvent]) -> List[Tuple[float, float, MacroStep]]:
+        """Map events to (start time, playback seconds, step)"""
+        steps: List[Tuple[float, float, MacroStep]] = []
+        held: set = set()
+        consumed = [False] * len(events)
+        gap = self.key_gap
+
+        for i, (t, kind, data) in enumerate(events):
+            if consumed[i]:
+                continue
+
+            if kind == KEY_DOWN:
+                if data in held:
+                    continue  # auto-repeat
+                combo = self._match_tap(events, i, consumed)
+                if combo is not None:
+                    keys, hold = combo
+                    if hold <= self.tap:
+                        step = MacroStep(type=MacroStepType.KEY_PRESS.value, key=keys)
+                        steps.append((t, 2 * gap * (keys.count('+') + 1), step))
+                    else:
+                        step = MacroStep(type=MacroStepType.KEY_DOWN.value, key=keys,
+                                         duration_ms=round(hold * 1000))
+                        steps.append((t, 2 * gap * (keys.count('+') + 1) + hold, step))
+                    continue
+                if self._released_later(events, i):
+                    held.add(data)
+                    steps.append((t, gap, MacroStep(type=MacroStepType.KEY_DOWN.value, key=data)))
+                # Never released: part of the stop hotkey
+
+            elif kind == KEY_UP:
+                if data in held:
+                    held.discard(data)
+                    steps.append((t, gap, MacroStep(type=MacroStepType.KEY_UP.value, key=data)))
+
+            elif kind == MOVE:
+                x, y = data
+                steps.append((t, 0.0, MacroStep(type=MacroStepType.MOUSE_MOVE.value, x=x, y=y)))
+
+            elif kind == BUTTON_DOWN:
+                x, y, button = data
+                # Drags are replayed as a click: there is no button-down step type
+                for j in range(i + 1, len(events)):
+                    if events[j][1] == BUTTON_UP and events[j][2][2] == button and not consumed[j]:
+                        consumed[j] = True
+                        break
+                steps.append((t, 0.0, MacroStep(type=MacroStepType.MOUSE_CLICK.value,
+                                                button=button, x=x, y=y)))
+
+            elif kind == SCROLL:
+                x, y, amount = data
+                previous = steps[-1] if steps else None
+                if (previous is not None
+                        and previous[2].type == MacroStepType.MOUSE_SCROLL.value
+                        and (previous[2].x, previous[2].y) == (x, y)
+                        and t - previous[0] <= self.scroll_merge
+                        and (previous[2].scroll_amount > 0) == (amount > 0)):
+                    previous[2].scroll_amount += amount
+                    continue
+                steps.append((t, 0.0, MacroStep(type=MacroStepType.MOUSE_SCROLL.value,
+                                                x=x, y=y, scroll_amount=amount)))
+
+        return steps
+
+    def _match_tap(self, events: List[RawEvent], i: int, consumed: List[bool]) -> Optional[Tuple[str, float]]:
+        """
+        Match a press at `i` released with nothing else in between
+
+        Recognizes "k down, k up" and "mod down, k down, k up, mod up".
+
+        Returns:
+            (key combo, hold seconds) with the matched events consumed, or None
+        """
+        t, _, name = events[i]
+        following = events[i + 1:i + 4]
+
+        if following and following[0][1] == KEY_UP and following[0][2] == name:
+            consumed[i + 1] = True
+            return name, following[0][0] - t
+
+        if (name in MODIFIER_BITS and len(following) == 3
+                and following[0][1] == KEY_DOWN and following[0][2] not in MODIFIER_BITS
+                and following[1][1] == KEY_UP and following[1][2] == following[0][2]
+                and following[2][1] == KEY_UP and following[2][2] == name):
+            consumed[i + 1] = consumed[i + 2] = consumed[i + 3] = True
+            return f"{name}+{following[0][2]}", following[1][0] - following[0][0]
+
+        return None
+
+    @staticmethod
+    def _released_later(events: List[RawEvent], i: int) -> bool:
+        name = events[i][2]
+        return any(kind == KEY_UP and data == name for _, kind, data in events[i + 1:])
+
+    def _with_delays(self, timed: List[Tuple[float, float, MacroStep]]) -> List[MacroStep]:
+        """Turn gaps between steps into delays"""
+        steps: List[MacroStep] = []
+        for index, (t, length, step) in enumerate(timed):
+            steps.append(step)
+            if index + 1 == len(timed):
+                break
+            delay_ms = round((timed[index + 1][0] - t - length) * 1000)
+            if delay_ms < self.min_delay_ms:
+                continue
+            if step.type in _TRAILING_DELAY_TYPES:
+                step.duration_ms += delay_ms
+            else:
+                steps.append(MacroStep(type=MacroStepType.DELAY.value, duration_ms=delay_ms))
+        return steps
@@ -5,13 +5,18 @@ Cross-platform support with anti-cheat awareness
 """
 
 import logging
-import time
 import threading
 import random
-from typing import Optional, Callable
+from typing import Optional, Callable, Dict
 from enum import Enum
 
-from src.macro_manager import Macro, MacroStep, MacroStepType, MacroManager
+from src.macro_manager import Macro, MacroStepType, MacroManager, check_macro, get_repeat_limit
+from src.macro_plan import (
+    ACTION, CLICK, JITTER, MARK, MOVE, PRESS, RELEASE, SCROLL, TYPE,
+    MacroPlan, MacroPlanCache, PlanEvent, compile_macro,
+)
+from src.macro_input import InputBackend, PynputInputBackend
+from src.macro_timing import PrecisionTimer, TimingStats
 
 logger = logging.getLogger(__name__)
 
@@ -29,6 +34,8 @@ except ImportError:
     KeyCode = None
     KeyboardController = None
 
+_STEP_TYPE_VALUES = frozenset(e.value for e in MacroStepType)
+
 
 class MacroExecutionState(Enum):
     """States of macro execution"""
@@ -44,9 +51,22 @@ class MacroRunner:
     """
     Executes macros with keyboard/mouse input simulation
     Runs in background thread to keep UI responsive
+
+    Macros are compiled once into a MacroPlan (resolved keys, absolute
+    offsets, merged delays) cached by macro id and version; execution then
+    dispatches each event at base + offset, so action overhead does not
+    accumulate across steps or repeats.
+
+    Input goes through an InputBackend and waits through `timer`, so a
+    RecordingInputBackend with a VirtualClock replays macros headlessly
+    in simulated time.
     """
 
-    def __init__(self, enabled: bool = True, macro_manager: Optional[MacroManager] = None, config=None):
+    KEY_EVENT_GAP = 0.01  # Seconds between synthesized key events
+    MAX_CATCH_UP = 0.05  # Seconds behind schedule before the schedule is reset
+
+    def __init__(self, enabled: bool = True, macro_manager: Optional[MacroManager] = None, config=None,
+                 backend: Optional[InputBackend] = None, timer=None):
         """
         Initialize the macro runner
 
@@ -54,11 +74,35 @@ class MacroRunner:
             enabled: Whether macros are enabled (respects anti-cheat awareness)
             macro_manager: The MacroManager instance with UI action handlers
             config: Configuration object with timeout settings
+            backend: Input backend (pynput controllers if None)
+            timer: PrecisionTimer, or a VirtualClock for simulated time
         """
         self.enabled = enabled
         self.macro_manager = macro_manager
         self.config = config
+
+        # Stop/pause are signalled through events so waits wake immediately
+        self._stop_event = threading.Event()
+        self._resume_event = threading.Event()
+        self._resume_event.set()
         self.state = MacroExecutionState.IDLE
+
+        # Compiled plans and the schedule base of the executing repeat
+        self.timer = timer if timer is not None else PrecisionTimer()
+        self.timing_stats = TimingStats()
+        self.plans = MacroPlanCache(self._compile)
+        self._base = 0.0
+        self._dispatch = {
+            PRESS: self._on_press,
+            RELEASE: self._on_release,
+            TYPE: self._on_type,
+            MOVE: self._on_move,
+            CLICK: self._on_click,
+            SCROLL: self._on_scroll,
+            JITTER: self._on_jitter,
+            ACTION: self._on_action,
+        }
+
         self.current_macro: Optional[Macro] = None
         self.execution_thread: Optional[threading.Thread] = None
 
@@ -68,11 +112,46 @@ class MacroRunner:
         self.on_error: Optional[Callable] = None
 
         # Input controllers (created lazily to allow tests to mock imports)
-        self.keyboard_controller = None
-        self.mouse_controller = None
+        self._pynput_backend = PynputInputBackend(create=False)
+        self.backend = backend if backend is not None else self._pynput_backend
 
         logger.info(f"MacroRunner initialized (enabled={enabled}, macro_manager={'present' if macro_manager else 'None'})")
 
+    @property
+    def keyboard_controller(self):
+        """Keyboard controller of the default pynput backend"""
+        return self._pynput_backend.keyboard_controller
+
+    @keyboard_controller.setter
+    def keyboard_controller(self, value) -> None:
+        self._pynput_backend.keyboard_controller = value
+
+    @property
+    def mouse_controller(self):
+        """Mouse controller of the default pynput backend"""
+        return self._pynput_backend.mouse_controller
+
+    @mouse_controller.setter
+    def mouse_controller(self, value) -> None:
+        self._pynput_backend.mouse_controller = value
+
+    @property
+    def state(self) -> MacroExecutionState:
+        """Current execution state"""
+        return self._state
+
+    @state.setter
+    def state(self, value: MacroExecutionState) -> None:
+        self._state = value
+        if value == MacroExecutionState.RUNNING:
+            self._stop_event.clear()
+            self._resume_event.set()
+        elif value == MacroExecutionState.PAUSED:
+            self._resume_event.clear()
+        elif value == MacroExecutionState.STOPPED:
+            self._stop_event.set()
+            self._resume_event.set()
+
     def execute_macro(self, macro: Macro) -> bool:
         """
         Execute a macro in background thread
@@ -89,7 +168,8 @@ class MacroRunner:
 
         # Lazy attempt to import controllers so tests can patch 'pynput' imports even when
         # the library isn't installed in the environment.
-        if self.keyboard_controller is None or self.mouse_controller is None:
+        if self.backend is self._pynput_backend and (
+                self.keyboard_controller is None or self.mouse_controller is None):
             try:
                 from pynput.keyboard import Controller as KeyboardController
                 from pynput import mouse as pynput_mouse
@@ -103,11 +183,7 @@ class MacroRunner:
             return False
 
         # Validate repeat count against configured maximum (global or per-macro)
-        max_repeat = 100  # Default safety limit
-        if self.config and hasattr(self.config, 'max_macro_repeat'):
-            max_repeat = self.config.max_macro_repeat
-        if getattr(macro, 'max_repeat', None) is not None:
-            max_repeat = macro.max_repeat
+        max_repeat = get_repeat_limit(macro, self.config)
 
         if macro.repeat > max_repeat:
             error_msg = f"Macro repeat count ({macro.repeat}) exceeds maximum allowed ({max_repeat})"
@@ -158,7 +234,7 @@ class MacroRunner:
 
     def stop_macro(self) -> None:
         """Stop any running macro execution."""
-        if self.state == MacroExecutionState.RUNNING:
+        if self.state in (MacroExecutionState.RUNNING, MacroExecutionState.PAUSED):
             self.state = MacroExecutionState.STOPPED
 
         # Join background thread if present
@@ -182,32 +258,32 @@ class MacroRunner:
             if getattr(macro, 'execution_timeout', None) is not None:
                 timeout_seconds = macro.execution_timeout
 
-            # Track start time for timeout enforcement
-            start_time = time.monotonic()
+            plan = self.plans.get(macro)
+            dispatch = self._dispatch
+            clock = self.timer.clock
+            on_step = self.on_step_executed
+
+            # Every event is due at base + its precomputed offset
+            self.timing_stats = TimingStats()
+            start_time = clock()
+            timeout_at = start_time + timeout_seconds
+            self._base = start_time
 
             # Execute macro 'repeat' times
             for repeat_count in range(macro.repeat):
-                # Check for timeout
-                elapsed_time = time.monotonic() - start_time
-                if elapsed_time > timeout_seconds:
-                    error_msg = f"Macro exceeded {timeout_seconds}s timeout (elapsed: {elapsed_time:.1f}s)"
-                    logger.error(error_msg)
-                    if self.on_error:
-                        self.on_error(error_msg)
-                    self.state = MacroExecutionState.ERROR
-                    return
-
                 if self.state == MacroExecutionState.STOPPED:
                     logger.info("Macro execution stopped by user")
                     break
 
                 logger.debug(f"Executing macro repeat {repeat_count + 1}/{macro.repeat}")
 
-                # Execute each step
-                for step_idx, step in enumerate(macro.steps):
-                    # Check for timeout in inner loop too
-                    elapsed_time = time.monotonic() - start_time
-                    if elapsed_time > timeout_seconds:
+                for event in plan.events:
+                    if event.kind == MARK and on_step is None:
+                        continue
+
+                    # Check for timeout
+                    if clock() > timeout_at:
+                        elapsed_time = clock() - start_time
                         error_msg = f"Macro exceeded {timeout_seconds}s timeout (elapsed: {elapsed_time:.1f}s)"
                         logger.error(error_msg)
                         if self.on_error:
@@ -215,26 +291,32 @@ class MacroRunner:
                         self.state = MacroExecutionState.ERROR
                         return
 
-                    if self.state == MacroExecutionState.STOPPED:
-                        logger.info("Macro execution stopped by user")
+                    if not self._await(event.offset):
                         break
 
                     try:
-                        self._execute_step(step)
-
-                        # Callback for each step
-                        if self.on_step_executed:
-                            self.on_step_executed(step_idx + 1, len(macro.steps))
+                        if event.kind == MARK:
+                            # Callback for each step
+                            on_step(event.step_index + 1, plan.step_count)
+                        else:
+                            dispatch[event.kind](event)
 
                     except Exception as e:
-                        logger.error(f"Error executing step {step_idx + 1}: {e}")
+                        logger.error(f"Error executing step {event.step_index + 1}: {e}")
                         if self.on_error:
-                            self.on_error(f"Error in step {step_idx + 1}: {str(e)}")
+                            self.on_error(f"Error in step {event.step_index + 1}: {str(e)}")
                         raise
 
+                # Trailing delays of the repeat
+                if not self._await(plan.duration, record=False):
+                    logger.info("Macro execution stopped by user")
+                    break
+                self._base += plan.duration
+
             # Macro completed successfully
             self.state = MacroExecutionState.COMPLETED
             logger.info(f"Macro execution completed: {macro.name}")
+            logger.debug(f"Macro event timing: {self.timing_stats.to_dict()}")
 
             if self.on_macro_finished:
                 self.on_macro_finished(macro)
@@ -245,258 +327,108 @@ class MacroRunner:
             if self.on_error:
                 self.on_error(f"Macro execution error: {str(e)}")
 
-    def _interruptible_sleep(self, duration_sec: float):
+    def _compile(self, macro: Macro) -> MacroPlan:
+        """Compile a macro with this runner's key and button resolution"""
+        return compile_macro(
+            macro,
+            resolve_keys=self._parse_key_combo,
+            resolve_button=self._resolve_button,
+            key_gap=self.KEY_EVENT_GAP,
+        )
+
+    def _await(self, offset: float, record: bool = True) -> bool:
         """
-        Sleep for duration, but wake up immediately if stopped.
+        Hold while paused, then wait until `offset` into the current repeat
 
         Args:
-            duration_sec: Duration to sleep in seconds
+            offset: Seconds from the start of the repeat
+            record: Whether to record the lateness in timing_stats
+
+        Returns:
+            False if execution was stopped
         """
-        end_time = time.monotonic() + duration_sec
-        while time.monotonic() < end_time:
-            if self.state == MacroExecutionState.STOPPED:
-                return
-            # Sleep in small increments to remain responsive
-            sleep_chunk = min(0.1, end_time - time.monotonic())
-            if sleep_chunk > 0:
-                time.sleep(sleep_chunk)
+        if not self._resume_event.is_set():
+            paused_at = self.timer.clock()
+            self._resume_event.wait()
+            # Shift the schedule so resuming does not fire a burst of events
+            self._base += self.timer.clock() - paused_at
+
+        deadline = self._base + offset
+        if not self.timer.wait_until(deadline, self._stop_event):
+            return False
+
+        if record:
+            lateness = max(0.0, self.timer.clock() - deadline)
+            self.timing_stats.record(lateness)
+            if lateness > self.MAX_CATCH_UP:
+                # A long stall (slow UI handler, suspended process): start a new base
+                self._base += lateness
+                self.timing_stats.rebases += 1
+        return True
 
-    def _execute_step(self, step: MacroStep):
+    def _interruptible_sleep(self, duration_sec: float):
         """
-        Execute a single macro step
+        Sleep for duration, but wake up immediately if stopped.
 
         Args:
-            step: MacroStep to execute
+            duration_sec: Duration to sleep in seconds
         """
-        # Add optional jitter to delays
-        delay = step.duration_ms if step.duration_ms > 0 else 0
-        if step.delay_jitter_ms > 0 and step.type == MacroStepType.DELAY.value:
-            jitter = random.randint(0, step.delay_jitter_ms)
-            delay = step.duration_ms + jitter
+        self.timer.sleep(duration_sec, self._stop_event)
 
-        try:
-            if step.type == MacroStepType.KEY_PRESS.value:
-                self._press_key(step.key)
-                if delay > 0:
-                    self._interruptible_sleep(delay / 1000.0)
-
-            elif step.type == MacroStepType.KEY_DOWN.value:
-                self._key_down(step.key)
-                if step.duration_ms > 0:
-                    self._interruptible_sleep(step.duration_ms / 1000.0)
-                    self._key_up(step.key)
-
-            elif step.type == MacroStepType.KEY_UP.value:
-                self._key_up(step.key)
-
-            elif step.type == MacroStepType.KEY_SEQUENCE.value:
-                self._type_sequence(step.key)
-                if delay > 0:
-                    self._interruptible_sleep(delay / 1000.0)
-
-            elif step.type == MacroStepType.MOUSE_MOVE.value:
-                self._move_mouse(step.x, step.y)
-                if delay > 0:
-                    self._interruptible_sleep(delay / 1000.0)
-
-            elif step.type == MacroStepType.MOUSE_CLICK.value:
-                self._click_mouse(step.button, step.x, step.y)
-                if delay > 0:
-                    self._interruptible_sleep(delay / 1000.0)
-
-            elif step.type == MacroStepType.MOUSE_SCROLL.value:
-                self._scroll_mouse(step.x, step.y, step.scroll_amount)
-                if delay > 0:
-                    self._interruptible_sleep(delay / 1000.0)
-
-            elif step.type == MacroStepType.DELAY.value:
-                self._interruptible_sleep(delay / 1000.0)
-
-            # Handle UI/legacy actions via the MacroManager
-            elif self.macro_manager and step.type in self.macro_manager.action_handlers:
-                logger.debug(f"Executing UI action: {step.type}")
-                handler = self.macro_manager.action_handlers[step.type]
-
-                # Note: UI action steps typically don't have parameters
-                # For SEND_MESSAGE action, the text would be stored in 'key' field
-                params = {}
-                if step.type == MacroStepType.SEND_MESSAGE.value and step.key:
-                    params['message'] = step.key
-
-                # Execute the handler
-                handler(**params)
-
-                # Apply delay if specified
-                if delay > 0:
-                    self._interruptible_sleep(delay / 1000.0)
-
-            # Handle unknown/unhandled step types
-            elif step.type in [e.value for e in MacroStepType]:
-                logger.warning(f"Skipping unhandled legacy/UI action type: {step.type}")
+    def get_timing_stats(self) -> Dict:
+        """Get lateness statistics for the events of the last execution"""
+        return self.timing_stats.to_dict()
 
-        except Exception as e:
-            logger.error(f"Error executing step {step.type}: {e}")
-            raise
-
-    def _press_key(self, key_combo: str):
-        """Press and release a key or key combination"""
-        if not self.keyboard_controller:
-            return
-
-        keys = self._parse_key_combo(key_combo)
-
-        # Press all keys
-        for key in keys:
-            self.keyboard_controller.press(key)
-            time.sleep(0.01)  # Small delay between key press
-
-        # Release all keys in reverse order
-        for key in reversed(keys):
-            self.keyboard_controller.release(key)
-            time.sleep(0.01)
-
-    def _key_down(self, key_combo: str):
-        """Press down a key without releasing"""
-        if not self.keyboard_controller:
-            return
-
-        keys = self._parse_key_combo(key_combo)
-
-        for key in keys:
-            self.keyboard_controller.press(key)
-            time.sleep(0.01)
-
-    def _key_up(self, key_combo: str):
-        """Release a pressed key"""
-        if not self.keyboard_controller:
-            return
-
-        keys = self._parse_key_combo(key_combo)
-
-        for key in reversed(keys):
-            self.keyboard_controller.release(key)
-            time.sleep(0.01)
-
-    def _type_sequence(self, text: str):
-        """Type a sequence of characters"""
-        if not self.keyboard_controller:
-            return
-
-        for char in text:
-            self.keyboard_controller.type(char)
-            time.sleep(0.01)  # Small delay between characters
-
-    def _move_mouse(self, x: int, y: int):
-        """Move mouse to position"""
-        if not self.mouse_controller:
-            return
-
-        self.mouse_controller.position = (x, y)
-
-    def _click_mouse(self, button: str, x: Optional[int] = None, y: Optional[int] = None):
-        """Click mouse button"""
-        if not self.mouse_controller:
-            return
-
-        # Move to position if specified
-        if x is not None and y is not None:
-            self.mouse_controller.position = (x, y)
-
-        # Click button
-        button_map = {
-            'left': mouse.Button.left,
-            'right': mouse.Button.right,
-            'middle': mouse.Button.middle
-        }
+    # ------------------------------------------------------------------
+    # Plan event handlers
+    # ------------------------------------------------------------------
 
-        click_button = button_map.get(button, mouse.Button.left)
-        self.mouse_controller.click(click_button)
+    def _on_press(self, event: PlanEvent):
+        self.backend.press(event.key)
 
-    def _scroll_mouse(self, x: int, y: int, amount: int):
-        """
-        Scroll mouse wheel
+    def _on_release(self, event: PlanEvent):
+        self.backend.release(event.key)
 
-        Note: Scroll direction behavior may vary by OS:
-        - Windows: Positive amount scrolls up, negative scrolls down
-        - macOS: Direction may be inverted if "natural scrolling" is enabled
-        - Linux: Behavior depends on desktop environment settings
+    def _on_type(self, event: PlanEvent):
+        self.backend.type(event.key)
 
-        Args:
-            x: X coordinate to scroll at
-            y: Y coordinate to scroll at
-            amount: Scroll amount (positive = up on Windows, negative = down)
-        """
-        if not self.mouse_controller:
-            return
+    def _on_move(self, event: PlanEvent):
+        self.backend.move(event.x, event.y)
+
+    def _on_click(self, event: PlanEvent):
+        self.backend.click(event.button, event.x, event.y)
 
-        # Move to position
-        self.mouse_controller.position = (x, y)
+    def _on_scroll(self, event: PlanEvent):
+        # Scroll direction may vary by OS (natural scrolling, desktop settings)
+        self.backend.scroll(event.x, event.y, event.amount)
 
-        # Scroll (dx=0, dy=amount)
-        # pynput uses (dx, dy) where dy is vertical scroll
-        self.mouse_controller.scroll(0, amount)
+    def _on_jitter(self, event: PlanEvent):
+        # Random extra delay shifts the rest of the repeat
+        self._base += random.randint(0, event.amount) / 1000.0
+
+    def _on_action(self, event: PlanEvent):
+        """Handle UI/legacy actions via the MacroManager"""
+        if self.macro_manager and event.action in self.macro_manager.action_handlers:
+            logger.debug(f"Executing UI action: {event.action}")
+            self.macro_manager.action_handlers[event.action](**dict(event.params))
+        elif event.action in _STEP_TYPE_VALUES:
+            logger.warning(f"Skipping unhandled legacy/UI action type: {event.action}")
+
+    def _resolve_button(self, button: Optional[str]):
+        """Map a button name to the backend's mouse button"""
+        return self.backend.resolve_button(button)
 
     def _parse_key_combo(self, key_combo: str) -> list:
         """
-        Parse key combination string into pynput keys
+        Parse key combination string into the backend's keys
 
         Args:
             key_combo: Key combination string (e.g., "ctrl+shift+a")
 
         Returns:
-            List of pynput Key/KeyCode objects
+            List of key objects (pynput Key/KeyCode for the default backend)
         """
-        if not Key or not KeyCode:
-            return []
-
-        keys = []
-        parts = key_combo.lower().split('+')
-
-        for part in parts:
-            part = part.strip()
-
-            # Map common key names
-            key_map = {
-                'ctrl': Key.ctrl_l,
-                'control': Key.ctrl_l,
-                'shift': Key.shift_l,
-                'alt': Key.alt_l,
-                'win': Key.cmd,
-                'cmd': Key.cmd,
-                'super': Key.cmd,
-                'tab': Key.tab,
-                'esc': Key.esc,
-                'escape': Key.esc,
-                'enter': Key.enter,
-                'return': Key.enter,
-                'space': Key.space,
-                'backspace': Key.backspace,
-                'delete': Key.delete,
-                'up': Key.up,
-                'down': Key.down,
-                'left': Key.left,
-                'right': Key.right,
-                'home': Key.home,
-                'end': Key.end,
-                'pageup': Key.page_up,
-                'pagedown': Key.page_down,
-                'f1': Key.f1, 'f2': Key.f2, 'f3': Key.f3, 'f4': Key.f4,
-                'f5': Key.f5, 'f6': Key.f6, 'f7': Key.f7, 'f8': Key.f8,
-                'f9': Key.f9, 'f10': Key.f10, 'f11': Key.f11, 'f12': Key.f12,
-            }
-
-            if part in key_map:
-                keys.append(key_map[part])
-            elif len(part) == 1:
-                # Single character key
-                try:
-                    keys.append(KeyCode.from_char(part))
-                except ValueError:
-                    logger.warning(f"Cannot convert character to key: {part}")
-            else:
-                logger.warning(f"Unknown key: {part}")
-
-        return keys
+        return self.backend.resolve_keys(key_combo)
 
     def pause_macro(self):
         """Pause currently executing macro"""
@@ -517,19 +449,10 @@ class MacroRunner:
         Returns:
             Tuple of (is_valid, error_list)
         """
-        errors = []
-
-        if not macro.name:
-            errors.append("Macro name is empty")
-
-        if len(macro.steps) == 0:
-            errors.append("Macro has no steps")
-
-        if macro.repeat < 1:
-            errors.append("Repeat count must be at least 1")
+        errors = check_macro(macro)
 
         # Check that we have required input simulation capabilities
-        if not PYNPUT_AVAILABLE:
+        if not PYNPUT_AVAILABLE and self.backend is self._pynput_backend:
             errors.append("Input simulation library (pynput) not available")
 
         return len(errors) == 0, errors
@@ -3,7 +3,7 @@
 import logging
 import json
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Dict, Optional, Set, Tuple
 from datetime import datetime
 
 from src.macro_manager import Macro, MacroStep
@@ -16,6 +16,12 @@ class MacroStore(BaseStore[Macro]):
     """
     Stores and retrieves macros from disk
     Handles JSON serialization and game profile associations
+
+    Each macro lives in its own file, written atomically. The directory is
+    read once into an in-memory index (by ID, game profile and name); reads
+    and searches are served from the index, and a save writes only the one
+    macro's file, and only if its serialized form changed. Callers that
+    edit a macro in place can `mark_dirty` it and `flush` later.
     """
 
     def __init__(self, config_dir: Optional[str] = None):
@@ -27,28 +33,145 @@ class MacroStore(BaseStore[Macro]):
         """
         super().__init__("macros", config_dir=config_dir)
         self.macros_dir = self.base_dir
+        self._macros: Dict[str, Macro] = {}
+        self._by_game: Dict[Optional[str], Set[str]] = {}
+        self._by_name: Dict[str, Set[str]] = {}
+        self._index_keys: Dict[str, Tuple[Optional[str], str]] = {}
+        self._written: Dict[str, str] = {}
+        self._dirty: Set[str] = set()
+        self._loaded = False
         logger.info("MacroStore initialized at %s", self.macros_dir)
 
+    def _macro_file(self, macro_id: str) -> Path:
+        return self.macros_dir / f"{macro_id}.json"
+
+    # ------------------------------------------------------------------
+    # Index
+    # ------------------------------------------------------------------
+
+    def _ensure_loaded(self) -> None:
+        if not self._loaded:
+            self.reload()
+
+    def reload(self) -> int:
+        """
+        Rebuild the index from the files on disk
+
+        Returns:
+            Number of macros loaded
+        """
+        self._macros.clear()
+        self._by_game.clear()
+        self._by_name.clear()
+        self._index_keys.clear()
+        self._written.clear()
+        self._dirty.clear()
+
+        for macro_file in self.iter_json_files(self.macros_dir):
+            try:
+                text = macro_file.read_text(encoding="utf-8")
+                macro = Macro.from_dict(json.loads(text))
+            except Exception as exc:  # pragma: no cover
+                logger.error("Failed to load macro from %s: %s", macro_file, exc)
+                continue
+            self._index(macro)
+            if macro_file.stem == macro.id:
+                self._written[macro.id] = text
+
+        self._loaded = True
+        logger.info("Loaded %s macros from disk", len(self._macros))
+        return len(self._macros)
+
+    def _index(self, macro: Macro) -> None:
+        self._unindex(macro.id)
+        keys = (macro.game_profile_id, macro.name.lower())
+        self._macros[macro.id] = macro
+        self._by_game.setdefault(keys[0], set()).add(macro.id)
+        self._by_name.setdefault(keys[1], set()).add(macro.id)
+        self._index_keys[macro.id] = keys
+
+    def _unindex(self, macro_id: str) -> None:
+        keys = self._index_keys.pop(macro_id, None)
+        self._macros.pop(macro_id, None)
+        if keys is None:
+            return
+        for index, key in ((self._by_game, keys[0]), (self._by_name, keys[1])):
+            ids = index.get(key)
+            if ids is not None:
+                ids.discard(macro_id)
+                if not ids:
+                    del index[key]
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+
     def save_macro(self, macro: Macro) -> bool:
         """
         Save a macro to disk
 
+        Only this macro's file is written, and only if its contents changed.
+
         Args:
             macro: Macro object to save
 
         Returns:
             True if successful, False otherwise
         """
-        macro_file = self.macros_dir / f"{macro.id}.json"
-        if self._json_save(macro_file, macro.to_dict()):
-            logger.info("Saved macro: %s (ID: %s)", macro.name, macro.id)
+        self._ensure_loaded()
+        self._index(macro)
+        text = json.dumps(macro.to_dict(compact=True), indent=2)
+        if self._written.get(macro.id) == text:
+            self._dirty.discard(macro.id)
             return True
-        logger.error("Failed to save macro %s", macro.id)
-        return False
+
+        try:
+            self._atomic_write(self._macro_file(macro.id), text)
+        except Exception as exc:
+            logger.error("Failed to save macro %s: %s", macro.id, exc)
+            self._dirty.add(macro.id)
+            return False
+
+        self._written[macro.id] = text
+        self._dirty.discard(macro.id)
+        logger.info("Saved macro: %s (ID: %s)", macro.name, macro.id)
+        return True
+
+    def mark_dirty(self, macro_id: str) -> None:
+        """
+        Mark an indexed macro as changed in place; written by `flush`
+
+        Args:
+            macro_id: ID of the edited macro
+        """
+        if macro_id in self._macros:
+            self._dirty.add(macro_id)
+
+    def is_dirty(self, macro_id: Optional[str] = None) -> bool:
+        """Whether a macro (or any macro) has unsaved changes"""
+        if macro_id is None:
+            return bool(self._dirty)
+        return macro_id in self._dirty
+
+    def flush(self) -> bool:
+        """
+        Write all dirty macros
+
+        Returns:
+            True if every dirty macro was written
+        """
+        all_success = True
+        for macro_id in list(self._dirty):
+            macro = self._macros.get(macro_id)
+            if macro is None:
+                self._dirty.discard(macro_id)
+            elif not self.save_macro(macro):
+                all_success = False
+        return all_success
 
     def load_macro(self, macro_id: str) -> Optional[Macro]:
         """
-        Load a macro from disk by ID
+        Load a macro by ID
 
         Args:
             macro_id: ID of macro to load
@@ -56,19 +179,11 @@ class MacroStore(BaseStore[Macro]):
         Returns:
             Macro object or None if not found
         """
-        macro_file = self.macros_dir / f"{macro_id}.json"
-        data = self._json_load(macro_file)
-        if not data:
+        self._ensure_loaded()
+        macro = self._macros.get(macro_id)
+        if macro is None:
             logger.warning("Macro file not found: %s", macro_id)
-            return None
-
-        try:
-            macro = Macro.from_dict(data)
-            logger.debug("Loaded macro: %s (ID: %s)", macro.name, macro.id)
-            return macro
-        except Exception as exc:  # pragma: no cover - defensive
-            logger.error("Failed to deserialize macro %s: %s", macro_id, exc)
-            return None
+        return macro
 
     def delete_macro(self, macro_id: str) -> bool:
         """
@@ -80,8 +195,11 @@ class MacroStore(BaseStore[Macro]):
         Returns:
             True if successful, False otherwise
         """
-        macro_file = self.macros_dir / f"{macro_id}.json"
-        if self._delete_file(macro_file):
+        self._ensure_loaded()
+        self._unindex(macro_id)
+        self._written.pop(macro_id, None)
+        self._dirty.discard(macro_id)
+        if self._delete_file(self._macro_file(macro_id)):
             logger.info("Deleted macro file: %s", macro_id)
             return True
         logger.warning("Macro file not found: %s", macro_id)
@@ -89,41 +207,38 @@ class MacroStore(BaseStore[Macro]):
 
     def load_all_macros(self) -> Dict[str, Macro]:
         """
-        Load all macros from disk
+        Load all macros
 
         Returns:
             Dictionary of {macro_id: Macro}
         """
-        macros: Dict[str, Macro] = {}
-        for macro_file in self.iter_json_files(self.macros_dir):
-            data = self._json_load(macro_file)
-            if not data:
-                continue
-            try:
-                macro = Macro.from_dict(data)
-                macros[macro.id] = macro
-            except Exception as exc:  # pragma: no cover
-                logger.error("Failed to load macro from %s: %s", macro_file, exc)
+        self._ensure_loaded()
+        return dict(self._macros)
 
-        logger.info("Loaded %s macros from disk", len(macros))
-        return macros
-
-    def save_all_macros(self, macros: Dict[str, Macro]) -> bool:
+    def save_all_macros(self, macros: Dict[str, Macro], remove_missing: bool = False) -> bool:
         """
         Save all macros to disk
 
+        Unchanged macros are not rewritten.
+
         Args:
             macros: Dictionary of {macro_id: Macro}
+            remove_missing: Also delete stored macros not in `macros`
 
         Returns:
             True if all saved successfully
         """
+        self._ensure_loaded()
         all_success = True
 
         for macro_id, macro in macros.items():
             if not self.save_macro(macro):
                 all_success = False
 
+        if remove_missing:
+            for macro_id in set(self._macros) - set(macros):
+                self.delete_macro(macro_id)
+
         if all_success:
             logger.info(f"Saved {len(macros)} macros to disk")
         else:
@@ -131,6 +246,10 @@ class MacroStore(BaseStore[Macro]):
 
         return all_success
 
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
     def get_macros_for_game(self, game_profile_id: str) -> Dict[str, Macro]:
         """
         Get all macros for a specific game profile
@@ -139,16 +258,25 @@ class MacroStore(BaseStore[Macro]):
             game_profile_id: ID of game profile
 
         Returns:
-            Dictionary of {macro_id: Macro} for that game
+            Dictionary of {macro_id: Macro} for that game (plus global macros)
         """
-        all_macros = self.load_all_macros()
-        game_macros = {}
+        self._ensure_loaded()
+        ids = self._by_game.get(game_profile_id, set()) | self._by_game.get(None, set())
+        return {macro_id: self._macros[macro_id] for macro_id in ids}
 
-        for macro_id, macro in all_macros.items():
-            if macro.game_profile_id == game_profile_id or macro.game_profile_id is None:
-                game_macros[macro_id] = macro
+    def find_by_name(self, name: str) -> Dict[str, Macro]:
+        """
+        Get macros with the given name (case-insensitive)
 
-        return game_macros
+        Args:
+            name: Macro name
+
+        Returns:
+            Dictionary of {macro_id: Macro}
+        """
+        self._ensure_loaded()
+        ids = self._by_name.get(name.lower(), set())
+        return {macro_id: self._macros[macro_id] for macro_id in ids}
 
     def search_macros(self, query: str) -> Dict[str, Macro]:
         """
@@ -160,11 +288,11 @@ class MacroStore(BaseStore[Macro]):
         Returns:
             Dictionary of {macro_id: Macro} matching query
         """
-        all_macros = self.load_all_macros()
+        self._ensure_loaded()
         results = {}
         query_lower = query.lower()
 
-        for macro_id, macro in all_macros.items():
+        for macro_id, macro in self._macros.items():
             if query_lower in macro.name.lower() or query_lower in macro.description.lower():
                 results[macro_id] = macro
 
@@ -0,0 +1,130 @@
+"""
+Macro Timing Module
+Deadline-based waits and jitter statistics for macro execution
+"""
+
+import math
+import threading
+import time
+from collections import deque
+from typing import Callable, Deque, Dict, Optional
+
+
+class TimingStats:
+    """
+    Running lateness statistics for scheduled events
+
+    Lateness is how far after its deadline an event actually ran. Mean
+    and deviation are kept with Welford's algorithm; percentiles use the
+    most recent `window` samples.
+    """
+
+    def __init__(self, window: int = 1000):
+        self.count = 0
+        self.mean = 0.0
+        self.max = 0.0
+        self._m2 = 0.0
+        self._recent: Deque[float] = deque(maxlen=window)
+        self.rebases = 0  # times the schedule was reset after a long stall
+
+    def record(self, lateness: float) -> None:
+        """Add one sample (seconds)"""
+        self.count += 1
+        delta = lateness - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (lateness - self.mean)
+        self.max = max(self.max, lateness)
+        self._recent.append(lateness)
+
+    def merge(self, other: "TimingStats") -> None:
+        """Fold another set of samples into this one"""
+        if not other.count:
+            return
+        total = self.count + other.count
+        delta = other.mean - self.mean
+        self._m2 += other._m2 + delta * delta * self.count * other.count / total
+        self.mean += delta * other.count / total
+        self.count = total
+        self.max = max(self.max, other.max)
+        self._recent.extend(other._recent)
+        self.rebases += other.rebases
+
+    @property
+    def stdev(self) -> float:
+        return math.sqrt(self._m2 / (self.count - 1)) if self.count > 1 else 0.0
+
+    def percentile(self, fraction: float) -> float:
+        """Percentile of recent samples (seconds)"""
+        if not self._recent:
+            return 0.0
+        ordered = sorted(self._recent)
+        index = min(len(ordered) - 1, int(math.ceil(fraction * len(ordered))) - 1)
+        return ordered[max(0, index)]
+
+    def to_dict(self) -> Dict:
+        """Summary in milliseconds"""
+        return {
+            "events": self.count,
+            "mean_ms": round(self.mean * 1000, 3),
+            "stdev_ms": round(self.stdev * 1000, 3),
+            "p95_ms": round(self.percentile(0.95) * 1000, 3),
+            "max_ms": round(self.max * 1000, 3),
+            "rebases": self.rebases,
+        }
+
+
+class PrecisionTimer:
+    """
+    Waits for absolute deadlines on a monotonic clock
+
+    The bulk of a wait blocks on the stop Event (so a stop wakes it
+    immediately); the last `spin_threshold` seconds are spent spinning on
+    the clock, which gets steps within a fraction of a millisecond of their
+    deadline instead of the scheduler's sleep granularity.
+    """
+
+    DEFAULT_SPIN_THRESHOLD = 0.002
+
+    def __init__(
+        self,
+        clock: Callable[[], float] = time.perf_counter,
+        spin_threshold: float = DEFAULT_SPIN_THRESHOLD,
+    ):
+        """
+        Initialize the timer
+
+        Args:
+            clock: Monotonic high-resolution clock
+            spin_threshold: Seconds before a deadline to stop sleeping and spin
+        """
+        self.clock = clock
+        self.spin_threshold = spin_threshold
+
+    def wait_until(self, deadline: float, stop_event: Optional[threading.Event] = None) -> bool:
+        """
+        Block until `deadline`
+
+        Args:
+            deadline: Absolute time on `clock`
+            stop_event: Event that cancels the wait when set
+
+        Returns:
+            False if the wait was cancelled, True otherwise
+        """
+        remaining = deadline - self.clock()
+        coarse = remaining - self.spin_threshold
+        if coarse > 0:
+            if stop_event is not None:
+                if stop_event.wait(coarse):
+                    return False
+            else:
+                time.sleep(coarse)
+
+        while self.clock() < deadline:
+            if stop_event is not None and stop_event.is_set():
+                return False
+        return not (stop_event is not None and stop_event.is_set())
+
+    def sleep(self, duration: float, stop_event: Optional[threading.Event] = None) -> bool:
+        """Relative variant of `wait_until`"""
+        return self.wait_until(self.clock() + duration, stop_event)
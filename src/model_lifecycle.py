@@ -0,0 +1,294 @@
+"""
+Model Lifecycle Module
+Keeps the active game's Ollama model warm while a game is running
+"""
+
+import logging
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional, Union
+
+from PyQt6.QtCore import QObject, pyqtSignal
+
+from src.config import Config
+from src.providers import OllamaProvider
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class LatencyStats:
+    """Running latency totals for one class of request (cold or warm)."""
+
+    count: int = 0
+    total_seconds: float = 0.0
+    max_seconds: float = 0.0
+    last_seconds: float = 0.0
+
+    def record(self, seconds: float) -> None:
+        """Add a single latency sample."""
+        self.count += 1
+        self.total_seconds += seconds
+        self.last_seconds = seconds
+        self.max_seconds = max(self.max_seconds, seconds)
+
+    @property
+    def mean_seconds(self) -> float:
+        """Average latency, or 0.0 when no samples were recorded."""
+        return self.total_seconds / self.count if self.count else 0.0
+
+    def to_dict(self) -> Dict[str, float]:
+        """Convert stats to a dictionary for display or logging."""
+        return {
+            "count": self.count,
+            "mean_seconds": self.mean_seconds,
+            "max_seconds": self.max_seconds,
+            "last_seconds": self.last_seconds,
+        }
+
+
+@dataclass
+class ModelLatencyReport:
+    """Cold versus warm chat latency observed by the lifecycle manager."""
+
+    cold: LatencyStats = field(default_factory=LatencyStats)
+    warm: LatencyStats = field(default_factory=LatencyStats)
+    preload: LatencyStats = field(default_factory=LatencyStats)
+
+    def to_dict(self) -> Dict[str, Dict[str, float]]:
+        """Convert the report to a dictionary."""
+        return {
+            "cold": self.cold.to_dict(),
+            "warm": self.warm.to_dict(),
+            "preload": self.preload.to_dict(),
+        }
+
+
+class ModelLifecycleManager(QObject):
+    """
+    Preloads, keeps alive and unloads Ollama models around game sessions.
+
+    When a game is detected the profile's ``default_model`` (or the configured
+    Ollama model) is loaded in the background and chat requests are sent with
+    the configured ``keep_alive`` so the model stays resident. When the game
+    closes the model is unloaded and the daemon default is restored.
+
+    Signals:
+        model_loaded: Emitted after a preload finishes (model, load_seconds)
+        model_unloaded: Emitted after a model is unloaded (model)
+        preload_failed: Emitted when a preload fails (model, error)
+    """
+
+    # Responses whose reported load time exceeds this are counted as cold
+    COLD_LOAD_THRESHOLD = 0.25  # seconds
+    # Longest the app waits at exit for the active model to unload
+    SHUTDOWN_TIMEOUT = 3.0  # seconds
+
+    model_loaded = pyqtSignal(str, float)
+    model_unloaded = pyqtSignal(str)
+    preload_failed = pyqtSignal(str, str)
+
+    def __init__(
+        self,
+        provider: Optional[OllamaProvider] = None,
+        config: Optional[Config] = None,
+        keep_alive: Optional[Union[str, float]] = None,
+    ):
+        """
+        Initialize the lifecycle manager.
+
+        Args:
+            provider: Ollama provider to manage (defaults to the router's)
+            config: Config instance (if None, creates a new one)
+            keep_alive: Keep-alive used while a game is active (defaults to
+                ``config.ollama_keep_alive``)
+        """
+        super().__init__()
+        self.config = config or Config()
+        if provider is None:
+            from src.ai_router import get_router
+
+            provider = get_router(self.config).get_provider()
+        self.provider = provider
+        self.keep_alive = (
+            keep_alive if keep_alive is not None else self.config.ollama_keep_alive
+        )
+        self.active_model: Optional[str] = None
+        self.latency = ModelLatencyReport()
+        self._lock = threading.Lock()
+        self._worker: Optional[threading.Thread] = None
+
+        if self.provider is not None:
+            self.provider.add_response_observer(self._on_response)
+
+    def attach_watcher(self, watcher: Any) -> None:
+        """
+        Follow a GameWatcher's game_changed and game_closed signals.
+
+        Args:
+            watcher: GameWatcher instance
+        """
+        watcher.game_changed.connect(self.on_game_changed)
+        watcher.game_closed.connect(self.on_game_closed)
+
+    def resolve_model(self, profile: Optional[Any] = None) -> Optional[str]:
+        """
+        Pick the model to keep warm for a profile.
+
+        Args:
+            profile: GameProfile or None
+
+        Returns:
+            The profile's default_model, else the configured Ollama model
+        """
+        model = getattr(profile, "default_model", None) if profile else None
+        return model or self.config.ollama_model or (
+            self.provider.default_model if self.provider else None
+        )
+
+    def on_game_changed(self, game_name: str, profile: Optional[Any] = None) -> None:
+        """Preload the game's model when the active game changes."""
+        if profile is not None and getattr(profile, "id", None) == "generic_game":
+            # Non-game foreground windows still use the default model
+            profile = None
+        self.activate(self.resolve_model(profile))
+
+    def on_game_closed(self) -> None:
+        """Unload the model once the game has closed."""
+        self.deactivate()
+
+    def activate(self, model: Optional[str], wait: bool = False) -> None:
+        """
+        Keep a model resident, unloading any previously active one.
+
+        The unload and preload run on a background thread so that callers
+        on the GUI thread never wait on the daemon.
+
+        Args:
+            model: Model name to preload
+            wait: Block until the preload finishes (used by tests and tools)
+        """
+        if self.provider is None or not model:
+            return
+
+        with self._lock:
+            previous = self.active_model
+            if previous == model:
+                return
+            self.active_model = model
+            self.provider.keep_alive = self.keep_alive
+
+        preload = self.config.model_preload_enabled
+        if previous or preload:
+            self._run_in_background(self._switch, (previous, model if preload else None), "ModelPreloadThread")
+        if wait:
+            self.wait_idle()
+
+    def deactivate(self, wait: bool = False) -> None:
+        """
+        Unload the active model and restore the daemon's keep-alive.
+
+        Args:
+            wait: Block until the unload finishes
+        """
+        with self._lock:
+            model = self.active_model
+            self.active_model = None
+            if self.provider is not None:
+                self.provider.keep_alive = None
+
+        if model:
+            self._run_in_background(self._unload, (model,), "ModelUnloadThread")
+        if wait:
+            self.wait_idle()
+
+    def wait_idle(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait for queued unloads and preloads to finish.
+
+        Args:
+            timeout: Maximum seconds to wait (None waits indefinitely)
+
+        Returns:
+            True if no background work is left
+        """
+        thread = self._worker
+        if thread is not None:
+            thread.join(timeout)
+            return not thread.is_alive()
+        return True
+
+    def _run_in_background(self, target, args: tuple, name: str) -> None:
+        """Run daemon requests on a thread, after any earlier ones finish."""
+        with self._lock:
+            previous = self._worker
+
+            def run():
+                if previous is not None:
+                    previous.join()
+                target(*args)
+
+            self._worker = threading.Thread(target=run, daemon=True, name=name)
+            self._worker.start()
+
+    def _switch(self, previous: Optional[str], model: Optional[str]) -> None:
+        """Unload the previous model, then preload the new one."""
+        if previous:
+            self._unload(previous)
+        if model:
+            self._preload(model)
+
+    def _preload(self, model: str) -> None:
+        """Load a model in the background and record how long it took."""
+        try:
+            load_seconds = self.provider.preload_model(model, keep_alive=self.keep_alive)
+        except Exception as e:
+            logger.warning(f"Failed to preload model '{model}': {e}")
+            self.preload_failed.emit(model, str(e))
+            return
+
+        with self._lock:
+            self.latency.preload.record(load_seconds)
+        logger.info(f"Preloaded model '{model}' in {load_seconds:.2f}s")
+        self.model_loaded.emit(model, load_seconds)
+
+    def _unload(self, model: str) -> None:
+        """Evict a model from the daemon."""
+        if self.provider.unload_model(model):
+            logger.info(f"Unloaded model '{model}'")
+            self.model_unloaded.emit(model)
+
+    def _on_response(self, stats: Dict[str, Any]) -> None:
+        """Classify a finished chat request as cold or warm."""
+        latency = stats.get("latency") or 0.0
+        load_seconds = (stats.get("load_duration") or 0) / 1e9
+        with self._lock:
+            if load_seconds > self.COLD_LOAD_THRESHOLD:
+                self.latency.cold.record(latency)
+            else:
+                self.latency.warm.record(latency)
+
+    def get_latency_report(self) -> Dict[str, Dict[str, float]]:
+        """Get cold, warm and preload latency statistics."""
+        with self._lock:
+            return self.latency.to_dict()
+
+    def shutdown(self) -> None:
+        """Unload the active model and stop observing the provider."""
+        self.deactivate()
+        if not self.wait_idle(self.SHUTDOWN_TIMEOUT):
+            logger.warning("Model unload still running at shutdown")
+        if self.provider is not None:
+            self.provider.remove_response_observer(self._on_response)
+
+
+# Global lifecycle manager instance
+_lifecycle_manager: Optional[ModelLifecycleManager] = None
+
+
+def get_model_lifecycle_manager(config: Optional[Config] = None) -> ModelLifecycleManager:
+    """Get or create the global model lifecycle manager instance"""
+    global _lifecycle_manager
+    if _lifecycle_manager is None:
+        _lifecycle_manager = ModelLifecycleManager(config=config)
+    return _lifecycle_manager
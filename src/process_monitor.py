@@ -0,0 +1,446 @@
+"""
+Process Monitor Module
+Keeps a shared table of running processes up to date from kernel process
+events where available, falling back to periodic snapshots
+"""
+
+import logging
+import os
+import select
+import socket
+import struct
+import sys
+import threading
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Tuple
+
+import psutil
+
+from src.scan_scheduler import AdaptiveScanScheduler
+
+logger = logging.getLogger(__name__)
+
+# Linux proc connector (see linux/connector.h and linux/cn_proc.h)
+NETLINK_CONNECTOR = 11
+CN_IDX_PROC = 1
+CN_VAL_PROC = 1
+PROC_CN_MCAST_LISTEN = 1
+PROC_CN_MCAST_IGNORE = 2
+NLMSG_DONE = 3
+PROC_EVENT_EXEC = 0x00000002
+PROC_EVENT_EXIT = 0x80000000
+
+_NLMSGHDR = struct.Struct("=IHHII")
+_CN_MSG = struct.Struct("=IIIIHH")
+_PROC_EVENT_HEADER = struct.Struct("=IIQ")
+_PROC_EVENT_IDS = struct.Struct("=II")
+
+
+@dataclass(frozen=True)
+class ProcessInfo:
+    """
+    A running process as seen by the monitor
+
+    Attributes:
+        pid: Process ID
+        name: Process name (e.g. 'eldenring.exe')
+        exe: Executable path, empty if unavailable
+    """
+    pid: int
+    name: str
+    exe: str = ""
+
+
+ChangeCallback = Callable[[List[ProcessInfo], List[ProcessInfo]], None]
+
+
+def snapshot_processes() -> Dict[int, ProcessInfo]:
+    """Enumerate all processes once"""
+    processes: Dict[int, ProcessInfo] = {}
+    for proc in psutil.process_iter(["pid", "name", "exe"]):
+        try:
+            info = proc.info
+            name = info.get("name")
+            if not name:
+                continue
+            pid = int(info.get("pid") or proc.pid)
+            processes[pid] = ProcessInfo(pid=pid, name=name, exe=info.get("exe") or "")
+        except (psutil.NoSuchProcess, psutil.AccessDenied):
+            continue
+    return processes
+
+
+def describe_process(pid: int) -> Optional[ProcessInfo]:
+    """Read name and executable for a single PID"""
+    try:
+        proc = psutil.Process(pid)
+        name = proc.name()
+        try:
+            exe = proc.exe() or ""
+        except (psutil.AccessDenied, psutil.ZombieProcess, OSError):
+            exe = ""
+        return ProcessInfo(pid=pid, name=name, exe=exe)
+    except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+        return None
+
+
+class NetlinkProcessSource:
+    """
+    Process exec/exit events from the Linux proc connector
+
+    Requires CAP_NET_ADMIN; `open` raises OSError when the connector is not
+    available so the caller can fall back to polling.
+    """
+
+    RECV_SIZE = 65536
+
+    def __init__(self):
+        self.sock: Optional[socket.socket] = None
+
+    def open(self) -> None:
+        """Subscribe to process events"""
+        sock = socket.socket(socket.AF_NETLINK, socket.SOCK_DGRAM, NETLINK_CONNECTOR)
+        try:
+            sock.bind((0, CN_IDX_PROC))
+            self._send_op(sock, PROC_CN_MCAST_LISTEN)
+        except OSError:
+            sock.close()
+            raise
+        self.sock = sock
+
+    @staticmethod
+    def _send_op(sock: socket.socket, op: int) -> None:
+        payload = struct.pack("=I", op)
+        cn_msg = _CN_MSG.pack(CN_IDX_PROC, CN_VAL_PROC, 0, 0, len(payload), 0) + payload
+        header = _NLMSGHDR.pack(_NLMSGHDR.size + len(cn_msg), NLMSG_DONE, 0, 0, 0)
+        sock.send(header + cn_msg)
+
+    def fileno(self) -> int:
+        return self.sock.fileno()
+
+    def read(self) -> List[Tuple[str, int]]:
+        """
+        Read pending events
+
+        Returns:
+            List of ('exec' | 'exit', pid) tuples for thread group leaders
+        """
+        data = self.sock.recv(self.RECV_SIZE)
+        return self.parse(data)
+
+    @staticmethod
+    def parse(data: bytes) -> List[Tuple[str, int]]:
+        """Decode a proc connector datagram"""
+        events: List[Tuple[str, int]] = []
+        offset = 0
+        while offset + _NLMSGHDR.size <= len(data):
+            length = _NLMSGHDR.unpack_from(data, offset)[0]
+            if length < _NLMSGHDR.size:
+                break
+            body = offset + _NLMSGHDR.size + _CN_MSG.size
+            if body + _PROC_EVENT_HEADER.size + _PROC_EVENT_IDS.size <= offset + length:
+                what = _PROC_EVENT_HEADER.unpack_from(data, body)[0]
+                pid, tgid = _PROC_EVENT_IDS.unpack_from(data, body + _PROC_EVENT_HEADER.size)
+                # Only whole processes matter, not individual threads
+                if pid == tgid:
+                    if what == PROC_EVENT_EXEC:
+                        events.append(("exec", tgid))
+                    elif what == PROC_EVENT_EXIT:
+                        events.append(("exit", tgid))
+            offset += (length + 3) & ~3
+        return events
+
+    def close(self) -> None:
+        if self.sock is None:
+            return
+        try:
+            self._send_op(self.sock, PROC_CN_MCAST_IGNORE)
+        except OSError:
+            pass
+        self.sock.close()
+        self.sock = None
+
+
+class ProcessMonitor:
+    """
+    Shared table of running processes with change notifications
+
+    On Linux the table is fed by proc connector exec/exit events, so new
+    and exited processes are seen within milliseconds while the monitor
+    thread sleeps in `select`. Where the connector is unavailable (no
+    CAP_NET_ADMIN, other platforms) the table is refreshed from a full
+    snapshot every `poll_interval` seconds (or on the cadence of an
+    AdaptiveScanScheduler), and watched PIDs get pidfd exit notifications
+    when the kernel supports them.
+
+    Subscribers receive (added, removed) lists of ProcessInfo.
+    """
+
+    DEFAULT_POLL_INTERVAL = 5.0
+    RESYNC_INTERVAL = 300.0  # seconds between safety snapshots in event mode
+
+    def __init__(
+        self,
+        poll_interval: float = DEFAULT_POLL_INTERVAL,
+        use_events: bool = True,
+        scheduler: Optional[AdaptiveScanScheduler] = None,
+    ):
+        """
+        Initialize the monitor
+
+        Args:
+            poll_interval: Seconds between snapshots when polling
+            use_events: Try kernel process events before falling back to polling
+            scheduler: Adaptive cadence used instead of poll_interval when polling
+        """
+        self.poll_interval = poll_interval
+        self.use_events = use_events
+        self.scheduler = scheduler
+        self.mode = "stopped"
+
+        self._processes: Dict[int, ProcessInfo] = {}
+        self._lock = threading.RLock()
+        self._subscribers: List[ChangeCallback] = []
+        self._source: Optional[NetlinkProcessSource] = None
+        self._pidfds: Dict[int, int] = {}
+        self._thread: Optional[threading.Thread] = None
+        self._stop_event = threading.Event()
+        self._rescan_event = threading.Event()
+        self._wake_r: Optional[int] = None
+        self._wake_w: Optional[int] = None
+
+        if self.scheduler is not None:
+            self.scheduler.add_wake_callback(self.request_rescan)
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    def start(self) -> None:
+        """Take an initial snapshot and start the monitor thread"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+
+        self._stop_event.clear()
+        if self.use_events and sys.platform.startswith("linux"):
+            source = NetlinkProcessSource()
+            try:
+                source.open()
+                self._source = source
+            except OSError as e:
+                logger.info(f"Process events unavailable ({e}); polling every {self.poll_interval}s")
+
+        # Snapshot after subscribing so no process falls between the two
+        self.refresh()
+
+        if hasattr(os, "pipe") and sys.platform != "win32":
+            self._wake_r, self._wake_w = os.pipe()
+        self.mode = "events" if self._source else "poll"
+        self._thread = threading.Thread(
+            target=self._run, daemon=True, name="ProcessMonitorThread"
+        )
+        self._thread.start()
+        logger.debug(f"Process monitor started in {self.mode} mode")
+
+    def stop(self) -> None:
+        """Stop the monitor thread and release kernel resources"""
+        self._stop_event.set()
+        self._rescan_event.set()
+        self._wake()
+        if self._thread and self._thread.is_alive():
+            self._thread.join(timeout=2.0)
+        self._thread = None
+
+        if self._source:
+            self._source.close()
+            self._source = None
+        with self._lock:
+            for fd in self._pidfds.values():
+                os.close(fd)
+            self._pidfds.clear()
+        for fd in (self._wake_r, self._wake_w):
+            if fd is not None:
+                os.close(fd)
+        self._wake_r = self._wake_w = None
+        self.mode = "stopped"
+
+    def request_rescan(self) -> None:
+        """Wake the monitor thread so a polling monitor rescans now"""
+        self._rescan_event.set()
+        self._wake()
+
+    def _poll_delay(self) -> float:
+        if self.scheduler is not None:
+            return self.scheduler.next_delay()
+        return self.poll_interval
+
+    def _poll_due(self) -> bool:
+        """Whether a polling wake-up needs a full snapshot"""
+        return self.scheduler is None or self.scheduler.should_full_scan()
+
+    def _wake(self) -> None:
+        if self._wake_w is not None:
+            try:
+                os.write(self._wake_w, b"\0")
+            except OSError:
+                pass
+
+    # ------------------------------------------------------------------
+    # Table access
+    # ------------------------------------------------------------------
+
+    def subscribe(self, callback: ChangeCallback) -> None:
+        """Register a callback for (added, removed) process lists"""
+        with self._lock:
+            if callback not in self._subscribers:
+                self._subscribers.append(callback)
+
+    def unsubscribe(self, callback: ChangeCallback) -> None:
+        """Remove a callback registered with subscribe"""
+        with self._lock:
+            if callback in self._subscribers:
+                self._subscribers.remove(callback)
+
+    def get_processes(self) -> List[ProcessInfo]:
+        """Get a copy of the process table"""
+        with self._lock:
+            return list(self._processes.values())
+
+    def get_process(self, pid: int) -> Optional[ProcessInfo]:
+        """Look up a process by PID"""
+        with self._lock:
+            return self._processes.get(pid)
+
+    def watch_pid(self, pid: int) -> None:
+        """
+        Ask for a prompt exit notification for one process
+
+        In polling mode this opens a pidfd (Linux 5.3+) so the exit is
+        reported as soon as it happens instead of at the next snapshot.
+        """
+        if self._source is not None or not hasattr(os, "pidfd_open"):
+            return
+        with self._lock:
+            if pid in self._pidfds:
+                return
+            try:
+                self._pidfds[pid] = os.pidfd_open(pid)
+            except OSError:
+                return
+        self._wake()
+
+    # ------------------------------------------------------------------
+    # Updates
+    # ------------------------------------------------------------------
+
+    def refresh(self) -> Tuple[List[ProcessInfo], List[ProcessInfo]]:
+        """
+        Replace the table with a fresh snapshot and publish the difference
+
+        Returns:
+            (added, removed) process lists
+        """
+        current = snapshot_processes()
+        with self._lock:
+            previous = self._processes
+            added = [info for pid, info in current.items() if previous.get(pid) != info]
+            removed = [info for pid, info in previous.items() if current.get(pid) != info]
+            self._processes = current
+        self._publish(added, removed)
+        return added, removed
+
+    def _apply(self, events: List[Tuple[str, int]]) -> None:
+        added: List[ProcessInfo] = []
+        removed: List[ProcessInfo] = []
+        for kind, pid in events:
+            if kind == "exec":
+                info = describe_process(pid)
+                if info is None:
+                    continue
+                with self._lock:
+                    old = self._processes.get(pid)
+                    self._processes[pid] = info
+                if old is not None and old != info:
+                    removed.append(old)
+                if old != info:
+                    added.append(info)
+            else:
+                with self._lock:
+                    old = self._processes.pop(pid, None)
+                    fd = self._pidfds.pop(pid, None)
+                if fd is not None:
+                    os.close(fd)
+                if old is not None:
+                    removed.append(old)
+        self._publish(added, removed)
+
+    def _publish(self, added: List[ProcessInfo], removed: List[ProcessInfo]) -> None:
+        if not added and not removed:
+            return
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for callback in subscribers:
+            try:
+                callback(added, removed)
+            except Exception as e:
+                logger.error(f"Process monitor subscriber failed: {e}", exc_info=True)
+
+    # ------------------------------------------------------------------
+    # Monitor thread
+    # ------------------------------------------------------------------
+
+    def _run(self) -> None:
+        while not self._stop_event.is_set():
+            try:
+                if self._wake_r is None:
+                    # No selectable handles (Windows): plain polling
+                    self._rescan_event.wait(self._poll_delay())
+                    self._rescan_event.clear()
+                    if self._stop_event.is_set():
+                        break
+                    if self._poll_due():
+                        self.refresh()
+                    continue
+                self._wait_and_dispatch()
+            except Exception as e:
+                logger.error(f"Process monitor error: {e}", exc_info=True)
+                if self._stop_event.wait(1.0):
+                    break
+
+    def _wait_and_dispatch(self) -> None:
+        with self._lock:
+            pidfds = dict(self._pidfds)
+        fds = [self._wake_r] + list(pidfds.values())
+        if self._source:
+            fds.append(self._source.fileno())
+        timeout = self.RESYNC_INTERVAL if self._source else self._poll_delay()
+
+        readable, _, _ = select.select(fds, [], [], timeout)
+        if self._stop_event.is_set():
+            return
+        if not readable:
+            if self._source or self._poll_due():
+                self.refresh()
+            return
+
+        events: List[Tuple[str, int]] = []
+        for fd in readable:
+            if fd == self._wake_r:
+                os.read(self._wake_r, 512)
+                if self._rescan_event.is_set():
+                    self._rescan_event.clear()
+                    # The event-fed table is already current; only consume the hint
+                    if self._poll_due() and not self._source:
+                        self.refresh()
+            elif self._source and fd == self._source.fileno():
+                try:
+                    events.extend(self._source.read())
+                except OSError as e:
+                    # ENOBUFS: events were dropped, so resynchronize
+                    logger.warning(f"Process event overflow ({e}); rescanning")
+                    self.refresh()
+            else:
+                pid = next(p for p, pfd in pidfds.items() if pfd == fd)
+                events.append(("exit", pid))
+        if events:
+            self._apply(events)
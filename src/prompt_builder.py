@@ -0,0 +1,214 @@
+"""
+Prompt Builder Module
+Assembles chat prompts with a byte-stable prefix so local inference servers
+can reuse their KV cache between turns
+"""
+
+import logging
+import threading
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class PromptParts:
+    """The pieces a single chat turn is built from."""
+
+    system_prompt: str
+    question: str
+    knowledge_context: Optional[str] = None
+    hrm_analysis: Optional[str] = None
+    web_context: Optional[str] = None
+
+
+def build_stable_prompt(
+    parts: PromptParts, knowledge_instructions: str = ""
+) -> Tuple[str, str]:
+    """
+    Build a prompt whose prefix stays identical across turns.
+
+    The system message holds only content that is fixed for the session
+    (the profile or game system prompt and the knowledge pack
+    instructions), so it leads every request unchanged. The user message
+    carries the per-turn context blocks, always in the same order, and
+    ends with the question.
+
+    Args:
+        parts: Prompt pieces for this turn
+        knowledge_instructions: Fixed instructions for using knowledge context
+
+    Returns:
+        Tuple of (system_prompt, user_prompt)
+    """
+    system_prompt = parts.system_prompt
+    if knowledge_instructions:
+        system_prompt = f"{system_prompt}\n\n{knowledge_instructions.strip()}"
+
+    sections = []
+    if parts.knowledge_context:
+        sections.append(parts.knowledge_context.strip())
+    if parts.hrm_analysis:
+        sections.append(parts.hrm_analysis.strip())
+    if parts.web_context:
+        sections.append(f"Additional context from game resources:\n{parts.web_context}")
+    sections.append(parts.question.strip())
+    return system_prompt, "\n\n".join(sections)
+
+
+def build_legacy_prompt(parts: PromptParts) -> Tuple[str, str]:
+    """
+    Build a prompt in the original ordering (context before the question).
+
+    Kept so `compare_prompt_orderings` (scripts/benchmark_prompt_ordering.py)
+    can measure the difference.
+
+    Args:
+        parts: Prompt pieces for this turn
+
+    Returns:
+        Tuple of (system_prompt, user_prompt)
+    """
+    user_message = parts.question.strip()
+    if parts.knowledge_context:
+        user_message = f"{parts.knowledge_context}\n{user_message}"
+    if parts.hrm_analysis:
+        user_message = f"{parts.hrm_analysis}\n\n{user_message}"
+    if parts.web_context:
+        user_message = (
+            f"{user_message}\n\nAdditional context from game resources:\n{parts.web_context}"
+        )
+    return parts.system_prompt, user_message
+
+
+def to_messages(system_prompt: str, user_prompt: str) -> List[Dict[str, str]]:
+    """Convert a (system, user) prompt pair to chat messages."""
+    return [
+        {"role": "system", "content": system_prompt},
+        {"role": "user", "content": user_prompt},
+    ]
+
+
+class PromptEvalStats:
+    """
+    Aggregates Ollama prompt evaluation timings.
+
+    Register `record` as an `OllamaProvider` response observer (or feed it
+    the 'timings' dict of chat responses) to track how long the server
+    spends processing prompt tokens. Prefix cache hits show up as fewer
+    evaluated prompt tokens and a lower prompt_eval_duration.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.samples = 0
+        self.prompt_eval_count = 0
+        self.prompt_eval_seconds = 0.0
+
+    def record(self, timings: Dict[str, Any]) -> None:
+        """
+        Add one response's timings.
+
+        Args:
+            timings: Dict with Ollama's 'prompt_eval_count' and
+                'prompt_eval_duration' (nanoseconds)
+        """
+        duration = timings.get("prompt_eval_duration")
+        if duration is None:
+            return
+        with self._lock:
+            self.samples += 1
+            self.prompt_eval_count += timings.get("prompt_eval_count") or 0
+            self.prompt_eval_seconds += duration / 1e9
+
+    @property
+    def mean_prompt_eval_seconds(self) -> Optional[float]:
+        """Average prompt evaluation time per request."""
+        if not self.samples:
+            return None
+        return self.prompt_eval_seconds / self.samples
+
+    @property
+    def mean_prompt_tokens(self) -> Optional[float]:
+        """Average number of prompt tokens the server had to evaluate."""
+        if not self.samples:
+            return None
+        return self.prompt_eval_count / self.samples
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert statistics to a dictionary."""
+        return {
+            "samples": self.samples,
+            "prompt_eval_count": self.prompt_eval_count,
+            "prompt_eval_seconds": self.prompt_eval_seconds,
+            "mean_prompt_eval_seconds": self.mean_prompt_eval_seconds,
+            "mean_prompt_tokens": self.mean_prompt_tokens,
+        }
+
+
+def measure_prompt_eval(
+    provider: Any,
+    turns: Sequence[PromptParts],
+    builder: Callable[[PromptParts], Tuple[str, str]],
+    model: Optional[str] = None,
+) -> PromptEvalStats:
+    """
+    Send a sequence of turns and collect prompt evaluation timings.
+
+    Args:
+        provider: Provider whose ``chat`` returns a 'timings' dict
+        turns: Prompt pieces for each turn, sent in order
+        builder: Function turning PromptParts into (system, user) prompts
+        model: Model name (default: the provider's default model)
+
+    Returns:
+        Aggregated PromptEvalStats
+    """
+    stats = PromptEvalStats()
+    for parts in turns:
+        system_prompt, user_prompt = builder(parts)
+        response = provider.chat(to_messages(system_prompt, user_prompt), model=model)
+        stats.record(response.get("timings") or {})
+    return stats
+
+
+def compare_prompt_orderings(
+    provider: Any,
+    turns: Sequence[PromptParts],
+    knowledge_instructions: str = "",
+    model: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    Measure prompt evaluation time for the legacy and stable orderings.
+
+    Both runs send the same turns to the same model. The first turn of
+    each run warms the cache for that ordering.
+
+    Args:
+        provider: Provider whose ``chat`` returns a 'timings' dict
+        turns: Prompt pieces for each turn
+        knowledge_instructions: Instructions appended to the stable system prompt
+        model: Model name (default: the provider's default model)
+
+    Returns:
+        Dict with 'legacy' and 'stable' statistics and 'seconds_saved'
+        (total prompt evaluation time saved by the stable ordering)
+    """
+    legacy = measure_prompt_eval(provider, turns, build_legacy_prompt, model=model)
+    stable = measure_prompt_eval(
+        provider,
+        turns,
+        lambda parts: build_stable_prompt(parts, knowledge_instructions),
+        model=model,
+    )
+    saved = legacy.prompt_eval_seconds - stable.prompt_eval_seconds
+    logger.info(
+        f"Prompt eval: legacy {legacy.prompt_eval_seconds:.3f}s, "
+        f"stable {stable.prompt_eval_seconds:.3f}s ({saved:+.3f}s saved)"
+    )
+    return {
+        "legacy": legacy.to_dict(),
+        "stable": stable.to_dict(),
+        "seconds_saved": saved,
+    }
@@ -0,0 +1,315 @@
+"""
+Provider Health Monitor
+Caches Ollama health and model listings so the UI never waits on the network
+"""
+
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from PyQt6.QtCore import QObject, pyqtSignal
+
+logger = logging.getLogger(__name__)
+
+
+class ProviderHealthMonitor(QObject):
+    """
+    Background health checker with a cached status and model list.
+
+    Reads (`get_status`, `get_models`) always return the cached values
+    immediately and schedule a background check when the cache is stale.
+    Healthy results are reused for ``ttl`` seconds. While the daemon is
+    unreachable the retry delay doubles after each failure, from
+    ``min_backoff`` up to ``max_backoff``, so a stopped daemon is not
+    hammered. `refresh` bypasses both.
+
+    Signals:
+        status_changed: Emitted when health or message changes (status dict)
+        models_changed: Emitted when the available model list changes
+    """
+
+    DEFAULT_TTL = 30.0  # seconds
+    DEFAULT_MIN_BACKOFF = 2.0  # seconds
+    DEFAULT_MAX_BACKOFF = 300.0  # seconds
+
+    status_changed = pyqtSignal(dict)
+    models_changed = pyqtSignal(list)
+
+    def __init__(
+        self,
+        provider_getter: Callable[[], Optional[Any]],
+        ttl: float = DEFAULT_TTL,
+        min_backoff: float = DEFAULT_MIN_BACKOFF,
+        max_backoff: float = DEFAULT_MAX_BACKOFF,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Initialize the monitor.
+
+        Args:
+            provider_getter: Returns the provider to check (may return None)
+            ttl: Seconds a healthy result stays fresh
+            min_backoff: First retry delay after a failed check (seconds)
+            max_backoff: Upper bound for the retry delay (seconds)
+            clock: Monotonic time source (injectable for tests)
+        """
+        super().__init__()
+        self._provider_getter = provider_getter
+        self.ttl = ttl
+        self.min_backoff = min_backoff
+        self.max_backoff = max_backoff
+        self._clock = clock
+
+        self._lock = threading.Lock()
+        self._check_lock = threading.Lock()
+        self._status: Dict[str, Any] = self._pending_status()
+        self._models: List[str] = []
+        self._checked = False
+        self._failures = 0
+        self._next_check_at = 0.0
+
+        self._check_hooks: List[Callable[[], Any]] = []
+
+        self._worker: Optional[threading.Thread] = None
+        self._monitor_thread: Optional[threading.Thread] = None
+        self._wake_event = threading.Event()
+        self._stop_event = threading.Event()
+
+    @staticmethod
+    def _pending_status() -> Dict[str, Any]:
+        """Status reported before the first check completes."""
+        return {
+            "name": "ollama",
+            "configured": False,
+            "healthy": None,
+            "message": "Checking connection...",
+            "error_type": None,
+            "details": {},
+        }
+
+    def get_status(self) -> Dict[str, Any]:
+        """
+        Get the cached provider status without blocking.
+
+        Returns:
+            Status dict with 'configured', 'healthy', 'message', 'error_type',
+            'details', 'checked_at' and 'stale' keys
+        """
+        stale = self._schedule_if_due()
+        with self._lock:
+            status = dict(self._status)
+        status["stale"] = stale
+        return status
+
+    def get_models(self) -> List[str]:
+        """Get the cached model list without blocking."""
+        self._schedule_if_due()
+        with self._lock:
+            return list(self._models)
+
+    def has_result(self) -> bool:
+        """Check whether at least one check has completed."""
+        with self._lock:
+            return self._checked
+
+    def is_fresh(self) -> bool:
+        """Check whether the cached result is still within its TTL/backoff."""
+        with self._lock:
+            return self._checked and self._clock() < self._next_check_at
+
+    @property
+    def consecutive_failures(self) -> int:
+        """Number of failed checks since the last successful one."""
+        return self._failures
+
+    def refresh(self, wait: bool = False) -> Dict[str, Any]:
+        """
+        Request an immediate check, ignoring TTL and backoff.
+
+        Args:
+            wait: Block until the check completes
+
+        Returns:
+            The status after the check if ``wait`` is True, otherwise the
+            currently cached status
+        """
+        if wait:
+            return self.check_now()
+        self._schedule_check()
+        with self._lock:
+            return dict(self._status)
+
+    def invalidate(self) -> None:
+        """Discard cached results (e.g. after the host changed)."""
+        with self._lock:
+            self._status = self._pending_status()
+            self._models = []
+            self._checked = False
+            self._failures = 0
+            self._next_check_at = 0.0
+
+    def add_check_hook(self, hook: Callable[[], Any]) -> None:
+        """
+        Register a callable run after every health check (e.g. probing
+        pooled endpoints), so it follows the monitor's schedule.
+
+        Args:
+            hook: Callable taking no arguments
+        """
+        if hook not in self._check_hooks:
+            self._check_hooks.append(hook)
+
+    def check_now(self) -> Dict[str, Any]:
+        """
+        Run a health check synchronously and update the cache.
+
+        Returns:
+            The new status dict
+        """
+        with self._check_lock:
+            status, models = self._run_check()
+            self._store_result(status, models)
+            for hook in list(self._check_hooks):
+                try:
+                    hook()
+                except Exception as e:
+                    logger.warning(f"Health check hook failed: {e}")
+        with self._lock:
+            return dict(self._status)
+
+    def _run_check(self) -> Tuple[Dict[str, Any], Optional[List[str]]]:
+        """Query the provider and build a status dict."""
+        provider = self._provider_getter()
+        if provider is None:
+            return {
+                "name": "ollama",
+                "configured": False,
+                "healthy": False,
+                "message": "Provider not initialized",
+                "error_type": "connection",
+                "details": {},
+            }, None
+
+        try:
+            health = provider.test_connection()
+        except Exception as e:
+            logger.warning(f"Provider health check failed: {e}")
+            return {
+                "name": "ollama",
+                "configured": provider.is_configured(),
+                "healthy": False,
+                "message": f"Test failed: {str(e)}",
+                "error_type": "connection",
+                "details": {},
+            }, None
+
+        details = health.details or {}
+        models = details.get("models", []) if health.is_healthy else None
+        return {
+            "name": "ollama",
+            "configured": provider.is_configured(),
+            "healthy": health.is_healthy,
+            "message": health.message,
+            "error_type": health.error_type,
+            "details": details,
+        }, models
+
+    def _store_result(self, status: Dict[str, Any], models: Optional[List[str]]) -> None:
+        """Cache a check result, schedule the next one and emit changes."""
+        now = self._clock()
+        with self._lock:
+            if status["healthy"]:
+                self._failures = 0
+                delay = self.ttl
+            else:
+                self._failures += 1
+                delay = min(
+                    self.max_backoff,
+                    self.min_backoff * (2 ** (self._failures - 1)),
+                )
+            self._next_check_at = now + delay
+            self._checked = True
+
+            previous = self._status
+            status["checked_at"] = time.time()
+            self._status = status
+            status_changed = (
+                previous.get("healthy") != status["healthy"]
+                or previous.get("message") != status["message"]
+            )
+
+            models_changed = models is not None and models != self._models
+            if models is not None:
+                self._models = list(models)
+
+        if status_changed:
+            self.status_changed.emit(dict(status))
+        if models_changed:
+            self.models_changed.emit(list(models))
+
+    def _schedule_if_due(self) -> bool:
+        """Start a background check if the cache is stale; return staleness."""
+        with self._lock:
+            stale = not self._checked or self._clock() >= self._next_check_at
+        if stale:
+            self._schedule_check()
+        return stale
+
+    def _schedule_check(self) -> None:
+        """Run a check off the calling thread, coalescing concurrent requests."""
+        if self._monitor_thread and self._monitor_thread.is_alive():
+            self._wake_event.set()
+            return
+
+        with self._lock:
+            if self._worker and self._worker.is_alive():
+                return
+            self._worker = threading.Thread(
+                target=self._background_check,
+                daemon=True,
+                name="ProviderHealthCheckThread",
+            )
+            self._worker.start()
+
+    def _background_check(self) -> None:
+        """Worker entry point for one-off checks."""
+        try:
+            self.check_now()
+        except Exception as e:
+            logger.error(f"Error in provider health check: {e}", exc_info=True)
+
+    def start(self) -> None:
+        """Start periodic monitoring in a background thread."""
+        if self._monitor_thread and self._monitor_thread.is_alive():
+            return
+
+        self._stop_event.clear()
+        self._monitor_thread = threading.Thread(
+            target=self._monitor_loop,
+            daemon=True,
+            name="ProviderHealthMonitorThread",
+        )
+        self._monitor_thread.start()
+        logger.info("Provider health monitor started")
+
+    def stop(self) -> None:
+        """Stop periodic monitoring."""
+        self._stop_event.set()
+        self._wake_event.set()
+        if self._monitor_thread and self._monitor_thread.is_alive():
+            self._monitor_thread.join(timeout=2)
+        self._monitor_thread = None
+
+    def _monitor_loop(self) -> None:
+        """Check whenever the cache expires or a refresh is requested."""
+        while not self._stop_event.is_set():
+            try:
+                self.check_now()
+            except Exception as e:
+                logger.error(f"Error in provider health monitor: {e}", exc_info=True)
+
+            with self._lock:
+                delay = max(0.0, self._next_check_at - self._clock())
+            self._wake_event.wait(delay)
+            self._wake_event.clear()
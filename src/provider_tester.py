@@ -4,7 +4,8 @@ Tests connectivity to Ollama
 """
 
 import logging
-from typing import Tuple
+import threading
+from typing import Any, Dict, Tuple
 
 logger = logging.getLogger(__name__)
 
@@ -14,6 +15,35 @@ class ProviderTester:
 
     DEFAULT_TIMEOUT = 15
 
+    # Clients are reused per (host, timeout) so repeated tests share a pool
+    _clients: Dict[Tuple[str, float], Any] = {}
+    _clients_lock = threading.Lock()
+
+    @classmethod
+    def get_client(cls, base_url: str, timeout: float = DEFAULT_TIMEOUT) -> Any:
+        """
+        Get a cached Ollama client for a host.
+
+        Args:
+            base_url: Ollama host URL
+            timeout: Request timeout in seconds
+
+        Returns:
+            ollama.Client instance
+
+        Raises:
+            ImportError: If the ollama library is not installed
+        """
+        import ollama
+
+        key = (base_url, float(timeout))
+        with cls._clients_lock:
+            client = cls._clients.get(key)
+            if client is None:
+                client = ollama.Client(host=base_url, timeout=timeout)
+                cls._clients[key] = client
+            return client
+
     @staticmethod
     def test_ollama(base_url: str = "http://localhost:11434", timeout: float = DEFAULT_TIMEOUT) -> Tuple[bool, str]:
         """
@@ -27,9 +57,7 @@ class ProviderTester:
             Tuple of (success: bool, message: str)
         """
         try:
-            import ollama
-
-            client = ollama.Client(host=base_url)
+            client = ProviderTester.get_client(base_url, timeout)
             models_response = client.list()
             models = models_response.get("models", [])
             model_count = len(models)
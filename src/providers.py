@@ -8,9 +8,10 @@ No API keys required - just point to your Ollama instance.
 import logging
 import requests
 import sys
+import time
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
-from typing import Any, Dict, List, Optional, Protocol
+from typing import Any, Callable, Dict, List, Optional, Protocol, Union
 
 # Ensure imports using either ``providers`` or ``src.providers`` resolve to the
 # same module instance so exception classes remain identical across import
@@ -150,7 +151,11 @@ class OllamaProvider(LLMProvider):
         self.api_key = api_key  # Included for API-compatibility; typically not required.
         self.base_url = base_url or "http://localhost:11434"
         self.default_model = default_model or "llama3"
+        # Applied to chat requests that don't pass their own ``keep_alive``.
+        # None leaves the decision to the Ollama daemon (5 minutes by default).
+        self.keep_alive: Optional[Union[str, float]] = None
         self.client = None
+        self._response_observers: List[Callable[[Dict[str, Any]], None]] = []
         self._initialize_client()
 
     def _initialize_client(self) -> None:
@@ -243,6 +248,103 @@ class OllamaProvider(LLMProvider):
             logger.warning(f"Failed to list Ollama models: {e}")
             return []
 
+    def add_response_observer(self, observer: Callable[[Dict[str, Any]], None]) -> None:
+        """
+        Register a callback invoked with timing stats after each chat call.
+
+        Args:
+            observer: Callable receiving a dict with 'model', 'latency' (wall
+                seconds) and the Ollama duration fields (nanoseconds)
+        """
+        if observer not in self._response_observers:
+            self._response_observers.append(observer)
+
+    def remove_response_observer(self, observer: Callable[[Dict[str, Any]], None]) -> None:
+        """Unregister a callback added with `add_response_observer`."""
+        if observer in self._response_observers:
+            self._response_observers.remove(observer)
+
+    def record_response(self, stats: Dict[str, Any]) -> None:
+        """
+        Report a chat request served elsewhere (e.g. a pooled endpoint).
+
+        Args:
+            stats: Same fields `add_response_observer` callbacks receive
+        """
+        if self._response_observers:
+            self._notify_response_observers(stats)
+
+    def _notify_response_observers(self, stats: Dict[str, Any]) -> None:
+        """Deliver timing stats to observers, isolating their failures."""
+        for observer in list(self._response_observers):
+            try:
+                observer(stats)
+            except Exception as e:
+                logger.error(f"Response observer failed: {e}", exc_info=True)
+
+    def preload_model(
+        self,
+        model: Optional[str] = None,
+        keep_alive: Optional[Union[str, float]] = None,
+    ) -> float:
+        """
+        Load a model into memory without generating any tokens.
+
+        Ollama loads a model when it receives a generate request with no
+        prompt, so this can be used to warm the model before the first
+        question arrives.
+
+        Args:
+            model: Model name (default: uses default_model)
+            keep_alive: How long the daemon should keep the model resident
+
+        Returns:
+            Model load time in seconds as reported by Ollama (0.0 when the
+            model was already resident)
+
+        Raises:
+            ProviderConnectionError: If the daemon cannot be reached
+            ProviderError: If the model cannot be loaded
+        """
+        if self.client is None:
+            raise ProviderConnectionError("Client not initialized")
+
+        model_name = model or self.default_model
+        request_kwargs: Dict[str, Any] = {"model": model_name}
+        effective_keep_alive = keep_alive if keep_alive is not None else self.keep_alive
+        if effective_keep_alive is not None:
+            request_kwargs["keep_alive"] = effective_keep_alive
+
+        try:
+            response = self.client.generate(**request_kwargs)
+        except Exception as exc:
+            if "connection" in str(exc).lower():
+                raise ProviderConnectionError(f"Ollama connection failed: {exc}")
+            raise ProviderError(f"Failed to load model '{model_name}': {exc}")
+
+        return (response.get("load_duration") or 0) / 1e9
+
+    def unload_model(self, model: Optional[str] = None) -> bool:
+        """
+        Ask Ollama to evict a model from memory immediately.
+
+        Args:
+            model: Model name (default: uses default_model)
+
+        Returns:
+            True if the request succeeded, False otherwise
+        """
+        if self.client is None:
+            return False
+
+        model_name = model or self.default_model
+        try:
+            self.client.generate(model=model_name, keep_alive=0)
+            return True
+        except Exception as e:
+            logger.warning(f"Failed to unload Ollama model '{model_name}': {e}")
+            return False
+
     def chat(
         self,
         messages: List[Dict[str, str]],
@@ -293,23 +395,46 @@ class OllamaProvider(LLMProvider):
             if (value := kwargs.pop(key, None)) is not None:
                 client_kwargs[key] = value
 
+        if "keep_alive" not in client_kwargs and self.keep_alive is not None:
+            client_kwargs["keep_alive"] = self.keep_alive
+
         if kwargs:
             logger.debug(f"Ignoring unsupported Ollama chat kwargs: {list(kwargs.keys())}")
 
         try:
+            started = time.perf_counter()
             response = self.client.chat(**client_kwargs)
+            latency = time.perf_counter() - started
             message = response.get("message", {})
+            timings = {
+                key: response.get(key)
+                for key in (
+                    "load_duration",
+                    "prompt_eval_count",
+                    "prompt_eval_duration",
+                    "eval_duration",
+                    "total_duration",
+                )
+            }
+            if self._response_observers:
+                self._notify_response_observers(
+                    {"model": model_name, "latency": latency, **timings}
+                )
             return AwaitableDict({
                 "content": message.get("content", ""),
                 "model": response.get("model", model_name),
                 "stop_reason": response.get("done_reason"),
                 "usage": response.get("usage"),
+                "timings": timings,
             })
         except Exception as exc:
             error_str = str(exc).lower()
 
             if "connection" in error_str or "failed to connect" in error_str:
                 raise ProviderConnectionError(f"Ollama connection failed: {exc}")
+            if (getattr(exc, "status_code", None) or 0) >= 500:
+                # Server-side failures are transient from the caller's view
+                raise ProviderConnectionError(f"Ollama server error: {exc}")
             if "not found" in error_str:
                 raise ProviderError(
                     f"Model '{model_name}' not found. "
@@ -381,6 +506,111 @@ class OpenAIProvider(LLMProvider):
         except Exception:
             return False
 
+    def is_configured(self) -> bool:
+        """OpenAI-compatible servers only need a base URL."""
+        return bool(self.base_url)
+
+    def test_connection(self) -> ProviderHealth:
+        """Test connectivity by listing the server's models."""
+        try:
+            models = self._fetch_models()
+        except ProviderError as exc:
+            return ProviderHealth(
+                is_healthy=False,
+                message=f"❌ Failed to reach {self.base_url}: {exc}",
+                error_type="connection",
+                details={"original_error": str(exc)},
+            )
+
+        return ProviderHealth(
+            is_healthy=True,
+            message=f"✅ Connected to {self.base_url}. {len(models)} models available.",
+            details={"models": models},
+        )
+
+    def list_models(self) -> List[str]:
+        """List model ids exposed by the server."""
+        try:
+            return self._fetch_models()
+        except ProviderError as e:
+            logger.warning(f"Failed to list OpenAI-compatible models: {e}")
+            return []
+
+    def _fetch_models(self) -> List[str]:
+        """GET /models and return the model ids."""
+        url = f"{self.base_url.rstrip('/')}/models"
+        headers = {"Authorization": f"Bearer {self.api_key}"}
+        try:
+            response = requests.get(url, headers=headers, timeout=10)
+            response.raise_for_status()
+            data = response.json()
+        except (requests.ConnectionError, requests.Timeout) as exc:
+            raise ProviderConnectionError(f"Connection failed: {exc}")
+        except Exception as exc:
+            raise ProviderError(f"Model listing failed: {exc}")
+        return [m.get("id", "") for m in data.get("data", []) if m.get("id")]
+
+    def chat(
+        self,
+        messages: List[Dict[str, str]],
+        model: Optional[str] = None,
+        **kwargs: Any,
+    ) -> AwaitableDict:
+        """
+        Send a chat completion request.
+
+        Args:
+            messages: Conversation messages with 'role' and 'content'
+            model: Model name (default: uses default_model)
+            **kwargs: Additional parameters (max_tokens, temperature, ...)
+
+        Returns:
+            Response dict with 'content', 'model', 'stop_reason', and 'usage'
+
+        Raises:
+            ProviderConnectionError: On connection errors, timeouts and 5xx
+                responses (safe to retry elsewhere)
+            ProviderError: For any other failure
+        """
+        model_name = model or self.default_model
+        url = f"{self.base_url.rstrip('/')}/chat/completions"
+        headers = {
+            "Authorization": f"Bearer {self.api_key}",
+            "Content-Type": "application/json"
+        }
+        payload: Dict[str, Any] = {"model": model_name, "messages": messages}
+        for key in ("max_tokens", "temperature", "top_p", "presence_penalty",
+                    "frequency_penalty", "stop"):
+            if (value := kwargs.pop(key, None)) is not None:
+                payload[key] = value
+        timeout = kwargs.pop("timeout", 60)
+
+        if kwargs:
+            logger.debug(f"Ignoring unsupported OpenAI chat kwargs: {list(kwargs.keys())}")
+
+        try:
+            response = requests.post(url, headers=headers, json=payload, timeout=timeout)
+        except (requests.ConnectionError, requests.Timeout) as exc:
+            raise ProviderConnectionError(f"Connection to {self.base_url} failed: {exc}")
+
+        if response.status_code >= 500:
+            raise ProviderConnectionError(
+                f"{self.base_url} returned HTTP {response.status_code}"
+            )
+        try:
+            response.raise_for_status()
+            data = response.json()
+            choice = data["choices"][0]
+        except Exception as exc:
+            raise ProviderError(f"API request failed: {exc}")
+
+        return AwaitableDict({
+            "content": choice.get("message", {}).get("content", ""),
+            "model": data.get("model", model_name),
+            "stop_reason": choice.get("finish_reason"),
+            "usage": data.get("usage"),
+        })
+
 
 def get_provider_class(provider_name: str) -> type:
     """
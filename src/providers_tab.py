@@ -20,6 +20,7 @@ from PyQt6.QtWidgets import (
 )
 from PyQt6.QtCore import pyqtSignal, QThread
 
+from src.ai_router import get_router
 from src.config import Config
 from src.provider_tester import ProviderTester
 
@@ -61,9 +62,7 @@ class FetchModelsThread(QThread):
     def run(self):
         """Fetch models from Ollama"""
         try:
-            import ollama
-
-            client = ollama.Client(host=self.base_url)
+            client = ProviderTester.get_client(self.base_url)
             models_response = client.list()
             models = [
                 m.get("name", "")
@@ -95,8 +94,19 @@ class ProvidersTab(QWidget):
         self.init_ui()
         self.load_config()
 
-        # Auto-fetch models on init
-        self.refresh_models()
+        # Show the router's cached models right away; only hit the network
+        # (in a background thread) when the cache is stale or for another host.
+        # The health monitor reports new listings through models_changed.
+        self.health_monitor = get_router(self.config).health_monitor
+        self.health_monitor.models_changed.connect(self.on_models_fetched)
+        cached_models = self.health_monitor.get_models()
+        if cached_models:
+            self.on_models_fetched(cached_models)
+        if not (
+            self.health_monitor.is_fresh()
+            and self.host_input.text().strip() == (self.config.ollama_host or "")
+        ):
+            self.refresh_models()
 
     def init_ui(self):
         """Initialize the UI"""
@@ -442,6 +452,13 @@ class ProvidersTab(QWidget):
         """Refresh the list of available Ollama models"""
         base_url = self.host_input.text().strip() or "http://localhost:11434"
 
+        if base_url == (self.config.ollama_host or "http://localhost:11434"):
+            # The configured host is the router's: let its health monitor
+            # re-list models rather than fetching them a second time
+            self.health_monitor.refresh()
+            return
+
+        # An edited, unsaved host: query it directly
         self.refresh_btn.setEnabled(False)
         self.refresh_btn.setText("🔄 Loading...")
 
@@ -492,6 +509,10 @@ class ProvidersTab(QWidget):
 
     def closeEvent(self, event):
         """Clean up threads on close"""
+        try:
+            self.health_monitor.models_changed.disconnect(self.on_models_fetched)
+        except TypeError:
+            pass
         if self.test_thread and self.test_thread.isRunning():
             self.test_thread.terminate()
             self.test_thread.wait(1000)
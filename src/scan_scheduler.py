@@ -0,0 +1,149 @@
+"""
+Scan Scheduler Module
+Adaptive cadence for game detection scans
+"""
+
+import logging
+import threading
+import time
+from typing import Callable, Set
+
+import psutil
+
+logger = logging.getLogger(__name__)
+
+
+class AdaptiveScanScheduler:
+    """
+    Decides how long to wait between game detection scans
+
+    - Right after start-up and after a game exits, scans run every
+      ``fast_interval`` seconds for ``fast_period`` seconds so a launch is
+      noticed quickly.
+    - While a detected game's PID stays alive, full scans are replaced by a
+      ``psutil.pid_exists`` check and the delay grows by ``backoff`` up to
+      ``max_interval``.
+    - Otherwise scans run every ``base_interval`` seconds.
+    - `hint` (e.g. a hotkey press) forces a full scan at the next wake-up
+      and resets the backoff; registered wake callbacks are run so sleeping
+      loops can react immediately.
+    """
+
+    DEFAULT_FAST_INTERVAL = 1.0
+    DEFAULT_BASE_INTERVAL = 5.0
+    DEFAULT_MAX_INTERVAL = 60.0
+    DEFAULT_BACKOFF = 2.0
+    DEFAULT_FAST_PERIOD = 30.0
+
+    def __init__(
+        self,
+        fast_interval: float = DEFAULT_FAST_INTERVAL,
+        base_interval: float = DEFAULT_BASE_INTERVAL,
+        max_interval: float = DEFAULT_MAX_INTERVAL,
+        backoff: float = DEFAULT_BACKOFF,
+        fast_period: float = DEFAULT_FAST_PERIOD,
+        clock: Callable[[], float] = time.monotonic,
+        pid_exists: Callable[[int], bool] = psutil.pid_exists,
+    ):
+        """
+        Initialize the scheduler
+
+        Args:
+            fast_interval: Delay during the fast period
+            base_interval: Delay while no game is running
+            max_interval: Upper bound for the backoff while a game runs
+            backoff: Multiplier applied after each confirmed-alive check
+            fast_period: Seconds of fast scanning after start-up or game exit
+            clock: Monotonic time source (injectable for tests)
+            pid_exists: Liveness check (injectable for tests)
+        """
+        self.fast_interval = fast_interval
+        self.base_interval = base_interval
+        self.max_interval = max(max_interval, base_interval)
+        self.backoff = max(1.0, backoff)
+        self.fast_period = fast_period
+        self._clock = clock
+        self._pid_exists = pid_exists
+
+        self._lock = threading.Lock()
+        self._game_pids: Set[int] = set()
+        self._interval = base_interval
+        self._fast_until = clock() + fast_period
+        self._hint_pending = False
+        self._wake_callbacks = []
+
+        self.full_scans = 0
+        self.liveness_checks = 0
+
+    def add_wake_callback(self, callback: Callable[[], None]) -> None:
+        """Register a callback that interrupts a sleeping scan loop"""
+        with self._lock:
+            if callback not in self._wake_callbacks:
+                self._wake_callbacks.append(callback)
+
+    def on_game_started(self, pid: int) -> None:
+        """A known game process appeared"""
+        with self._lock:
+            self._game_pids.add(pid)
+            self._interval = self.base_interval
+            self._fast_until = 0.0
+
+    def on_game_exited(self, pid: int) -> None:
+        """A known game process went away"""
+        with self._lock:
+            self._game_pids.discard(pid)
+            if not self._game_pids:
+                self._interval = self.base_interval
+                self._fast_until = self._clock() + self.fast_period
+
+    def hint(self, reason: str = "") -> None:
+        """Request a full scan as soon as possible"""
+        with self._lock:
+            self._hint_pending = True
+            self._interval = self.base_interval
+            callbacks = list(self._wake_callbacks)
+        logger.debug(f"Rescan requested{f' ({reason})' if reason else ''}")
+        for callback in callbacks:
+            try:
+                callback()
+            except Exception as e:
+                logger.error(f"Scan wake callback failed: {e}")
+
+    def next_delay(self) -> float:
+        """Seconds to sleep before the next wake-up"""
+        with self._lock:
+            if self._hint_pending:
+                return 0.0
+            if self._clock() < self._fast_until:
+                return self.fast_interval
+            if self._game_pids:
+                return self._interval
+            return self.base_interval
+
+    def should_full_scan(self) -> bool:
+        """
+        Decide what to do at a wake-up
+
+        Returns:
+            True if a full process scan is needed, False if every tracked
+            game PID is still alive (the delay is then backed off)
+        """
+        with self._lock:
+            if self._hint_pending:
+                self._hint_pending = False
+                self.full_scans += 1
+                return True
+            pids = set(self._game_pids)
+            if not pids or self._clock() < self._fast_until:
+                self.full_scans += 1
+                return True
+
+        self.liveness_checks += 1
+        if all(self._pid_exists(pid) for pid in pids):
+            with self._lock:
+                self._interval = min(self.max_interval, self._interval * self.backoff)
+            return False
+
+        with self._lock:
+            self.full_scans += 1
+        return True
@@ -8,6 +8,7 @@ from typing import Optional, Dict, List
 from datetime import datetime
 
 from src.session_logger import SessionLogger, SessionEvent, get_session_logger
+from src.session_summarizer import SessionSummarizer, format_events
 from src.ai_router import get_router, AIRouter
 from src.config import Config
 
@@ -22,7 +23,8 @@ class SessionCoach:
     def __init__(
         self,
         session_logger: Optional[SessionLogger] = None,
-        config: Optional[Config] = None
+        config: Optional[Config] = None,
+        summarizer: Optional[SessionSummarizer] = None
     ):
         """
         Initialize session coach
@@ -30,11 +32,21 @@ class SessionCoach:
         Args:
             session_logger: SessionLogger instance (uses global if None)
             config: Config instance (creates new if None)
+            summarizer: SessionSummarizer for long sessions (created for
+                SessionLogger instances if None)
         """
         self.session_logger = session_logger or get_session_logger()
         self.config = config or Config()
         self.router = get_router(self.config)
 
+        self.summarizer = summarizer
+        if self.summarizer is None and isinstance(self.session_logger, SessionLogger):
+            self.summarizer = SessionSummarizer(
+                self.session_logger,
+                self._summarize,
+                self.session_logger.config_dir / "session_summaries",
+            )
+
         logger.info("SessionCoach initialized")
 
     def _format_events_for_recap(self, events: List[SessionEvent]) -> str:
@@ -93,6 +105,64 @@ class SessionCoach:
 
         return "\n".join(lines)
 
+    def _complete(self, system_prompt: str, prompt: str) -> str:
+        """
+        Send one system + user prompt pair through the router
+
+        Args:
+            system_prompt: Instructions for the model
+            prompt: User prompt
+
+        Returns:
+            Response text
+        """
+        response = self.router.chat(
+            messages=[
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": prompt},
+            ],
+            provider=self.config.ai_provider
+        )
+        return response["content"]
+
+    def _summarize(self, prompt: str) -> str:
+        """Run one summarization prompt through the configured provider"""
+        return self._complete(
+            "You summarize gaming session activity concisely and factually.", prompt
+        )
+
+    def _build_recap_activity(self, game_profile_id: str, events: List[SessionEvent]) -> str:
+        """
+        Describe the current session for a recap prompt
+
+        Uses the summarizer's window summaries plus the events logged since
+        the last window, so the prompt size does not grow with the session.
+        Falls back to formatting the in-memory events directly.
+
+        Args:
+            game_profile_id: Game profile ID
+            events: Current in-memory session events
+
+        Returns:
+            Formatted session activity
+        """
+        session_id = self.session_logger.current_sessions.get(game_profile_id)
+        if self.summarizer is None or not session_id:
+            return self._format_events_for_recap(events)
+
+        summaries, recent = self.summarizer.get_recap_context(game_profile_id, session_id)
+        if not summaries:
+            return self._format_events_for_recap(events)
+
+        lines = [f"Session started at: {summaries[0].start_time.strftime('%Y-%m-%d %H:%M')}\n"]
+        lines.append("## Earlier in the Session:")
+        lines.extend(f"- {summary.format()}" for summary in summaries)
+        if recent:
+            lines.append("")
+            lines.append("## Latest Activity:")
+            lines.append(format_events(recent))
+        return "\n".join(lines)
+
     def generate_session_recap(
         self,
         game_profile_id: str,
@@ -118,8 +188,8 @@ class SessionCoach:
             # Get session summary stats
             summary = self.session_logger.get_session_summary(game_profile_id)
 
-            # Format events
-            events_text = self._format_events_for_recap(events)
+            # Format events (window summaries for long sessions)
+            events_text = self._build_recap_activity(game_profile_id, events)
 
             # Create prompt for AI
             game_str = game_name or game_profile_id
@@ -140,11 +210,9 @@ Please provide a concise session recap that includes:
 Keep the tone friendly and encouraging. Format the response with clear sections."""
 
             # Call AI
-            response = self.router.generate_response(
-                prompt=prompt,
-                provider=self.config.ai_provider,
-                system_prompt="You are a helpful gaming coach providing session recaps and next-step suggestions.",
-                conversation_history=[]
+            response = self._complete(
+                "You are a helpful gaming coach providing session recaps and next-step suggestions.",
+                prompt
             )
 
             logger.info(f"Generated session recap for {game_profile_id}")
@@ -203,11 +271,9 @@ Focus on:
 Keep the response concise and actionable."""
 
             # Call AI
-            response = self.router.generate_response(
-                prompt=prompt,
-                provider=self.config.ai_provider,
-                system_prompt="You are a helpful gaming coach focused on progress tracking and improvement.",
-                conversation_history=[]
+            response = self._complete(
+                "You are a helpful gaming coach focused on progress tracking and improvement.",
+                prompt
             )
 
             logger.info(f"Answered coach question for {game_profile_id}")
@@ -235,18 +301,16 @@ Keep the response concise and actionable."""
             AI-generated progress summary
         """
         try:
-            # Get all recent events
-            events = self.session_logger.get_recent_events(game_profile_id, limit=100)
-
-            if not events:
-                return "No session history available yet."
-
-            # Filter by date range
+            # Get recent events within the date range
             from datetime import timedelta
             cutoff_date = datetime.now() - timedelta(days=days)
-            recent_events = [e for e in events if e.timestamp >= cutoff_date]
+            recent_events = self.session_logger.get_events_since(
+                game_profile_id, cutoff_date, limit=100
+            )
 
             if not recent_events:
+                if not self.session_logger.get_all_sessions(game_profile_id):
+                    return "No session history available yet."
                 return f"No session activity in the last {days} days."
 
             # Count sessions (approximate by gaps)
@@ -277,11 +341,9 @@ Please provide a progress summary that includes:
 Keep it encouraging and constructive."""
 
             # Call AI
-            response = self.router.generate_response(
-                prompt=prompt,
-                provider=self.config.ai_provider,
-                system_prompt="You are a supportive gaming coach analyzing player progress.",
-                conversation_history=[]
+            response = self._complete(
+                "You are a supportive gaming coach analyzing player progress.",
+                prompt
             )
 
             logger.info(f"Generated progress summary for {game_profile_id}")
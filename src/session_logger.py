@@ -3,18 +3,34 @@ Session Logger Module
 Tracks user interactions and AI responses per game profile for coaching and recap
 """
 
+import atexit
 import logging
 import json
 import os
+import queue
+import re
 import threading
+import time
+import weakref
 from pathlib import Path
-from typing import List, Dict, Optional
+from typing import Any, Callable, List, Dict, Optional, Tuple
 from datetime import datetime, timedelta
 from dataclasses import dataclass, asdict, field
 from collections import deque
 
+from src.session_stats import RollingSessionStats, SessionStatsSidecar
+
 logger = logging.getLogger(__name__)
 
+# Session IDs are start timestamps, e.g. 20240131_184502
+SESSION_FILE_PATTERN = re.compile(r"^(.+)_(\d{8}_\d{6})$")
+
+# Sentinel telling the writer thread to exit
+_STOP = object()
+
+# Loggers flushed at interpreter exit
+_live_loggers: "weakref.WeakSet" = weakref.WeakSet()
+
 
 @dataclass
 class SessionEvent:
@@ -51,27 +67,132 @@ class SessionEvent:
         return cls(**data)
 
 
+def read_session_file(session_file: Path) -> List[SessionEvent]:
+    """
+    Parse a JSONL or legacy JSON session log, skipping damaged lines
+
+    Args:
+        session_file: Path to a ``.jsonl`` or ``.json`` session log
+
+    Returns:
+        Events in file order
+    """
+    if session_file.suffix == ".json":
+        with open(session_file, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        return [SessionEvent.from_dict(e) for e in data.get("events", [])]
+
+    events = []
+    with open(session_file, "r", encoding="utf-8") as f:
+        for line_number, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                events.append(SessionEvent.from_dict(json.loads(line)))
+            except (ValueError, TypeError) as e:
+                logger.warning(
+                    f"Skipping damaged line {line_number} in {session_file.name}: {e}"
+                )
+    return events
+
+
+def parse_session_filename(session_file: Path) -> Optional[Tuple[str, str]]:
+    """Split a session log name into (game_profile_id, session_id)"""
+    match = SESSION_FILE_PATTERN.match(session_file.stem)
+    if not match:
+        return None
+    return match.group(1), match.group(2)
+
+
 class SessionLogger:
     """
     Logs gaming session events for coaching and recap features
+
+    Each session is stored as an append-only JSON Lines file
+    (``{game_profile_id}_{session_id}.jsonl``). Events are buffered and
+    written in group commits once ``flush_events`` are pending or
+    ``flush_interval`` seconds have passed, so a write costs O(1) no matter
+    how long the session is. ``fsync_policy`` controls durability:
+
+    - ``always``: commit and fsync every event
+    - ``batch``: fsync once per group commit (default)
+    - ``never``: leave syncing to the operating system
+
+    Finished sessions are compacted: torn lines left by a crash are
+    dropped and legacy ``.json`` logs are rewritten as ``.jsonl``.
+
+    With ``background=True`` (default) serialization and disk I/O run on a
+    dedicated writer thread; `log_event` only updates the in-memory window
+    and enqueues the event on a bounded queue. When the queue is full,
+    ``backpressure`` decides whether the caller waits (``block``) or the
+    oldest queued event is discarded (``drop_oldest``); compaction tasks
+    are never dropped. Pending events are flushed at interpreter exit.
+
+    When a `SessionStore` is supplied, group commits go to SQLite instead
+    of JSONL files and history queries use its indexes.
     """
 
     # Maximum events to keep in memory per game
     MAX_EVENTS_IN_MEMORY = 100
 
-    # Maximum events to persist to disk per game
-    MAX_EVENTS_ON_DISK = 500
-
     # Session timeout (if no events for this duration, consider it a new session)
     SESSION_TIMEOUT = timedelta(hours=2)
 
-    def __init__(self, config_dir: Optional[str] = None):
+    # Group commit thresholds
+    DEFAULT_FLUSH_EVENTS = 10
+    DEFAULT_FLUSH_INTERVAL = 2.0  # seconds
+
+    FSYNC_POLICIES = ("always", "batch", "never")
+
+    # Writer queue
+    DEFAULT_QUEUE_SIZE = 1000
+    BACKPRESSURE_POLICIES = ("block", "drop_oldest")
+
+    def __init__(
+        self,
+        config_dir: Optional[str] = None,
+        flush_events: int = DEFAULT_FLUSH_EVENTS,
+        flush_interval: float = DEFAULT_FLUSH_INTERVAL,
+        fsync_policy: str = "batch",
+        background: bool = True,
+        queue_size: int = DEFAULT_QUEUE_SIZE,
+        backpressure: str = "block",
+        store: Optional[Any] = None,
+    ):
         """
         Initialize session logger
 
         Args:
             config_dir: Directory to store session logs (defaults to ~/.gaming_ai_assistant)
+            flush_events: Pending events that trigger a group commit
+            flush_interval: Seconds after which pending events are committed
+            fsync_policy: 'always', 'batch' or 'never'
+            background: Write from a dedicated thread instead of the caller's
+            queue_size: Maximum events waiting for the writer thread
+            backpressure: 'block' or 'drop_oldest' when the queue is full
+            store: Optional SessionStore; when given, events are committed to
+                it instead of JSONL files and existing logs are imported
+
+        Raises:
+            ValueError: If fsync_policy or backpressure is unknown
         """
+        if fsync_policy not in self.FSYNC_POLICIES:
+            raise ValueError(
+                f"Unknown fsync policy: {fsync_policy}. "
+                f"Expected one of: {', '.join(self.FSYNC_POLICIES)}"
+            )
+        if backpressure not in self.BACKPRESSURE_POLICIES:
+            raise ValueError(
+                f"Unknown backpressure policy: {backpressure}. "
+                f"Expected one of: {', '.join(self.BACKPRESSURE_POLICIES)}"
+            )
+        self.flush_events = max(1, flush_events)
+        self.flush_interval = flush_interval
+        self.fsync_policy = fsync_policy
+        self.background = background
+        self.backpressure = backpressure
+
         if config_dir is None:
             config_dir = os.path.expanduser("~/.gaming_ai_assistant")
 
@@ -88,15 +209,84 @@ class SessionLogger:
         # Last event timestamps: {game_profile_id: datetime}
         self.last_event_time: Dict[str, datetime] = {}
 
+        # Rolling aggregates for the current session: {game_profile_id: stats}
+        self.session_stats: Dict[str, RollingSessionStats] = {}
+
+        # Callbacks notified of every logged event
+        self._event_observers: List[Callable[[str, str, SessionEvent, int], None]] = []
+
+        # Events waiting for the next group commit: {(game, session): [events]}
+        self._pending: Dict[Tuple[str, str], List[SessionEvent]] = {}
+        self._pending_count = 0
+        self._last_commit = time.monotonic()
+
         # File write lock to prevent concurrent write corruption
-        self._save_lock = threading.Lock()
+        self._save_lock = threading.RLock()
+
+        # Writer thread state
+        self._queue: "queue.Queue" = queue.Queue(maxsize=max(1, queue_size))
+        self._writer: Optional[threading.Thread] = None
+        self._writer_lock = threading.Lock()
+        self._closed = False
+        self._enqueued = 0
+        self._written = 0
+        self._dropped = 0
+        self._max_queue_depth = 0
+
+        _live_loggers.add(self)
+
+        # Cross-session aggregates, rebuilt once if the sidecar is missing
+        self.lifetime_stats = SessionStatsSidecar(self.logs_dir / SessionStatsSidecar.FILENAME)
+        if not self.lifetime_stats.loaded:
+            self._rebuild_lifetime_stats()
+
+        # Optional SQLite backend
+        self.store = store
+        if self.store is not None:
+            self.store.import_logs(str(self.logs_dir))
 
         logger.info(f"SessionLogger initialized at {self.logs_dir}")
 
     def _get_session_file(self, game_profile_id: str, session_id: str) -> Path:
         """Get the file path for a session log"""
+        return self.logs_dir / f"{game_profile_id}_{session_id}.jsonl"
+
+    def _get_legacy_session_file(self, game_profile_id: str, session_id: str) -> Path:
+        """Get the path a session was stored at before JSONL logs"""
         return self.logs_dir / f"{game_profile_id}_{session_id}.json"
 
+    def _list_session_files(self, game_profile_id: str) -> Dict[str, Path]:
+        """Map session IDs to their log files (JSONL preferred over legacy JSON)"""
+        prefix = f"{game_profile_id}_"
+        files: Dict[str, Path] = {}
+        for pattern in (f"{prefix}*.json", f"{prefix}*.jsonl"):
+            for path in self.logs_dir.glob(pattern):
+                parsed = parse_session_filename(path)
+                if parsed and parsed[0] == game_profile_id:
+                    files[parsed[1]] = path
+        return files
+
+    def _rebuild_lifetime_stats(self) -> None:
+        """Recompute the cross-session sidecar from the session logs on disk"""
+        files: Dict[Tuple[str, str], Path] = {}
+        for path in sorted(self.logs_dir.glob("*.json")) + sorted(self.logs_dir.glob("*.jsonl")):
+            parsed = parse_session_filename(path)
+            if parsed:
+                files[parsed] = path
+        if not files:
+            return
+
+        def sessions():
+            for key in sorted(files):
+                try:
+                    yield read_session_file(files[key])
+                except Exception as e:
+                    logger.warning(f"Skipping unreadable session log {files[key].name}: {e}")
+
+        self.lifetime_stats.rebuild(sessions())
+        self.lifetime_stats.save()
+        logger.info(f"Rebuilt session statistics from {len(files)} session logs")
+
     def _get_current_session_id(self, game_profile_id: str) -> str:
         """
         Get or create current session ID for a game
@@ -111,9 +301,15 @@ class SessionLogger:
         last_time = self.last_event_time.get(game_profile_id)
         if last_time is None or (now - last_time) > self.SESSION_TIMEOUT:
             # New session
+            previous_id = self.current_sessions.get(game_profile_id)
             session_id = now.strftime("%Y%m%d_%H%M%S")
             self.current_sessions[game_profile_id] = session_id
             logger.info(f"Started new session for {game_profile_id}: {session_id}")
+            if previous_id and previous_id != session_id:
+                # Start the new session with an empty in-memory window
+                self.events.pop(game_profile_id, None)
+                if self.store is None:
+                    self._submit(("compact", (game_profile_id, previous_id)))
         else:
             # Continue existing session
             session_id = self.current_sessions.get(game_profile_id)
@@ -151,65 +347,274 @@ class SessionLogger:
                 meta=meta or {}
             )
 
+            # Get current session (may roll over to a new one)
+            session_id = self._get_current_session_id(game_profile_id)
+
             # Add to in-memory storage
             if game_profile_id not in self.events:
                 self.events[game_profile_id] = deque(maxlen=self.MAX_EVENTS_IN_MEMORY)
 
             self.events[game_profile_id].append(event)
 
-            # Get current session
-            session_id = self._get_current_session_id(game_profile_id)
+            # Update rolling aggregates
+            stats = self.session_stats.get(game_profile_id)
+            new_session = stats is None or stats.session_id != session_id
+            if new_session:
+                stats = RollingSessionStats(session_id=session_id)
+                self.session_stats[game_profile_id] = stats
+            stats.record(event_type, event.timestamp)
+            self.lifetime_stats.record(
+                game_profile_id, event_type, event.timestamp, new_session=new_session
+            )
 
-            # Persist to disk periodically (every 10 events)
-            if len(self.events[game_profile_id]) % 10 == 0:
-                self._save_session(game_profile_id, session_id)
+            self._submit(("event", (game_profile_id, session_id, event)))
+
+            for observer in list(self._event_observers):
+                try:
+                    observer(game_profile_id, session_id, event, stats.total_events)
+                except Exception as e:
+                    logger.error(f"Session event observer failed: {e}")
 
             logger.debug(f"Logged {event_type} event for {game_profile_id}")
 
         except Exception as e:
             logger.error(f"Failed to log event: {e}", exc_info=True)
 
-    def _save_session(self, game_profile_id: str, session_id: str) -> None:
-        """Save current session to disk"""
-        try:
-            if game_profile_id not in self.events:
-                return
+    def add_event_observer(
+        self, observer: Callable[[str, str, SessionEvent, int], None]
+    ) -> None:
+        """
+        Register a callback run after every logged event
 
-            session_file = self._get_session_file(game_profile_id, session_id)
+        Args:
+            observer: Called with (game_profile_id, session_id, event, index),
+                where index is the 1-based position of the event in its session
+        """
+        if observer not in self._event_observers:
+            self._event_observers.append(observer)
 
-            # Convert events to dict
-            events_data = [event.to_dict() for event in self.events[game_profile_id]]
+    def remove_event_observer(
+        self, observer: Callable[[str, str, SessionEvent, int], None]
+    ) -> None:
+        """Unregister a callback added with add_event_observer"""
+        if observer in self._event_observers:
+            self._event_observers.remove(observer)
+
+    def _submit(self, item: tuple) -> None:
+        """Hand a write task to the writer thread (or run it inline)"""
+        if not self.background or self._closed:
+            self._process(item)
+            return
+
+        self._ensure_writer()
+        if self.backpressure == "block" or item[0] != "event":
+            # Control tasks (compaction) are never dropped, so they wait
+            self._queue.put(item)
+        else:
+            while True:
+                try:
+                    self._queue.put_nowait(item)
+                    break
+                except queue.Full:
+                    if not self._drop_oldest_event():
+                        # Only control tasks are queued; wait for room
+                        self._queue.put(item)
+                        break
+
+        self._enqueued += 1
+        depth = self._queue.qsize()
+        if depth > self._max_queue_depth:
+            self._max_queue_depth = depth
+
+    def _drop_oldest_event(self) -> bool:
+        """
+        Discard the oldest queued event, leaving control tasks in place
 
-            # Limit to MAX_EVENTS_ON_DISK
-            if len(events_data) > self.MAX_EVENTS_ON_DISK:
-                events_data = events_data[-self.MAX_EVENTS_ON_DISK:]
+        Returns:
+            True if an event was dropped, False if none is queued
+        """
+        with self._queue.mutex:
+            for index, queued in enumerate(self._queue.queue):
+                if queued is not _STOP and queued[0] == "event":
+                    del self._queue.queue[index]
+                    self._queue.not_full.notify()
+                    break
+            else:
+                return False
+        self._queue.task_done()
+        self._dropped += 1
+        logger.warning("Session log queue full, dropped oldest event")
+        return True
+
+    def _process(self, item: tuple) -> None:
+        """Run one write task"""
+        kind, payload = item
+        if kind == "event":
+            self._append(*payload)
+            self._written += 1
+        elif kind == "compact":
+            with self._save_lock:
+                if self._pending_count:
+                    self._commit()
+            self._compact_session(*payload)
+
+    def _ensure_writer(self) -> None:
+        """Start the writer thread on first use"""
+        if self._writer and self._writer.is_alive():
+            return
+        with self._writer_lock:
+            if self._writer and self._writer.is_alive():
+                return
+            self._writer = threading.Thread(
+                target=self._writer_loop, daemon=True, name="SessionLogWriterThread"
+            )
+            self._writer.start()
 
-            # Save to file with lock protection to prevent concurrent write corruption
+    def _writer_loop(self) -> None:
+        """Drain the queue, committing pending events when it goes idle"""
+        while True:
             with self._save_lock:
-                with open(session_file, 'w') as f:
-                    json.dump({
-                        'game_profile_id': game_profile_id,
-                        'session_id': session_id,
-                        'events': events_data
-                    }, f, indent=2)
+                has_pending = self._pending_count > 0
+                wait = self.flush_interval - (time.monotonic() - self._last_commit)
+            try:
+                item = self._queue.get(timeout=max(0.0, wait) if has_pending else None)
+            except queue.Empty:
+                self.flush_pending()
+                continue
+
+            try:
+                if item is _STOP:
+                    return
+                self._process(item)
+            except Exception as e:
+                logger.error(f"Session log writer failed: {e}", exc_info=True)
+            finally:
+                self._queue.task_done()
+
+    def flush_pending(self) -> None:
+        """Commit events already handed to the writer's buffer"""
+        with self._save_lock:
+            if self._pending_count:
+                self._commit()
+            else:
+                self.lifetime_stats.save()
+
+    def get_writer_stats(self) -> Dict:
+        """
+        Get writer queue metrics
 
-            logger.debug(f"Saved session {session_id} for {game_profile_id}")
+        Returns:
+            Dictionary with queue depth, throughput and drop counts
+        """
+        return {
+            "background": self.background and not self._closed,
+            "queue_depth": self._queue.qsize(),
+            "max_queue_depth": self._max_queue_depth,
+            "queue_capacity": self._queue.maxsize,
+            "enqueued": self._enqueued,
+            "written": self._written,
+            "dropped": self._dropped,
+            "pending_commit": self._pending_count,
+            "backpressure": self.backpressure,
+        }
 
-        except Exception as e:
-            logger.error(f"Failed to save session: {e}")
+    def close(self) -> None:
+        """Stop the writer thread and commit everything still queued"""
+        if self._closed:
+            return
+        self._closed = True
+        writer = self._writer
+        if writer and writer.is_alive():
+            self._queue.put(_STOP)
+            writer.join(timeout=5)
+        # Anything left (e.g. the writer died) is written inline
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is not _STOP:
+                self._process(item)
+            self._queue.task_done()
+        self.flush_pending()
+
+    def _append(self, game_profile_id: str, session_id: str, event: SessionEvent) -> None:
+        """Buffer one event and commit if a size or time threshold is hit"""
+        with self._save_lock:
+            self._pending.setdefault((game_profile_id, session_id), []).append(event)
+            self._pending_count += 1
+            if (
+                self.fsync_policy == "always"
+                or self._pending_count >= self.flush_events
+                or time.monotonic() - self._last_commit >= self.flush_interval
+            ):
+                self._commit()
+
+    def _commit(self) -> None:
+        """Write all pending events (caller holds the lock)"""
+        pending, self._pending = self._pending, {}
+        self._pending_count = 0
+        self._last_commit = time.monotonic()
+        self.lifetime_stats.save()
+
+        if self.store is not None:
+            try:
+                self.store.add_events(
+                    (session_id, event)
+                    for (_, session_id), events in pending.items()
+                    for event in events
+                )
+            except Exception as e:
+                # Keep the events so the next commit retries them
+                logger.error(f"Failed to write session events to store: {e}")
+                self._requeue(pending)
+            return
+
+        for (game_profile_id, session_id), events in pending.items():
+            session_file = self._get_session_file(game_profile_id, session_id)
+            try:
+                lines = [json.dumps(event.to_dict(), ensure_ascii=False) for event in events]
+                with open(session_file, "a", encoding="utf-8") as f:
+                    f.write("\n".join(lines) + "\n")
+                    if self.fsync_policy != "never":
+                        f.flush()
+                        os.fsync(f.fileno())
+            except OSError as e:
+                # Keep the events so the next commit retries them
+                logger.error(f"Failed to write session log {session_file}: {e}")
+                self._requeue({(game_profile_id, session_id): events})
+
+    def _requeue(self, pending: Dict[Tuple[str, str], List[SessionEvent]]) -> None:
+        """Put events from a failed commit back in front of the buffer"""
+        for key, events in pending.items():
+            self._pending.setdefault(key, [])[:0] = events
+            self._pending_count += len(events)
+
+    def flush(self) -> None:
+        """Wait for queued events and commit them to disk"""
+        writer = self._writer
+        if writer and writer.is_alive() and threading.current_thread() is not writer:
+            self._queue.join()
+        self.flush_pending()
+
+    def _save_session(self, game_profile_id: str, session_id: str) -> None:
+        """Persist buffered events (kept for callers of the old snapshot API)"""
+        self.flush()
 
     def _load_session(self, game_profile_id: str, session_id: str) -> List[SessionEvent]:
         """Load a session from disk"""
         try:
-            session_file = self._get_session_file(game_profile_id, session_id)
+            self.flush()
+            if self.store is not None:
+                return self.store.get_events(game_profile_id, session_id=session_id)
 
+            session_file = self._get_session_file(game_profile_id, session_id)
+            if not session_file.exists():
+                session_file = self._get_legacy_session_file(game_profile_id, session_id)
             if not session_file.exists():
                 return []
 
-            with open(session_file, 'r') as f:
-                data = json.load(f)
-
-            events = [SessionEvent.from_dict(e) for e in data.get('events', [])]
+            events = read_session_file(session_file)
             logger.debug(f"Loaded {len(events)} events for session {session_id}")
             return events
 
@@ -217,6 +622,72 @@ class SessionLogger:
             logger.error(f"Failed to load session: {e}")
             return []
 
+    def get_session_events(self, game_profile_id: str, session_id: str) -> List[SessionEvent]:
+        """
+        Get every event recorded for a session
+
+        Args:
+            game_profile_id: Game profile ID
+            session_id: Session ID
+
+        Returns:
+            List of events in chronological order
+        """
+        return self._load_session(game_profile_id, session_id)
+
+    def _compact_session(self, game_profile_id: str, session_id: str) -> None:
+        """Rewrite a finished session as a clean JSONL file"""
+        try:
+            jsonl_file = self._get_session_file(game_profile_id, session_id)
+            legacy_file = self._get_legacy_session_file(game_profile_id, session_id)
+
+            events = []
+            if legacy_file.exists():
+                events.extend(read_session_file(legacy_file))
+            if jsonl_file.exists():
+                events.extend(read_session_file(jsonl_file))
+            if not events:
+                return
+
+            tmp_file = jsonl_file.with_suffix(".jsonl.tmp")
+            with self._save_lock:
+                with open(tmp_file, "w", encoding="utf-8") as f:
+                    for event in events:
+                        f.write(json.dumps(event.to_dict(), ensure_ascii=False) + "\n")
+                    f.flush()
+                    if self.fsync_policy != "never":
+                        os.fsync(f.fileno())
+                os.replace(tmp_file, jsonl_file)
+                if legacy_file.exists():
+                    legacy_file.unlink()
+
+            logger.debug(f"Compacted session {session_id} for {game_profile_id}")
+
+        except Exception as e:
+            logger.error(f"Failed to compact session {session_id}: {e}")
+
+    def compact(self, game_profile_id: str) -> int:
+        """
+        Compact all finished sessions for a game
+
+        Drops lines damaged by an interrupted write and converts legacy
+        JSON session files to JSONL. The current session is left alone.
+
+        Args:
+            game_profile_id: Game profile ID
+
+        Returns:
+            Number of sessions compacted
+        """
+        self.flush()
+        current = self.current_sessions.get(game_profile_id)
+        compacted = 0
+        for session_id in self._list_session_files(game_profile_id):
+            if session_id != current:
+                self._compact_session(game_profile_id, session_id)
+                compacted += 1
+        return compacted
+
     def get_current_session_events(self, game_profile_id: str) -> List[SessionEvent]:
         """
         Get events from the current session
@@ -243,25 +714,25 @@ class SessionLogger:
         Returns:
             List of recent events in chronological order
         """
-        # Get current session events
+        # The in-memory window covers recent history when it is large enough
         events = self.get_current_session_events(game_profile_id)
+        if len(events) >= limit:
+            return events[-limit:]
 
-        # If we need more, load from recent session files
-        if len(events) < limit:
-            session_files = sorted(
-                self.logs_dir.glob(f"{game_profile_id}_*.json"),
-                reverse=True  # Most recent first
-            )
+        if self.store is not None:
+            self.flush()
+            return self.store.get_recent_events(game_profile_id, limit)
 
-            for session_file in session_files[:5]:  # Check last 5 sessions
-                session_id = session_file.stem.split('_', 1)[1]  # Extract session_id
-                if session_id not in self.current_sessions.values():
-                    # Load historical session
-                    historical_events = self._load_session(game_profile_id, session_id)
-                    events = historical_events + events
+        # Otherwise read the session logs, newest first
+        session_files = self._list_session_files(game_profile_id)
+        events = []
+        for session_id in sorted(session_files, reverse=True)[:5]:  # Check last 5 sessions
+            events = self._load_session(game_profile_id, session_id) + events
+            if len(events) >= limit:
+                break
 
-                if len(events) >= limit:
-                    break
+        if not events:
+            events = self.get_current_session_events(game_profile_id)
 
         # Return most recent events up to limit
         return events[-limit:] if len(events) > limit else events
@@ -270,42 +741,33 @@ class SessionLogger:
         """
         Get a summary of the current session
 
+        Served from the rolling aggregates kept by log_event, so the cost
+        does not depend on the session length.
+
         Args:
             game_profile_id: Game profile ID
 
         Returns:
-            Dictionary with session statistics
+            Dictionary with session statistics, including an hour-of-day
+            histogram under 'hourly'
         """
-        events = self.get_current_session_events(game_profile_id)
+        stats = self.session_stats.get(game_profile_id)
+        if stats is None or stats.session_id != self.current_sessions.get(game_profile_id):
+            return RollingSessionStats().to_summary()
+        return stats.to_summary()
 
-        if not events:
-            return {
-                'total_events': 0,
-                'session_id': None,
-                'start_time': None,
-                'duration_minutes': 0,
-                'event_types': {}
-            }
-
-        # Count event types
-        event_types = {}
-        for event in events:
-            event_types[event.event_type] = event_types.get(event.event_type, 0) + 1
-
-        # Calculate duration
-        start_time = events[0].timestamp
-        end_time = events[-1].timestamp
-        duration = (end_time - start_time).total_seconds() / 60
-
-        session_id = self.current_sessions.get(game_profile_id, 'unknown')
+    def get_lifetime_stats(self, game_profile_id: str) -> Dict:
+        """
+        Get aggregates across every session recorded for a game
 
-        return {
-            'total_events': len(events),
-            'session_id': session_id,
-            'start_time': start_time.isoformat(),
-            'duration_minutes': round(duration, 1),
-            'event_types': event_types
-        }
+        Args:
+            game_profile_id: Game profile ID
+
+        Returns:
+            Dictionary with 'total_events', 'sessions', 'event_types',
+            'first_event', 'last_event', 'hourly' and per-ISO-week 'weeks'
+        """
+        return self.lifetime_stats.get(game_profile_id)
 
     def clear_session(self, game_profile_id: str) -> None:
         """
@@ -322,6 +784,7 @@ class SessionLogger:
 
             # Clear memory
             del self.events[game_profile_id]
+            self.session_stats.pop(game_profile_id, None)
             if game_profile_id in self.current_sessions:
                 del self.current_sessions[game_profile_id]
 
@@ -337,17 +800,64 @@ class SessionLogger:
         Returns:
             List of session IDs (sorted by date, most recent first)
         """
-        session_files = sorted(
-            self.logs_dir.glob(f"{game_profile_id}_*.json"),
-            reverse=True
-        )
+        self.flush()
+        if self.store is not None:
+            return self.store.get_session_ids(game_profile_id)
+        return sorted(self._list_session_files(game_profile_id), reverse=True)
+
+    def get_events_since(
+        self, game_profile_id: str, since: datetime, limit: int = 100
+    ) -> List[SessionEvent]:
+        """
+        Get the newest events at or after a point in time
 
-        session_ids = []
-        for session_file in session_files:
-            session_id = session_file.stem.split('_', 1)[1]
-            session_ids.append(session_id)
+        Args:
+            game_profile_id: Game profile ID
+            since: Earliest timestamp to include
+            limit: Maximum number of events to return
 
-        return session_ids
+        Returns:
+            List of events in chronological order
+        """
+        if self.store is not None:
+            self.flush()
+            return self.store.get_events(game_profile_id, start=since, limit=limit)
+        events = self.get_recent_events(game_profile_id, limit=limit)
+        return [event for event in events if event.timestamp >= since]
+
+    def get_event_counts(
+        self, game_profile_id: str, since: Optional[datetime] = None
+    ) -> Dict[str, int]:
+        """
+        Count events per type across sessions
+
+        Args:
+            game_profile_id: Game profile ID
+            since: Only count events at or after this time
+
+        Returns:
+            Mapping of event type to count
+        """
+        if self.store is not None:
+            self.flush()
+            return self.store.count_by_type(game_profile_id, start=since)
+
+        counts: Dict[str, int] = {}
+        for session_id in self.get_all_sessions(game_profile_id):
+            for event in self._load_session(game_profile_id, session_id):
+                if since is None or event.timestamp >= since:
+                    counts[event.event_type] = counts.get(event.event_type, 0) + 1
+        return counts
+
+
+@atexit.register
+def _close_live_loggers() -> None:
+    """Flush every session logger still alive at shutdown"""
+    for session_logger in list(_live_loggers):
+        try:
+            session_logger.close()
+        except Exception as e:
+            logger.error(f"Failed to flush session log at exit: {e}")
 
 
 # Global session logger instance
@@ -355,8 +865,19 @@ _session_logger: Optional[SessionLogger] = None
 
 
 def get_session_logger() -> SessionLogger:
-    """Get or create the global session logger instance"""
+    """
+    Get or create the global session logger instance
+
+    Set SESSION_LOG_BACKEND=sqlite to store events in SQLite instead of
+    JSONL files.
+    """
     global _session_logger
     if _session_logger is None:
-        _session_logger = SessionLogger()
+        store = None
+        if os.getenv("SESSION_LOG_BACKEND", "jsonl").lower() == "sqlite":
+            from src.session_store import SessionStore
+
+            logs_dir = Path(os.path.expanduser("~/.gaming_ai_assistant")) / "session_logs"
+            store = SessionStore(str(logs_dir / SessionStore.DB_FILENAME))
+        _session_logger = SessionLogger(store=store)
     return _session_logger
@@ -259,4 +259,16 @@ class SessionRecapDialog(QDialog):
         else:
             stats_lines.append("No events logged yet in this session.")
 
+        lifetime = self.session_logger.get_lifetime_stats(self.game_profile_id)
+        if lifetime['total_events']:
+            stats_lines.append("\n=== All Sessions ===\n")
+            stats_lines.append(f"Sessions: {lifetime['sessions']}")
+            stats_lines.append(f"Total Events: {lifetime['total_events']}")
+            if lifetime['weeks']:
+                week = max(lifetime['weeks'])
+                counts = lifetime['weeks'][week]
+                stats_lines.append(
+                    f"Week {week}: {counts['sessions']} sessions, {counts['events']} events"
+                )
+
         self.stats_text.setPlainText("\n".join(stats_lines))
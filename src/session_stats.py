@@ -0,0 +1,198 @@
+"""
+Session Statistics Module
+Rolling per-session and cross-session aggregates maintained as events arrive
+"""
+
+import json
+import logging
+import os
+import threading
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+def week_key(timestamp: datetime) -> str:
+    """ISO week bucket for a timestamp, e.g. '2024-W05'"""
+    year, week, _ = timestamp.isocalendar()
+    return f"{year}-W{week:02d}"
+
+
+@dataclass
+class RollingSessionStats:
+    """
+    Aggregates for the current session, updated in O(1) per event
+
+    Attributes:
+        session_id: Session the aggregates belong to
+        total_events: Number of events logged
+        event_types: Count per event type
+        start_time: Timestamp of the first event
+        end_time: Timestamp of the latest event
+        hourly: Events per hour of day (24 buckets)
+    """
+    session_id: Optional[str] = None
+    total_events: int = 0
+    event_types: Dict[str, int] = field(default_factory=dict)
+    start_time: Optional[datetime] = None
+    end_time: Optional[datetime] = None
+    hourly: List[int] = field(default_factory=lambda: [0] * 24)
+
+    def record(self, event_type: str, timestamp: datetime) -> None:
+        """Fold one event into the aggregates"""
+        self.total_events += 1
+        self.event_types[event_type] = self.event_types.get(event_type, 0) + 1
+        if self.start_time is None:
+            self.start_time = timestamp
+        self.end_time = timestamp
+        self.hourly[timestamp.hour] += 1
+
+    def to_summary(self) -> Dict:
+        """Convert to the dictionary returned by SessionLogger.get_session_summary"""
+        if not self.total_events:
+            return {
+                'total_events': 0,
+                'session_id': None,
+                'start_time': None,
+                'duration_minutes': 0,
+                'event_types': {},
+                'hourly': [0] * 24,
+            }
+        duration = (self.end_time - self.start_time).total_seconds() / 60
+        return {
+            'total_events': self.total_events,
+            'session_id': self.session_id,
+            'start_time': self.start_time.isoformat(),
+            'duration_minutes': round(duration, 1),
+            'event_types': dict(self.event_types),
+            'hourly': list(self.hourly),
+        }
+
+
+class SessionStatsSidecar:
+    """
+    Cross-session aggregates persisted next to the session logs
+
+    Keeps, per game profile, lifetime totals, counts per event type, the
+    number of sessions, an hour-of-day histogram and per-ISO-week event and
+    session counts. The file is a few hundred bytes per game and is
+    rewritten atomically by `save`, so reading lifetime statistics never
+    touches the session logs.
+    """
+
+    FILENAME = "stats.json"
+
+    def __init__(self, path: Path):
+        """
+        Load (or start) a statistics sidecar
+
+        Args:
+            path: Path of the sidecar JSON file
+        """
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._stats: Dict[str, Dict] = {}
+        self._dirty = False
+        self.loaded = self._load()
+
+    def _load(self) -> bool:
+        if not self.path.exists():
+            return False
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                self._stats = json.load(f).get("games", {})
+            return True
+        except Exception as e:
+            logger.error(f"Failed to load session stats sidecar: {e}")
+            self._stats = {}
+            return False
+
+    @staticmethod
+    def _empty() -> Dict:
+        return {
+            "total_events": 0,
+            "sessions": 0,
+            "event_types": {},
+            "first_event": None,
+            "last_event": None,
+            "hourly": [0] * 24,
+            "weeks": {},
+        }
+
+    def record(
+        self,
+        game_profile_id: str,
+        event_type: str,
+        timestamp: datetime,
+        new_session: bool = False,
+    ) -> None:
+        """
+        Fold one event into the lifetime aggregates
+
+        Args:
+            game_profile_id: Game profile ID
+            event_type: Event type
+            timestamp: Event timestamp
+            new_session: Whether this event started a new session
+        """
+        stamp = timestamp.isoformat()
+        week = week_key(timestamp)
+        with self._lock:
+            stats = self._stats.setdefault(game_profile_id, self._empty())
+            stats["total_events"] += 1
+            stats["event_types"][event_type] = stats["event_types"].get(event_type, 0) + 1
+            if stats["first_event"] is None:
+                stats["first_event"] = stamp
+            stats["last_event"] = stamp
+            stats["hourly"][timestamp.hour] += 1
+
+            bucket = stats["weeks"].setdefault(week, {"events": 0, "sessions": 0})
+            bucket["events"] += 1
+            if new_session:
+                stats["sessions"] += 1
+                bucket["sessions"] += 1
+            self._dirty = True
+
+    def rebuild(self, sessions: Iterable) -> None:
+        """
+        Recompute aggregates from existing history
+
+        Args:
+            sessions: Iterable of event lists, one list per session
+        """
+        with self._lock:
+            self._stats = {}
+        for events in sessions:
+            for index, event in enumerate(events):
+                self.record(
+                    event.game_profile_id,
+                    event.event_type,
+                    event.timestamp,
+                    new_session=index == 0,
+                )
+
+    def get(self, game_profile_id: str) -> Dict:
+        """Get a copy of the lifetime aggregates for a game"""
+        with self._lock:
+            stats = self._stats.get(game_profile_id)
+            return json.loads(json.dumps(stats)) if stats else self._empty()
+
+    def save(self) -> None:
+        """Write the sidecar atomically if anything changed"""
+        with self._lock:
+            if not self._dirty:
+                return
+            data = json.dumps({"games": self._stats}, separators=(",", ":"))
+            self._dirty = False
+        try:
+            tmp_path = self.path.with_suffix(".json.tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.write(data)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            logger.error(f"Failed to save session stats sidecar: {e}")
+            with self._lock:
+                self._dirty = True
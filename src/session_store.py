@@ -0,0 +1,342 @@
+"""
+Session Store Module
+SQLite-backed session history with indexed range and aggregate queries
+"""
+
+import argparse
+import json
+import logging
+import os
+import sqlite3
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from src.session_logger import SessionEvent, parse_session_filename, read_session_file
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS events (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    game_profile_id TEXT NOT NULL,
+    session_id TEXT NOT NULL,
+    timestamp TEXT NOT NULL,
+    event_type TEXT NOT NULL,
+    content TEXT NOT NULL,
+    meta TEXT NOT NULL DEFAULT '{}'
+);
+CREATE INDEX IF NOT EXISTS idx_events_game_time
+    ON events (game_profile_id, timestamp);
+CREATE INDEX IF NOT EXISTS idx_events_game_type_time
+    ON events (game_profile_id, event_type, timestamp);
+CREATE INDEX IF NOT EXISTS idx_events_game_session
+    ON events (game_profile_id, session_id);
+CREATE TABLE IF NOT EXISTS imported_files (
+    name TEXT PRIMARY KEY,
+    events INTEGER NOT NULL,
+    imported_at TEXT NOT NULL
+);
+"""
+
+_EVENT_COLUMNS = "timestamp, event_type, game_profile_id, content, meta"
+
+
+class SessionStore:
+    """
+    Session events stored in SQLite (WAL mode).
+
+    Events are indexed on (game_profile_id, timestamp) and
+    (game_profile_id, event_type, timestamp), so "last N events" and
+    per-type counts are single indexed queries regardless of how many
+    sessions have been recorded.
+    """
+
+    DB_FILENAME = "sessions.db"
+
+    def __init__(self, db_path: str):
+        """
+        Open (or create) a session database
+
+        Args:
+            db_path: Path to the SQLite database file
+        """
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+        self._conn.commit()
+        logger.info(f"SessionStore opened at {self.db_path}")
+
+    @staticmethod
+    def _row_to_event(row: Tuple) -> SessionEvent:
+        timestamp, event_type, game_profile_id, content, meta = row
+        return SessionEvent(
+            timestamp=timestamp,
+            event_type=event_type,
+            game_profile_id=game_profile_id,
+            content=content,
+            meta=json.loads(meta) if meta else {},
+        )
+
+    def add_events(self, events: Iterable[Tuple[str, SessionEvent]]) -> int:
+        """
+        Insert events in a single transaction
+
+        Args:
+            events: (session_id, event) pairs
+
+        Returns:
+            Number of events inserted
+        """
+        rows = [
+            (
+                event.game_profile_id,
+                session_id,
+                event.timestamp.isoformat(),
+                event.event_type,
+                event.content,
+                json.dumps(event.meta or {}, ensure_ascii=False),
+            )
+            for session_id, event in events
+        ]
+        if not rows:
+            return 0
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT INTO events "
+                "(game_profile_id, session_id, timestamp, event_type, content, meta) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+        return len(rows)
+
+    def _query(self, sql: str, params: Sequence) -> List[Tuple]:
+        with self._lock:
+            return self._conn.execute(sql, params).fetchall()
+
+    def get_recent_events(self, game_profile_id: str, limit: int = 50) -> List[SessionEvent]:
+        """
+        Get the most recent events across all sessions
+
+        Args:
+            game_profile_id: Game profile ID
+            limit: Maximum number of events to return
+
+        Returns:
+            List of events in chronological order
+        """
+        rows = self._query(
+            f"SELECT {_EVENT_COLUMNS} FROM events WHERE game_profile_id = ? "
+            "ORDER BY timestamp DESC, id DESC LIMIT ?",
+            (game_profile_id, limit),
+        )
+        return [self._row_to_event(row) for row in reversed(rows)]
+
+    def get_events(
+        self,
+        game_profile_id: str,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        event_types: Optional[Sequence[str]] = None,
+        session_id: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> List[SessionEvent]:
+        """
+        Get events in a time range
+
+        Args:
+            game_profile_id: Game profile ID
+            start: Inclusive lower bound on the timestamp
+            end: Exclusive upper bound on the timestamp
+            event_types: Only return these event types
+            session_id: Only return events from this session
+            limit: Return at most this many of the newest matching events
+
+        Returns:
+            List of events in chronological order
+        """
+        where, params = self._filters(game_profile_id, start, end, event_types)
+        if session_id is not None:
+            where.append("session_id = ?")
+            params.append(session_id)
+
+        sql = f"SELECT {_EVENT_COLUMNS} FROM events WHERE {' AND '.join(where)}"
+        if limit is not None:
+            rows = self._query(
+                f"{sql} ORDER BY timestamp DESC, id DESC LIMIT ?", params + [limit]
+            )
+            rows.reverse()
+        else:
+            rows = self._query(f"{sql} ORDER BY timestamp, id", params)
+        return [self._row_to_event(row) for row in rows]
+
+    @staticmethod
+    def _filters(
+        game_profile_id: str,
+        start: Optional[datetime],
+        end: Optional[datetime],
+        event_types: Optional[Sequence[str]],
+    ) -> Tuple[List[str], List]:
+        where = ["game_profile_id = ?"]
+        params: List = [game_profile_id]
+        if start is not None:
+            where.append("timestamp >= ?")
+            params.append(start.isoformat())
+        if end is not None:
+            where.append("timestamp < ?")
+            params.append(end.isoformat())
+        if event_types:
+            where.append(f"event_type IN ({', '.join('?' for _ in event_types)})")
+            params.extend(event_types)
+        return where, params
+
+    def count_by_type(
+        self,
+        game_profile_id: str,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+    ) -> Dict[str, int]:
+        """
+        Count events per type
+
+        Args:
+            game_profile_id: Game profile ID
+            start: Inclusive lower bound on the timestamp
+            end: Exclusive upper bound on the timestamp
+
+        Returns:
+            Mapping of event type to count
+        """
+        where, params = self._filters(game_profile_id, start, end, None)
+        rows = self._query(
+            f"SELECT event_type, COUNT(*) FROM events WHERE {' AND '.join(where)} "
+            "GROUP BY event_type",
+            params,
+        )
+        return dict(rows)
+
+    def get_session_ids(self, game_profile_id: str) -> List[str]:
+        """Get session IDs for a game, most recent first"""
+        rows = self._query(
+            "SELECT DISTINCT session_id FROM events WHERE game_profile_id = ? "
+            "ORDER BY session_id DESC",
+            (game_profile_id,),
+        )
+        return [row[0] for row in rows]
+
+    def get_sessions(
+        self, game_profile_id: str, start: Optional[datetime] = None
+    ) -> List[Dict]:
+        """
+        Get per-session aggregates
+
+        Args:
+            game_profile_id: Game profile ID
+            start: Only include events at or after this time
+
+        Returns:
+            List of dicts with 'session_id', 'start_time', 'end_time' and
+            'total_events', most recent first
+        """
+        where, params = self._filters(game_profile_id, start, None, None)
+        rows = self._query(
+            "SELECT session_id, MIN(timestamp), MAX(timestamp), COUNT(*) FROM events "
+            f"WHERE {' AND '.join(where)} GROUP BY session_id ORDER BY session_id DESC",
+            params,
+        )
+        return [
+            {
+                "session_id": session_id,
+                "start_time": first,
+                "end_time": last,
+                "total_events": count,
+            }
+            for session_id, first, last, count in rows
+        ]
+
+    def import_logs(self, logs_dir: str) -> int:
+        """
+        Import JSON and JSONL session logs that have not been imported yet
+
+        A session is imported once: when both a legacy ``.json`` log and its
+        compacted ``.jsonl`` rewrite exist, only the ``.jsonl`` is read, and
+        a session imported under either name is not imported again.
+
+        Args:
+            logs_dir: Directory containing ``{profile}_{session}.json[l]`` files
+
+        Returns:
+            Number of events imported
+        """
+        logs_path = Path(logs_dir)
+        with self._lock:
+            done = {
+                Path(row[0]).stem
+                for row in self._conn.execute("SELECT name FROM imported_files")
+            }
+
+        imported = 0
+        for log_file in sorted(logs_path.glob("*.jsonl")) + sorted(logs_path.glob("*.json")):
+            # Both extensions share the {profile}_{session} stem
+            if log_file.stem in done:
+                continue
+            parsed = parse_session_filename(log_file)
+            if parsed is None:
+                continue
+            session_id = parsed[1]
+            done.add(log_file.stem)
+
+            try:
+                events = read_session_file(log_file)
+            except Exception as e:
+                logger.warning(f"Skipping unreadable session log {log_file.name}: {e}")
+                continue
+
+            count = self.add_events((session_id, event) for event in events)
+            with self._lock, self._conn:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO imported_files (name, events, imported_at) "
+                    "VALUES (?, ?, ?)",
+                    (log_file.name, count, datetime.now().isoformat()),
+                )
+            imported += count
+
+        if imported:
+            logger.info(f"Imported {imported} session events from {logs_path}")
+        return imported
+
+    def close(self) -> None:
+        """Close the database connection"""
+        with self._lock:
+            self._conn.close()
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Import existing session logs into the SQLite store"""
+    parser = argparse.ArgumentParser(
+        description="Import JSON/JSONL session logs into the SQLite session store"
+    )
+    parser.add_argument(
+        "--config-dir",
+        default=os.path.expanduser("~/.gaming_ai_assistant"),
+        help="Application config directory (default: ~/.gaming_ai_assistant)",
+    )
+    args = parser.parse_args(argv)
+
+    logs_dir = Path(args.config_dir) / "session_logs"
+    store = SessionStore(str(logs_dir / SessionStore.DB_FILENAME))
+    try:
+        count = store.import_logs(str(logs_dir))
+    finally:
+        store.close()
+    print(f"Imported {count} events into {logs_dir / SessionStore.DB_FILENAME}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
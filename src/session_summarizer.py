@@ -0,0 +1,422 @@
+"""
+Session Summarizer Module
+Incrementally summarizes closed windows of session events so recaps of
+long sessions only need one small reduce call
+"""
+
+import json
+import logging
+import queue
+import threading
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from src.session_logger import SessionEvent
+
+logger = logging.getLogger(__name__)
+
+# Sentinel telling the worker thread to exit
+_STOP = object()
+
+
+@dataclass
+class WindowSummary:
+    """
+    Summary of a contiguous range of events in one session
+
+    Level 0 summaries cover a window of raw events; a level N+1 summary
+    merges `fanout` consecutive level N summaries.
+
+    Attributes:
+        level: Depth in the summary hierarchy
+        start_index: 1-based index of the first event covered
+        end_index: 1-based index of the last event covered (inclusive)
+        start_time: Timestamp of the first event covered
+        end_time: Timestamp of the last event covered
+        text: Summary text
+    """
+    level: int
+    start_index: int
+    end_index: int
+    start_time: datetime
+    end_time: datetime
+    text: str
+
+    def to_dict(self) -> Dict:
+        """Convert to dictionary for JSON serialization"""
+        return {
+            'level': self.level,
+            'start_index': self.start_index,
+            'end_index': self.end_index,
+            'start_time': self.start_time.isoformat(),
+            'end_time': self.end_time.isoformat(),
+            'text': self.text,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "WindowSummary":
+        """Create from dictionary"""
+        return cls(
+            level=data['level'],
+            start_index=data['start_index'],
+            end_index=data['end_index'],
+            start_time=datetime.fromisoformat(data['start_time']),
+            end_time=datetime.fromisoformat(data['end_time']),
+            text=data['text'],
+        )
+
+    def format(self) -> str:
+        """One line for a recap prompt"""
+        return (
+            f"[{self.start_time.strftime('%H:%M')}-{self.end_time.strftime('%H:%M')}, "
+            f"events {self.start_index}-{self.end_index}] {self.text.strip()}"
+        )
+
+
+def format_events(events: Sequence[SessionEvent], max_chars: int = 200) -> str:
+    """Format events one per line for a summarization prompt"""
+    lines = []
+    for event in events:
+        content = " ".join(event.content.split())
+        if len(content) > max_chars:
+            content = content[:max_chars] + "..."
+        lines.append(f"- [{event.timestamp.strftime('%H:%M')}] {event.event_type}: {content}")
+    return "\n".join(lines)
+
+
+class _SessionState:
+    """Summaries and unsummarized events for one session"""
+
+    def __init__(self):
+        # Summaries not yet merged into a higher level, ordered by start_index
+        self.frontier: List[WindowSummary] = []
+        # Events after the last level 0 summary: [(index, event)]
+        self.tail: List[Tuple[int, SessionEvent]] = []
+        self.covered = 0
+
+    @property
+    def last_index(self) -> int:
+        return self.tail[-1][0] if self.tail else self.covered
+
+
+class SessionSummarizer:
+    """
+    Background map-reduce summarizer for session events
+
+    Events reach the summarizer through `SessionLogger.add_event_observer`.
+    Once a window is closed (``window_events`` events, or at least
+    ``min_window_events`` events spanning ``window_minutes``) it is
+    summarized off the caller's thread and the summary appended to
+    ``summaries_dir/{profile}_{session}.jsonl``. Every ``fanout`` summaries
+    of one level are merged into a summary of the next level, so a session
+    is always described by O(fanout * log n) summaries plus fewer than
+    ``window_events`` raw events.
+    """
+
+    DEFAULT_WINDOW_EVENTS = 40
+    DEFAULT_WINDOW_MINUTES = 20.0
+    DEFAULT_MIN_WINDOW_EVENTS = 5
+    DEFAULT_FANOUT = 4
+    TICK_INTERVAL = 30.0  # seconds between time-based window checks
+
+    def __init__(
+        self,
+        session_logger,
+        summarize: Callable[[str], str],
+        summaries_dir: Path,
+        window_events: int = DEFAULT_WINDOW_EVENTS,
+        window_minutes: float = DEFAULT_WINDOW_MINUTES,
+        min_window_events: int = DEFAULT_MIN_WINDOW_EVENTS,
+        fanout: int = DEFAULT_FANOUT,
+        background: bool = True,
+        clock: Callable[[], datetime] = datetime.now,
+    ):
+        """
+        Initialize the summarizer
+
+        Args:
+            session_logger: SessionLogger to observe and read sessions from
+            summarize: Sends a prompt to the LLM and returns its text
+            summaries_dir: Directory for persisted summaries
+            window_events: Events that close a window
+            window_minutes: Minutes after which a window closes by time
+            min_window_events: Smallest window closed by time
+            fanout: Summaries of one level merged into the next
+            background: Summarize on a worker thread instead of inline
+            clock: Time source (injectable for tests)
+        """
+        self.session_logger = session_logger
+        self.summarize = summarize
+        self.summaries_dir = Path(summaries_dir)
+        self.window_events = max(1, window_events)
+        self.window = timedelta(minutes=window_minutes)
+        self.min_window_events = max(1, min_window_events)
+        self.fanout = max(2, fanout)
+        self.background = background
+        self._clock = clock
+
+        self._states: Dict[Tuple[str, str], _SessionState] = {}
+        self._lock = threading.RLock()
+        self._queue: "queue.Queue" = queue.Queue()
+        self._worker: Optional[threading.Thread] = None
+        self._stopped = False
+
+        self.session_logger.add_event_observer(self.observe)
+
+    def _get_summary_file(self, game_profile_id: str, session_id: str) -> Path:
+        return self.summaries_dir / f"{game_profile_id}_{session_id}.jsonl"
+
+    # ------------------------------------------------------------------
+    # Event intake
+    # ------------------------------------------------------------------
+
+    def observe(
+        self, game_profile_id: str, session_id: str, event: SessionEvent, index: int
+    ) -> None:
+        """SessionLogger observer: queue an event for summarization"""
+        item = (game_profile_id, session_id, event, index)
+        if not self.background:
+            self._process(item)
+            return
+        if self._stopped:
+            return
+        self._ensure_worker()
+        self._queue.put(item)
+
+    def _ensure_worker(self) -> None:
+        with self._lock:
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(
+                    target=self._worker_loop, name="SessionSummarizerThread", daemon=True
+                )
+                self._worker.start()
+
+    def _worker_loop(self) -> None:
+        while True:
+            try:
+                item = self._queue.get(timeout=self.TICK_INTERVAL)
+            except queue.Empty:
+                self.tick()
+                continue
+            try:
+                if item is _STOP:
+                    return
+                self._process(item)
+            except Exception as e:
+                logger.error(f"Session summarizer failed: {e}", exc_info=True)
+            finally:
+                self._queue.task_done()
+
+    def _process(self, item: tuple) -> None:
+        game_profile_id, session_id, event, index = item
+        state = self._get_state(game_profile_id, session_id)
+        with self._lock:
+            # Events already read from disk while loading are skipped
+            if index > state.last_index:
+                state.tail.append((index, event))
+        self._summarize_closed_windows(game_profile_id, session_id, state)
+
+    def tick(self) -> None:
+        """Close windows that have timed out"""
+        with self._lock:
+            keys = list(self._states.items())
+        for (game_profile_id, session_id), state in keys:
+            self._summarize_closed_windows(game_profile_id, session_id, state)
+
+    # ------------------------------------------------------------------
+    # State
+    # ------------------------------------------------------------------
+
+    def _get_state(self, game_profile_id: str, session_id: str) -> _SessionState:
+        """Get a session's state, loading it from disk on first use"""
+        key = (game_profile_id, session_id)
+        with self._lock:
+            state = self._states.get(key)
+            if state is not None:
+                return state
+            # Only the current session of each game is kept in memory
+            for other in [k for k in self._states if k[0] == game_profile_id]:
+                del self._states[other]
+            state = self._load_state(game_profile_id, session_id)
+            self._states[key] = state
+            return state
+
+    def _load_state(self, game_profile_id: str, session_id: str) -> _SessionState:
+        state = _SessionState()
+        summaries: List[WindowSummary] = []
+        summary_file = self._get_summary_file(game_profile_id, session_id)
+        if summary_file.exists():
+            with open(summary_file, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        summaries.append(WindowSummary.from_dict(json.loads(line)))
+                    except (ValueError, KeyError):
+                        logger.warning(f"Skipping damaged line in {summary_file.name}")
+
+        # Drop summaries that were merged into a higher level
+        for summary in summaries:
+            merged = any(
+                other.level > summary.level
+                and other.start_index <= summary.start_index
+                and summary.end_index <= other.end_index
+                for other in summaries
+            )
+            if not merged:
+                state.frontier.append(summary)
+        state.frontier.sort(key=lambda s: s.start_index)
+        state.covered = max((s.end_index for s in summaries), default=0)
+
+        events = self.session_logger.get_session_events(game_profile_id, session_id)
+        state.tail = [
+            (index, event)
+            for index, event in enumerate(events, 1)
+            if index > state.covered
+        ]
+        return state
+
+    def _persist(self, game_profile_id: str, session_id: str, summary: WindowSummary) -> None:
+        try:
+            self.summaries_dir.mkdir(parents=True, exist_ok=True)
+            with open(self._get_summary_file(game_profile_id, session_id), "a", encoding="utf-8") as f:
+                f.write(json.dumps(summary.to_dict(), ensure_ascii=False) + "\n")
+        except OSError as e:
+            logger.error(f"Failed to save session summary: {e}")
+
+    # ------------------------------------------------------------------
+    # Map and reduce
+    # ------------------------------------------------------------------
+
+    def _window_closed(self, state: _SessionState) -> bool:
+        if len(state.tail) >= self.window_events:
+            return True
+        if len(state.tail) < self.min_window_events:
+            return False
+        return self._clock() - state.tail[0][1].timestamp >= self.window
+
+    def _summarize_closed_windows(
+        self, game_profile_id: str, session_id: str, state: _SessionState
+    ) -> None:
+        while True:
+            with self._lock:
+                if not self._window_closed(state):
+                    return
+                window = state.tail[:self.window_events]
+
+            events = [event for _, event in window]
+            prompt = (
+                "Summarize this part of a gaming session in 2-4 sentences. "
+                "Mention the topics, builds, strategies and macros involved.\n\n"
+                f"{format_events(events)}"
+            )
+            try:
+                text = self.summarize(prompt)
+            except Exception as e:
+                # The window stays in the tail and is retried on the next event
+                logger.error(f"Failed to summarize session window: {e}")
+                return
+
+            summary = WindowSummary(
+                level=0,
+                start_index=window[0][0],
+                end_index=window[-1][0],
+                start_time=events[0].timestamp,
+                end_time=events[-1].timestamp,
+                text=text,
+            )
+            self._persist(game_profile_id, session_id, summary)
+            with self._lock:
+                del state.tail[:len(window)]
+                state.covered = summary.end_index
+                state.frontier.append(summary)
+            logger.debug(
+                f"Summarized events {summary.start_index}-{summary.end_index} "
+                f"of {game_profile_id} session {session_id}"
+            )
+            self._merge(game_profile_id, session_id, state, level=0)
+
+    def _merge(
+        self, game_profile_id: str, session_id: str, state: _SessionState, level: int
+    ) -> None:
+        while True:
+            with self._lock:
+                group = [s for s in state.frontier if s.level == level][:self.fanout]
+            if len(group) < self.fanout:
+                return
+
+            parts = "\n".join(f"{i}. {s.format()}" for i, s in enumerate(group, 1))
+            prompt = (
+                "Combine these consecutive summaries of a gaming session into one "
+                "summary of 3-5 sentences, keeping the most important topics.\n\n"
+                f"{parts}"
+            )
+            try:
+                text = self.summarize(prompt)
+            except Exception as e:
+                logger.error(f"Failed to merge session summaries: {e}")
+                return
+
+            merged = WindowSummary(
+                level=level + 1,
+                start_index=group[0].start_index,
+                end_index=group[-1].end_index,
+                start_time=group[0].start_time,
+                end_time=group[-1].end_time,
+                text=text,
+            )
+            self._persist(game_profile_id, session_id, merged)
+            with self._lock:
+                state.frontier = [s for s in state.frontier if s not in group]
+                state.frontier.append(merged)
+                state.frontier.sort(key=lambda s: s.start_index)
+            level += 1
+
+    # ------------------------------------------------------------------
+    # Recap
+    # ------------------------------------------------------------------
+
+    def get_recap_context(
+        self, game_profile_id: str, session_id: str
+    ) -> Tuple[List[WindowSummary], List[SessionEvent]]:
+        """
+        Get what a recap of a session needs
+
+        Args:
+            game_profile_id: Game profile ID
+            session_id: Session ID
+
+        Returns:
+            (summaries in chronological order, events not yet summarized)
+        """
+        state = self._get_state(game_profile_id, session_id)
+        with self._lock:
+            return list(state.frontier), [event for _, event in state.tail]
+
+    def wait_idle(self, timeout: float = 5.0) -> bool:
+        """
+        Block until every observed event has been processed
+
+        Args:
+            timeout: Maximum seconds to wait
+
+        Returns:
+            True if the queue drained in time
+        """
+        done = threading.Event()
+
+        def join():
+            self._queue.join()
+            done.set()
+
+        threading.Thread(target=join, daemon=True).start()
+        return done.wait(timeout)
+
+    def shutdown(self) -> None:
+        """Stop observing and end the worker thread"""
+        self._stopped = True
+        self.session_logger.remove_event_observer(self.observe)
+        worker = self._worker
+        if worker and worker.is_alive():
+            self._queue.put(_STOP)
+            worker.join(timeout=2)
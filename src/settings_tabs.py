@@ -4,7 +4,7 @@ Contains UI tabs for the Settings dialog
 """
 
 import logging
-from typing import Dict, Optional, List
+from typing import Callable, Dict, Optional, List
 from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QGroupBox, QLabel, QLineEdit,
     QPushButton, QRadioButton, QButtonGroup, QSlider, QComboBox,
@@ -103,8 +103,9 @@ class KeybindingsTab(QWidget):
 
         # If no keybinds, load defaults
         if not keybinds:
-            for default_keybind in DEFAULT_KEYBINDS:
-                self.keybind_manager.register_keybind(default_keybind, lambda: None, override=True)
+            with self.keybind_manager.batch_updates():
+                for default_keybind in DEFAULT_KEYBINDS:
+                    self.keybind_manager.register_keybind(default_keybind, lambda: None, override=True)
             keybinds = self.keybind_manager.get_all_keybinds()
 
         for keybind in keybinds:
@@ -191,6 +192,9 @@ class KeybindingsTab(QWidget):
         elif col == 4:
             keybind.enabled = (item.checkState() == Qt.CheckState.Checked)
 
+        # Edits above change the keybind in place; recompile the hotkey tables
+        self.keybind_manager.refresh_bindings()
+
         # Emit changes
         self.emit_keybinds()
 
@@ -202,14 +206,13 @@ class KeybindingsTab(QWidget):
             if dialog.is_macro_action():
                 macro_keybind = dialog.get_macro_keybind()
                 if macro_keybind:
-                    # For now, register with a placeholder callback
-                    # The actual macro execution should be wired at the application level
-                    self.keybind_manager.register_macro_keybind(macro_keybind, lambda: None, override=True)
+                    self.keybind_manager.register_macro_keybind(
+                        macro_keybind, self._macro_callback(macro_keybind.macro_id), override=True
+                    )
                     QMessageBox.information(
                         self,
                         "Macro Keybind Created",
-                        f"Macro keybind created: {macro_keybind.keys}\n\n"
-                        "Note: The macro execution will be active after saving settings and restarting."
+                        f"Macro keybind created: {macro_keybind.keys}"
                     )
             else:
                 keybind = dialog.get_keybind()
@@ -240,12 +243,13 @@ class KeybindingsTab(QWidget):
             if dialog.is_macro_action():
                 macro_keybind = dialog.get_macro_keybind()
                 if macro_keybind:
-                    self.keybind_manager.register_macro_keybind(macro_keybind, lambda: None, override=True)
+                    self.keybind_manager.register_macro_keybind(
+                        macro_keybind, self._macro_callback(macro_keybind.macro_id), override=True
+                    )
                     QMessageBox.information(
                         self,
                         "Macro Keybind Updated",
-                        f"Macro keybind updated: {macro_keybind.keys}\n\n"
-                        "Note: The macro execution will be active after saving settings and restarting."
+                        f"Macro keybind updated: {macro_keybind.keys}"
                     )
             else:
                 updated_keybind = dialog.get_keybind()
@@ -289,18 +293,25 @@ class KeybindingsTab(QWidget):
         )
 
         if reply == QMessageBox.StandardButton.Yes:
-            # Clear all keybinds
-            for action in list(self.keybind_manager.keybinds.keys()):
-                self.keybind_manager.unregister_keybind(action)
+            with self.keybind_manager.batch_updates():
+                # Clear all keybinds
+                for action in list(self.keybind_manager.keybinds.keys()):
+                    self.keybind_manager.unregister_keybind(action)
 
-            # Load defaults
-            for default_keybind in DEFAULT_KEYBINDS:
-                self.keybind_manager.register_keybind(default_keybind, lambda: None, override=True)
+                # Load defaults
+                for default_keybind in DEFAULT_KEYBINDS:
+                    self.keybind_manager.register_keybind(default_keybind, lambda: None, override=True)
 
             self.load_keybinds()
             self.emit_keybinds()
             QMessageBox.information(self, "Defaults Restored", "Default keybindings have been restored.")
 
+    def _macro_callback(self, macro_id: str) -> Callable:
+        """Keybind callback running a macro through the macro manager"""
+        if self.macro_manager is None:
+            return lambda: None
+        return self.macro_manager.hotkey_callback(macro_id)
+
     def emit_keybinds(self):
         """Emit keybinds changed signal"""
         keybinds_dict = self.keybind_manager.save_to_dict()
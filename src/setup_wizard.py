@@ -63,9 +63,7 @@ class FetchModelsThread(QThread):
     def run(self):
         """Fetch models from Ollama"""
         try:
-            import ollama
-
-            client = ollama.Client(host=self.base_url)
+            client = ProviderTester.get_client(self.base_url)
             models_response = client.list()
             models = [
                 m.get("name", "")
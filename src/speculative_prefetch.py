@@ -0,0 +1,262 @@
+"""
+Speculative Prefetch Module
+Retrieves knowledge context and HRM decisions for a draft question while
+the user is still typing
+"""
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, Dict, Optional, Tuple
+
+from src.hrm_integration import get_hrm_analysis, requires_complex_reasoning
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class PrefetchRequest:
+    """A draft question waiting to be prefetched."""
+
+    draft: str
+    game_profile_id: str
+    game_name: str
+    extra_settings: Dict
+    use_knowledge: bool
+    hrm_enabled: bool
+
+
+@dataclass
+class PrefetchResult:
+    """Work done ahead of time for one draft question."""
+
+    question: str
+    game_profile_id: str
+    knowledge_context: Optional[str]
+    chunks_retrieved: int
+    use_hrm: bool
+    hrm_analysis: Optional[str]
+    created_at: float
+
+
+def normalize_draft(text: str) -> str:
+    """Normalize a draft so trivially different inputs share a cache entry."""
+    return " ".join(text.split())
+
+
+class SpeculativePrefetcher:
+    """
+    Background worker that prefetches retrieval results for draft input.
+
+    Drafts are coalesced: only the most recent draft is processed, so a
+    burst of keystrokes costs at most one query in flight plus one queued.
+    Results are kept in a small LRU keyed by (profile, normalized text) and
+    handed to `AIAssistant.ask_question` when the submitted question matches.
+    """
+
+    DEFAULT_MIN_CHARS = 8
+    DEFAULT_MAX_ENTRIES = 16
+    DEFAULT_TTL = 60.0  # seconds
+
+    def __init__(
+        self,
+        knowledge_integration,
+        min_chars: int = DEFAULT_MIN_CHARS,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        ttl: float = DEFAULT_TTL,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Initialize the prefetcher.
+
+        Args:
+            knowledge_integration: KnowledgeIntegration used for retrieval
+            min_chars: Shortest draft worth prefetching
+            max_entries: Number of prefetched drafts to keep
+            ttl: Seconds a prefetched result stays usable
+            clock: Monotonic time source (injectable for tests)
+        """
+        self.knowledge_integration = knowledge_integration
+        self.min_chars = min_chars
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._clock = clock
+
+        self._results: "OrderedDict[Tuple[str, str], PrefetchResult]" = OrderedDict()
+        self._pending: Optional[PrefetchRequest] = None
+        self._condition = threading.Condition()
+        self._worker: Optional[threading.Thread] = None
+        self._stopped = False
+        self._busy = False
+
+        self.hits = 0
+        self.misses = 0
+
+    def submit(
+        self,
+        draft: str,
+        game_profile_id: str,
+        game_name: str,
+        extra_settings: Optional[Dict] = None,
+        use_knowledge: bool = True,
+        hrm_enabled: bool = False,
+    ) -> bool:
+        """
+        Queue a draft for prefetching without blocking.
+
+        Args:
+            draft: Partial question text
+            game_profile_id: Active game profile ID
+            game_name: Active game name (for HRM classification)
+            extra_settings: Profile's extra_settings dict
+            use_knowledge: Whether knowledge packs apply to this profile
+            hrm_enabled: Whether HRM analysis is enabled and available
+
+        Returns:
+            True if the draft was queued, False if it was skipped
+        """
+        text = normalize_draft(draft)
+        if len(text) < self.min_chars:
+            return False
+
+        with self._condition:
+            if self._stopped:
+                return False
+            cached = self._results.get((game_profile_id, text))
+            if cached and not self._is_expired(cached):
+                return False
+            self._pending = PrefetchRequest(
+                draft=text,
+                game_profile_id=game_profile_id,
+                game_name=game_name,
+                extra_settings=dict(extra_settings or {}),
+                use_knowledge=use_knowledge,
+                hrm_enabled=hrm_enabled,
+            )
+            self._ensure_worker()
+            self._condition.notify()
+        return True
+
+    def take(self, question: str, game_profile_id: str) -> Optional[PrefetchResult]:
+        """
+        Claim the prefetched result for a submitted question.
+
+        Args:
+            question: The submitted question
+            game_profile_id: Active game profile ID
+
+        Returns:
+            The prefetched result, or None if nothing usable was prepared
+        """
+        key = (game_profile_id, normalize_draft(question))
+        with self._condition:
+            result = self._results.pop(key, None)
+            if result is None or self._is_expired(result):
+                self.misses += 1
+                return None
+            self.hits += 1
+            return result
+
+    def wait_idle(self, timeout: float = 5.0) -> bool:
+        """
+        Block until no draft is pending or being processed.
+
+        Args:
+            timeout: Maximum seconds to wait
+
+        Returns:
+            True if the worker became idle
+        """
+        deadline = time.monotonic() + timeout
+        with self._condition:
+            while self._pending is not None or self._busy:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                self._condition.wait(remaining)
+        return True
+
+    def clear(self) -> None:
+        """Drop all prefetched results (e.g. when the game changes)."""
+        with self._condition:
+            self._results.clear()
+            self._pending = None
+
+    def shutdown(self) -> None:
+        """Stop the worker thread."""
+        with self._condition:
+            self._stopped = True
+            self._pending = None
+            self._condition.notify_all()
+        if self._worker and self._worker.is_alive():
+            self._worker.join(timeout=2)
+
+    def _is_expired(self, result: PrefetchResult) -> bool:
+        return self._clock() - result.created_at > self.ttl
+
+    def _ensure_worker(self) -> None:
+        """Start the worker thread on first use (caller holds the lock)."""
+        if self._worker and self._worker.is_alive():
+            return
+        self._worker = threading.Thread(
+            target=self._run, daemon=True, name="SpeculativePrefetchThread"
+        )
+        self._worker.start()
+
+    def _run(self) -> None:
+        """Process the latest pending draft until shut down."""
+        while True:
+            with self._condition:
+                while self._pending is None and not self._stopped:
+                    self._condition.wait()
+                if self._stopped:
+                    return
+                request = self._pending
+                self._pending = None
+                self._busy = True
+
+            try:
+                result = self._prefetch(request)
+            except Exception as e:
+                logger.error(f"Speculative prefetch failed: {e}", exc_info=True)
+                result = None
+
+            with self._condition:
+                self._busy = False
+                if result is not None:
+                    key = (result.game_profile_id, result.question)
+                    self._results[key] = result
+                    self._results.move_to_end(key)
+                    while len(self._results) > self.max_entries:
+                        self._results.popitem(last=False)
+                self._condition.notify_all()
+
+    def _prefetch(self, request: PrefetchRequest) -> PrefetchResult:
+        """Run retrieval and HRM classification for one draft."""
+        knowledge_context = None
+        chunks_retrieved = 0
+        if request.use_knowledge:
+            knowledge_context, chunks_retrieved = (
+                self.knowledge_integration.build_knowledge_context(
+                    game_profile_id=request.game_profile_id,
+                    question=request.draft,
+                    extra_settings=request.extra_settings,
+                )
+            )
+
+        use_hrm = request.hrm_enabled and requires_complex_reasoning(
+            request.draft, request.game_name
+        )
+        hrm_analysis = get_hrm_analysis(request.draft) if use_hrm else None
+
+        return PrefetchResult(
+            question=request.draft,
+            game_profile_id=request.game_profile_id,
+            knowledge_context=knowledge_context,
+            chunks_retrieved=chunks_retrieved,
+            use_hrm=use_hrm,
+            hrm_analysis=hrm_analysis,
+            created_at=self._clock(),
+        )
@@ -127,10 +127,11 @@ def test_aiassistant_formats_provider_errors(monkeypatch):
     
     # Mock provider instance that raises error
     mock_provider = MagicMock()
-    mock_provider.generate_response.side_effect = ProviderError("Ollama error")
-    
-    # Patch get_provider to return our mock
-    monkeypatch.setattr(ai_assistant, "get_provider", lambda config: mock_provider)
+    router = MagicMock(get_provider=lambda: mock_provider)
+    router.chat.side_effect = ProviderError("Ollama error")
+
+    # The assistant shares the router's provider and sends through the router
+    monkeypatch.setattr(ai_assistant, "get_router", lambda config: router)
     monkeypatch.setattr(ai_assistant, "get_knowledge_integration", knowledge_factory)
 
     assistant = AIAssistant(provider="ollama", config=cfg)
@@ -51,7 +51,7 @@ def test_js_bridge_save_macro():
     # Verify it was added to the dict
     assert "m1" in mock_macro_manager.macros
     # Verify save call
-    mock_window.config.save_macros.assert_called()
+    mock_window.config.save_macro.assert_called()
 
 def test_js_bridge_recording():
     """Test start/stop recording."""
@@ -70,4 +70,4 @@ def test_js_bridge_recording():
     
     bridge.stopMacroRecording()
     mock_macro_manager.stop_recording.assert_called()
-    mock_window.config.save_macros.assert_called()
+    mock_window.config.save_macro.assert_called()
@@ -0,0 +1,365 @@
+"""
+Test suite for the endpoint pool
+
+Runs stub Ollama and OpenAI-compatible HTTP servers on localhost to test
+load balancing, failover, ejection and per-endpoint statistics.
+"""
+import json
+import socket
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import Mock, patch
+
+import pytest
+
+from src.ai_router import AIRouter
+from src.config import Config
+from src.endpoint_pool import Endpoint, EndpointPool
+from src.providers import (
+    OllamaProvider,
+    OpenAIProvider,
+    ProviderConnectionError,
+    ProviderError,
+)
+
+
+class StubServer:
+    """Minimal Ollama / OpenAI-compatible chat server"""
+
+    def __init__(self, reply="ok", delay=0.0, status=200):
+        self.reply = reply
+        self.delay = delay
+        self.status = status
+        self.requests = 0
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_POST(self):
+                stub.requests += 1
+                length = int(self.headers.get("Content-Length", 0))
+                body = json.loads(self.rfile.read(length) or b"{}")
+                time.sleep(stub.delay)
+                if self.path.endswith("/chat/completions"):
+                    payload = {
+                        "model": body.get("model"),
+                        "choices": [{
+                            "message": {"role": "assistant", "content": stub.reply},
+                            "finish_reason": "stop",
+                        }],
+                    }
+                else:
+                    payload = {
+                        "model": body.get("model"),
+                        "message": {"role": "assistant", "content": stub.reply},
+                        "done": True,
+                        "done_reason": "stop",
+                    }
+                if stub.status != 200:
+                    payload = {"error": "stub failure"}
+                data = json.dumps(payload).encode()
+                self.send_response(stub.status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_GET(self):
+                data = json.dumps({"models": [], "data": []}).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.httpd.server_address[1]}"
+        self.thread = threading.Thread(
+            target=self.httpd.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True
+        )
+        self.thread.start()
+
+    def close(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+def _dead_url():
+    """URL of a port with nothing listening"""
+    sock = socket.socket()
+    sock.bind(("127.0.0.1", 0))
+    port = sock.getsockname()[1]
+    sock.close()
+    return f"http://127.0.0.1:{port}"
+
+
+@pytest.fixture
+def servers():
+    started = []
+
+    def start(**kwargs):
+        server = StubServer(**kwargs)
+        started.append(server)
+        return server
+
+    yield start
+    for server in started:
+        server.close()
+
+
+MESSAGES = [{"role": "user", "content": "hello"}]
+
+
+@pytest.mark.unit
+class TestRouting:
+    """Test endpoint selection"""
+
+    def test_round_trip_through_ollama_stub(self, servers):
+        """Requests reach a stub Ollama server and report the endpoint"""
+        server = servers(reply="from stub")
+        pool = EndpointPool.from_specs([server.url], default_model="llama3")
+
+        response = pool.chat(MESSAGES)
+
+        assert response["content"] == "from stub"
+        assert response["endpoint"] == server.url
+
+    def test_openai_compatible_endpoint(self, servers):
+        """kind=url specs create OpenAI-compatible endpoints"""
+        server = servers(reply="from lm studio")
+        pool = EndpointPool.from_specs([f"openai_compatible={server.url}/v1"])
+
+        response = pool.chat(MESSAGES)
+
+        assert isinstance(pool.endpoints[0].provider, OpenAIProvider)
+        assert response["content"] == "from lm studio"
+
+    def test_unknown_kind_rejected(self):
+        """Unknown endpoint kinds raise ValueError"""
+        with pytest.raises(ValueError, match="Unknown endpoint kind"):
+            EndpointPool.from_specs(["bogus=http://localhost:1"])
+
+    def test_least_outstanding_spreads_concurrent_load(self, servers):
+        """Concurrent requests go to idle endpoints first"""
+        slow = [servers(delay=0.2), servers(delay=0.2)]
+        pool = EndpointPool.from_specs([s.url for s in slow])
+
+        threads = [threading.Thread(target=pool.chat, args=(MESSAGES,)) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert [s.requests for s in slow] == [2, 2]
+
+    def test_latency_ewma_prefers_fast_endpoint(self, servers):
+        """After sampling, the lower-latency endpoint receives the traffic"""
+        slow, fast = servers(delay=0.1), servers()
+        pool = EndpointPool.from_specs([slow.url, fast.url], strategy="latency_ewma")
+
+        for _ in range(6):
+            pool.chat(MESSAGES)
+
+        assert slow.requests == 1
+        assert fast.requests == 5
+
+    def test_unknown_strategy_rejected(self, servers):
+        """Invalid strategy names raise ValueError"""
+        with pytest.raises(ValueError, match="Unknown load balancing strategy"):
+            EndpointPool.from_specs([servers().url], strategy="random")
+
+
+@pytest.mark.unit
+class TestFailover:
+    """Test retries and ejection"""
+
+    def test_connection_failure_retries_next_endpoint(self, servers):
+        """A refused connection fails over transparently"""
+        dead = _dead_url()
+        live = servers(reply="survivor")
+        pool = EndpointPool.from_specs([dead, live.url])
+
+        response = pool.chat(MESSAGES)
+
+        assert response["content"] == "survivor"
+        stats = {s["name"]: s for s in pool.get_stats()}
+        assert stats[dead]["failures"] == 1
+        assert stats[live.url]["successes"] == 1
+
+    def test_server_error_retries_next_endpoint(self, servers):
+        """5xx responses are treated as endpoint failures"""
+        broken = servers(status=500)
+        live = servers(reply="fine")
+        pool = EndpointPool.from_specs([broken.url, live.url])
+
+        assert pool.chat(MESSAGES)["content"] == "fine"
+
+    def test_non_idempotent_requests_are_not_retried(self, servers):
+        """idempotent=False surfaces the first failure"""
+        dead = _dead_url()
+        live = servers()
+        pool = EndpointPool.from_specs([dead, live.url])
+
+        with pytest.raises(ProviderConnectionError):
+            pool.chat(MESSAGES, idempotent=False)
+        assert live.requests == 0
+
+    def test_client_errors_are_not_retried(self, servers):
+        """4xx responses mean the request is bad, not the endpoint"""
+        rejected = servers(status=404)
+        live = servers()
+        pool = EndpointPool.from_specs([rejected.url, live.url])
+
+        with pytest.raises(ProviderError):
+            pool.chat(MESSAGES)
+        assert live.requests == 0
+        assert pool.get_stats()[0]["ejected"] is False
+
+    def test_repeated_failures_eject_endpoint(self, servers):
+        """An endpoint is skipped after max_consecutive_failures"""
+        now = [0.0]
+        dead = _dead_url()
+        live = servers()
+        pool = EndpointPool.from_specs(
+            [dead, live.url],
+            max_consecutive_failures=2,
+            ejection_seconds=30,
+            clock=lambda: now[0],
+        )
+
+        for _ in range(4):
+            pool.chat(MESSAGES)
+
+        stats = {s["name"]: s for s in pool.get_stats()}
+        assert stats[dead]["failures"] == 2
+        assert stats[dead]["ejected"] is True
+        assert live.requests == 4
+
+        now[0] = 31.0
+        assert pool.get_stats()[0]["ejected"] is False
+
+    def test_timeout_retries_next_endpoint(self, servers):
+        """A hung endpoint that times out is failed over and ejected"""
+        def timed_out(*args, **kwargs):
+            try:
+                raise TimeoutError("read timed out")
+            except TimeoutError as exc:
+                raise ProviderError(f"Ollama error: {exc}")
+
+        hung = Mock()
+        hung.chat.side_effect = timed_out
+        live = servers(reply="fine")
+        pool = EndpointPool(
+            [Endpoint(hung, name="hung"), Endpoint(OllamaProvider(base_url=live.url))],
+            max_consecutive_failures=1,
+        )
+
+        for _ in range(2):
+            assert pool.chat(MESSAGES)["content"] == "fine"
+
+        assert hung.chat.call_count == 1
+        assert {s["name"]: s for s in pool.get_stats()}["hung"]["ejected"] is True
+
+    def test_all_endpoints_down(self):
+        """The pool raises once every endpoint has been tried"""
+        pool = EndpointPool.from_specs([_dead_url(), _dead_url()])
+
+        with pytest.raises(ProviderConnectionError, match="All endpoints failed"):
+            pool.chat(MESSAGES)
+
+    def test_check_health_restores_endpoint(self, servers):
+        """Active health checks re-admit recovered endpoints"""
+        server = servers()
+        pool = EndpointPool([Endpoint(OllamaProvider(base_url=server.url))])
+        pool.endpoints[0].ejected_until = float("inf")
+
+        assert pool.check_health() == {server.url: True}
+        assert pool.get_stats()[0]["ejected"] is False
+
+
+@pytest.mark.unit
+class TestRouterPool:
+    """Test AIRouter integration"""
+
+    def test_router_uses_pool(self, servers):
+        """Configured endpoints are used for router chat requests"""
+        first, second = servers(reply="a"), servers(reply="b")
+        config = Config(require_keys=False)
+        config.ai_endpoints = [first.url, second.url]
+
+        router = AIRouter(config=config)
+        response = router.chat(MESSAGES)
+
+        assert response["content"] in ("a", "b")
+        assert len(router.get_endpoint_stats()) == 2
+
+    def test_router_without_pool(self):
+        """No endpoints configured means no pool statistics"""
+        config = Config(require_keys=False)
+        config.ai_endpoints = []
+
+        assert AIRouter(config=config).get_endpoint_stats() == []
+
+    def test_pool_requests_use_provider_settings(self, servers):
+        """Pooled requests carry keep_alive and reach the response observers"""
+        server = servers(reply="a")
+        config = Config(require_keys=False)
+        config.ai_endpoints = [server.url]
+        router = AIRouter(config=config)
+        router.get_provider().keep_alive = "30m"
+        observed = []
+        router.get_provider().add_response_observer(observed.append)
+
+        with patch.object(EndpointPool, "chat", wraps=router._pool.chat) as pool_chat:
+            router.chat(MESSAGES, model="llama3")
+
+        assert pool_chat.call_args.kwargs["keep_alive"] == "30m"
+        assert [stats["model"] for stats in observed] == ["llama3"]
+
+    def test_assistant_questions_use_pool(self, servers):
+        """ask_question is load balanced across the router's endpoints"""
+        first, second = servers(reply="a"), servers(reply="b")
+        config = Config(require_keys=False)
+        config.ai_provider = "ollama"
+        config.ai_endpoints = [first.url, second.url]
+        router = AIRouter(config=config)
+        with patch("src.ai_assistant.get_router", return_value=router), \
+             patch("src.ai_assistant.get_knowledge_integration"), \
+             patch("src.ai_assistant.get_hrm_interface") as get_hrm:
+            get_hrm.return_value.is_available.return_value = False
+            from src.ai_assistant import AIAssistant
+
+            assistant = AIAssistant(config=config)
+        assistant.set_current_game({"name": "Elden Ring"})
+
+        assert assistant.ask_question("How do I parry?") in ("a", "b")
+        assert first.requests + second.requests == 1
+        assert sum(s["successes"] for s in router.get_endpoint_stats()) == 1
+        assistant.prefetcher.shutdown()
+
+    def test_pool_errors_keep_type_and_message(self, servers):
+        """Errors from OpenAI-compatible endpoints are not relabelled"""
+        rejected = servers(status=404)
+        config = Config(require_keys=False)
+        config.ai_endpoints = [f"openai_compatible={rejected.url}"]
+
+        with pytest.raises(ProviderError) as excinfo:
+            AIRouter(config=config).chat(MESSAGES)
+
+        assert type(excinfo.value) is ProviderError
+        assert str(excinfo.value).startswith("API request failed")
+
+    def test_health_monitor_checks_pool(self, servers):
+        """Pooled endpoints are probed on the health monitor's schedule"""
+        server = servers()
+        config = Config(require_keys=False)
+        config.ai_endpoints = [server.url]
+        router = AIRouter(config=config)
+        router._pool.endpoints[0].ejected_until = float("inf")
+
+        router.health_monitor.check_now()
+
+        assert router.get_endpoint_stats()[0]["ejected"] is False
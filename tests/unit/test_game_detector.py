@@ -112,3 +112,24 @@ class TestGameDetectorEdgeCases:
         # Try to add with different case - should fail (duplicate)
         result = detector.add_custom_game("TEST GAME", ["other.exe"])
         assert result is False
+
+    def test_game_added_while_running_is_detected(self, monkeypatch):
+        """A game added while its process runs shows up despite the scan cache"""
+        from unittest.mock import MagicMock
+        import src.process_monitor as pm
+        from src.process_monitor import ProcessMonitor
+        from game_detector import GameDetector
+
+        proc = MagicMock()
+        proc.pid = 100
+        proc.info = {"pid": 100, "name": "sleep", "exe": ""}
+        monkeypatch.setattr(pm.psutil, "process_iter", lambda attrs=None: [proc])
+        monitor = ProcessMonitor(use_events=False)
+        monitor.refresh()
+        monitor.mode = "events"  # Running monitor: cached scans never expire by age
+        detector = GameDetector(process_monitor=monitor)
+
+        assert detector.get_running_games() == []
+        detector.add_custom_game("SleepGame", ["sleep"])
+
+        assert [g["name"] for g in detector.get_running_games()] == ["SleepGame"]
@@ -0,0 +1,222 @@
+"""
+Test suite for signature-based game discovery
+
+Tests static signals, per-process signals, the (exe, mtime) cache and
+GameDetector integration.
+"""
+import os
+import threading
+
+import pytest
+
+import src.process_monitor as pm
+from src.game_detector import GameDetector
+from src.game_discovery import GameDiscovery
+from src.process_monitor import ProcessInfo, ProcessMonitor
+
+
+def _install(root, relative_exe, *neighbours):
+    """Create an executable and sibling files under root"""
+    exe = root / relative_exe
+    exe.parent.mkdir(parents=True, exist_ok=True)
+    exe.write_bytes(b"MZ")
+    for name in neighbours:
+        (exe.parent / name).write_bytes(b"")
+    return str(exe)
+
+
+def _discovery(tmp_path, **kwargs):
+    kwargs.setdefault("cpu_probe", None)
+    kwargs.setdefault("window_class_probe", None)
+    return GameDiscovery(config_dir=tmp_path / "config", **kwargs)
+
+
+@pytest.mark.unit
+class TestStaticSignals:
+    """Test path and engine file signals"""
+
+    def test_steam_library_with_engine_files(self, tmp_path):
+        """A Unity game in a Steam library is a game named after its folder"""
+        exe = _install(
+            tmp_path, "SteamLibrary/steamapps/common/Hollow Knight/hollow_knight.exe",
+            "UnityPlayer.dll", "steam_api64.dll",
+        )
+
+        result = _discovery(tmp_path).classify(ProcessInfo(1, "hollow_knight.exe", exe))
+
+        assert result.is_game
+        assert result.name == "Hollow Knight"
+        assert "engine:unity" in result.signals and "middleware" in result.signals
+
+    def test_unreal_shipping_binary(self, tmp_path):
+        """Unreal shipping binaries are recognized outside any library"""
+        exe = _install(tmp_path, "apps/Lyra/Binaries/Win64/Lyra-Win64-Shipping.exe")
+
+        result = _discovery(tmp_path).classify(ProcessInfo(1, "Lyra-Win64-Shipping.exe", exe))
+
+        assert result.is_game and result.name == "Lyra"
+
+    def test_plain_tool_is_not_a_game(self, tmp_path):
+        """An executable with no signals is rejected"""
+        exe = _install(tmp_path, "tools/editor/editor.exe", "readme.txt")
+
+        result = _discovery(tmp_path).classify(ProcessInfo(1, "editor.exe", exe))
+
+        assert not result.is_game and result.score == 0
+
+    def test_launchers_and_system_binaries_skipped(self, tmp_path):
+        """Launchers in the library and system paths are never classified"""
+        steam = _install(tmp_path, "steamapps/common/Steam/steam.exe", "steam_api.dll")
+        discovery = _discovery(tmp_path)
+
+        assert discovery.classify(ProcessInfo(1, "steam.exe", steam)) is None
+        assert discovery.classify(ProcessInfo(2, "bash", "/usr/bin/bash")) is None
+        assert discovery.classify(ProcessInfo(3, "kthreadd", "")) is None
+
+    def test_proton_game_classified_by_child_exe(self, tmp_path):
+        """Wine/Proton loaders are classified by the Windows executable they run"""
+        game = _install(
+            tmp_path, "steamapps/common/Hades II/Ship/Hades2.exe", "fmod.dll", "steam_api64.dll"
+        )
+        loader = _install(tmp_path, "steamapps/common/Proton 9.0/files/bin/wine64-preloader")
+        discovery = _discovery(tmp_path, wine_exe_probe=lambda pid: game if pid == 9 else None)
+
+        result = discovery.classify(ProcessInfo(9, "Hades2.exe", loader))
+
+        assert result.is_game and result.exe == game
+        assert result.name == "Hades II"
+        assert discovery.classify(ProcessInfo(10, "wineserver", loader)) is None
+
+    def test_wine_system_programs_skipped(self, tmp_path):
+        """Programs from the prefix's Windows directory are never games"""
+        conhost = _install(tmp_path, "pfx/drive_c/windows/system32/conhost.exe")
+        loader = _install(tmp_path, "wine/bin/wine-preloader")
+        discovery = _discovery(tmp_path, wine_exe_probe=lambda pid: conhost)
+
+        assert discovery.classify(ProcessInfo(1, "conhost.exe", loader)) is None
+
+    def test_custom_library_root(self, tmp_path):
+        """Configured library roots count like store libraries"""
+        exe = _install(tmp_path, "MyGames/Celeste/Celeste.exe", "FNA.dll")
+
+        result = _discovery(tmp_path, library_roots=[tmp_path / "MyGames"]).classify(
+            ProcessInfo(1, "Celeste.exe", exe)
+        )
+
+        assert result.is_game
+        assert "library:custom" in result.signals
+
+
+@pytest.mark.unit
+class TestProcessSignals:
+    """Test window class and CPU usage for borderline binaries"""
+
+    def test_window_class_promotes_borderline_binary(self, tmp_path):
+        """Middleware alone is not enough; an engine window class tips it over"""
+        exe = _install(tmp_path, "apps/Indie/indie.exe", "fmod.dll")
+        discovery = _discovery(
+            tmp_path,
+            window_class_probe=lambda pid: ["SDL_app"] if pid == 7 else [],
+            cpu_probe=lambda pid: 40.0,
+        )
+
+        assert discovery.classify(ProcessInfo(7, "indie.exe", exe)).is_game
+        assert not discovery.classify(ProcessInfo(8, "indie.exe", exe)).is_game
+
+    def test_probes_skipped_without_static_signals(self, tmp_path):
+        """Processes without any static signal never pay for probes"""
+        exe = _install(tmp_path, "tools/tool.exe")
+        calls = []
+        discovery = _discovery(tmp_path, cpu_probe=lambda pid: calls.append(pid) or 99.0)
+
+        assert not discovery.classify(ProcessInfo(1, "tool.exe", exe)).is_game
+        assert calls == []
+
+
+@pytest.mark.unit
+class TestCache:
+    """Test the persistent (exe, mtime) cache"""
+
+    def test_known_binary_not_reclassified(self, tmp_path, monkeypatch):
+        """Reloaded cache answers without listing the install directory"""
+        exe = _install(tmp_path, "steamapps/common/Hades/Hades.exe", "fmod.dll")
+        discovery = _discovery(tmp_path)
+        discovery.classify(ProcessInfo(1, "Hades.exe", exe))
+        discovery.save()
+
+        reloaded = _discovery(tmp_path)
+        monkeypatch.setattr(os, "listdir", lambda path: pytest.fail("reclassified"))
+        result = reloaded.classify(ProcessInfo(2, "Hades.exe", exe))
+
+        assert result.is_game and result.name == "Hades"
+        assert reloaded.classifications == 0
+
+    def test_cache_is_bounded(self, tmp_path, monkeypatch):
+        """The least recently used binary is evicted past MAX_ENTRIES"""
+        monkeypatch.setattr(GameDiscovery, "MAX_ENTRIES", 2)
+        exes = [_install(tmp_path, f"tools/t{i}/t{i}.exe") for i in range(3)]
+        discovery = _discovery(tmp_path)
+
+        discovery.classify(ProcessInfo(1, "t0.exe", exes[0]))
+        discovery.classify(ProcessInfo(2, "t1.exe", exes[1]))
+        discovery.classify(ProcessInfo(1, "t0.exe", exes[0]))
+        discovery.classify(ProcessInfo(3, "t2.exe", exes[2]))
+
+        assert len(discovery) == 2
+        assert set(discovery._entries) == {exes[0], exes[2]}
+
+    def test_changed_binary_reclassified(self, tmp_path):
+        """A new mtime (game update) invalidates the cached entry"""
+        exe = _install(tmp_path, "apps/Game/game.exe")
+        discovery = _discovery(tmp_path)
+        assert not discovery.classify(ProcessInfo(1, "game.exe", exe)).is_game
+
+        _install(tmp_path, "apps/Game/game.exe", "UnityPlayer.dll")
+        stat = os.stat(exe)
+        os.utime(exe, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+        assert discovery.classify(ProcessInfo(1, "game.exe", exe)).is_game
+        assert discovery.classifications == 2
+
+
+@pytest.mark.unit
+class TestDetectorIntegration:
+    """Test discovered games in GameDetector results"""
+
+    def test_discovered_game_reported_and_removed(self, tmp_path, monkeypatch):
+        """Discovered games follow known games and disappear on exit"""
+        exe = _install(tmp_path, "steamapps/common/Balatro/Balatro.exe", "love.dll", "game.pck")
+        monkeypatch.setattr(pm.psutil, "process_iter", lambda attrs=None: [])
+        monitor = ProcessMonitor(use_events=False)
+        detector = GameDetector(process_monitor=monitor, discovery=_discovery(tmp_path))
+
+        with monkeypatch.context() as m:
+            m.setattr(pm, "describe_process", lambda pid: ProcessInfo(pid, "Balatro.exe", exe))
+            monitor._apply([("exec", 50)])
+
+        game = detector.detect_running_game()
+        assert game["name"] == "Balatro" and game["pid"] == 50
+        assert (tmp_path / "config" / GameDiscovery.FILENAME).exists()
+
+        monitor._apply([("exit", 50)])
+        assert detector.get_running_games() == []
+        detector.stop_background_scan()
+
+    def test_initial_pass_runs_off_constructor(self, tmp_path):
+        """Games already running at startup are classified in the background"""
+        exe = _install(tmp_path, "steamapps/common/Balatro/Balatro.exe", "game.pck")
+        running = [ProcessInfo(60, "Balatro.exe", exe)]
+        gate = threading.Event()
+        discovery = _discovery(tmp_path)
+        classify = discovery.classify
+        discovery.classify = lambda info: gate.wait(2) and classify(info)
+        monitor = ProcessMonitor(use_events=False)
+        monitor._processes = {p.pid: p for p in running}
+
+        detector = GameDetector(process_monitor=monitor, discovery=discovery)
+        assert detector.get_discovered_games() == {}
+
+        gate.set()
+        detector._initial_discovery.join(timeout=2)
+        assert detector.get_discovered_games() == {60: "Balatro"}
+        detector.stop_background_scan()
@@ -5,6 +5,7 @@ Tests game profile creation, management, storage, and matching.
 """
 import pytest
 from pathlib import Path
+from unittest.mock import patch
 
 
 @pytest.mark.unit
@@ -262,3 +263,74 @@ class TestOverlayModes:
         assert OverlayModeConfig.should_show_conversation_history("compact") is False
         # Full should show history
         assert OverlayModeConfig.should_show_conversation_history("full") is True
+
+
+@pytest.mark.unit
+class TestExecutableIndex:
+    """Test the hashed executable lookup"""
+
+    def _store(self, tmp_path):
+        from src.game_profile import GameProfileStore
+
+        return GameProfileStore(config_dir=tmp_path)
+
+    def _profile(self, profile_id, exe_names):
+        from src.game_profile import GameProfile
+
+        return GameProfile(
+            id=profile_id, display_name=profile_id, exe_names=exe_names, system_prompt="Prompt"
+        )
+
+    def test_lookup_does_not_scan_profiles(self, tmp_path):
+        """Lookups use the index instead of matches_executable"""
+        from src.game_profile import GameProfile
+
+        store = self._store(tmp_path)
+        with patch.object(GameProfile, "matches_executable", side_effect=AssertionError("scan")):
+            assert store.get_profile_by_executable("ELDENRING.EXE").id == "elden_ring"
+            assert store.get_profile_by_executable("unknown.exe").id == "generic_game"
+
+    def test_index_follows_mutations(self, tmp_path):
+        """Create, update, duplicate and delete keep the index current"""
+        store = self._store(tmp_path)
+        store.create_profile(self._profile("custom", ["custom.exe"]))
+        assert store.get_profile_by_executable("custom.exe").id == "custom"
+
+        store.update_profile(self._profile("custom", ["renamed.exe"]))
+        assert store.get_profile_by_executable("custom.exe").id == "generic_game"
+        assert store.get_profile_by_executable("renamed.exe").id == "custom"
+
+        store.duplicate_profile("custom", "copy", "Copy")
+        assert store.get_profile_by_executable("renamed.exe").id == "custom"
+
+        store.delete_profile("custom")
+        assert store.get_profile_by_executable("renamed.exe").id == "copy"
+
+    def test_index_rebuilt_on_load(self, tmp_path):
+        """Profiles loaded from disk are indexed"""
+        self._store(tmp_path).create_profile(self._profile("custom", ["custom.exe"]))
+
+        assert self._store(tmp_path).get_profile_by_executable("custom.exe").id == "custom"
+
+    def test_glob_and_regex_patterns(self, tmp_path):
+        """Glob and regex entries match case-insensitively; literal names win"""
+        store = self._store(tmp_path)
+        store.create_profile(self._profile("unreal", ["*-Win64-Shipping.exe"]))
+        store.create_profile(self._profile("versioned", [r"re:game_v\d+\.exe", "re:("]))
+        store.create_profile(self._profile("literal", ["Foo-Win64-Shipping.exe"]))
+
+        assert store.get_profile_by_executable("bar-win64-shipping.exe").id == "unreal"
+        assert store.get_profile_by_executable("foo-Win64-Shipping.exe").id == "literal"
+        assert store.get_profile_by_executable("GAME_V12.exe").id == "versioned"
+        assert store.get_profile_by_executable("game_v.exe").id == "generic_game"
+        assert store.get_profile_by_id("unreal").matches_executable("x-Win64-Shipping.exe")
+
+    def test_regex_with_inline_flags(self, tmp_path):
+        """Inline-flag regexes and invalid entries never break indexing or saving"""
+        store = self._store(tmp_path)
+        store.create_profile(self._profile("glob", ["*-Shipping.exe"]))
+        store.create_profile(self._profile("flagged", [r"re:(?i)foo.*\.exe", "re:(?i"]))
+
+        assert store.get_profile_by_executable("FooBar.exe").id == "flagged"
+        assert store.get_profile_by_executable("x-Shipping.exe").id == "glob"
+        assert self._store(tmp_path).get_profile_by_executable("foo2.exe").id == "flagged"
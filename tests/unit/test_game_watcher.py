@@ -161,3 +161,81 @@ class TestGameWatcherIntegration:
         # Stop watching
         watcher.stop_watching()
         assert not watcher._watching
+
+
+@pytest.mark.unit
+class TestSharedProcessTable:
+    """Test consuming the detector's process monitor"""
+
+    def _watcher(self, tmp_path, monkeypatch, *names):
+        import src.process_monitor as pm
+        from src.process_monitor import ProcessMonitor
+
+        procs = []
+        for pid, name in enumerate(names, start=100):
+            proc = MagicMock()
+            proc.pid = pid
+            proc.info = {"pid": pid, "name": name, "exe": ""}
+            procs.append(proc)
+        monkeypatch.setattr(pm.psutil, "process_iter", lambda attrs=None: procs)
+        monitor = ProcessMonitor(use_events=False)
+        monitor.refresh()
+        detector = GameDetector(process_monitor=monitor)
+        store = GameProfileStore(config_dir=tmp_path)
+        return GameWatcher(detector=detector, profile_store=store, check_interval=60), monitor
+
+    def test_uses_detector_monitor(self, tmp_path, monkeypatch):
+        """The watcher and detector read the same process table"""
+        watcher, monitor = self._watcher(tmp_path, monkeypatch, "bash", "eldenring.exe")
+
+        assert watcher.process_monitor is monitor
+        watcher._on_processes_changed(monitor.get_processes(), [])
+        assert watcher.get_running_game_processes() == {101: "eldenring.exe"}
+
+    def test_profiles_matched_once_per_new_process(self, tmp_path, monkeypatch):
+        """Watch ticks do not enumerate processes or rescan profiles"""
+        watcher, monitor = self._watcher(tmp_path, monkeypatch, "bash", "eldenring.exe")
+        watcher._rematch_running_games()
+
+        with patch("psutil.process_iter", side_effect=AssertionError("enumerated")), \
+             patch("platform.system", return_value="Linux"), \
+             patch.object(watcher.profile_store, "get_profile_by_executable") as lookup:
+            for _ in range(3):
+                assert watcher._get_foreground_executable() == "eldenring.exe"
+        lookup.assert_not_called()
+
+    def test_process_exit_wakes_watch_loop(self, tmp_path, monkeypatch):
+        """A game exit is handled without waiting for check_interval"""
+        import time
+
+        watcher, monitor = self._watcher(tmp_path, monkeypatch, "eldenring.exe")
+        with patch("platform.system", return_value="Linux"):
+            watcher.start_watching()
+            try:
+                deadline = time.monotonic() + 2
+                while watcher.active_game_exe is None and time.monotonic() < deadline:
+                    time.sleep(0.01)
+                assert watcher.active_game_exe == "eldenring.exe"
+
+                monitor._apply([("exit", 100)])
+                deadline = time.monotonic() + 2
+                while watcher.active_game_exe is not None and time.monotonic() < deadline:
+                    time.sleep(0.01)
+                assert watcher.active_game_exe is None
+            finally:
+                watcher.stop_watching()
+
+    def test_profile_changes_trigger_rematch(self, tmp_path, monkeypatch):
+        """A profile created while a game runs is picked up on the next tick"""
+        from src.game_profile import GameProfile
+
+        watcher, monitor = self._watcher(tmp_path, monkeypatch, "newgame.exe")
+        watcher._rematch_running_games()
+        assert watcher.get_running_game_processes() == {}
+
+        watcher.profile_store.create_profile(
+            GameProfile(id="new_game", display_name="New Game",
+                        exe_names=["newgame.exe"], system_prompt="Prompt")
+        )
+        with patch("platform.system", return_value="Linux"):
+            assert watcher._get_foreground_executable() == "newgame.exe"
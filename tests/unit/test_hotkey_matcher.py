@@ -0,0 +1,233 @@
+"""
+Test suite for hotkey matching
+
+Tests the modifier-mask binding table, held-key tracking, KeybindManager
+dispatching matched actions off the input hook thread and per-game
+binding tables.
+"""
+import threading
+import time
+from dataclasses import dataclass
+from types import SimpleNamespace
+from typing import Optional
+from unittest.mock import patch
+
+import pytest
+
+from src.hotkey_matcher import (
+    ALT, CTRL, SHIFT, BindingTable, HotkeyBinding, HotkeyMatcher, key_name, parse_combo,
+)
+from src.keybind_manager import Keybind, KeybindManager, MacroKeybind
+
+
+@dataclass(frozen=True)
+class FakeKey:
+    """pynput-like Key member"""
+    name: str
+
+
+@dataclass(frozen=True)
+class FakeKeyCode:
+    """pynput-like KeyCode"""
+    char: str
+    vk: Optional[int] = None
+
+
+def _matcher(**combos):
+    table = BindingTable(HotkeyBinding.compile(action, keys) for action, keys in combos.items())
+    return HotkeyMatcher(table)
+
+
+@pytest.mark.unit
+class TestParsing:
+    """Test combo and key event normalization"""
+
+    def test_parse_combo(self):
+        """Modifiers become a mask; aliases map to pynput key names"""
+        assert parse_combo("Ctrl+Shift+G") == (CTRL | SHIFT, frozenset({"g"}))
+        assert parse_combo("alt+pageup") == (ALT, frozenset({"page_up"}))
+        assert parse_combo("ctrl+shift") is None
+
+    def test_key_names(self):
+        """Ctrl control codes fall back to the virtual key"""
+        assert key_name(FakeKey("ctrl_r")) == "ctrl_r"
+        assert key_name(FakeKeyCode("G")) == "g"
+        assert key_name(FakeKeyCode("\x07", vk=0x47)) == "g"
+        assert key_name("Escape") == "esc"
+
+
+@pytest.mark.unit
+class TestMatcher:
+    """Test matching key events against the table"""
+
+    def test_exact_modifiers_required(self):
+        """ctrl+g does not fire while shift is also held"""
+        matcher = _matcher(plain="ctrl+g", shifted="ctrl+shift+g")
+
+        matcher.press(FakeKey("ctrl_l"))
+        assert matcher.press(FakeKeyCode("g")) == ["plain"]
+        matcher.release(FakeKeyCode("g"))
+        matcher.press(FakeKey("shift_r"))
+        assert matcher.press(FakeKeyCode("g")) == ["shifted"]
+
+    def test_held_movement_keys_do_not_block(self):
+        """A hotkey fires while other non-modifier keys are held"""
+        matcher = _matcher(heal="alt+q")
+        matcher.press(FakeKeyCode("w"))
+        matcher.press(FakeKey("alt_l"))
+
+        assert matcher.press(FakeKeyCode("q")) == ["heal"]
+
+    def test_auto_repeat_fires_once(self):
+        """Repeated press events of a held key are ignored"""
+        matcher = _matcher(fire="f5")
+
+        assert matcher.press(FakeKey("f5")) == ["fire"]
+        assert matcher.press(FakeKey("f5")) == []
+        matcher.release(FakeKey("f5"))
+        assert matcher.press(FakeKey("f5")) == ["fire"]
+
+    def test_multi_key_combo(self):
+        """Combos with several non-modifier keys need all of them down"""
+        matcher = _matcher(combo="ctrl+a+b")
+        matcher.press(FakeKey("ctrl_l"))
+
+        assert matcher.press(FakeKeyCode("b")) == []
+        assert matcher.press(FakeKeyCode("a")) == ["combo"]
+
+    def test_table_copy_on_write(self):
+        """Adding or removing bindings leaves the original table untouched"""
+        table = BindingTable([HotkeyBinding.compile("a", "ctrl+1")])
+        grown = table.with_binding(HotkeyBinding.compile("b", "ctrl+2"))
+
+        assert len(table) == 1 and len(grown) == 2
+        assert grown.without("a").lookup(CTRL, "1") == ()
+        assert table.lookup(CTRL, "1")[0].action == "a"
+
+
+@pytest.mark.unit
+class TestKeybindDispatch:
+    """Test KeybindManager matching and worker dispatch"""
+
+    def test_slow_callback_does_not_block_hook(self):
+        """Callbacks run on the worker thread, after the hook returns"""
+        manager = KeybindManager()
+        started = threading.Event()
+        release = threading.Event()
+        hook_thread = threading.current_thread()
+        ran_on = []
+
+        def slow():
+            ran_on.append(threading.current_thread())
+            started.set()
+            release.wait(2)
+
+        manager.register_keybind(Keybind(action="slow", keys="ctrl+k", description="",
+                                         system_wide=True), slow)
+        try:
+            manager._on_press(FakeKey("ctrl_l"))
+            start = time.perf_counter()
+            manager._on_press(FakeKeyCode("k"))
+            assert time.perf_counter() - start < 0.05
+            assert started.wait(1)
+            release.set()
+            manager.wait_for_dispatch()
+        finally:
+            manager.stop_listening()
+
+        assert ran_on and ran_on[0] is not hook_thread
+
+    def test_unregister_removes_binding(self):
+        """Unregistered keybinds no longer match"""
+        manager = KeybindManager()
+        manager.register_keybind(Keybind(action="x", keys="alt+x", description="",
+                                         system_wide=True), lambda: None)
+        manager.unregister_keybind("x")
+
+        manager._on_press(FakeKey("alt_l"))
+        assert manager.matcher.press(FakeKeyCode("x")) == []
+        assert "x" not in manager.matcher.table
+
+
+@pytest.mark.unit
+class TestPerGameTables:
+    """Test per-game binding tables swapped on game changes"""
+
+    def _manager(self):
+        manager = KeybindManager()
+        manager.register_keybind(Keybind(action="overlay", keys="ctrl+shift+g", description="",
+                                         system_wide=True), lambda: None)
+        manager.register_macro_keybind(MacroKeybind(macro_id="rotation", keys="alt+1", description="",
+                                                    game_profile_id="elden_ring"), lambda: None)
+        manager.register_macro_keybind(MacroKeybind(macro_id="build", keys="alt+1", description="",
+                                                    game_profile_id="factorio"), lambda: None)
+        return manager
+
+    def test_only_active_game_bindings_match(self):
+        """The hook sees global bindings plus the active game's"""
+        manager = self._manager()
+        assert set(manager.matcher.table.bindings) == {"overlay"}
+
+        manager.on_game_changed("Elden Ring", SimpleNamespace(id="elden_ring"))
+        manager.matcher.press(FakeKey("alt_l"))
+        assert manager.matcher.press(FakeKeyCode("1")) == ["macro_rotation"]
+
+        manager.matcher.release(FakeKeyCode("1"))
+        manager.on_game_changed("Factorio", SimpleNamespace(id="factorio"))
+        assert manager.matcher.press(FakeKeyCode("1")) == ["macro_build"]
+
+        manager.on_game_closed()
+        assert set(manager.matcher.table.bindings) == {"overlay"}
+
+    def test_switching_reuses_compiled_tables(self):
+        """Switching back to a game neither recompiles nor parses keys"""
+        manager = self._manager()
+        manager.set_active_game("elden_ring")
+        elden_table = manager.matcher.table
+
+        with patch("src.hotkey_matcher.parse_combo") as parse:
+            manager.set_active_game("factorio")
+            manager.set_active_game("elden_ring")
+
+        parse.assert_not_called()
+        assert manager.matcher.table is elden_table
+
+    def test_keybinds_for_game(self):
+        """get_keybinds_for_game filters by scope and follows changes"""
+        manager = self._manager()
+
+        actions = {k.action for k in manager.get_keybinds_for_game("factorio")}
+        assert actions == {"overlay", "macro_build"}
+
+        manager.unregister_macro_keybind("build")
+        actions = {k.action for k in manager.get_keybinds_for_game("factorio")}
+        assert actions == {"overlay"}
+
+    def test_refresh_after_in_place_edit(self):
+        """Editing a keybind in place takes effect after refresh_bindings"""
+        manager = self._manager()
+        manager.keybinds["overlay"].keys = "ctrl+shift+o"
+
+        manager.refresh_bindings()
+
+        assert manager.matcher.table.lookup(CTRL | SHIFT, "o")[0].action == "overlay"
+        assert manager.matcher.table.lookup(CTRL | SHIFT, "g") == ()
+
+    def test_bulk_registration_compiles_once(self):
+        """Keybinds registered in a batch rebuild the tables once, keeping precompiled games"""
+        manager = self._manager()
+        manager.precompile_tables(["elden_ring", "factorio"])
+
+        with patch("src.keybind_manager.BindingTable", wraps=BindingTable) as table_cls:
+            with manager.batch_updates():
+                for i in range(20):
+                    manager.register_macro_keybind(
+                        MacroKeybind(macro_id=f"m{i}", keys=f"ctrl+alt+f{i + 1}", description=""),
+                        lambda: None,
+                    )
+                assert table_cls.call_count == 0
+
+        # The global table and both precompiled games
+        assert table_cls.call_count == 3
+        assert set(manager._tables) == {None, "elden_ring", "factorio"}
+        assert len(manager.matcher.table) == 21
@@ -6,6 +6,7 @@ error handling, and timeout behavior.
 """
 
 import pytest
+import threading
 import time
 from unittest.mock import patch, MagicMock
 from src.hrm_integration import HRMInterface, get_hrm_interface, requires_complex_reasoning
@@ -392,3 +393,111 @@ class TestConvenienceFunctions:
 
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
+
+
+_PUZZLE = (
+    "53..7...."
+    "6..195..."
+    ".98....6."
+    "8...6...3"
+    "4..8.3..1"
+    "7...2...6"
+    ".6....28."
+    "...419..5"
+    "....8..79"
+)
+_SOLUTION = [int(d) for d in (
+    "534678912672195348198342567859761423426853791713924856961537284287419635345286179"
+)]
+
+
+class FakeSudokuModel:
+    """Stands in for HRMCPUModel, returning a canned answer"""
+
+    def __init__(self, solution):
+        self.solution = solution
+        self.deadlines = []
+
+    def solve_sudoku(self, puzzle, deadline=None):
+        from src.hrm_inference import is_solution
+        self.deadlines.append(deadline)
+        return {"solution": self.solution, "valid": is_solution(puzzle, self.solution),
+                "steps": 4, "halted": True}
+
+
+class TestPuzzleInference:
+    """Test suite for model-backed puzzle answers."""
+
+    def test_parse_sudoku_grid(self):
+        """Grids are found in free text, in one line or as rows."""
+        from src.hrm_inference import is_solution, parse_sudoku
+
+        rows = "\n".join(_PUZZLE[i:i + 9] for i in range(0, 81, 9))
+        grid = parse_sudoku(f"Can you solve this sudoku?\n{rows}")
+
+        assert grid is not None and grid[:3] == [5, 3, 0]
+        assert parse_sudoku("How do I solve the water temple puzzle?") is None
+        assert is_solution(grid, _SOLUTION)
+        assert not is_solution(grid, _SOLUTION[::-1])
+
+    def test_analyze_uses_model_for_sudoku(self):
+        """A Sudoku question is answered by the model within the time limit."""
+        hrm = HRMInterface()
+        model = FakeSudokuModel(_SOLUTION)
+        started = time.perf_counter()
+
+        with patch.object(hrm, '_get_model', return_value=model):
+            result = hrm.analyze(f"Solve this sudoku: {_PUZZLE}")
+
+        assert "Sudoku Solution" in result and "5 3 4 | 6 7 8 | 9 1 2" in result
+        assert model.deadlines[0] <= started + hrm.config.hrm_max_inference_time + 0.1
+
+    def test_invalid_answer_falls_back_to_outline(self):
+        """An answer that breaks the rules is not shown."""
+        hrm = HRMInterface()
+
+        with patch.object(hrm, '_get_model', return_value=FakeSudokuModel([1] * 81)):
+            result = hrm.analyze(f"Solve this sudoku: {_PUZZLE}")
+
+        assert "Puzzle Solving Strategy" in result
+
+    def test_no_checkpoint_means_no_model(self):
+        """Without a configured checkpoint the model is never loaded."""
+        hrm = HRMInterface()
+        hrm.config.hrm_checkpoint_path = None
+
+        assert hrm._get_model() is None
+
+    def test_model_error_falls_back_to_outline(self):
+        """A failing model still yields the reasoning outline."""
+        hrm = HRMInterface()
+        model = MagicMock()
+        model.solve_sudoku.side_effect = RuntimeError("bad checkpoint")
+
+        with patch.object(hrm, '_get_model', return_value=model):
+            result = hrm.analyze(f"Solve this sudoku: {_PUZZLE}")
+
+        assert "Puzzle Solving Strategy" in result
+
+    def test_checkpoint_preloaded_in_background(self):
+        """A configured checkpoint loads at startup; questions don't wait on it."""
+        loading = threading.Event()
+        release = threading.Event()
+
+        def slow_model(*args, **kwargs):
+            loading.set()
+            release.wait(5)
+            return FakeSudokuModel(_SOLUTION)
+
+        with patch.dict('os.environ', {'HRM_CHECKPOINT_PATH': 'ckpt.pt'}), \
+                patch('src.hrm_inference.HRMCPUModel', side_effect=slow_model), \
+                patch.dict('sys.modules', {'torch': MagicMock()}):
+            hrm = HRMInterface()
+            assert loading.wait(5)
+
+            result = hrm.analyze(f"Solve this sudoku: {_PUZZLE}")
+            assert "Puzzle Solving Strategy" in result
+
+            release.set()
+            assert hrm._get_model() is not None
+            assert "Sudoku Solution" in hrm.analyze(f"Solve this sudoku: {_PUZZLE}")
@@ -0,0 +1,91 @@
+"""
+Test suite for AI macro generation
+
+Tests schema-constrained requests, result caching, batched variant
+generation and generation stats against a fake router.
+"""
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from src.macro_ai_generator import MacroAIGenerator
+
+_MACRO = {
+    "name": "Quick Attack",
+    "description": "Press 1 then 2",
+    "steps": [
+        {"type": "key_press", "key": "1"},
+        {"type": "delay", "duration_ms": 100},
+        {"type": "key_press", "key": "2"},
+    ],
+}
+
+
+class FakeRouter:
+    """Router returning canned replies and recording chat calls"""
+
+    def __init__(self, *replies):
+        self.replies = list(replies)
+        self.calls = []
+        self.config = SimpleNamespace(ollama_model="llama3")
+
+    def chat(self, messages, model=None, **kwargs):
+        self.calls.append(kwargs)
+        return {"content": self.replies.pop(0), "model": model or self.config.ollama_model}
+
+
+@pytest.mark.unit
+class TestMacroAIGenerator:
+    """Test MacroAIGenerator requests, caching and batching"""
+
+    def test_schema_format_and_cache(self):
+        """Requests carry the JSON schema; repeats are served from the cache"""
+        router = FakeRouter(json.dumps(_MACRO))
+        generator = MacroAIGenerator(router)
+
+        first, _ = generator.generate_macro("press 1 then 2", "Elden Ring")
+        second, _ = generator.generate_macro("Press 1  then 2", "Elden Ring")
+
+        assert len(router.calls) == 1
+        assert router.calls[0]["format"] == generator.get_schema()
+        assert first.name == second.name == "Quick Attack"
+        assert first.id != second.id
+        assert generator.get_generation_stats()["cache_hits"] == 1
+
+    def test_cache_keyed_by_model_and_game(self):
+        """A different model or game makes a new request"""
+        router = FakeRouter(*[json.dumps(_MACRO)] * 3)
+        generator = MacroAIGenerator(router)
+
+        generator.generate_macro("attack", "Elden Ring")
+        generator.generate_macro("attack", "Factorio")
+        router.config.ollama_model = "mistral"
+        generator.generate_macro("attack", "Elden Ring")
+
+        assert len(router.calls) == 3
+
+    def test_variants_in_one_request(self):
+        """Several variants come back from a single request; invalid ones are dropped"""
+        broken = {"name": "Broken", "description": "", "steps": []}
+        router = FakeRouter(json.dumps({"macros": [_MACRO, broken, dict(_MACRO, name="Slow Attack")]}))
+        generator = MacroAIGenerator(router)
+
+        macros, _ = generator.generate_variants("attack", count=3)
+
+        assert len(router.calls) == 1
+        assert router.calls[0]["format"]["properties"]["macros"]["maxItems"] == 3
+        assert [m.name for m in macros] == ["Quick Attack", "Slow Attack"]
+
+    def test_failures_counted_and_not_cached(self):
+        """Unparseable replies count as failures and are retried next time"""
+        router = FakeRouter("no json here", json.dumps(_MACRO))
+        generator = MacroAIGenerator(router)
+
+        macro, message = generator.generate_macro("attack")
+        assert macro is None and message.startswith("❌")
+        macro, _ = generator.generate_macro("attack")
+
+        stats = generator.get_generation_stats()
+        assert macro is not None
+        assert (stats["requests"], stats["failures"], stats["failure_rate"]) == (2, 1, 0.5)
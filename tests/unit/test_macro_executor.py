@@ -0,0 +1,215 @@
+"""
+Test suite for concurrent macro execution
+
+Tests interleaving on one timing thread, key-hold conflicts between
+runs, priorities and cancellation, using a virtual clock and a
+recording input backend.
+"""
+import time
+from unittest.mock import patch
+
+import pytest
+
+from src.macro_executor import MacroExecutor, MacroPriority
+from src.macro_input import RecordingInputBackend, VirtualClock
+from src.macro_manager import Macro, MacroManager, MacroStep, MacroStepType
+
+
+def _macro(macro_id, steps, repeat=1):
+    return Macro(id=macro_id, name=macro_id, description="", steps=steps, repeat=repeat)
+
+
+def _press(key, ms=0):
+    return MacroStep(type=MacroStepType.KEY_PRESS.value, key=key, duration_ms=ms)
+
+
+def _hold(key, ms):
+    return MacroStep(type=MacroStepType.KEY_DOWN.value, key=key, duration_ms=ms)
+
+
+def _executor():
+    clock = VirtualClock()
+    backend = RecordingInputBackend(clock)
+    executor = MacroExecutor(backend=backend, timer=clock, default_timeout=None)
+    return executor, backend, clock
+
+
+def _timed(backend):
+    return [(round(t, 3), op, arg) for t, op, arg in backend.events]
+
+
+@pytest.mark.unit
+class TestConcurrentRuns:
+    """Test several macros sharing one schedule"""
+
+    def test_runs_interleave_by_deadline(self):
+        """Two macros run side by side at their own offsets"""
+        executor, backend, clock = _executor()
+        executor.submit(_macro("a", [_press("a", 30)], repeat=2))
+        executor.tick()
+        clock.advance(0.01)
+        executor.tick()
+        clock.advance(0.005)
+        executor.submit(_macro("b", [_press("b", 30)]))
+
+        executor.run_until_idle()
+
+        assert _timed(backend) == [
+            (0.0, "press", "a"), (0.01, "release", "a"),
+            (0.015, "press", "b"), (0.025, "release", "b"),
+            (0.05, "press", "a"), (0.06, "release", "a"),
+        ]
+        assert executor.active_runs() == []
+
+    def test_equal_deadlines_favour_priority(self):
+        """A hotkey run's event goes before a loop run's event due at the same time"""
+        executor, backend, _ = _executor()
+        executor.submit(_macro("loop", [_press("x")]), MacroPriority.LOOP)
+        executor.submit(_macro("hot", [_press("y")]), MacroPriority.HOTKEY)
+
+        executor.tick()
+
+        assert backend.operations() == [("press", "y"), ("press", "x")]
+
+    def test_finished_callback_and_timeout(self):
+        """Completed runs report back; overdue runs stop with an error"""
+        executor, _, _ = _executor()
+        finished, errors = [], []
+        executor.on_macro_finished = lambda run_id, macro: finished.append(macro.id)
+        executor.on_error = lambda run_id, message: errors.append(run_id)
+        executor.submit(_macro("quick", [_press("q")]))
+        slow = _macro("slow", [_press("s", 500)], repeat=10)
+        slow.execution_timeout = 1
+        slow_id = executor.submit(slow)
+
+        executor.run_until_idle()
+
+        assert finished == ["quick"]
+        assert errors == [slow_id]
+
+
+@pytest.mark.unit
+class TestKeyConflicts:
+    """Test ownership of keys held by more than one run"""
+
+    def test_hotkey_preempts_held_key(self):
+        """A hotkey macro takes over a key a loop macro is holding"""
+        executor, backend, clock = _executor()
+        loop_id = executor.submit(_macro("loop", [_hold("w", 100)]), MacroPriority.LOOP)
+        executor.tick()
+        clock.advance(0.02)
+        hot_id = executor.submit(_macro("hot", [_press("w")]), MacroPriority.HOTKEY)
+
+        executor.run_until_idle()
+
+        assert _timed(backend) == [
+            (0.0, "press", "w"),
+            (0.02, "release", "w"), (0.02, "press", "w"),
+            (0.03, "release", "w"),
+        ]
+        conflict = executor.conflicts[0]
+        assert (conflict.holder, conflict.contender, conflict.resolution) == (loop_id, hot_id, "preempted")
+        assert executor.held_keys() == {}
+
+    def test_lower_priority_waits_for_release(self):
+        """A loop macro pressing a held key waits, then keeps its own spacing"""
+        executor, backend, clock = _executor()
+        executor.submit(_macro("hot", [_hold("w", 50)]), MacroPriority.HOTKEY)
+        executor.tick()
+        clock.advance(0.02)
+        executor.submit(_macro("loop", [_press("w"), _press("e")]), MacroPriority.LOOP)
+
+        executor.run_until_idle()
+
+        assert _timed(backend) == [
+            (0.0, "press", "w"),
+            (0.06, "release", "w"), (0.06, "press", "w"),
+            (0.07, "release", "w"),
+            (0.08, "press", "e"), (0.09, "release", "e"),
+        ]
+        assert executor.conflicts[0].resolution == "deferred"
+
+    def test_cancel_releases_held_keys(self):
+        """Cancelling a run releases its keys and unblocks waiting runs"""
+        executor, backend, clock = _executor()
+        holder = executor.submit(_macro("hold", [_hold("shift", 1000)]), MacroPriority.HOTKEY)
+        executor.tick()
+        executor.submit(_macro("wait", [_press("shift")]), MacroPriority.LOOP)
+        executor.tick()
+        clock.advance(0.1)
+
+        executor.cancel(holder)
+        executor.run_until_idle()
+
+        assert _timed(backend) == [
+            (0.0, "press", "shift"),
+            (0.1, "release", "shift"), (0.1, "press", "shift"),
+            (0.11, "release", "shift"),
+        ]
+
+
+@pytest.mark.unit
+class TestTimingThread:
+    """Test the real-time thread and MacroManager integration"""
+
+    def test_manager_runs_macros_concurrently(self):
+        """run_macro starts a second macro while the first is still running"""
+        manager = MacroManager()
+        first = manager.create_macro("First")
+        second = manager.create_macro("Second")
+        first.steps.append(MacroStep(type=MacroStepType.DELAY.value, duration_ms=100))
+        second.steps.append(MacroStep(type=MacroStepType.DELAY.value, duration_ms=20))
+        executor = manager.get_executor()
+        executor.backend = RecordingInputBackend()
+        finished = []
+        executor.on_macro_finished = lambda run_id, macro: finished.append(macro.name)
+
+        try:
+            assert manager.run_macro(first.id) is not None
+            assert manager.run_macro(second.id, MacroPriority.HOTKEY) is not None
+            deadline = time.time() + 2
+            while len(finished) < 2 and time.time() < deadline:
+                time.sleep(0.01)
+        finally:
+            executor.stop()
+
+        assert finished == ["Second", "First"]
+
+    def test_run_macro_enforces_runner_limits(self):
+        """run_macro applies the same repeat limit and validation as MacroRunner"""
+        manager = MacroManager(config=type("Cfg", (), {"max_macro_repeat": 5})())
+        looped = manager.create_macro("Looped")
+        looped.steps.append(_press("a"))
+        looped.repeat = 6
+        empty = manager.create_macro("Empty")
+
+        with patch.object(MacroManager, "get_executor") as get_executor:
+            assert manager.run_macro(looped.id) is None
+            assert manager.run_macro(empty.id) is None
+            looped.max_repeat = 10
+            assert manager.run_macro(looped.id) is not None
+
+        assert get_executor.return_value.submit.call_count == 1
+
+    def test_hotkey_callback_runs_at_hotkey_priority(self):
+        """Keybind callbacks submit through run_macro with HOTKEY priority"""
+        manager = MacroManager()
+        macro = manager.create_macro("Bound")
+        macro.steps.append(_press("a"))
+
+        with patch.object(MacroManager, "get_executor") as get_executor:
+            manager.hotkey_callback(macro.id)()
+
+        get_executor.return_value.submit.assert_called_once_with(macro, MacroPriority.HOTKEY)
+
+    def test_shutdown_stops_executor(self):
+        """shutdown stops the shared timing thread"""
+        manager = MacroManager()
+        executor = manager.get_executor()
+        thread = executor._thread
+
+        manager.shutdown()
+
+        assert not thread.is_alive()
+        assert manager.get_executor() is not executor
+        manager.shutdown()
@@ -0,0 +1,83 @@
+"""
+Test suite for pluggable macro input
+
+Tests MacroRunner replaying macros through a recording backend on a
+virtual clock, with no display, pynput or real sleeps.
+"""
+import time
+
+import pytest
+
+from src.macro_input import RecordingInputBackend, VirtualClock
+from src.macro_manager import Macro, MacroStep, MacroStepType
+from src.macro_runner import MacroExecutionState, MacroRunner
+from src.macro_timing import TimingStats
+
+
+def _headless_runner():
+    clock = VirtualClock(start=100.0)
+    backend = RecordingInputBackend(clock)
+    return MacroRunner(enabled=True, backend=backend, timer=clock), backend, clock
+
+
+@pytest.mark.unit
+class TestHeadlessReplay:
+    """Test MacroRunner on the recording backend"""
+
+    def test_replay_in_simulated_time(self):
+        """A ten-second macro replays instantly with exact event times"""
+        runner, backend, clock = _headless_runner()
+        macro = Macro(id="m", name="Long", description="", repeat=2, steps=[
+            MacroStep(type=MacroStepType.KEY_PRESS.value, key="ctrl+s", duration_ms=5000),
+            MacroStep(type=MacroStepType.MOUSE_CLICK.value, button="right", x=5, y=6),
+        ])
+
+        start = time.perf_counter()
+        assert runner.execute_macro(macro)
+        runner.execution_thread.join(timeout=2)
+
+        assert time.perf_counter() - start < 1.0
+        assert runner.state == MacroExecutionState.COMPLETED
+        assert [(round(t - 100.0, 3), op, arg) for t, op, arg in backend.events] == [
+            (0.0, "press", "ctrl"), (0.01, "press", "s"),
+            (0.02, "release", "s"), (0.03, "release", "ctrl"),
+            (5.04, "click", ("right", 5, 6)),
+            (5.04, "press", "ctrl"), (5.05, "press", "s"),
+            (5.06, "release", "s"), (5.07, "release", "ctrl"),
+            (10.08, "click", ("right", 5, 6)),
+        ]
+        assert runner.get_timing_stats()["max_ms"] == 0.0
+
+    def test_timeout_uses_injected_clock(self):
+        """Timeouts are measured on the virtual clock"""
+        runner, _, _ = _headless_runner()
+        errors = []
+        runner.on_error = errors.append
+        macro = Macro(id="m", name="Slow", description="", execution_timeout=1, repeat=5,
+                      steps=[MacroStep(type=MacroStepType.KEY_PRESS.value, key="e", duration_ms=600)])
+
+        runner.execute_macro(macro)
+        runner.execution_thread.join(timeout=2)
+
+        assert runner.state == MacroExecutionState.ERROR
+        assert "timeout" in errors[0]
+
+
+@pytest.mark.unit
+class TestTimingStatsMerge:
+    """Test combining lateness statistics across runs"""
+
+    def test_merge_matches_single_pass(self):
+        """Merged statistics equal those of all samples recorded together"""
+        samples = [0.001, 0.004, 0.002, 0.009, 0.003]
+        combined, first, second = TimingStats(), TimingStats(), TimingStats()
+        for value in samples:
+            combined.record(value)
+        for value in samples[:2]:
+            first.record(value)
+        for value in samples[2:]:
+            second.record(value)
+
+        first.merge(second)
+
+        assert first.to_dict() == combined.to_dict()
@@ -0,0 +1,120 @@
+"""
+Test suite for compiled macro execution plans
+
+Tests event offsets, delay merging, key resolution and plan caching.
+"""
+import time
+from unittest.mock import MagicMock
+
+import pytest
+
+from src.macro_manager import Macro, MacroManager, MacroStep, MacroStepType
+from src.macro_plan import (
+    ACTION, JITTER, MARK, PRESS, RELEASE, TYPE, MacroPlanCache, compile_macro,
+)
+from src.macro_runner import MacroExecutionState, MacroRunner
+
+
+def _compile(steps, gap=0.01):
+    macro = Macro(id="m", name="Plan", description="", steps=steps)
+    return compile_macro(macro, resolve_keys=lambda combo: combo.split("+"), key_gap=gap)
+
+
+def _inputs(plan):
+    return [(e.kind, e.key, round(e.offset, 3)) for e in plan.events if e.kind != MARK]
+
+
+@pytest.mark.unit
+class TestCompile:
+    """Test compiling steps into timed events"""
+
+    def test_key_combo_offsets(self):
+        """Combos press in order, release in reverse, key_gap apart"""
+        plan = _compile([
+            MacroStep(type=MacroStepType.KEY_PRESS.value, key="ctrl+a", duration_ms=100),
+            MacroStep(type=MacroStepType.KEY_SEQUENCE.value, key="hi"),
+        ])
+
+        assert _inputs(plan) == [
+            (PRESS, "ctrl", 0.0), (PRESS, "a", 0.01),
+            (RELEASE, "a", 0.02), (RELEASE, "ctrl", 0.03),
+            (TYPE, "h", 0.14), (TYPE, "i", 0.15),
+        ]
+        assert plan.duration == pytest.approx(0.16)
+
+    def test_consecutive_delays_merge(self):
+        """Delays produce no events; they only move later offsets"""
+        plan = _compile([
+            MacroStep(type=MacroStepType.DELAY.value, duration_ms=50),
+            MacroStep(type=MacroStepType.DELAY.value, duration_ms=70),
+            MacroStep(type=MacroStepType.DELAY.value, duration_ms=30, delay_jitter_ms=5),
+            MacroStep(type=MacroStepType.KEY_DOWN.value, key="w", duration_ms=200),
+        ])
+
+        assert [(e.kind, round(e.offset, 3)) for e in plan.events if e.kind != MARK] == [
+            (JITTER, 0.12), (PRESS, 0.15), (RELEASE, 0.36),
+        ]
+        assert [e.step_index for e in plan.events if e.kind == MARK] == [0, 1, 2, 3]
+
+    def test_ui_action_parameters(self):
+        """UI actions carry their handler parameters"""
+        plan = _compile([MacroStep(type=MacroStepType.SEND_MESSAGE.value, key="gg")])
+
+        event = plan.events[0]
+        assert event.kind == ACTION and dict(event.params) == {"message": "gg"}
+
+
+@pytest.mark.unit
+class TestPlanCache:
+    """Test plans cached by macro id and version"""
+
+    def test_recompiles_only_on_change(self):
+        """Repeated executions reuse the plan until the macro is edited"""
+        compiler = MagicMock(
+            side_effect=lambda macro: compile_macro(macro, resolve_keys=lambda combo: [combo])
+        )
+        cache = MacroPlanCache(compiler)
+        macro = Macro(id="m", name="Plan", description="",
+                      steps=[MacroStep(type=MacroStepType.KEY_PRESS.value, key="a")])
+
+        first = cache.get(macro)
+        assert cache.get(macro) is first
+
+        macro.add_step(MacroStep(type=MacroStepType.KEY_PRESS.value, key="b"))
+        assert cache.get(macro) is not first
+        assert cache.compilations == 2
+
+    def test_manager_update_bumps_version(self):
+        """MacroManager.update_macro changes the version the cache keys on"""
+        manager = MacroManager()
+        macro = manager.create_macro("Plan")
+        macro.steps.append(MacroStep(type=MacroStepType.KEY_PRESS.value, key="a"))
+        before = macro.updated_at
+        time.sleep(0.001)
+
+        manager.update_macro(macro.id, name="Renamed")
+
+        assert macro.updated_at > before
+
+
+@pytest.mark.unit
+class TestRunnerUsesPlans:
+    """Test the runner executing compiled plans"""
+
+    def test_repeats_share_one_compilation(self):
+        """Key combos are parsed once per macro version, not per repeat"""
+        runner = MacroRunner(enabled=True)
+        runner.keyboard_controller = MagicMock()
+        parse = MagicMock(side_effect=lambda combo: [combo])
+        runner._parse_key_combo = parse
+        macro = Macro(id="m", name="Plan", description="", repeat=5,
+                      steps=[MacroStep(type=MacroStepType.KEY_PRESS.value, key="e")])
+
+        for _ in range(2):
+            runner.current_macro = macro
+            runner.state = MacroExecutionState.RUNNING
+            runner._execute_macro_thread()
+
+        assert parse.call_count == 1
+        assert runner.keyboard_controller.press.call_count == 10
+        assert runner.state == MacroExecutionState.COMPLETED
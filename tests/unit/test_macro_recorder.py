@@ -0,0 +1,190 @@
+"""
+Test suite for macro recording
+
+Tests raw input coalescing in MacroRecorder and the compact packed step
+format used for stored macros.
+"""
+import math
+from dataclasses import dataclass
+
+import pytest
+
+from src.macro_codec import pack_steps, unpack_steps
+from src.macro_manager import Macro, MacroManager, MacroStep, MacroStepType
+from src.macro_recorder import MacroRecorder, simplify_path
+
+
+@dataclass(frozen=True)
+class FakeKey:
+    """pynput-like Key member"""
+    name: str
+
+
+@dataclass(frozen=True)
+class FakeKeyCode:
+    """pynput-like KeyCode"""
+    char: str
+
+
+class FakeClock:
+    """Manually advanced clock"""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _recorder(**kwargs):
+    clock = FakeClock()
+    recorder = MacroRecorder(clock=clock, key_gap=0.0, **kwargs)
+    recorder.start(capture_input=False)
+    return recorder, clock
+
+
+def _types(steps):
+    return [s.type for s in steps]
+
+
+@pytest.mark.unit
+class TestRecorder:
+    """Test coalescing of recorded input events"""
+
+    def test_straight_drag_collapses_to_endpoints(self):
+        """A near-straight mouse path keeps only points outside the tolerance"""
+        recorder, clock = _recorder(move_bucket_ms=0)
+        for i in range(200):
+            clock.now = i * 0.001
+            recorder.on_move(i, 100 + (i % 2))
+
+        steps = recorder.build_steps()
+
+        assert _types(steps) == [MacroStepType.MOUSE_MOVE.value] * 2
+        assert (steps[0].x, steps[-1].x) == (0, 199)
+
+    def test_simplified_path_stays_within_tolerance(self):
+        """Every dropped sample lies within the tolerance of the kept polyline"""
+        points = [(i * 0.001, i, round(40 * (i / 50.0) ** 2)) for i in range(100)]
+        kept = simplify_path(points, 2.0)
+
+        assert len(kept) < len(points) / 4
+        for (_, x1, y1), (_, x2, y2) in zip(kept, kept[1:]):
+            for _, x, y in points[x1:x2 + 1]:
+                distance = abs((y2 - y1) * (x - x1) - (x2 - x1) * (y - y1)) / math.hypot(x2 - x1, y2 - y1)
+                assert distance <= 2.0
+
+    def test_tap_and_modifier_combo_merge(self):
+        """Down/up pairs become KEY_PRESS; ctrl held around c becomes ctrl+c"""
+        recorder, clock = _recorder()
+        recorder.on_key_down(FakeKeyCode("a"))
+        clock.now = 0.02
+        recorder.on_key_up(FakeKeyCode("a"))
+        clock.now = 0.5
+        recorder.on_key_down(FakeKey("ctrl_l"))
+        clock.now = 0.52
+        recorder.on_key_down(FakeKeyCode("c"))
+        clock.now = 0.53
+        recorder.on_key_up(FakeKeyCode("c"))
+        clock.now = 0.55
+        recorder.on_key_up(FakeKey("ctrl_l"))
+
+        steps = recorder.build_steps()
+
+        assert [(s.type, s.key) for s in steps] == [
+            (MacroStepType.KEY_PRESS.value, "a"),
+            (MacroStepType.KEY_PRESS.value, "ctrl+c"),
+        ]
+        assert steps[0].duration_ms == 500
+
+    def test_long_hold_and_overlapping_keys(self):
+        """Long holds keep their duration; overlapping keys stay down/up pairs"""
+        recorder, clock = _recorder()
+        recorder.on_key_down(FakeKeyCode("w"))
+        clock.now = 1.0
+        recorder.on_key_up(FakeKeyCode("w"))
+        clock.now = 2.0
+        recorder.on_key_down(FakeKeyCode("w"))
+        clock.now = 2.1
+        recorder.on_key_down(FakeKeyCode("d"))
+        clock.now = 2.2
+        recorder.on_key_up(FakeKeyCode("w"))
+        clock.now = 2.3
+        recorder.on_key_up(FakeKeyCode("d"))
+
+        steps = recorder.build_steps()
+
+        assert (steps[0].type, steps[0].duration_ms) == (MacroStepType.KEY_DOWN.value, 1000)
+        assert [(s.type, s.key) for s in steps if s.type != MacroStepType.DELAY.value][1:] == [
+            (MacroStepType.KEY_DOWN.value, "w"),
+            (MacroStepType.KEY_DOWN.value, "d"),
+            (MacroStepType.KEY_UP.value, "w"),
+            (MacroStepType.KEY_UP.value, "d"),
+        ]
+
+    def test_hotkey_leftovers_and_clicks(self):
+        """Orphan releases and unreleased presses drop; clicks and scrolls merge"""
+        recorder, clock = _recorder()
+        recorder.on_key_up(FakeKey("f9"))
+        recorder.on_click(10, 20, "left", True)
+        clock.now = 0.05
+        recorder.on_click(10, 20, "left", False)
+        clock.now = 0.2
+        for _ in range(3):
+            recorder.on_scroll(10, 20, 0, -1)
+            clock.now += 0.01
+        recorder.on_key_down(FakeKey("f9"))
+
+        steps = recorder.build_steps()
+
+        assert _types(steps) == [MacroStepType.MOUSE_CLICK.value, MacroStepType.MOUSE_SCROLL.value]
+        assert steps[0].duration_ms == 200
+        assert steps[1].scroll_amount == -3
+
+
+@pytest.mark.unit
+class TestPackedSteps:
+    """Test the compact stored step format"""
+
+    def _path_steps(self, n=100):
+        return [MacroStep(type=MacroStepType.MOUSE_MOVE.value, x=500 + i, y=300 - i, duration_ms=8)
+                for i in range(n)] + [MacroStep(type=MacroStepType.KEY_PRESS.value, key="e",
+                                                meta={"note": "use"})]
+
+    def test_round_trip(self):
+        """Packing and unpacking reproduces the step dicts"""
+        steps = [s.to_dict() for s in self._path_steps()]
+
+        assert unpack_steps(pack_steps(steps)) == steps
+
+    def test_unknown_format_rejected(self):
+        """Unknown format versions raise ValueError"""
+        with pytest.raises(ValueError):
+            unpack_steps({"format": 99, "types": [], "rows": []})
+
+    def test_macro_packs_long_step_lists(self):
+        """Long macros are stored packed and load back unchanged"""
+        macro = Macro(id="m", name="path", description="", steps=self._path_steps())
+        short = Macro(id="s", name="tap", description="", steps=self._path_steps(3))
+
+        data = macro.to_dict(compact=True)
+        assert "steps_packed" in data and "steps" not in data
+        assert "steps" in short.to_dict(compact=True)
+        assert "steps" in macro.to_dict()
+
+        loaded = Macro.from_dict(data)
+        assert [s.to_dict() for s in loaded.steps] == [s.to_dict() for s in macro.steps]
+
+    def test_stop_recording_adds_steps(self):
+        """stop_recording appends the recorder's steps to the macro"""
+        manager = MacroManager()
+        manager.start_recording("rec")
+        manager.recorder, clock = _recorder()
+        manager.recorder.on_key_down(FakeKeyCode("q"))
+        clock.now = 0.01
+        manager.recorder.on_key_up(FakeKeyCode("q"))
+
+        macro = manager.stop_recording()
+
+        assert [(s.type, s.key) for s in macro.steps] == [(MacroStepType.KEY_PRESS.value, "q")]
+        assert manager.recorder is None
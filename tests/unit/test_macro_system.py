@@ -6,6 +6,7 @@ Tests macro creation, storage, execution, and keybind management.
 import pytest
 import json
 from pathlib import Path
+from unittest.mock import patch
 
 
 @pytest.mark.unit
@@ -251,6 +252,58 @@ class TestMacroStore:
         results = store.search_macros("spell")
         assert len(results) == 1  # "Quick Heal"
 
+    def test_save_writes_only_changed_macro(self, temp_dir):
+        """Saving one macro writes one file; unchanged macros are not rewritten"""
+        from macro_store import MacroStore
+        from macro_manager import Macro
+
+        store = MacroStore(temp_dir)
+        macros = {f"m{i}": Macro(id=f"m{i}", name=f"Macro {i}", description="") for i in range(5)}
+        store.save_all_macros(macros)
+
+        with patch.object(MacroStore, "_atomic_write", wraps=store._atomic_write) as write:
+            macros["m2"].name = "Renamed"
+            store.save_all_macros(macros)
+            store.save_macro(macros["m3"])
+
+        assert [c.args[0].name for c in write.call_args_list] == ["m2.json"]
+        assert list(Path(temp_dir, "macros").glob("*.tmp")) == []
+        assert MacroStore(temp_dir).load_macro("m2").name == "Renamed"
+
+    def test_index_by_game_and_name(self, temp_dir):
+        """Game and name lookups follow saves and deletes without reloading"""
+        from macro_store import MacroStore
+        from macro_manager import Macro
+
+        store = MacroStore(temp_dir)
+        store.save_macro(Macro(id="g", name="Global", description=""))
+        store.save_macro(Macro(id="e", name="Heal", description="", game_profile_id="elden_ring"))
+        store.save_macro(Macro(id="f", name="Heal", description="", game_profile_id="factorio"))
+
+        with patch.object(MacroStore, "reload") as reload:
+            assert set(store.get_macros_for_game("elden_ring")) == {"g", "e"}
+            assert set(store.find_by_name("heal")) == {"e", "f"}
+            store.delete_macro("e")
+            assert set(store.get_macros_for_game("elden_ring")) == {"g"}
+        reload.assert_not_called()
+
+    def test_dirty_flush(self, temp_dir):
+        """In-place edits marked dirty are written by flush"""
+        from macro_store import MacroStore
+        from macro_manager import Macro
+
+        store = MacroStore(temp_dir)
+        macro = Macro(id="d", name="Draft", description="")
+        store.save_macro(macro)
+
+        macro.description = "edited"
+        store.mark_dirty("d")
+        assert store.is_dirty("d")
+        assert store.flush() is True
+
+        assert not store.is_dirty()
+        assert MacroStore(temp_dir).load_macro("d").description == "edited"
+
 
 @pytest.mark.unit
 class TestKeybinds:
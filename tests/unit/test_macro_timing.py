@@ -0,0 +1,160 @@
+"""
+Test suite for macro step timing
+
+Tests deadline waits, jitter statistics and drift-free, event-driven
+macro execution.
+"""
+import threading
+import time
+from unittest.mock import MagicMock
+
+import pytest
+
+from src.macro_manager import Macro, MacroStep, MacroStepType
+from src.macro_runner import MacroExecutionState, MacroRunner
+from src.macro_timing import PrecisionTimer, TimingStats
+
+
+def _macro(steps, repeat=1):
+    return Macro(id="m", name="Timing", description="", steps=steps, repeat=repeat)
+
+
+def _run_inline(runner, macro):
+    """Execute on the calling thread (pynput may be unavailable here)"""
+    runner.current_macro = macro
+    runner.state = MacroExecutionState.RUNNING
+    runner._execute_macro_thread()
+
+
+@pytest.mark.unit
+class TestTimingStats:
+    """Test lateness aggregation"""
+
+    def test_summary(self):
+        """Mean, deviation, percentile and max are reported in milliseconds"""
+        stats = TimingStats()
+        for lateness in (0.001, 0.002, 0.003, 0.010):
+            stats.record(lateness)
+
+        summary = stats.to_dict()
+
+        assert summary["events"] == 4
+        assert summary["mean_ms"] == 4.0
+        assert summary["max_ms"] == 10.0
+        assert summary["p95_ms"] == 10.0
+        assert summary["stdev_ms"] == pytest.approx(4.0825, abs=1e-3)
+
+
+@pytest.mark.unit
+class TestPrecisionTimer:
+    """Test deadline waits"""
+
+    def test_wait_hits_deadline(self):
+        """The hybrid wait returns at, and shortly after, the deadline"""
+        timer = PrecisionTimer()
+        deadline = timer.clock() + 0.03
+
+        assert timer.wait_until(deadline)
+        late = timer.clock() - deadline
+
+        assert 0 <= late < 0.005
+
+    def test_stop_event_cancels_wait(self):
+        """Setting the stop event wakes a long wait immediately"""
+        timer = PrecisionTimer()
+        stop = threading.Event()
+        threading.Timer(0.05, stop.set).start()
+
+        start = time.perf_counter()
+        assert not timer.sleep(5.0, stop)
+
+        assert time.perf_counter() - start < 0.5
+
+
+@pytest.mark.unit
+class TestDriftCompensation:
+    """Test macro execution against an absolute schedule"""
+
+    def test_slow_input_does_not_accumulate(self):
+        """Per-event overhead is absorbed by the schedule instead of adding up"""
+        runner = MacroRunner(enabled=True)
+        runner.keyboard_controller = MagicMock()
+        # Each synthesized event costs 4 ms, under the 10 ms event gap
+        runner.keyboard_controller.press.side_effect = lambda key: time.sleep(0.004)
+        runner.keyboard_controller.release.side_effect = lambda key: time.sleep(0.004)
+        runner._parse_key_combo = lambda combo: [combo]
+        macro = _macro([MacroStep(type=MacroStepType.KEY_PRESS.value, key="a", duration_ms=10)] * 5,
+                       repeat=2)
+
+        start = time.perf_counter()
+        _run_inline(runner, macro)
+        elapsed = time.perf_counter() - start
+
+        # 10 presses x (press gap + release gap + delay) = 300 ms; the old
+        # relative sleeps would add 80 ms of input overhead on top
+        assert runner.state == MacroExecutionState.COMPLETED
+        assert 0.3 <= elapsed < 0.34
+        stats = runner.get_timing_stats()
+        assert stats["events"] == 20
+        assert stats["rebases"] == 0
+
+    def test_stall_rebases_schedule(self):
+        """A step far behind schedule starts a new base instead of bursting"""
+        runner = MacroRunner(enabled=True)
+        runner.macro_manager = MagicMock()
+        runner.macro_manager.action_handlers = {
+            MacroStepType.TOGGLE_OVERLAY.value: lambda: time.sleep(0.1)
+        }
+        macro = _macro([
+            MacroStep(type=MacroStepType.TOGGLE_OVERLAY.value),
+            MacroStep(type=MacroStepType.DELAY.value, duration_ms=1),
+            MacroStep(type=MacroStepType.KEY_SEQUENCE.value, key="a"),
+        ])
+
+        _run_inline(runner, macro)
+
+        assert runner.get_timing_stats()["rebases"] == 1
+
+
+@pytest.mark.unit
+class TestPauseAndStop:
+    """Test event-driven pause, resume and stop"""
+
+    def test_pause_holds_and_resume_shifts_schedule(self):
+        """No steps run while paused; the rest of the schedule starts on resume"""
+        runner = MacroRunner(enabled=True)
+        executed = []
+        runner.on_step_executed = lambda index, total: executed.append(time.perf_counter())
+        macro = _macro([MacroStep(type=MacroStepType.DELAY.value, duration_ms=20)] * 10)
+
+        thread = threading.Thread(target=_run_inline, args=(runner, macro))
+        thread.start()
+        time.sleep(0.05)
+        runner.pause_macro()
+        time.sleep(0.05)  # let the step in flight finish
+        count_at_pause = len(executed)
+        time.sleep(0.1)
+        assert len(executed) == count_at_pause
+
+        resumed_at = time.perf_counter()
+        runner.resume_macro()
+        thread.join(timeout=2)
+
+        assert runner.state == MacroExecutionState.COMPLETED
+        assert len(executed) == 10
+        # Resuming continues at the normal cadence rather than catching up
+        assert executed[-1] - resumed_at >= 0.02 * (10 - count_at_pause - 1)
+
+    def test_stop_while_paused(self):
+        """A paused macro can be stopped"""
+        runner = MacroRunner(enabled=True)
+        macro = _macro([MacroStep(type=MacroStepType.DELAY.value, duration_ms=20)] * 50)
+        thread = threading.Thread(target=_run_inline, args=(runner, macro))
+        thread.start()
+        time.sleep(0.03)
+        runner.pause_macro()
+
+        runner.stop_macro()
+        thread.join(timeout=1)
+
+        assert not thread.is_alive()
@@ -0,0 +1,192 @@
+"""
+Test suite for the model lifecycle manager
+
+Tests preload on game detection, keep-alive handling and latency tracking.
+"""
+import threading
+
+import pytest
+from unittest.mock import patch
+
+from src.ai_router import AIRouter
+from src.config import Config
+from src.game_profile import GameProfile
+from src.model_lifecycle import ModelLifecycleManager
+from src.providers import OllamaProvider
+
+
+@pytest.fixture
+def mock_ollama_client():
+    with patch('ollama.Client') as mock:
+        yield mock.return_value
+
+
+@pytest.fixture
+def provider(mock_ollama_client):
+    mock_ollama_client.generate.return_value = {'load_duration': 2_000_000_000}
+    return OllamaProvider(default_model="llama3")
+
+
+@pytest.fixture
+def config():
+    config = Config(require_keys=False)
+    config.ollama_model = "llama3"
+    config.model_preload_enabled = True
+    return config
+
+
+def _profile(model=None):
+    return GameProfile(
+        id="elden_ring",
+        display_name="Elden Ring",
+        exe_names=["eldenring.exe"],
+        system_prompt="Elden Ring guide",
+        default_model=model,
+    )
+
+
+@pytest.mark.unit
+class TestModelPreloading:
+    """Test preload and unload around game sessions"""
+
+    def test_preload_uses_profile_model(self, provider, config, mock_ollama_client):
+        """Detected game's default_model is loaded with the configured keep_alive"""
+        manager = ModelLifecycleManager(provider=provider, config=config, keep_alive="45m")
+
+        manager.activate(manager.resolve_model(_profile("mistral")), wait=True)
+
+        mock_ollama_client.generate.assert_called_once_with(model="mistral", keep_alive="45m")
+        assert manager.active_model == "mistral"
+        assert provider.keep_alive == "45m"
+        assert manager.get_latency_report()["preload"]["last_seconds"] == pytest.approx(2.0)
+
+    def test_falls_back_to_config_model(self, provider, config):
+        """Profiles without a default model use the configured Ollama model"""
+        manager = ModelLifecycleManager(provider=provider, config=config)
+
+        assert manager.resolve_model(_profile()) == "llama3"
+        assert manager.resolve_model(None) == "llama3"
+
+    def test_game_closed_unloads_model(self, provider, config, mock_ollama_client):
+        """Closing the game evicts the model and restores the daemon default"""
+        manager = ModelLifecycleManager(provider=provider, config=config)
+        manager.activate("llama3", wait=True)
+
+        manager.on_game_closed()
+        manager.wait_idle()
+
+        mock_ollama_client.generate.assert_called_with(model="llama3", keep_alive=0)
+        assert manager.active_model is None
+        assert provider.keep_alive is None
+
+    def test_switching_games_unloads_previous_model(self, provider, config, mock_ollama_client):
+        """Changing to a game with another model unloads the old one first"""
+        manager = ModelLifecycleManager(provider=provider, config=config)
+        manager.activate("llama3", wait=True)
+        manager.activate("mistral", wait=True)
+
+        calls = mock_ollama_client.generate.call_args_list
+        assert calls[1].kwargs == {"model": "llama3", "keep_alive": 0}
+        assert calls[2].kwargs["model"] == "mistral"
+
+    def test_unload_does_not_block_caller(self, provider, config, mock_ollama_client):
+        """Game close returns immediately; shutdown waits for the unload"""
+        manager = ModelLifecycleManager(provider=provider, config=config)
+        manager.activate("llama3", wait=True)
+        release = threading.Event()
+        mock_ollama_client.generate.side_effect = lambda **kwargs: release.wait(5)
+
+        manager.on_game_closed()
+        assert not manager.wait_idle(timeout=0.05)
+
+        release.set()
+        manager.shutdown()
+        mock_ollama_client.generate.assert_called_with(model="llama3", keep_alive=0)
+
+    def test_same_model_is_not_reloaded(self, provider, config, mock_ollama_client):
+        """Re-activating the resident model does not hit the daemon again"""
+        manager = ModelLifecycleManager(provider=provider, config=config)
+        manager.activate("llama3", wait=True)
+        manager.activate("llama3", wait=True)
+
+        assert mock_ollama_client.generate.call_count == 1
+
+    def test_preload_disabled(self, provider, config, mock_ollama_client):
+        """Keep-alive is still applied when preloading is switched off"""
+        config.model_preload_enabled = False
+        manager = ModelLifecycleManager(provider=provider, config=config, keep_alive="10m")
+
+        manager.activate("llama3", wait=True)
+
+        mock_ollama_client.generate.assert_not_called()
+        assert provider.keep_alive == "10m"
+
+    def test_preload_failure_emits_signal(self, qtbot, provider, config, mock_ollama_client):
+        """Daemon errors during preload are reported, not raised"""
+        mock_ollama_client.generate.side_effect = Exception("connection refused")
+        manager = ModelLifecycleManager(provider=provider, config=config)
+        failures = []
+        manager.preload_failed.connect(lambda model, error: failures.append(model))
+
+        manager.activate("llama3", wait=True)
+
+        qtbot.waitUntil(lambda: failures == ["llama3"], timeout=1000)
+
+
+@pytest.mark.unit
+class TestLatencyTracking:
+    """Test cold versus warm latency classification"""
+
+    def test_chat_keep_alive_and_latency(self, provider, config, mock_ollama_client):
+        """Chat requests carry keep_alive and are classified by load time"""
+        manager = ModelLifecycleManager(provider=provider, config=config, keep_alive="30m")
+        manager.activate("llama3")
+        mock_ollama_client.chat.side_effect = [
+            {'message': {'content': 'a'}, 'load_duration': 3_000_000_000},
+            {'message': {'content': 'b'}, 'load_duration': 1_000_000},
+        ]
+
+        provider.chat([{"role": "user", "content": "hi"}])
+        provider.chat([{"role": "user", "content": "hi"}])
+
+        assert mock_ollama_client.chat.call_args.kwargs["keep_alive"] == "30m"
+        report = manager.get_latency_report()
+        assert report["cold"]["count"] == 1
+        assert report["warm"]["count"] == 1
+
+    def test_assistant_questions_use_managed_provider(self, provider, config, mock_ollama_client):
+        """ask_question goes through the provider the manager keeps warm"""
+        config.ai_provider = "ollama"
+        config.ai_endpoints = []
+        router = AIRouter(config=config)
+        router._provider = provider
+        with patch("src.ai_assistant.get_router", return_value=router), \
+             patch("src.ai_assistant.get_knowledge_integration"), \
+             patch("src.ai_assistant.get_hrm_interface") as get_hrm:
+            get_hrm.return_value.is_available.return_value = False
+            from src.ai_assistant import AIAssistant
+
+            assistant = AIAssistant(config=config)
+        manager = ModelLifecycleManager(provider=provider, config=config, keep_alive="30m")
+        manager.activate("llama3", wait=True)
+        mock_ollama_client.chat.return_value = {
+            'message': {'content': 'Use a shield'}, 'load_duration': 1_000_000,
+        }
+        assistant.set_current_game({"name": "Elden Ring"})
+
+        assert assistant.ask_question("How do I parry?") == "Use a shield"
+
+        assert assistant.provider_instance is provider
+        assert mock_ollama_client.chat.call_args.kwargs["keep_alive"] == "30m"
+        assert manager.get_latency_report()["warm"]["count"] == 1
+        assistant.prefetcher.shutdown()
+
+    def test_shutdown_detaches_observer(self, provider, config, mock_ollama_client):
+        """After shutdown the manager no longer records chat latency"""
+        manager = ModelLifecycleManager(provider=provider, config=config)
+        manager.shutdown()
+        mock_ollama_client.chat.return_value = {'message': {'content': 'a'}}
+
+        provider.chat([{"role": "user", "content": "hi"}])
+
+        assert manager.get_latency_report()["warm"]["count"] == 0
@@ -0,0 +1,176 @@
+"""
+Test suite for the process monitor
+
+Tests proc connector decoding, snapshot diffs, kernel event delivery and
+GameDetector integration.
+"""
+import os
+import struct
+import subprocess
+import sys
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+import src.process_monitor as pm
+from src.game_detector import GameDetector
+from src.process_monitor import NetlinkProcessSource, ProcessInfo, ProcessMonitor
+
+
+def _fake_procs(*entries):
+    procs = []
+    for pid, name in entries:
+        proc = MagicMock()
+        proc.pid = pid
+        proc.info = {"pid": pid, "name": name, "exe": f"/games/{name}"}
+        procs.append(proc)
+    return procs
+
+
+def _proc_event(what, pid, tgid):
+    event = struct.pack("=IIQ", what, 0, 0) + struct.pack("=II", pid, tgid) + b"\0" * 8
+    cn_msg = struct.pack("=IIIIHH", pm.CN_IDX_PROC, pm.CN_VAL_PROC, 0, 0, len(event), 0)
+    header = struct.pack("=IHHII", 16 + len(cn_msg) + len(event), pm.NLMSG_DONE, 0, 0, 0)
+    return header + cn_msg + event
+
+
+class Recorder:
+    """Collects (added, removed) notifications"""
+
+    def __init__(self):
+        self.changes = []
+
+    def __call__(self, added, removed):
+        self.changes.append((added, removed))
+
+    def names(self, index):
+        return {info.name for info in self.changes[-1][index]}
+
+
+@pytest.mark.unit
+class TestNetlinkParsing:
+    """Test proc connector datagram decoding"""
+
+    def test_exec_and_exit_for_process_leaders(self):
+        """Exec and exit events are reported; thread events are ignored"""
+        data = (
+            _proc_event(pm.PROC_EVENT_EXEC, 100, 100)
+            + _proc_event(pm.PROC_EVENT_EXIT, 101, 100)
+            + _proc_event(pm.PROC_EVENT_EXIT, 100, 100)
+            + _proc_event(0x1, 102, 102)
+        )
+
+        assert NetlinkProcessSource.parse(data) == [("exec", 100), ("exit", 100)]
+
+    def test_truncated_datagram(self):
+        """A short buffer yields no events"""
+        assert NetlinkProcessSource.parse(b"\x05\x00") == []
+
+
+@pytest.mark.unit
+class TestProcessTable:
+    """Test snapshot diffs and event application"""
+
+    def test_refresh_publishes_diff(self, monkeypatch):
+        """Only started and exited processes are reported"""
+        procs = _fake_procs((1, "init"), (42, "eldenring.exe"))
+        monkeypatch.setattr(pm.psutil, "process_iter", lambda attrs=None: procs)
+        monitor = ProcessMonitor(use_events=False)
+        monitor.refresh()
+        recorder = Recorder()
+        monitor.subscribe(recorder)
+
+        procs[:] = _fake_procs((1, "init"), (43, "bg3.exe"))
+        added, removed = monitor.refresh()
+
+        assert [p.name for p in added] == ["bg3.exe"]
+        assert [p.name for p in removed] == ["eldenring.exe"]
+        assert len(recorder.changes) == 1
+        assert monitor.get_process(43).exe == "/games/bg3.exe"
+
+    def test_apply_exec_and_exit(self):
+        """Kernel events update the table without a full scan"""
+        monitor = ProcessMonitor(use_events=False)
+        recorder = Recorder()
+        monitor.subscribe(recorder)
+
+        with patch.object(pm, "describe_process", return_value=ProcessInfo(7, "cs2.exe")):
+            monitor._apply([("exec", 7)])
+        assert recorder.names(0) == {"cs2.exe"}
+
+        monitor._apply([("exit", 7), ("exit", 8)])
+        assert recorder.names(1) == {"cs2.exe"}
+        assert monitor.get_processes() == []
+
+
+@pytest.mark.unit
+@pytest.mark.skipif(not sys.platform.startswith("linux"), reason="Linux process events")
+class TestKernelNotifications:
+    """Test event delivery from the kernel"""
+
+    def _wait_for(self, recorder, predicate, timeout=3.0):
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if any(predicate(added, removed) for added, removed in list(recorder.changes)):
+                return True
+            time.sleep(0.01)
+        return False
+
+    def test_proc_connector_reports_start_and_exit(self):
+        """A child process is seen starting and exiting without polling"""
+        monitor = ProcessMonitor(poll_interval=60)
+        monitor.start()
+        try:
+            if monitor.mode != "events":
+                pytest.skip("proc connector not available")
+            recorder = Recorder()
+            monitor.subscribe(recorder)
+
+            child = subprocess.Popen(["sleep", "0.2"])
+            child.wait()
+
+            assert self._wait_for(recorder, lambda a, r: any(p.pid == child.pid for p in a))
+            assert self._wait_for(recorder, lambda a, r: any(p.pid == child.pid for p in r))
+        finally:
+            monitor.stop()
+
+    @pytest.mark.skipif(not hasattr(os, "pidfd_open"), reason="pidfd not supported")
+    def test_pidfd_exit_while_polling(self):
+        """Watched PIDs are removed on exit without waiting for the next snapshot"""
+        child = subprocess.Popen(["sleep", "30"])
+        monitor = ProcessMonitor(poll_interval=60, use_events=False)
+        monitor.start()
+        try:
+            recorder = Recorder()
+            monitor.subscribe(recorder)
+            monitor.watch_pid(child.pid)
+
+            child.kill()
+            child.wait()
+
+            assert self._wait_for(recorder, lambda a, r: any(p.pid == child.pid for p in r))
+            assert monitor.mode == "poll"
+        finally:
+            monitor.stop()
+
+
+@pytest.mark.unit
+class TestGameDetectorIntegration:
+    """Test GameDetector on top of the shared table"""
+
+    def test_exit_event_invalidates_cached_result(self, monkeypatch):
+        """A game exit is reflected immediately instead of after the cache expires"""
+        procs = _fake_procs((42, "eldenring.exe"))
+        monkeypatch.setattr(pm.psutil, "process_iter", lambda attrs=None: procs)
+        monitor = ProcessMonitor(use_events=False)
+        monitor.refresh()
+        detector = GameDetector(process_monitor=monitor)
+
+        game = detector.detect_running_game()
+        assert game["pid"] == 42 and game["exe"] == "/games/eldenring.exe"
+
+        monitor._apply([("exit", 42)])
+
+        assert detector.get_running_games() == []
+        detector.stop_background_scan()
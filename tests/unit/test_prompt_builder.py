@@ -0,0 +1,89 @@
+"""
+Test suite for the prompt builder
+
+Tests prefix stability, section ordering and prompt evaluation statistics.
+"""
+from unittest.mock import Mock
+
+import pytest
+
+from src.prompt_builder import (
+    PromptEvalStats,
+    PromptParts,
+    build_legacy_prompt,
+    build_stable_prompt,
+    compare_prompt_orderings,
+    to_messages,
+)
+
+
+def _turn(question, knowledge=None, hrm=None, web=None):
+    return PromptParts(
+        system_prompt="You are a Elden Ring assistant.",
+        question=question,
+        knowledge_context=knowledge,
+        hrm_analysis=hrm,
+        web_context=web,
+    )
+
+
+@pytest.mark.unit
+class TestStablePrompt:
+    """Test prompt assembly"""
+
+    def test_system_prompt_is_identical_across_turns(self):
+        """Per-turn context never leaks into the system prompt"""
+        first, _ = build_stable_prompt(_turn("Q1", knowledge="K1"), "Use the packs.")
+        second, _ = build_stable_prompt(_turn("Q2", hrm="H2", web="W2"), "Use the packs.")
+
+        assert first == second
+        assert first.endswith("Use the packs.")
+
+    def test_context_in_fixed_order_then_question(self):
+        """Volatile context comes as knowledge, HRM, web; the question is last"""
+        _, user = build_stable_prompt(_turn("Q", knowledge="K", hrm="H", web="W"))
+
+        assert user == "K\n\nH\n\nAdditional context from game resources:\nW\n\nQ"
+
+    def test_question_only(self):
+        """Without context the user prompt is just the question"""
+        assert build_stable_prompt(_turn("  Q  ")) == ("You are a Elden Ring assistant.", "Q")
+
+    def test_legacy_prompt_puts_context_first(self):
+        """The legacy ordering matches the original ask_question layout"""
+        _, user = build_legacy_prompt(_turn("Q", knowledge="K", hrm="H", web="W"))
+
+        assert user == "H\n\nK\nQ\n\nAdditional context from game resources:\nW"
+
+
+@pytest.mark.unit
+class TestPromptEvalStats:
+    """Test timing aggregation and comparison"""
+
+    def test_record_aggregates_nanoseconds(self):
+        """prompt_eval_duration is converted from nanoseconds"""
+        stats = PromptEvalStats()
+        stats.record({"prompt_eval_count": 100, "prompt_eval_duration": 2_000_000_000})
+        stats.record({"prompt_eval_count": 20, "prompt_eval_duration": 500_000_000})
+        stats.record({"latency": 1.0})
+
+        assert stats.samples == 2
+        assert stats.mean_prompt_eval_seconds == pytest.approx(1.25)
+        assert stats.mean_prompt_tokens == 60
+
+    def test_compare_prompt_orderings(self):
+        """Both orderings are sent and the savings reported"""
+        durations = iter([900_000_000, 800_000_000, 300_000_000, 100_000_000])
+        provider = Mock()
+        provider.chat.side_effect = lambda messages, model=None: {
+            "content": "ok",
+            "timings": {"prompt_eval_count": 10, "prompt_eval_duration": next(durations)},
+        }
+        turns = [_turn("Q1", knowledge="K1"), _turn("Q2", knowledge="K2")]
+
+        result = compare_prompt_orderings(provider, turns, "Use the packs.")
+
+        assert provider.chat.call_count == 4
+        assert result["seconds_saved"] == pytest.approx(1.3)
+        stable_messages = provider.chat.call_args_list[2].args[0]
+        assert stable_messages == to_messages(*build_stable_prompt(turns[0], "Use the packs."))
@@ -0,0 +1,235 @@
+"""
+Test suite for the provider health monitor
+
+Tests cached status, TTL, exponential backoff and change notifications.
+"""
+import threading
+
+import pytest
+from unittest.mock import Mock, patch
+
+from src.ai_router import AIRouter
+from src.config import Config
+from src.provider_health import ProviderHealthMonitor
+from src.providers import ProviderHealth
+
+
+class FakeClock:
+    """Manually advanced monotonic clock"""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+    def advance(self, seconds):
+        self.now += seconds
+
+
+def _healthy(models=("llama3",)):
+    return ProviderHealth(
+        is_healthy=True,
+        message="Connected",
+        details={"models": list(models)},
+    )
+
+
+def _down():
+    return ProviderHealth(is_healthy=False, message="Down", error_type="connection")
+
+
+@pytest.fixture
+def provider():
+    provider = Mock()
+    provider.is_configured.return_value = True
+    provider.test_connection.return_value = _healthy()
+    return provider
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.mark.unit
+class TestCachedStatus:
+    """Test that reads are served from cache"""
+
+    def test_first_read_does_not_block(self, provider, clock):
+        """Status is pending until the background check completes"""
+        monitor = ProviderHealthMonitor(lambda: provider, clock=clock)
+        with patch.object(monitor, "_schedule_check") as schedule:
+            status = monitor.get_status()
+
+        assert status["healthy"] is None
+        assert status["stale"] is True
+        schedule.assert_called_once()
+        provider.test_connection.assert_not_called()
+
+    def test_fresh_cache_skips_network(self, provider, clock):
+        """Reads within the TTL reuse the cached result"""
+        monitor = ProviderHealthMonitor(lambda: provider, ttl=30, clock=clock)
+        monitor.check_now()
+
+        clock.advance(10)
+        for _ in range(5):
+            status = monitor.get_status()
+            models = monitor.get_models()
+
+        assert status["healthy"] is True
+        assert status["stale"] is False
+        assert models == ["llama3"]
+        assert provider.test_connection.call_count == 1
+
+    def test_expired_cache_schedules_refresh(self, provider, clock):
+        """Reads after the TTL trigger a background check"""
+        monitor = ProviderHealthMonitor(lambda: provider, ttl=30, clock=clock)
+        monitor.check_now()
+        clock.advance(31)
+
+        with patch.object(monitor, "_schedule_check") as schedule:
+            status = monitor.get_status()
+
+        assert status["stale"] is True
+        schedule.assert_called_once()
+
+    def test_background_refresh_updates_cache(self, provider, clock):
+        """A scheduled check runs off-thread and fills the cache"""
+        monitor = ProviderHealthMonitor(lambda: provider, clock=clock)
+
+        monitor.get_status()
+        monitor._worker.join(timeout=2)
+
+        assert monitor.get_status()["healthy"] is True
+
+
+@pytest.mark.unit
+class TestBackoff:
+    """Test exponential backoff while the daemon is down"""
+
+    def test_backoff_doubles_until_cap(self, provider, clock):
+        """Retry delay grows 2, 4, 8 ... up to max_backoff"""
+        provider.test_connection.return_value = _down()
+        monitor = ProviderHealthMonitor(
+            lambda: provider, min_backoff=2, max_backoff=10, clock=clock
+        )
+
+        delays = []
+        for _ in range(5):
+            monitor.check_now()
+            delays.append(monitor._next_check_at - clock.now)
+
+        assert delays == [2, 4, 8, 10, 10]
+        assert monitor.consecutive_failures == 5
+
+    def test_recovery_resets_backoff(self, provider, clock):
+        """A healthy check resets the failure count and uses the TTL"""
+        provider.test_connection.return_value = _down()
+        monitor = ProviderHealthMonitor(lambda: provider, ttl=30, clock=clock)
+        monitor.check_now()
+        monitor.check_now()
+
+        provider.test_connection.return_value = _healthy()
+        monitor.check_now()
+
+        assert monitor.consecutive_failures == 0
+        assert monitor._next_check_at - clock.now == 30
+
+    def test_exception_counts_as_failure(self, provider, clock):
+        """Exceptions from the provider are reported as unhealthy"""
+        provider.test_connection.side_effect = RuntimeError("boom")
+        monitor = ProviderHealthMonitor(lambda: provider, clock=clock)
+
+        status = monitor.check_now()
+
+        assert status["healthy"] is False
+        assert "boom" in status["message"]
+
+
+@pytest.mark.unit
+class TestNotifications:
+    """Test change signals"""
+
+    def test_signals_only_on_change(self, provider, clock):
+        """status_changed and models_changed fire when values change"""
+        monitor = ProviderHealthMonitor(lambda: provider, clock=clock)
+        statuses, model_lists = [], []
+        monitor.status_changed.connect(statuses.append)
+        monitor.models_changed.connect(model_lists.append)
+
+        monitor.check_now()
+        monitor.check_now()
+        provider.test_connection.return_value = _healthy(["llama3", "mistral"])
+        monitor.check_now()
+        provider.test_connection.return_value = _down()
+        monitor.check_now()
+
+        assert [s["healthy"] for s in statuses] == [True, False]
+        assert model_lists == [["llama3"], ["llama3", "mistral"]]
+
+    def test_invalidate_clears_cache(self, provider, clock):
+        """Invalidating forgets the cached models and status"""
+        monitor = ProviderHealthMonitor(lambda: provider, clock=clock)
+        monitor.check_now()
+
+        monitor.invalidate()
+
+        assert monitor.is_fresh() is False
+        assert monitor._models == []
+
+
+@pytest.mark.unit
+class TestRouterIntegration:
+    """Test AIRouter use of the monitor"""
+
+    def test_router_status_uses_cache(self, provider):
+        """get_provider_status serves the cached status"""
+        router = AIRouter(config=Config(require_keys=False))
+        router._provider = provider
+        router.health_monitor.check_now()
+
+        status = router.get_provider_status()
+        router.get_provider_status()
+
+        assert status["healthy"] is True
+        assert provider.test_connection.call_count == 1
+
+    def test_router_list_models_cached(self, provider):
+        """list_models never blocks; a cold cache is filled in the background"""
+        gate = threading.Event()
+        provider.test_connection.side_effect = lambda: gate.wait(2) and _healthy()
+        router = AIRouter(config=Config(require_keys=False))
+        router._provider = provider
+
+        assert router.list_models() == []
+        gate.set()
+        router.health_monitor._worker.join(timeout=2)
+
+        assert router.list_models() == ["llama3"]
+        assert provider.test_connection.call_count == 1
+
+    def test_router_test_provider_does_not_block(self, provider):
+        """test_provider returns the cached status and re-checks in the background"""
+        gate = threading.Event()
+        provider.test_connection.side_effect = lambda: gate.wait(2) and _healthy()
+        router = AIRouter(config=Config(require_keys=False))
+        router._provider = provider
+
+        assert router.test_provider()[0] is False
+        gate.set()
+        router.health_monitor._worker.join(timeout=2)
+
+        assert router.test_provider()[0] is True
+        router.health_monitor._worker.join(timeout=2)
+        assert provider.test_connection.call_count == 2
+
+    def test_set_host_invalidates(self, provider):
+        """Changing the host discards cached health"""
+        router = AIRouter(config=Config(require_keys=False))
+        router._provider = provider
+        router.health_monitor.check_now()
+
+        router.set_host("http://example.invalid:11434")
+
+        assert router.health_monitor.is_fresh() is False
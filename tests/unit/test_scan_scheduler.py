@@ -0,0 +1,175 @@
+"""
+Test suite for adaptive game detection scan scheduling
+
+Tests the fast window, liveness backoff, hints and the wiring into the
+process monitor, GameDetector and KeybindManager.
+"""
+from unittest.mock import MagicMock
+
+import pytest
+
+import src.process_monitor as pm
+from src.game_detector import GameDetector
+from src.keybind_manager import Keybind, KeybindManager
+from src.process_monitor import ProcessInfo, ProcessMonitor
+from src.scan_scheduler import AdaptiveScanScheduler
+
+
+class FakeClock:
+    """Manually advanced monotonic clock"""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def _scheduler(clock, alive=None, **kwargs):
+    alive = alive if alive is not None else set()
+    return AdaptiveScanScheduler(
+        fast_interval=1.0,
+        base_interval=5.0,
+        max_interval=40.0,
+        backoff=2.0,
+        fast_period=30.0,
+        clock=clock,
+        pid_exists=lambda pid: pid in alive,
+        **kwargs,
+    )
+
+
+@pytest.mark.unit
+class TestAdaptiveScanScheduler:
+    """Test the scan cadence decisions"""
+
+    def test_fast_window_after_start(self):
+        """Scans run at the fast interval until the fast period ends"""
+        clock = FakeClock()
+        scheduler = _scheduler(clock)
+
+        assert scheduler.next_delay() == 1.0
+        assert scheduler.should_full_scan()
+
+        clock.now += 31
+        assert scheduler.next_delay() == 5.0
+        assert scheduler.should_full_scan()
+
+    def test_backoff_while_game_alive(self):
+        """A live game PID replaces full scans with liveness checks and backs off"""
+        clock = FakeClock()
+        alive = {42}
+        scheduler = _scheduler(clock, alive)
+        scheduler.on_game_started(42)
+
+        delays = []
+        for _ in range(5):
+            assert not scheduler.should_full_scan()
+            delays.append(scheduler.next_delay())
+
+        assert delays == [10.0, 20.0, 40.0, 40.0, 40.0]
+        assert scheduler.liveness_checks == 5
+        assert scheduler.full_scans == 0
+
+    def test_dead_pid_forces_scan(self):
+        """A tracked PID that vanished triggers a full scan"""
+        clock = FakeClock()
+        scheduler = _scheduler(clock, alive=set())
+        scheduler.on_game_started(42)
+
+        assert scheduler.should_full_scan()
+
+    def test_exit_restarts_fast_window(self):
+        """The last game exiting resets the cadence to fast scanning"""
+        clock = FakeClock()
+        scheduler = _scheduler(clock, alive={42})
+        scheduler.on_game_started(42)
+        scheduler.should_full_scan()
+        scheduler.should_full_scan()
+
+        scheduler.on_game_exited(42)
+
+        assert scheduler.next_delay() == 1.0
+
+    def test_hint_wakes_and_forces_scan(self):
+        """A hint runs wake callbacks and forces one full scan"""
+        clock = FakeClock()
+        scheduler = _scheduler(clock, alive={42})
+        scheduler.on_game_started(42)
+        scheduler.should_full_scan()
+        woken = []
+        scheduler.add_wake_callback(lambda: woken.append(True))
+
+        scheduler.hint("hotkey")
+
+        assert woken == [True]
+        assert scheduler.next_delay() == 0.0
+        assert scheduler.should_full_scan()
+        assert scheduler.next_delay() == 5.0
+        assert not scheduler.should_full_scan()
+
+
+@pytest.mark.unit
+class TestSchedulerIntegration:
+    """Test the scheduler driving detection"""
+
+    def test_detector_tracks_game_lifecycle(self, monkeypatch):
+        """Game starts and exits seen by the detector update the scheduler"""
+        procs = []
+        monkeypatch.setattr(pm.psutil, "process_iter", lambda attrs=None: procs)
+        clock = FakeClock()
+        scheduler = _scheduler(clock, alive={42})
+        monitor = ProcessMonitor(use_events=False, scheduler=scheduler)
+        detector = GameDetector(process_monitor=monitor)
+        assert detector.scan_scheduler is scheduler
+        clock.now += 31
+
+        with monkeypatch.context() as m:
+            m.setattr(pm, "describe_process", lambda pid: ProcessInfo(pid, "eldenring.exe"))
+            monitor._apply([("exec", 42)])
+        assert not scheduler.should_full_scan()
+        assert scheduler.next_delay() == 10.0
+
+        monitor._apply([("exit", 42)])
+        assert scheduler.next_delay() == 1.0
+        detector.stop_background_scan()
+
+    def test_stopped_monitor_skips_snapshot_while_game_alive(self, monkeypatch):
+        """Without a monitor thread, detection only snapshots when the scheduler asks"""
+        proc = MagicMock()
+        proc.pid = 42
+        proc.info = {"pid": 42, "name": "eldenring.exe", "exe": "/games/eldenring.exe"}
+        process_iter = MagicMock(return_value=[proc])
+        monkeypatch.setattr(pm.psutil, "process_iter", process_iter)
+        clock = FakeClock()
+        scheduler = _scheduler(clock, alive={42})
+        monitor = ProcessMonitor(use_events=False, scheduler=scheduler)
+        monitor.refresh()
+        detector = GameDetector(process_monitor=monitor)
+        clock.now += 31
+        detector._last_process_scan = 0.0
+        process_iter.reset_mock()
+
+        with detector._cache_lock:
+            detector._scan_cache.clear()
+        assert detector.detect_running_game()["pid"] == 42
+        process_iter.assert_not_called()
+
+        detector.request_rescan("test")
+        detector.detect_running_game()
+        process_iter.assert_called_once()
+        detector.stop_background_scan()
+
+    def test_hotkey_trigger_notifies_observers(self):
+        """Keybind observers receive the triggered action name"""
+        manager = KeybindManager()
+        manager.keybinds["toggle_overlay"] = Keybind(
+            keys="ctrl+shift+g", action="toggle_overlay", description="", system_wide=False
+        )
+        manager.callbacks["toggle_overlay"] = lambda: None
+        seen = []
+        manager.add_trigger_observer(seen.append)
+
+        manager._trigger_action("toggle_overlay")
+
+        assert seen == ["toggle_overlay"]
@@ -0,0 +1,281 @@
+"""
+Test suite for session log persistence
+
+Tests the append-only JSONL log, group commits, fsync policies, legacy
+JSON compatibility and compaction.
+"""
+import json
+import threading
+import time
+from datetime import datetime, timedelta
+
+import pytest
+
+from src.session_logger import SessionEvent, SessionLogger
+
+
+def _lines(path):
+    return path.read_text(encoding="utf-8").splitlines()
+
+
+@pytest.fixture
+def make_logger(tmp_path):
+    """Build SessionLoggers under tmp_path and close them on teardown"""
+    loggers = []
+
+    def factory(**kwargs):
+        session_logger = SessionLogger(config_dir=str(tmp_path), **kwargs)
+        loggers.append(session_logger)
+        return session_logger
+
+    yield factory
+    for session_logger in loggers:
+        session_logger.close()
+
+
+@pytest.mark.unit
+class TestAppendOnlyLog:
+    """Test JSONL writes"""
+
+    def test_group_commit_by_size(self, make_logger):
+        """Events are written once flush_events are pending"""
+        session_logger = make_logger(flush_events=3, background=False)
+        for i in range(2):
+            session_logger.log_event("elden_ring", "question", f"Q{i}")
+
+        session_id = session_logger.current_sessions["elden_ring"]
+        log_file = session_logger._get_session_file("elden_ring", session_id)
+        assert not log_file.exists()
+
+        session_logger.log_event("elden_ring", "answer", "A")
+        assert [json.loads(line)["content"] for line in _lines(log_file)] == ["Q0", "Q1", "A"]
+
+    def test_group_commit_by_time(self, make_logger):
+        """Pending events are committed once flush_interval has passed"""
+        session_logger = make_logger(flush_events=100, flush_interval=0, background=False)
+        session_logger.log_event("elden_ring", "question", "Q")
+
+        session_id = session_logger.current_sessions["elden_ring"]
+        assert len(_lines(session_logger._get_session_file("elden_ring", session_id))) == 1
+
+    def test_fsync_always_commits_every_event(self, make_logger):
+        """The 'always' policy writes each event immediately"""
+        session_logger = make_logger(flush_events=100, fsync_policy="always", background=False)
+        session_logger.log_event("elden_ring", "question", "Q")
+
+        session_id = session_logger.current_sessions["elden_ring"]
+        assert session_logger._get_session_file("elden_ring", session_id).exists()
+
+    def test_unknown_fsync_policy(self, tmp_path):
+        """Invalid policies raise ValueError"""
+        with pytest.raises(ValueError, match="Unknown fsync policy"):
+            SessionLogger(config_dir=str(tmp_path), fsync_policy="sometimes")
+
+    def test_long_sessions_keep_every_event(self, make_logger):
+        """Nothing beyond the in-memory window is lost on disk"""
+        session_logger = make_logger()
+        for i in range(250):
+            session_logger.log_event("elden_ring", "question", f"Q{i}")
+        session_logger.flush()
+
+        session_id = session_logger.current_sessions["elden_ring"]
+        assert len(session_logger._load_session("elden_ring", session_id)) == 250
+        assert len(session_logger.get_current_session_events("elden_ring")) == 100
+
+        recent = session_logger.get_recent_events("elden_ring", limit=150)
+        assert [e.content for e in recent] == [f"Q{i}" for i in range(100, 250)]
+
+
+@pytest.mark.unit
+class TestReadingAndCompaction:
+    """Test loading damaged and legacy logs"""
+
+    def _event(self, content):
+        return SessionEvent(
+            timestamp=datetime(2024, 1, 1, 12, 0),
+            event_type="question",
+            game_profile_id="elden_ring",
+            content=content,
+        ).to_dict()
+
+    def test_damaged_line_is_skipped(self, make_logger):
+        """A torn final line from a crash does not hide earlier events"""
+        session_logger = make_logger()
+        log_file = session_logger._get_session_file("elden_ring", "20240101_120000")
+        log_file.write_text(json.dumps(self._event("ok")) + '\n{"timestamp": "2024-')
+
+        events = session_logger._load_session("elden_ring", "20240101_120000")
+
+        assert [e.content for e in events] == ["ok"]
+
+    def test_legacy_json_sessions_are_read_and_compacted(self, make_logger):
+        """Old .json snapshots are listed, loaded and converted to JSONL"""
+        session_logger = make_logger()
+        legacy = session_logger._get_legacy_session_file("elden_ring", "20240101_120000")
+        legacy.write_text(json.dumps({"events": [self._event("old")]}))
+
+        assert session_logger.get_all_sessions("elden_ring") == ["20240101_120000"]
+        assert session_logger.compact("elden_ring") == 1
+
+        assert not legacy.exists()
+        jsonl = session_logger._get_session_file("elden_ring", "20240101_120000")
+        assert [json.loads(line)["content"] for line in _lines(jsonl)] == ["old"]
+
+    def test_profile_ids_with_underscores(self, make_logger):
+        """Session IDs are parsed correctly for profiles containing '_'"""
+        session_logger = make_logger()
+        session_logger.log_event("elden_ring", "question", "Q")
+
+        assert session_logger.get_all_sessions("elden_ring") == [
+            session_logger.current_sessions["elden_ring"]
+        ]
+        assert session_logger.get_all_sessions("elden") == []
+
+    def test_session_rollover_compacts_previous(self, make_logger):
+        """A timed-out session is flushed and a fresh window started"""
+        session_logger = make_logger(flush_events=100)
+        session_logger.log_event("elden_ring", "question", "first")
+        # Pretend the first event belongs to an older session
+        session_logger._pending.clear()
+        session_logger._pending_count = 0
+        session_logger._append(
+            "elden_ring", "20240101_120000", SessionEvent.from_dict(self._event("first"))
+        )
+        session_logger.current_sessions["elden_ring"] = "20240101_120000"
+        session_logger.last_event_time["elden_ring"] -= timedelta(hours=3)
+
+        session_logger.log_event("elden_ring", "question", "second")
+
+        assert [e.content for e in session_logger._load_session("elden_ring", "20240101_120000")] == [
+            "first"
+        ]
+        assert [e.content for e in session_logger.get_current_session_events("elden_ring")] == [
+            "second"
+        ]
+
+
+@pytest.mark.unit
+class TestBackgroundWriter:
+    """Test the writer thread and queue"""
+
+    def _log_file(self, session_logger, game="elden_ring"):
+        return session_logger._get_session_file(game, session_logger.current_sessions[game])
+
+    def test_disk_io_runs_on_writer_thread(self, make_logger):
+        """log_event only enqueues; serialization happens off the caller"""
+        session_logger = make_logger()
+        threads = []
+        original = session_logger._append
+        session_logger._append = lambda *args: (
+            threads.append(threading.current_thread().name),
+            original(*args),
+        )
+
+        session_logger.log_event("elden_ring", "question", "Q")
+        session_logger.flush()
+
+        assert threads == ["SessionLogWriterThread"]
+        assert len(_lines(self._log_file(session_logger))) == 1
+        session_logger.close()
+
+    def test_flush_waits_for_queue(self, make_logger):
+        """flush returns only after every queued event is on disk"""
+        session_logger = make_logger(flush_events=1000)
+        for i in range(50):
+            session_logger.log_event("elden_ring", "question", f"Q{i}")
+
+        session_logger.flush()
+
+        assert len(_lines(self._log_file(session_logger))) == 50
+        stats = session_logger.get_writer_stats()
+        assert stats["enqueued"] == stats["written"] == 50
+        assert stats["queue_depth"] == 0
+        session_logger.close()
+
+    def test_idle_writer_commits_after_interval(self, make_logger):
+        """Buffered events are committed once the writer has been idle"""
+        session_logger = make_logger(flush_events=1000, flush_interval=0.05)
+        session_logger.log_event("elden_ring", "question", "Q")
+        log_file = self._log_file(session_logger)
+
+        deadline = time.monotonic() + 2
+        while not log_file.exists() and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+        assert log_file.exists()
+        session_logger.close()
+
+    def test_drop_oldest_backpressure(self, make_logger):
+        """A full queue discards the oldest event instead of blocking"""
+        session_logger = make_logger(queue_size=2, backpressure="drop_oldest")
+        gate = threading.Event()
+        original = session_logger._append
+
+        def stalled_append(*args):
+            gate.wait(2)
+            original(*args)
+
+        session_logger._append = stalled_append
+        # The writer takes the first event and then stalls
+        session_logger.log_event("elden_ring", "question", "Q0")
+        deadline = time.monotonic() + 2
+        while session_logger._queue.qsize() and time.monotonic() < deadline:
+            time.sleep(0.01)
+        for i in range(1, 4):
+            session_logger.log_event("elden_ring", "question", f"Q{i}")
+        gate.set()
+
+        session_logger.flush()
+
+        contents = [json.loads(line)["content"] for line in _lines(self._log_file(session_logger))]
+        assert contents == ["Q0", "Q2", "Q3"]
+        assert session_logger.get_writer_stats()["dropped"] == 1
+        session_logger.close()
+
+    def test_drop_oldest_keeps_control_tasks(self, make_logger):
+        """Compaction tasks survive a full queue; the oldest event goes instead"""
+        session_logger = make_logger(queue_size=2, backpressure="drop_oldest")
+        gate = threading.Event()
+        original = session_logger._append
+        compacted = []
+
+        def stalled_append(*args):
+            gate.wait(2)
+            original(*args)
+
+        session_logger._append = stalled_append
+        session_logger._compact_session = lambda *args: compacted.append(args)
+        session_logger.log_event("elden_ring", "question", "Q0")
+        deadline = time.monotonic() + 2
+        while session_logger._queue.qsize() and time.monotonic() < deadline:
+            time.sleep(0.01)
+        session_logger._submit(("compact", ("elden_ring", "20240101_000000")))
+        for i in range(1, 4):
+            session_logger.log_event("elden_ring", "question", f"Q{i}")
+        gate.set()
+
+        session_logger.flush()
+
+        contents = [json.loads(line)["content"] for line in _lines(self._log_file(session_logger))]
+        assert compacted == [("elden_ring", "20240101_000000")]
+        assert contents == ["Q0", "Q3"]
+        assert session_logger.get_writer_stats()["dropped"] == 2
+        session_logger.close()
+
+    def test_unknown_backpressure_policy(self, tmp_path):
+        """Invalid backpressure policies raise ValueError"""
+        with pytest.raises(ValueError, match="Unknown backpressure policy"):
+            SessionLogger(config_dir=str(tmp_path), backpressure="spill")
+
+    def test_close_flushes_and_falls_back_to_inline_writes(self, make_logger):
+        """close() commits queued events; later events are written inline"""
+        session_logger = make_logger(flush_events=1000)
+        session_logger.log_event("elden_ring", "question", "before")
+
+        session_logger.close()
+        assert len(_lines(self._log_file(session_logger))) == 1
+
+        session_logger.log_event("elden_ring", "question", "after")
+        session_logger.flush()
+        assert len(_lines(self._log_file(session_logger))) == 2
+        assert session_logger.get_writer_stats()["background"] is False
@@ -0,0 +1,116 @@
+"""
+Test suite for rolling session statistics
+
+Tests per-session aggregates, the persisted cross-session sidecar and its
+rebuild from existing logs.
+"""
+import json
+from datetime import datetime, timedelta
+
+import pytest
+
+from src.session_logger import SessionEvent, SessionLogger
+from src.session_stats import RollingSessionStats, SessionStatsSidecar, week_key
+
+
+@pytest.mark.unit
+class TestRollingSessionStats:
+    """Test per-session aggregates"""
+
+    def test_record_updates_counts_and_histogram(self):
+        """Counts, bounds and the hour histogram are updated per event"""
+        stats = RollingSessionStats(session_id="20240101_120000")
+        start = datetime(2024, 1, 1, 23, 50)
+        stats.record("question", start)
+        stats.record("answer", start + timedelta(minutes=15))
+
+        summary = stats.to_summary()
+
+        assert summary["total_events"] == 2
+        assert summary["event_types"] == {"question": 1, "answer": 1}
+        assert summary["duration_minutes"] == 15.0
+        assert summary["hourly"][23] == 1 and summary["hourly"][0] == 1
+
+    def test_summary_beyond_memory_window(self, tmp_path):
+        """Totals cover the whole session, not just the in-memory events"""
+        session_logger = SessionLogger(config_dir=str(tmp_path), background=False)
+        for i in range(150):
+            session_logger.log_event("elden_ring", "question", f"Q{i}")
+
+        summary = session_logger.get_session_summary("elden_ring")
+
+        assert summary["total_events"] == 150
+        assert summary["session_id"] == session_logger.current_sessions["elden_ring"]
+        session_logger.close()
+
+    def test_clear_session_resets_summary(self, tmp_path):
+        """Clearing a session drops its rolling aggregates"""
+        session_logger = SessionLogger(config_dir=str(tmp_path), background=False)
+        session_logger.log_event("elden_ring", "question", "Q")
+
+        session_logger.clear_session("elden_ring")
+
+        assert session_logger.get_session_summary("elden_ring")["total_events"] == 0
+        session_logger.close()
+
+
+@pytest.mark.unit
+class TestLifetimeStats:
+    """Test the cross-session sidecar"""
+
+    def test_sessions_and_weeks_are_counted(self, tmp_path):
+        """A new session bumps the session counters for its week"""
+        sidecar = SessionStatsSidecar(tmp_path / "stats.json")
+        monday = datetime(2024, 1, 1, 10, 0)
+        sidecar.record("elden_ring", "question", monday, new_session=True)
+        sidecar.record("elden_ring", "answer", monday)
+        sidecar.record("elden_ring", "question", monday + timedelta(days=7), new_session=True)
+
+        stats = sidecar.get("elden_ring")
+
+        assert stats["sessions"] == 2
+        assert stats["event_types"] == {"question": 2, "answer": 1}
+        assert stats["weeks"] == {
+            "2024-W01": {"events": 2, "sessions": 1},
+            "2024-W02": {"events": 1, "sessions": 1},
+        }
+        assert week_key(monday) == "2024-W01"
+
+    def test_persisted_across_restarts(self, tmp_path):
+        """Lifetime totals survive a new logger instance"""
+        session_logger = SessionLogger(config_dir=str(tmp_path), background=False)
+        for i in range(3):
+            session_logger.log_event("elden_ring", "question", f"Q{i}")
+        session_logger.close()
+
+        restarted = SessionLogger(config_dir=str(tmp_path), background=False)
+        restarted.log_event("elden_ring", "answer", "A")
+        stats = restarted.get_lifetime_stats("elden_ring")
+
+        assert stats["total_events"] == 4
+        assert stats["sessions"] == 2
+        assert restarted.get_lifetime_stats("dark_souls")["total_events"] == 0
+        restarted.close()
+
+    def test_rebuilt_from_logs_when_missing(self, tmp_path):
+        """Existing history is folded in once if there is no sidecar"""
+        logs_dir = tmp_path / "session_logs"
+        logs_dir.mkdir()
+        for session_id, count in (("20240101_120000", 2), ("20240108_120000", 3)):
+            timestamp = datetime.strptime(session_id, "%Y%m%d_%H%M%S")
+            lines = [
+                json.dumps(
+                    SessionEvent(timestamp, "question", "elden_ring", f"Q{i}").to_dict()
+                )
+                for i in range(count)
+            ]
+            (logs_dir / f"elden_ring_{session_id}.jsonl").write_text("\n".join(lines) + "\n")
+
+        session_logger = SessionLogger(config_dir=str(tmp_path))
+        stats = session_logger.get_lifetime_stats("elden_ring")
+
+        assert stats["total_events"] == 5
+        assert stats["sessions"] == 2
+        assert set(stats["weeks"]) == {"2024-W01", "2024-W02"}
+        assert (logs_dir / SessionStatsSidecar.FILENAME).exists()
+        session_logger.close()
@@ -0,0 +1,184 @@
+"""
+Test suite for the SQLite session store
+
+Tests indexed queries, aggregation, SessionLogger integration and the
+JSON log migration.
+"""
+import json
+import sqlite3
+from datetime import datetime, timedelta
+
+import pytest
+
+from src.session_logger import SessionEvent, SessionLogger
+from src.session_store import SessionStore, main
+
+
+def _event(content, event_type="question", minutes=0, game="elden_ring"):
+    return SessionEvent(
+        timestamp=datetime(2024, 1, 1, 12, 0) + timedelta(minutes=minutes),
+        event_type=event_type,
+        game_profile_id=game,
+        content=content,
+        meta={"n": minutes},
+    )
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = SessionStore(str(tmp_path / "sessions.db"))
+    yield store
+    store.close()
+
+
+@pytest.mark.unit
+class TestQueries:
+    """Test range and aggregate queries"""
+
+    def test_wal_mode_and_indexes(self, store):
+        """The database uses WAL and indexes the query columns"""
+        conn = sqlite3.connect(str(store.db_path))
+        mode = conn.execute("PRAGMA journal_mode").fetchone()[0]
+        indexes = {row[1] for row in conn.execute("PRAGMA index_list(events)")}
+        conn.close()
+
+        assert mode == "wal"
+        assert {"idx_events_game_time", "idx_events_game_type_time"} <= indexes
+
+    def test_recent_events_across_sessions(self, store):
+        """The newest N events come back in chronological order"""
+        store.add_events(("20240101_120000", _event(f"Q{i}", minutes=i)) for i in range(5))
+        store.add_events([("20240102_120000", _event("Q5", minutes=60 * 24))])
+        store.add_events([("20240101_120000", _event("other", game="dark_souls"))])
+
+        recent = store.get_recent_events("elden_ring", limit=3)
+
+        assert [e.content for e in recent] == ["Q3", "Q4", "Q5"]
+        assert recent[0].meta == {"n": 3}
+        assert store.get_session_ids("elden_ring") == ["20240102_120000", "20240101_120000"]
+
+    def test_range_and_type_filters(self, store):
+        """Time bounds and event types narrow the result"""
+        store.add_events(
+            ("20240101_120000", _event(f"E{i}", "question" if i % 2 else "answer", minutes=i))
+            for i in range(6)
+        )
+        start = datetime(2024, 1, 1, 12, 2)
+        end = datetime(2024, 1, 1, 12, 5)
+
+        events = store.get_events("elden_ring", start=start, end=end, event_types=["question"])
+
+        assert [e.content for e in events] == ["E3"]
+        assert store.count_by_type("elden_ring") == {"question": 3, "answer": 3}
+        assert store.count_by_type("elden_ring", start=start) == {"question": 2, "answer": 2}
+
+    def test_session_aggregates(self, store):
+        """Per-session start, end and counts come from one grouped query"""
+        store.add_events(("20240101_120000", _event(f"Q{i}", minutes=i)) for i in range(3))
+
+        (session,) = store.get_sessions("elden_ring")
+
+        assert session["session_id"] == "20240101_120000"
+        assert session["total_events"] == 3
+        assert session["end_time"] == "2024-01-01T12:02:00"
+
+
+@pytest.mark.unit
+class TestMigration:
+    """Test importing JSON and JSONL logs"""
+
+    def _write_logs(self, logs_dir):
+        logs_dir.mkdir(parents=True, exist_ok=True)
+        (logs_dir / "elden_ring_20240101_120000.json").write_text(
+            json.dumps({"events": [_event("legacy").to_dict()]})
+        )
+        (logs_dir / "elden_ring_20240102_120000.jsonl").write_text(
+            json.dumps(_event("jsonl", minutes=60 * 24).to_dict()) + "\n"
+        )
+        (logs_dir / "notes.json").write_text("{}")
+
+    def test_import_is_idempotent(self, tmp_path, store):
+        """Each log file is imported once"""
+        self._write_logs(tmp_path)
+
+        assert store.import_logs(str(tmp_path)) == 2
+        assert store.import_logs(str(tmp_path)) == 0
+        assert [e.content for e in store.get_recent_events("elden_ring")] == ["legacy", "jsonl"]
+
+    def test_compacted_session_imported_once(self, tmp_path, store):
+        """A session with both .json and .jsonl logs is imported from the .jsonl only"""
+        self._write_logs(tmp_path)
+        legacy = tmp_path / "elden_ring_20240101_120000.json"
+        legacy.with_suffix(".jsonl").write_text(
+            json.dumps(_event("compacted").to_dict()) + "\n"
+        )
+
+        assert store.import_logs(str(tmp_path)) == 2
+        assert [e.content for e in store.get_recent_events("elden_ring")] == ["compacted", "jsonl"]
+
+        # A session imported from its legacy log is skipped once compacted
+        other = SessionStore(str(tmp_path / "other.db"))
+        legacy.with_suffix(".jsonl").unlink()
+        assert other.import_logs(str(tmp_path)) == 2
+        legacy.with_suffix(".jsonl").write_text(
+            json.dumps(_event("compacted").to_dict()) + "\n"
+        )
+        legacy.unlink()
+        assert other.import_logs(str(tmp_path)) == 0
+        other.close()
+
+    def test_cli_migrates_config_dir(self, tmp_path, capsys):
+        """The command line tool imports logs from the config directory"""
+        self._write_logs(tmp_path / "session_logs")
+
+        assert main(["--config-dir", str(tmp_path)]) == 0
+
+        assert "Imported 2 events" in capsys.readouterr().out
+        store = SessionStore(str(tmp_path / "session_logs" / "sessions.db"))
+        assert store.count_by_type("elden_ring") == {"question": 2}
+        store.close()
+
+
+@pytest.mark.unit
+class TestLoggerBackend:
+    """Test SessionLogger with the SQLite backend"""
+
+    def test_logger_commits_to_store(self, tmp_path):
+        """Group commits insert into SQLite and queries use the store"""
+        store = SessionStore(str(tmp_path / "sessions.db"))
+        session_logger = SessionLogger(config_dir=str(tmp_path), store=store)
+        for i in range(150):
+            session_logger.log_event("elden_ring", "question", f"Q{i}")
+        session_logger.log_event("elden_ring", "answer", "A")
+
+        recent = session_logger.get_recent_events("elden_ring", limit=120)
+        counts = session_logger.get_event_counts("elden_ring")
+        since = session_logger.get_events_since(
+            "elden_ring", datetime.now() - timedelta(hours=1), limit=5
+        )
+
+        assert len(recent) == 120
+        assert recent[-1].content == "A"
+        assert counts == {"question": 150, "answer": 1}
+        assert [e.content for e in since] == ["Q146", "Q147", "Q148", "Q149", "A"]
+        assert session_logger.get_all_sessions("elden_ring") == [
+            session_logger.current_sessions["elden_ring"]
+        ]
+        assert not list((tmp_path / "session_logs").glob("*.jsonl"))
+        session_logger.close()
+        store.close()
+
+    def test_existing_logs_imported_on_startup(self, tmp_path):
+        """Switching to SQLite keeps the history recorded as JSONL"""
+        jsonl_logger = SessionLogger(config_dir=str(tmp_path))
+        jsonl_logger.log_event("elden_ring", "question", "from jsonl")
+        jsonl_logger.close()
+
+        store = SessionStore(str(tmp_path / "sessions.db"))
+        session_logger = SessionLogger(config_dir=str(tmp_path), store=store)
+
+        assert [e.content for e in session_logger.get_recent_events("elden_ring")] == [
+            "from jsonl"
+        ]
+        session_logger.close()
+        store.close()
@@ -0,0 +1,198 @@
+"""
+Test suite for incremental session summarization
+
+Tests window closing, hierarchical merging, persistence and the recap
+prompt built from window summaries.
+"""
+import json
+from datetime import datetime, timedelta
+from unittest.mock import Mock, patch
+
+import pytest
+
+from src.session_coaching import SessionCoach
+from src.session_logger import SessionLogger
+from src.session_summarizer import SessionSummarizer, WindowSummary
+
+
+class FakeLLM:
+    """Records prompts and answers with numbered summaries"""
+
+    def __init__(self):
+        self.prompts = []
+
+    def __call__(self, prompt):
+        self.prompts.append(prompt)
+        return f"summary {len(self.prompts)}"
+
+
+class ChatOnlyRouter:
+    """Stands in for AIRouter, which only exposes chat()"""
+
+    def __init__(self, reply):
+        self.reply = reply
+        self.calls = []
+
+    def chat(self, messages, provider=None, model=None, **kwargs):
+        self.calls.append(messages)
+        return {"content": self.reply}
+
+
+def _summarizer(tmp_path, session_logger, llm, **kwargs):
+    kwargs.setdefault("background", False)
+    return SessionSummarizer(
+        session_logger, llm, tmp_path / "session_summaries", **kwargs
+    )
+
+
+@pytest.fixture
+def session_logger(tmp_path):
+    session_logger = SessionLogger(config_dir=str(tmp_path), background=False)
+    yield session_logger
+    session_logger.close()
+
+
+@pytest.mark.unit
+class TestWindows:
+    """Test map and reduce steps"""
+
+    def test_window_closes_by_size(self, tmp_path, session_logger):
+        """Every window_events events produce one level 0 summary"""
+        llm = FakeLLM()
+        summarizer = _summarizer(tmp_path, session_logger, llm, window_events=5)
+        for i in range(12):
+            session_logger.log_event("elden_ring", "question", f"Q{i}")
+
+        session_id = session_logger.current_sessions["elden_ring"]
+        summaries, recent = summarizer.get_recap_context("elden_ring", session_id)
+
+        assert [(s.start_index, s.end_index) for s in summaries] == [(1, 5), (6, 10)]
+        assert [e.content for e in recent] == ["Q10", "Q11"]
+        assert "question: Q4" in llm.prompts[0]
+
+    def test_window_closes_by_time(self, tmp_path, session_logger):
+        """A window spanning window_minutes closes once it has enough events"""
+        llm = FakeLLM()
+        now = [datetime.now()]
+        summarizer = _summarizer(
+            tmp_path, session_logger, llm,
+            window_events=100, window_minutes=10, min_window_events=2,
+            clock=lambda: now[0],
+        )
+        session_logger.log_event("elden_ring", "question", "Q0")
+        session_logger.log_event("elden_ring", "question", "Q1")
+        assert llm.prompts == []
+
+        now[0] += timedelta(minutes=11)
+        summarizer.tick()
+
+        assert len(llm.prompts) == 1
+
+    def test_summaries_merge_hierarchically(self, tmp_path, session_logger):
+        """fanout summaries of one level are reduced into the next"""
+        llm = FakeLLM()
+        summarizer = _summarizer(tmp_path, session_logger, llm, window_events=2, fanout=2)
+        for i in range(10):
+            session_logger.log_event("elden_ring", "question", f"Q{i}")
+
+        session_id = session_logger.current_sessions["elden_ring"]
+        summaries, recent = summarizer.get_recap_context("elden_ring", session_id)
+
+        # 5 windows: 1-8 merged to level 2, 9-10 left at level 0
+        assert [(s.level, s.start_index, s.end_index) for s in summaries] == [
+            (2, 1, 8), (0, 9, 10)
+        ]
+        assert recent == []
+
+    def test_failed_window_is_retried(self, tmp_path, session_logger):
+        """Events stay unsummarized until the LLM call succeeds"""
+        llm = Mock(side_effect=[RuntimeError("offline"), "ok"])
+        summarizer = _summarizer(tmp_path, session_logger, llm, window_events=2)
+        for i in range(3):
+            session_logger.log_event("elden_ring", "question", f"Q{i}")
+
+        session_id = session_logger.current_sessions["elden_ring"]
+        summaries, recent = summarizer.get_recap_context("elden_ring", session_id)
+
+        assert [(s.start_index, s.end_index) for s in summaries] == [(1, 2)]
+        assert [e.content for e in recent] == ["Q2"]
+
+
+@pytest.mark.unit
+class TestPersistence:
+    """Test summaries stored next to the session logs"""
+
+    def test_summaries_reloaded_without_llm_calls(self, tmp_path, session_logger):
+        """A new summarizer resumes from the summary file and the session log"""
+        _summarizer(tmp_path, session_logger, FakeLLM(), window_events=2, fanout=2)
+        for i in range(5):
+            session_logger.log_event("elden_ring", "question", f"Q{i}")
+        session_id = session_logger.current_sessions["elden_ring"]
+
+        llm = FakeLLM()
+        resumed = SessionSummarizer(
+            Mock(get_session_events=session_logger.get_session_events),
+            llm,
+            tmp_path / "session_summaries",
+            window_events=2,
+            fanout=2,
+            background=False,
+        )
+        summaries, recent = resumed.get_recap_context("elden_ring", session_id)
+
+        assert [(s.level, s.end_index) for s in summaries] == [(1, 4)]
+        assert [e.content for e in recent] == ["Q4"]
+        assert llm.prompts == []
+
+        lines = (tmp_path / "session_summaries" / f"elden_ring_{session_id}.jsonl").read_text()
+        assert [json.loads(line)["level"] for line in lines.splitlines()] == [0, 0, 1]
+
+    def test_window_summary_round_trip(self):
+        """WindowSummary survives serialization"""
+        summary = WindowSummary(0, 1, 5, datetime(2024, 1, 1, 12), datetime(2024, 1, 1, 12, 5), "t")
+
+        assert WindowSummary.from_dict(summary.to_dict()) == summary
+        assert summary.format() == "[12:00-12:05, events 1-5] t"
+
+
+@pytest.mark.unit
+class TestRecap:
+    """Test recaps built from summaries"""
+
+    def test_recap_uses_one_call_over_summaries(self, session_logger):
+        """The recap prompt contains summaries and only the latest raw events"""
+        router = ChatOnlyRouter("window")
+        with patch("src.session_coaching.get_router", return_value=router):
+            coach = SessionCoach(session_logger=session_logger, config=Mock(ai_provider="ollama"))
+        for i in range(130):
+            session_logger.log_event("elden_ring", "question", f"Question {i}")
+        assert coach.summarizer.wait_idle()
+        router.calls.clear()
+        router.reply = "recap"
+
+        assert coach.generate_session_recap("elden_ring") == "recap"
+
+        assert len(router.calls) == 1
+        prompt = router.calls[0][-1]["content"]
+        assert "events 81-120] window" in prompt
+        assert "Question 129" in prompt and "Question 119" not in prompt
+        assert "Total interactions: 130" in prompt
+        coach.summarizer.shutdown()
+
+    def test_windows_summarized_through_router_chat(self, session_logger):
+        """Window summaries go through AIRouter.chat with a system message"""
+        router = ChatOnlyRouter("window")
+        with patch("src.session_coaching.get_router", return_value=router):
+            coach = SessionCoach(session_logger=session_logger, config=Mock(ai_provider="ollama"))
+        coach.summarizer.window_events = 5
+        for i in range(6):
+            session_logger.log_event("elden_ring", "question", f"Question {i}")
+        assert coach.summarizer.wait_idle()
+
+        session_id = session_logger.current_sessions["elden_ring"]
+        summaries, recent = coach.summarizer.get_recap_context("elden_ring", session_id)
+
+        assert [s.text for s in summaries] == ["window"]
+        assert [e.content for e in recent] == ["Question 5"]
+        assert [m["role"] for m in router.calls[0]] == ["system", "user"]
+        coach.summarizer.shutdown()
@@ -0,0 +1,181 @@
+"""
+Test suite for speculative knowledge prefetching
+
+Tests draft coalescing, cache hits and misses, and AIAssistant reuse of
+prefetched context.
+"""
+import threading
+from unittest.mock import MagicMock, Mock, patch
+
+import pytest
+
+from src.speculative_prefetch import SpeculativePrefetcher, normalize_draft
+
+
+class FakeClock:
+    """Manually advanced monotonic clock"""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def knowledge():
+    knowledge = Mock()
+    knowledge.build_knowledge_context.side_effect = (
+        lambda game_profile_id, question, extra_settings: (f"ctx:{question}", 2)
+    )
+    return knowledge
+
+
+@pytest.fixture
+def prefetcher(knowledge):
+    prefetcher = SpeculativePrefetcher(knowledge, clock=FakeClock())
+    yield prefetcher
+    prefetcher.shutdown()
+
+
+@pytest.mark.unit
+class TestPrefetcher:
+    """Test the background prefetch worker"""
+
+    def test_normalize_draft(self):
+        """Whitespace differences share a cache entry"""
+        assert normalize_draft("  how   do I\tparry ") == "how do I parry"
+
+    def test_short_drafts_are_ignored(self, prefetcher, knowledge):
+        """Drafts below min_chars are not prefetched"""
+        assert prefetcher.submit("how", "elden_ring", "Elden Ring") is False
+        knowledge.build_knowledge_context.assert_not_called()
+
+    def test_prefetched_result_is_reused(self, prefetcher, knowledge):
+        """A submitted question matching the draft is a cache hit"""
+        prefetcher.submit("How do I parry?", "elden_ring", "Elden Ring")
+        assert prefetcher.wait_idle()
+
+        result = prefetcher.take("How do I  parry?", "elden_ring")
+
+        assert result.knowledge_context == "ctx:How do I parry?"
+        assert result.chunks_retrieved == 2
+        assert prefetcher.hits == 1
+        assert prefetcher.take("How do I parry?", "elden_ring") is None
+
+    def test_different_profile_misses(self, prefetcher):
+        """Results are keyed by game profile"""
+        prefetcher.submit("How do I parry?", "elden_ring", "Elden Ring")
+        prefetcher.wait_idle()
+
+        assert prefetcher.take("How do I parry?", "dark_souls") is None
+        assert prefetcher.misses == 1
+
+    def test_expired_results_miss(self, prefetcher):
+        """Results older than the TTL are not used"""
+        prefetcher.submit("How do I parry?", "elden_ring", "Elden Ring")
+        prefetcher.wait_idle()
+        prefetcher._clock.now += prefetcher.ttl + 1
+
+        assert prefetcher.take("How do I parry?", "elden_ring") is None
+
+    def test_latest_draft_wins(self, knowledge):
+        """Drafts queued while a query runs collapse into the newest one"""
+        gate = threading.Event()
+        seen = []
+
+        def slow_build(game_profile_id, question, extra_settings):
+            seen.append(question)
+            gate.wait(2)
+            return None, 0
+
+        knowledge.build_knowledge_context.side_effect = slow_build
+        prefetcher = SpeculativePrefetcher(knowledge)
+        try:
+            prefetcher.submit("How do I p", "g", "Game")
+            for draft in ("How do I pa", "How do I par", "How do I parry"):
+                prefetcher.submit(draft, "g", "Game")
+            gate.set()
+            assert prefetcher.wait_idle()
+        finally:
+            prefetcher.shutdown()
+
+        assert seen[-1] == "How do I parry"
+        assert len(seen) <= 2
+
+    def test_hrm_decision_is_prefetched(self, prefetcher):
+        """HRM classification and analysis run ahead of submission"""
+        with patch(
+            "src.speculative_prefetch.requires_complex_reasoning", return_value=True
+        ), patch(
+            "src.speculative_prefetch.get_hrm_analysis", return_value="analysis"
+        ):
+            prefetcher.submit(
+                "What is the best build order?", "g", "Game", hrm_enabled=True
+            )
+            prefetcher.wait_idle()
+
+        result = prefetcher.take("What is the best build order?", "g")
+        assert result.use_hrm is True
+        assert result.hrm_analysis == "analysis"
+
+
+@pytest.mark.unit
+class TestAssistantIntegration:
+    """Test AIAssistant use of prefetched results"""
+
+    @pytest.fixture
+    def assistant(self):
+        with patch("src.ai_assistant.get_knowledge_integration") as get_ki, \
+             patch("src.ai_assistant.get_hrm_interface") as get_hrm, \
+             patch("src.ai_assistant.get_router"):
+            knowledge = MagicMock()
+            knowledge.should_use_knowledge_packs.return_value = True
+            knowledge.build_knowledge_context.return_value = ("PACK CONTEXT", 3)
+            get_ki.return_value = knowledge
+            get_hrm.return_value.is_available.return_value = False
+
+            from src.ai_assistant import AIAssistant
+            from src.config import Config
+
+            provider = Mock()
+            provider.generate_response.return_value = "answer"
+            assistant = AIAssistant(config=Config(require_keys=False))
+            assistant.provider_instance = provider
+            assistant.set_current_game({"name": "Elden Ring"})
+            profile = Mock(id="elden_ring", extra_settings={}, system_prompt="sys")
+            profile.default_model = None
+            assistant.set_game_profile(profile)
+            yield assistant
+            assistant.prefetcher.shutdown()
+
+    def test_ask_question_uses_prefetch(self, assistant):
+        """A prefetched draft skips the synchronous retrieval"""
+        knowledge = assistant.knowledge_integration
+
+        assert assistant.prefetch_draft("Where is the first boss?") is True
+        assistant.prefetcher.wait_idle()
+        assistant.ask_question("Where is the first boss?")
+
+        knowledge.get_knowledge_context.assert_not_called()
+        knowledge.log_knowledge_query.assert_called_once_with(
+            "elden_ring", "Where is the first boss?", 3
+        )
+        prompt = assistant.provider_instance.generate_response.call_args.kwargs["user_prompt"]
+        assert prompt.endswith("Where is the first boss?")
+        assert "PACK CONTEXT" in prompt
+
+    def test_ask_question_without_prefetch(self, assistant):
+        """Unmatched questions fall back to synchronous retrieval"""
+        knowledge = assistant.knowledge_integration
+        knowledge.get_knowledge_context.return_value = "SYNC CONTEXT"
+
+        assistant.ask_question("Where is the first boss?")
+
+        knowledge.get_knowledge_context.assert_called_once()
+
+    def test_no_prefetch_without_game(self, assistant):
+        """Drafts are ignored when no game is active"""
+        assistant.current_game = None
+
+        assert assistant.prefetch_draft("Where is the first boss?") is False